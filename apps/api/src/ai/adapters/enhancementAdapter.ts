@@ -39,49 +39,28 @@ class AIEnhancementAdapter {
       pricing: null
     };
 
-    try {
-      // Normalisation si activée
-      if (this.config.enableNormalize) {
-        const normalizeResponse = await fetch('http://localhost:8001/normalize', {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify(briefData),
-          signal: AbortSignal.timeout(3000)
-        });
-        
-        if (normalizeResponse.ok) {
-          enhancements.normalized = await normalizeResponse.json();
-        }
-      }
+    // Services demandés au service ML, servis en un seul appel /enhance
+    const parts = [
+      this.config.enableNormalize && 'normalize',
+      this.config.enableGenerator && 'generate',
+      this.config.enableQuestioner && 'questions'
+    ].filter(Boolean);
 
-      // Génération de variantes si activée
-      if (this.config.enableGenerator) {
-        const generatorResponse = await fetch('http://localhost:8001/generate', {
+    try {
+      if (parts.length > 0) {
+        const enhanceResponse = await fetch('http://localhost:8001/enhance', {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify(briefData),
+          body: JSON.stringify({ ...briefData, parts, answers: {} }),
           signal: AbortSignal.timeout(5000)
         });
-        
-        if (generatorResponse.ok) {
-          enhancements.variants = await generatorResponse.json();
-        }
-      }
 
-      // Questions adaptatives si activées
-      if (this.config.enableQuestioner) {
-        const questionResponse = await fetch('http://localhost:8001/questions', {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({
-            brief: briefData,
-            answers: {}
-          }),
-          signal: AbortSignal.timeout(2000)
-        });
-        
-        if (questionResponse.ok) {
-          enhancements.questions = await questionResponse.json();
+        if (enhanceResponse.ok) {
+          // Chaque partie a la forme de la réponse de /normalize, /generate et /questions
+          const payload = await enhanceResponse.json();
+          enhancements.normalized = payload.normalized;
+          enhancements.variants = payload.variants;
+          enhancements.questions = payload.questions;
         }
       }
 
@@ -0,0 +1,176 @@
+"""
+Ligne de commande du service ML
+
+    python -m apps.ml backfill projets.ndjson -o scores.ndjson --checkpoint scores.ckpt
+    cat projets.csv | python -m apps.ml backfill --format csv > scores.ndjson
+    python -m apps.ml sketches build missions.ndjson -o infra/data/price_sketches.json
+    python -m apps.ml sketches merge a.json b.json -o infra/data/price_sketches.json
+    python -m apps.ml client-features ingest mission_events.ndjson --db client_features.sqlite
+
+Depuis apps/ml (ou dans l'image Docker) : python . backfill ...
+"""
+
+import argparse
+from itertools import islice
+import logging
+import os
+import sys
+
+# Les modules du service s'importent depuis apps/ml (`from services.x import ...`)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.backfill import BackfillRunner, Checkpoint, detect_format, read_rows  # noqa: E402
+from services.client_features import ClientFeatureStore  # noqa: E402
+from services.price_sketches import MissionPriceSketches  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+def open_output(path, checkpoint_path):
+    """Sortie du backfill ; en reprise, tronquée au dernier lot complet puis complétée"""
+    if path is None:
+        return sys.stdout
+    checkpoint = Checkpoint.load(checkpoint_path)
+    if checkpoint.offset and os.path.exists(path):
+        output = open(path, 'r+', encoding='utf-8')
+        if checkpoint.output_bytes is not None:
+            output.truncate(checkpoint.output_bytes)
+        output.seek(0, os.SEEK_END)
+        return output
+    return open(path, 'w', encoding='utf-8')
+
+def run_backfill(args) -> int:
+    input_format = detect_format(args.input, args.format)
+    runner = BackfillRunner(
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        max_in_flight=args.max_in_flight,
+        checkpoint_path=args.checkpoint,
+        start_method=os.getenv('ML_PROCESS_START_METHOD', 'spawn')
+    )
+
+    source = open(args.input, 'r', encoding='utf-8', newline='') if args.input and args.input != '-' else sys.stdin
+    output = open_output(args.output, args.checkpoint)
+    try:
+        report = runner.run(read_rows(source, input_format), output)
+    except RuntimeError as e:
+        logger.error(str(e))
+        return 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+    print(report.format(), file=sys.stderr)
+    return 0
+
+def run_sketches_build(args) -> int:
+    # Mise à jour incrémentale : on repart du fichier existant s'il est fourni
+    sketches = MissionPriceSketches.load(args.base) if args.base else MissionPriceSketches(k=args.k)
+    source = open(args.input, 'r', encoding='utf-8', newline='') if args.input and args.input != '-' else sys.stdin
+    try:
+        added = sketches.update_many(read_rows(source, detect_format(args.input, args.format)))
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    sketches.save(args.output)
+    stats = sketches.get_stats()
+    print(f"{added} missions ajoutées ({sketches.skipped} ignorées au total), {stats['cells']} cellules, "
+          f"{stats['retained_values']} valeurs conservées -> {args.output}", file=sys.stderr)
+    return 0
+
+def run_sketches_merge(args) -> int:
+    merged = MissionPriceSketches.load(args.inputs[0])
+    for path in args.inputs[1:]:
+        merged.merge(MissionPriceSketches.load(path))
+    merged.save(args.output)
+    stats = merged.get_stats()
+    print(f"{len(args.inputs)} fichiers fusionnés: {stats['missions']} missions, {stats['cells']} cellules "
+          f"-> {args.output}", file=sys.stderr)
+    return 0
+
+def run_client_features_ingest(args) -> int:
+    from_stdin = not args.input or args.input == '-'
+    feed = args.feed or (None if from_stdin else os.path.abspath(args.input))
+    if feed is None:
+        logger.error("--feed est obligatoire pour lire stdin (position de reprise)")
+        return 1
+    store = ClientFeatureStore(args.db)
+    source = sys.stdin if from_stdin else open(args.input, 'r', encoding='utf-8', newline='')
+    applied = ignored = 0
+    try:
+        # Reprise : les événements déjà appliqués depuis ce flux sont sautés
+        position = store.feed_position(feed)
+        events = read_rows(source, detect_format(args.input, args.format))
+        for _ in islice(events, position):
+            pass
+        while True:
+            chunk = list(islice(events, args.chunk_size))
+            if not chunk:
+                break
+            position += len(chunk)
+            chunk_applied, chunk_ignored = store.apply_events(chunk, feed=feed, position=position)
+            applied += chunk_applied
+            ignored += chunk_ignored
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print(f"{applied} événements appliqués, {ignored} ignorés (position {position} dans {feed}), "
+          f"{store.count_clients()} clients -> {args.db}", file=sys.stderr)
+    store.close()
+    return 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m apps.ml', description="Service ML AppelsPro")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    backfill = commands.add_parser(
+        'backfill',
+        help="Re-score une table de projets (NDJSON ou CSV) avec le pipeline /improve"
+    )
+    backfill.add_argument('input', nargs='?', help="Fichier d'entrée (stdin par défaut ou '-')")
+    backfill.add_argument('-o', '--output', help="Fichier NDJSON de sortie (stdout par défaut)")
+    backfill.add_argument('--format', choices=('ndjson', 'csv'), help="Format d'entrée (d'après l'extension par défaut)")
+    backfill.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                          help="Processus de scoring (0 = processus courant)")
+    backfill.add_argument('--chunk-size', type=int, default=256, help="Lignes par lot envoyé à un processus")
+    backfill.add_argument('--max-in-flight', type=int, help="Lots en cours au maximum (2 par processus par défaut)")
+    backfill.add_argument('--checkpoint', help="Fichier du point de reprise (reprise automatique s'il existe)")
+    backfill.set_defaults(handler=run_backfill)
+
+    sketches = commands.add_parser('sketches', help="Quantiles des prix des missions conclues (mode 'market')")
+    sketch_commands = sketches.add_subparsers(dest='sketch_command', required=True)
+    build = sketch_commands.add_parser(
+        'build',
+        help="Ajoute un flux de missions {category, sub_category, amount, timeline_days} aux sketches"
+    )
+    build.add_argument('input', nargs='?', help="Fichier d'entrée NDJSON ou CSV (stdin par défaut ou '-')")
+    build.add_argument('-o', '--output', required=True, help="Fichier de sketches à écrire")
+    build.add_argument('--base', help="Sketches existants à compléter (mise à jour incrémentale)")
+    build.add_argument('--format', choices=('ndjson', 'csv'), help="Format d'entrée (d'après l'extension par défaut)")
+    build.add_argument('--k', type=int, default=200, help="Précision des sketches (valeurs conservées ~3k par cellule)")
+    build.set_defaults(handler=run_sketches_build)
+    merge = sketch_commands.add_parser('merge', help="Fusionne des fichiers de sketches")
+    merge.add_argument('inputs', nargs='+', help="Fichiers de sketches")
+    merge.add_argument('-o', '--output', required=True, help="Fichier fusionné")
+    merge.set_defaults(handler=run_sketches_merge)
+
+    client_features = commands.add_parser('client-features', help="Historique des clients du calcul LOC")
+    client_feature_commands = client_features.add_subparsers(dest='client_features_command', required=True)
+    ingest = client_feature_commands.add_parser(
+        'ingest',
+        help="Applique un flux d'événements {event: posted|completed|cancelled, client_id, budget, amount}"
+    )
+    ingest.add_argument('input', nargs='?', help="Fichier d'événements NDJSON ou CSV (stdin par défaut ou '-')")
+    ingest.add_argument('--db', required=True, help="Fichier SQLite de l'historique (créé s'il n'existe pas)")
+    ingest.add_argument('--feed', help="Nom du flux pour la reprise (chemin absolu de l'entrée par défaut)")
+    ingest.add_argument('--format', choices=('ndjson', 'csv'), help="Format d'entrée (d'après l'extension par défaut)")
+    ingest.add_argument('--chunk-size', type=int, default=10000, help="Événements par transaction")
+    ingest.set_defaults(handler=run_client_features_ingest)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Temps CPU par requête du chemin /improve : services appelés indépendamment
+(chacun renormalise et remet le texte en minuscules) contre le pipeline qui
+partage un seul brief analysé entre taxonomie, réécriture et analyse qualité.
+
+Vérifie d'abord que les deux chemins produisent les mêmes résultats.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_analyzed_brief [répétitions]
+"""
+
+import logging
+import sys
+import time
+
+from benchmarks.corpus import make_briefs, make_text
+from services.brief_quality import BriefQualityAnalyzer
+from services.data_registry import DataRegistry
+from services.improve_pipeline import ImprovePipeline
+from services.template_rewriter import TemplateRewriter
+from services.text_normalizer import TextNormalizer
+
+def independent_improve(pipeline: ImprovePipeline, request, data):
+    """Chemin sans brief partagé : chaque service recalcule ses caractéristiques"""
+    normalized = pipeline.text_normalizer.normalize(request['description'])
+    taxonomy = data.taxonomizer.classify(
+        text=f"{request['title']} {request['description']}",
+        keywords=normalized.keywords
+    )
+    rewritten = pipeline.template_rewriter.rewrite_project(
+        original_title=request['title'],
+        original_description=request['description'],
+        category=taxonomy.category_std,
+        sub_category=taxonomy.sub_category_std,
+        skills=taxonomy.skills_std
+    )
+    quality = pipeline.brief_quality_analyzer.analyze(
+        title=request['title'],
+        description=request['description'],
+        category=taxonomy.category_std
+    )
+    price = data.price_time_suggester.suggest(
+        category=taxonomy.category_std,
+        sub_category=taxonomy.sub_category_std,
+        complexity='medium',
+        brief_quality_score=quality.brief_quality_score,
+        constraints=normalized.constraints
+    )
+    return taxonomy, rewritten, quality, price
+
+def cpu_per_request(fn, requests, repeat: int) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        for request in requests:
+            fn(request)
+    return (time.process_time() - start) / (repeat * len(requests))
+
+def main():
+    logging.disable(logging.INFO)
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    registry = DataRegistry('../../infra/data')
+    data = registry.current
+    pipeline = ImprovePipeline(
+        text_normalizer=TextNormalizer(),
+        data_registry=registry,
+        template_rewriter=TemplateRewriter(),
+        brief_quality_analyzer=BriefQualityAnalyzer()
+    )
+
+    print(f"{'brief':>12} | {'indépendant (ms)':>16} | {'partagé (ms)':>12} | gain CPU")
+    for word_count in (None, 200, 2000):
+        if word_count is None:
+            label, requests = 'corpus', make_briefs(50)
+        else:
+            label = f"{word_count} mots"
+            requests = [{'title': f"Projet {index}", 'description': make_text(word_count, seed=index)}
+                        for index in range(10)]
+
+        for request in requests:
+            shared = pipeline.improve(request, data)
+            taxonomy, rewritten, quality, price = independent_improve(pipeline, request, data)
+            assert shared['skills_std'] == taxonomy.skills_std
+            assert shared['summary_std'] == rewritten.summary_std
+            assert shared['brief_quality_score'] == quality.brief_quality_score
+            assert shared['price_suggested_med'] == price.price_suggested_med
+
+        independent = cpu_per_request(lambda request: independent_improve(pipeline, request, data), requests, repeat)
+        shared = cpu_per_request(lambda request: pipeline.improve(request, data), requests, repeat)
+        print(
+            f"{label:>12} | {independent * 1000:>16.2f} | {shared * 1000:>12.2f} | "
+            f"{(1 - shared / independent) * 100:.0f} %"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Backfill hors ligne (services/backfill.py) : débit comparé à /improve/batch par lots
+via HTTP, mémoire selon la taille de l'entrée, et reprise après interruption.
+
+Vérifie aussi que la sortie est dans l'ordre d'entrée, identique à /improve/batch,
+et qu'une exécution interrompue puis reprise produit le même fichier.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_backfill [nb_lignes]
+"""
+
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from fastapi.testclient import TestClient
+
+from benchmarks.corpus import make_brief
+from services.backfill import BackfillRunner
+
+logging.disable(logging.INFO)
+os.environ.setdefault('ML_CACHE_ENABLED', 'false')
+
+from main import app  # noqa: E402
+
+def rows(count: int):
+    """Générateur de lignes : l'entrée n'est jamais matérialisée"""
+    for index in range(count):
+        brief = make_brief(index)
+        yield {**brief, 'id': f"p{index}", 'budget': 1000 + index}
+
+def http_rows(count: int):
+    """Mêmes projets au format de /improve/batch (budget -> budget_min / budget_max)"""
+    for row in rows(count):
+        yield {**row, 'budget_min': row['budget'], 'budget_max': row['budget']}
+
+class Interrupted(Exception):
+    pass
+
+def interrupt_after(iterable, count: int):
+    for index, row in enumerate(iterable):
+        if index == count:
+            raise Interrupted()
+        yield row
+
+def run_to_string(runner: BackfillRunner, source) -> str:
+    output = io.StringIO()
+    runner.run(source, output)
+    return output.getvalue()
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    chunk_size = 256
+
+    # Référence : /improve/batch par lots de chunk_size
+    client = TestClient(app)
+    batch = list(http_rows(chunk_size))
+    client.post("/improve/batch", json=batch).raise_for_status()
+    start = time.perf_counter()
+    http_results = []
+    pending = []
+    for row in http_rows(count):
+        pending.append(row)
+        if len(pending) == chunk_size:
+            http_results.extend(client.post("/improve/batch", json=pending).json()['results'])
+            pending = []
+    if pending:
+        http_results.extend(client.post("/improve/batch", json=pending).json()['results'])
+    http_elapsed = time.perf_counter() - start
+
+    print(f"{count} lignes, lots de {chunk_size} ({os.cpu_count()} CPU)")
+    print(f"  {'/improve/batch (HTTP)':<24}: {count / http_elapsed:8.0f} lignes/s")
+
+    outputs = {}
+    for workers in (0, 1, 2):
+        runner = BackfillRunner(workers=workers, chunk_size=chunk_size)
+        start = time.perf_counter()
+        outputs[workers] = run_to_string(runner, rows(count))
+        elapsed = time.perf_counter() - start
+        print(f"  {f'backfill workers={workers}':<24}: {count / elapsed:8.0f} lignes/s")
+
+    # Ordre et contenu identiques à /improve/batch, quel que soit le nombre de processus
+    lines = [json.loads(line) for line in outputs[2].splitlines()]
+    assert [line['index'] for line in lines] == list(range(count))
+    assert all(line['data'] == http['data'] for line, http in zip(lines, http_results))
+    assert outputs[0] == outputs[1] == outputs[2]
+
+    # Mémoire du processus parent (tracemalloc) : constante en fonction de l'entrée
+    for size in (count, count * 4):
+        tracemalloc.start()
+        BackfillRunner(workers=1, chunk_size=chunk_size).run(rows(size), open(os.devnull, 'w'))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  pic mémoire parent, {size:>6} lignes : {peak / 2**20:5.1f} Mo")
+
+    # Reprise : interruption au milieu d'un lot, puis relance avec le même point de reprise
+    with tempfile.TemporaryDirectory() as directory:
+        checkpoint = os.path.join(directory, 'backfill.ckpt')
+        runner = BackfillRunner(workers=1, chunk_size=chunk_size, checkpoint_path=checkpoint)
+        output = io.StringIO()
+        try:
+            runner.run(interrupt_after(rows(count), count // 2 + 7), output)
+        except Interrupted:
+            pass
+        with open(checkpoint) as f:
+            offset = json.load(f)['offset']
+        resumed = io.StringIO()
+        report = runner.run(rows(count), resumed)
+        assert output.getvalue().splitlines()[:offset] + resumed.getvalue().splitlines() == outputs[2].splitlines()
+        print(f"  reprise : {offset} lignes conservées, {report.rows} rescorées, sortie identique")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Coût de /brief/recompute : application incrémentale d'une réponse à la session
+du projet, contre une nouvelle exécution complète du pipeline /improve sur le
+brief complété par la réponse. Vérifie d'abord la lecture des réponses budget
+(parse_budget) sur des cas piégeux.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_brief_recompute [nb_projets]
+"""
+
+import logging
+import statistics
+import sys
+import time
+
+from benchmarks.bench_event_loop import _percentile
+from benchmarks.corpus import make_briefs
+from services.brief_quality import BriefQualityAnalyzer
+from services.brief_recompute import BriefRecomputer, BriefSessionStore, parse_budget
+from services.data_registry import DataRegistry
+from services.improve_pipeline import ImprovePipeline
+from services.template_rewriter import TemplateRewriter
+from services.text_normalizer import TextNormalizer
+
+ANSWERS = [
+    {'id': 'budget', 'answer': '1500-5000€'},
+    {'id': 'timeline', 'answer': 'Urgent (< 1 semaine)'},
+    {'id': 'deliverables', 'answer': 'Fichiers sources et documentation à fournir'},
+    {'id': 'tech_constraints', 'answer': 'Hébergement certifié HDS nécessaire'},
+]
+
+# Réponse budget -> montant retenu (milieu de fourchette, None sans montant)
+BUDGET_CASES = {
+    '8000 €': 8000.0,
+    '1500-5000€': 3250.0,
+    '< 500€': 500.0,
+    '10k': 10000.0,
+    '15 000 €': 15000.0,
+    'entre 5 000 et 8 000 euros': 6500.0,
+    '5-10k€': 7500.0,
+    # Deux nombres sans marqueur de fourchette : pas de fusion ni de moyenne
+    '5000 10000': 5000.0,
+    '2 000 3000': 2000.0,
+    # Nombres d'une autre unité ignorés
+    '2 ans, 8000€': 8000.0,
+    '3 mois et 2000 euros': 2000.0,
+    'pas de budget défini': None,
+}
+
+def check_budgets():
+    for answer, expected in BUDGET_CASES.items():
+        assert parse_budget(answer) == expected, (answer, parse_budget(answer))
+    print(f"{len(BUDGET_CASES)} réponses budget lues correctement")
+
+def main():
+    logging.disable(logging.INFO)
+    check_budgets()
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    registry = DataRegistry('../../infra/data')
+    data = registry.current
+    text_normalizer = TextNormalizer()
+    brief_quality_analyzer = BriefQualityAnalyzer()
+    recomputer = BriefRecomputer(BriefSessionStore(), brief_quality_analyzer, text_normalizer)
+    pipeline = ImprovePipeline(
+        text_normalizer=text_normalizer,
+        data_registry=registry,
+        template_rewriter=TemplateRewriter(),
+        brief_quality_analyzer=brief_quality_analyzer,
+        brief_recomputer=recomputer
+    )
+
+    briefs = [dict(brief, project_id=f"projet-{index}") for index, brief in enumerate(make_briefs(count))]
+    for brief in briefs:
+        pipeline.improve(brief, data)
+
+    incremental, full = [], []
+    for index, brief in enumerate(briefs):
+        answer = ANSWERS[index % len(ANSWERS)]
+
+        start = time.perf_counter()
+        recomputer.recompute(brief['project_id'], [answer], data)
+        incremental.append(time.perf_counter() - start)
+
+        completed = dict(brief, description=f"{brief['description']} {answer['answer']}", project_id=None)
+        start = time.perf_counter()
+        pipeline.improve(completed, data)
+        full.append(time.perf_counter() - start)
+
+    for label, values in (("Recalcul incrémental", incremental), ("Pipeline complet", full)):
+        print(
+            f"{label:<22} p50={statistics.median(values) * 1e6:7.1f} µs  "
+            f"p99={_percentile(values, 99) * 1e6:7.1f} µs"
+        )
+    print(f"{'accélération (p50)':<22} x{statistics.median(full) / statistics.median(incremental):.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Historique des clients (services/client_features.py) : ingestion du flux des
+événements de missions, coût d'une lecture (LRU, SQLite, simulation), prélecture
+groupée pour le scoring par lot, et calculate_loc_batch avec le magasin.
+
+Vérifie aussi que les agrégats stockés sont ceux recalculés directement depuis les
+événements, y compris après une ingestion en plusieurs fois.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_client_features [nb_clients]
+Fichier SQLite temporaire : aucune base externe n'est nécessaire.
+"""
+
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+from services.client_features import ClientFeatureStore, budget_accuracy
+from services.loc_uplift import LOCUpliftCalculator
+
+logging.disable(logging.INFO)
+
+def mission_events(clients: int, count: int, seed: int):
+    rng = random.Random(seed)
+    for _ in range(count):
+        budget = rng.randint(200, 5000)
+        yield {
+            'event': rng.choices(['posted', 'completed', 'cancelled'], weights=[5, 3, 1])[0],
+            'client_id': f"client-{rng.randrange(clients)}",
+            'budget': budget,
+            'amount': budget * rng.uniform(0.6, 1.5)
+        }
+
+def expected_features(events):
+    """Agrégats recalculés directement depuis les événements"""
+    aggregates = {}
+    for event in events:
+        posted, completed, cancelled, accuracy_sum, accuracy_count = aggregates.get(event['client_id'], (0, 0, 0, 0.0, 0))
+        if event['event'] == 'posted':
+            posted += 1
+        elif event['event'] == 'completed':
+            completed += 1
+            accuracy_sum += budget_accuracy(event['budget'], event['amount'])
+            accuracy_count += 1
+        else:
+            cancelled += 1
+        aggregates[event['client_id']] = (posted, completed, cancelled, accuracy_sum, accuracy_count)
+    return aggregates
+
+def per_call(function, arguments):
+    start = time.perf_counter()
+    for argument in arguments:
+        function(argument)
+    return (time.perf_counter() - start) / len(arguments)
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    event_count = clients * 5
+    events = list(mission_events(clients, event_count, seed=1))
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ClientFeatureStore(os.path.join(directory, 'client_features.sqlite'), cache_size=clients)
+
+        # Ingestion par transactions de 10 000 événements, position du flux comprise
+        start = time.perf_counter()
+        for position in range(0, event_count, 10000):
+            store.apply_events(events[position:position + 10000], feed='bench', position=position + 10000)
+        ingest_elapsed = time.perf_counter() - start
+        known = store.count_clients()
+
+        # Agrégats identiques à un recalcul direct ; une seconde base alimentée en deux
+        # fois (reprise à la position enregistrée) donne les mêmes agrégats
+        expected = expected_features(events)
+        resumed = ClientFeatureStore(os.path.join(directory, 'resumed.sqlite'))
+        resumed.apply_events(events[:event_count // 3], feed='bench', position=event_count // 3)
+        resumed.apply_events(events[resumed.feed_position('bench'):], feed='bench', position=event_count)
+        sample = random.Random(2).sample(sorted(expected), 2000)
+        for client_id in sample:
+            posted, completed, cancelled, accuracy_sum, accuracy_count = expected[client_id]
+            for features in (store.get(client_id), resumed.get(client_id)):
+                assert (features.missions_posted, features.missions_completed, features.missions_cancelled) == \
+                    (posted, completed, cancelled), client_id
+                if accuracy_count:
+                    assert abs(features.budget_accuracy - accuracy_sum / accuracy_count) < 1e-9, client_id
+        resumed.close()
+        print(f"Agrégats vérifiés sur {len(sample)} clients (ingestion en une et deux fois)")
+
+        rng = random.Random(3)
+        lookups = [f"client-{rng.randrange(clients)}" for _ in range(100000)]
+        store.clear_cache()
+        cold = per_call(store.get, lookups[:20000])
+        store.prefetch(lookups)
+        warm = per_call(store.get, lookups)
+        simulated = per_call(LOCUpliftCalculator()._assess_client_history, lookups)
+
+        distinct = list(dict.fromkeys(lookups))[:10000]
+        store.clear_cache()
+        start = time.perf_counter()
+        for client_id in distinct:
+            store.get(client_id)
+        single_elapsed = time.perf_counter() - start
+        store.clear_cache()
+        start = time.perf_counter()
+        store.prefetch(distinct)
+        prefetch_elapsed = time.perf_counter() - start
+
+        # Scoring par lot : 100 000 projets, historique lu par une prélecture groupée
+        projects = {
+            'budget': [rng.randint(200, 5000) for _ in range(100000)],
+            'client_id': lookups,
+            'description': ['site vitrine pour un restaurant'] * 100000,
+            'price_suggested_min': [1000] * 100000,
+            'price_suggested_med': [2000] * 100000,
+            'price_suggested_max': [3000] * 100000
+        }
+        store.clear_cache()
+        with_store = LOCUpliftCalculator(client_features=store)
+        start = time.perf_counter()
+        batch = with_store.calculate_loc_batch(projects)
+        batch_elapsed = time.perf_counter() - start
+        for index in range(0, 100000, 997):
+            components = with_store.calculate_loc_components(
+                {'budget': projects['budget'][index], 'client_id': lookups[index],
+                 'description': projects['description'][index]},
+                {name: projects[name][index] for name in ('price_suggested_min', 'price_suggested_max')},
+                {'price_suggested_med': projects['price_suggested_med'][index]}
+            )
+            assert batch.loc_base[index] == with_store.combine_loc_components(components), index
+        start = time.perf_counter()
+        LOCUpliftCalculator().calculate_loc_batch(projects)
+        simulated_batch_elapsed = time.perf_counter() - start
+        store.close()
+
+    print(f"{clients} clients, {event_count} événements ({known} clients distincts)")
+    print(f"  {'ingestion':<36}: {event_count / ingest_elapsed:9.0f} événements/s")
+    print(f"  {'get, LRU froid (SQLite)':<36}: {cold * 1e6:9.1f} µs")
+    print(f"  {'get, LRU chaud':<36}: {warm * 1e6:9.1f} µs")
+    print(f"  {'historique simulé (avant)':<36}: {simulated * 1e6:9.1f} µs")
+    print(f"  {f'{len(distinct)} clients, get un par un':<36}: {single_elapsed * 1000:9.1f} ms")
+    print(f"  {f'{len(distinct)} clients, prefetch':<36}: {prefetch_elapsed * 1000:9.1f} ms")
+    print(f"  {'calculate_loc_batch 100k, magasin':<36}: {batch_elapsed * 1000:9.1f} ms")
+    print(f"  {'calculate_loc_batch 100k, simulé':<36}: {simulated_batch_elapsed * 1000:9.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Codec des corps (services/codec.py) vs le chemin par défaut de FastAPI, par endpoint.
+
+Décodage : json.loads puis validation du dict (modèle typé, ou `dict` pour les
+anciens corps non typés de /normalize, /generate et /questions) vs
+`model_validate_json` sur les octets bruts. Encodage : serialize_response
+(response_model de /improve) ou jsonable_encoder, puis JSONResponse vs orjson /
+`model_dump_json`. Les charges utiles sont de vraies réponses du service.
+
+Vérifie que le JSON produit est identique une fois parsé et que les requêtes
+décodées sont égales.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_codec [répétitions]
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from benchmarks.corpus import make_brief
+
+logging.disable(logging.INFO)
+os.environ['ML_CACHE_ENABLED'] = 'false'
+
+import main as service  # noqa: E402
+from services import codec  # noqa: E402
+
+_dict_body = TypeAdapter(dict)
+
+def _per_call(fn, repeat: int) -> float:
+    """Durée médiane d'un appel (µs) sur 5 séries"""
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        timings.append((time.perf_counter() - start) / repeat * 1e6)
+    return sorted(timings)[2]
+
+def fastapi_encode(route, content) -> bytes:
+    """Partie synchrone de serialize_response (response_model) ou jsonable_encoder,
+    puis JSONResponse"""
+    field = route.response_field
+    if field is not None:
+        value, errors = field.validate(content, {}, loc=('response',))
+        assert not errors
+        content = field.serialize(value, mode='json')
+    else:
+        content = jsonable_encoder(content)
+    return JSONResponse(content).body
+
+def route_for(path: str):
+    return next(route for route in service.app.routes if getattr(route, 'path', None) == path)
+
+def cases():
+    """(endpoint, corps de requête, modèle de la requête, contenu de la réponse)"""
+    from enhancements.generator import generate_brief_variants
+    from enhancements.normalize import normalize_brief
+    from enhancements.questioner import get_next_questions
+
+    brief = make_brief(3)
+    improve_body = {**brief, 'budget_min': 800, 'budget_max': 2500, 'classifier': 'linear'}
+    improve = service.ProjectImproveResponse(
+        **service.improve_pipeline.improve(service.ProjectImproveRequest(**improve_body).model_dump())
+    )
+    normalized = normalize_brief(brief['title'], brief['description'], brief.get('category'))
+    variants = generate_brief_variants(brief['title'], brief['description'], brief.get('category') or 'autre')
+    questions = get_next_questions(brief, {}, 5)
+    return [
+        ('/improve', improve_body, service.ProjectImproveRequest, improve),
+        ('/normalize', brief, service.BriefRequest, {'success': True, 'data': normalized}),
+        ('/generate', brief, service.BriefGenerateRequest, {'success': True, 'data': variants}),
+        ('/questions', {'brief': brief, 'answers': {}, 'max_questions': 5}, service.BriefQuestionsRequest,
+         {'success': True, 'data': questions}),
+        ('/enhance', brief, service.BriefEnhanceRequest, {
+            'normalized': {'success': True, 'data': normalized},
+            'variants': {'success': True, 'data': variants},
+            'questions': {'success': True, 'data': questions}
+        }),
+    ]
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"orjson {'présent' if codec.orjson else 'absent'}, msgpack {'présent' if codec.msgpack else 'absent'}")
+    print(f"{'Endpoint':<11} {'Décodage FastAPI':>17} {'codec':>9} {'Encodage FastAPI':>17} {'codec':>9} {'Octets':>7}")
+    for path, body, model, content in cases():
+        raw = json.dumps(body).encode('utf-8')
+        # Ancien corps non typé : seul /improve et /enhance validaient un modèle
+        typed_before = path in ('/improve', '/enhance')
+
+        def decode_default():
+            payload = json.loads(raw)
+            return model.model_validate(payload) if typed_before else _dict_body.validate_python(payload)
+
+        def decode_codec():
+            return model.model_validate_json(raw)
+
+        route = route_for(path)
+        encoded_default = fastapi_encode(route, content)
+        encoded_codec = codec.dumps_json(content)
+        assert json.loads(encoded_default) == json.loads(encoded_codec), path
+        assert decode_codec() == model.model_validate(json.loads(raw)), path
+
+        decode_before = _per_call(decode_default, repeat)
+        decode_after = _per_call(decode_codec, repeat)
+        encode_before = _per_call(lambda: fastapi_encode(route, content), repeat)
+        encode_after = _per_call(lambda: codec.dumps_json(content), repeat)
+        print(f"{path:<11} {decode_before:14.1f} µs {decode_after:6.1f} µs {encode_before:14.1f} µs "
+              f"{encode_after:6.1f} µs {len(encoded_codec):7d}")
+    print("JSON identique une fois parsé, requêtes décodées égales")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Latence de /improve pendant des rechargements à chaud des données.
+
+Démarre un uvicorn sur une copie de `infra/data`, envoie des briefs en continu et,
+dans la seconde configuration, modifie la grille de prix puis appelle
+`/admin/reload` toutes les 500 ms. Le cache de résultats est désactivé.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_data_reload [durée_s] [clients]
+"""
+
+import asyncio
+import csv
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.bench_event_loop import _free_port, _percentile, _wait_ready
+from benchmarks.corpus import make_briefs
+from services.price_time_suggester import PRICE_FILE
+
+def _scale_prices(price_file: Path, rows: List[Dict[str, str]], factor: float):
+    """Réécrit la grille de prix d'origine `rows` avec des tarifs multipliés par `factor`"""
+    with open(price_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        for row in rows:
+            scaled = dict(row)
+            for column in ('hourly_min', 'hourly_med', 'hourly_max'):
+                scaled[column] = f"{float(row[column]) * factor:.2f}"
+            writer.writerow(scaled)
+
+ADMIN_TOKEN = 'bench-reload'
+
+async def _load(url: str, data_dir: Path, duration: float, clients: int, reload: bool) -> Dict[str, List]:
+    briefs = make_briefs(50)
+    stats: Dict[str, List] = {'improve': [], 'reload': [], 'versions': []}
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(timeout=60) as client:
+        await _wait_ready(client, url)
+
+        async def improve_worker(offset: int):
+            index = offset
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.post(f"{url}/improve", json=briefs[index % len(briefs)])
+                if response.status_code == 200:
+                    stats['improve'].append(time.perf_counter() - start)
+                index += clients
+
+        async def reloader():
+            with open(data_dir / PRICE_FILE, encoding='utf-8') as f:
+                rows = list(csv.DictReader(line for line in f if line.strip()))
+            factor = 1.0
+            while time.perf_counter() < deadline:
+                await asyncio.sleep(0.5)
+                factor = 1.1 if factor == 1.0 else 1.0
+                _scale_prices(data_dir / PRICE_FILE, rows, factor)
+                start = time.perf_counter()
+                response = await client.post(f"{url}/admin/reload", headers={'X-Admin-Token': ADMIN_TOKEN})
+                stats['reload'].append(time.perf_counter() - start)
+                stats['versions'].append(response.json()['data_version'])
+
+        tasks = [improve_worker(offset) for offset in range(clients)]
+        if reload:
+            tasks.append(reloader())
+        await asyncio.gather(*tasks)
+
+    return stats
+
+def run_config(label: str, source_dir: Path, duration: float, clients: int, reload: bool):
+    data_dir = Path(tempfile.mkdtemp())
+    for path in source_dir.glob('*.csv'):
+        shutil.copy(path, data_dir / path.name)
+
+    port = _free_port()
+    env = {**os.environ, 'ML_DATA_PATH': str(data_dir), 'ML_CACHE_ENABLED': 'false', 'ML_ADMIN_TOKEN': ADMIN_TOKEN}
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--log-level', 'warning'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        stats = asyncio.run(_load(f"http://127.0.0.1:{port}", data_dir, duration, clients, reload))
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(data_dir)
+
+    values = stats['improve']
+    print(
+        f"{label:<28} /improve n={len(values):<5} p50={statistics.median(values) * 1000:6.1f} ms  "
+        f"p99={_percentile(values, 99) * 1000:6.1f} ms"
+    )
+    if stats['reload']:
+        print(
+            f"{'':<28} rechargements={len(stats['reload'])} "
+            f"versions distinctes={len(set(stats['versions']))} "
+            f"durée p50={statistics.median(stats['reload']) * 1000:.1f} ms"
+        )
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 8.0
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    source_dir = Path('../../infra/data')
+    run_config("Sans rechargement", source_dir, duration, clients, reload=False)
+    run_config("Rechargement toutes 500 ms", source_dir, duration, clients, reload=True)
+
+if __name__ == "__main__":
+    main()
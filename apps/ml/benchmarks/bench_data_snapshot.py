@@ -0,0 +1,111 @@
+"""
+Temps de chargement des données de référence par worker : parsing des CSV +
+compilation de l'automate, contre chargement du snapshot projeté en mémoire.
+
+Mesure la taxonomie réelle (`infra/data`) puis des taxonomies synthétiques de
+1 000 et 10 000 lignes (11 mots-clés par ligne), avec la grille de prix réelle.
+Vérifie que la grille du snapshot est lue dans le fichier projeté (sans copie) et
+chiffre à l'identique des CSV.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_data_snapshot [dossier_infra_data]
+"""
+
+import csv
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from services.data_snapshot import build_snapshot, load_snapshot
+from services.price_time_suggester import PRICE_FILE, PriceTimeSuggester
+from services.taxonomizer import TAXONOMY_COLUMNS, TAXONOMY_FILE, Taxonomizer
+
+SYLLABLES = ['ka', 'lo', 'mi', 'to', 'zu', 're', 'pa', 'no', 'vi', 'sha', 'dro', 'qui', 'bel', 'tor']
+
+def write_synthetic_taxonomy(path: Path, rows: int, seed: int = 0):
+    rng = random.Random(seed)
+
+    def word(index: int) -> str:
+        return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) + str(index)
+
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(TAXONOMY_COLUMNS)
+        for index in range(rows):
+            writer.writerow([
+                f"catégorie_{index % 40}",
+                f"sous_catégorie_{index % 500}",
+                ','.join(f"{word(index)} {skill}" for skill in range(5)),
+                ','.join(word(index) for _ in range(6)),
+            ])
+
+def check_pricing(csv_pricer: PriceTimeSuggester, snap_pricer: PriceTimeSuggester):
+    """Prix identiques, la grille du snapshot étant lue dans le fichier projeté"""
+    matrix = snap_pricer.price_data.matrix
+    assert not matrix.flags.owndata and not matrix.flags.writeable
+    assert snap_pricer._price_matrix()[0] is matrix
+
+    pairs = [(category, sub_category) for category in csv_pricer.price_data
+             for sub_category in csv_pricer.price_data[category]] + [('inconnue', None), ('design', 'absente')]
+    for category, sub_category in pairs:
+        assert csv_pricer.suggest(category, sub_category) == snap_pricer.suggest(category, sub_category)
+    categories, sub_categories = zip(*pairs)
+    csv_batch = csv_pricer.suggest_many(categories, sub_categories, complexity='complex')
+    snap_batch = snap_pricer.suggest_many(categories, sub_categories, complexity='complex')
+    assert (csv_batch.price_suggested_med == snap_batch.price_suggested_med).all()
+    assert (csv_batch.delay_suggested_days == snap_batch.delay_suggested_days).all()
+
+def best_of(fn, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    logging.disable(logging.INFO)
+    source_dir = Path(sys.argv[1] if len(sys.argv) > 1 else '../../infra/data')
+
+    print(f"{'lignes':>7} | {'snapshot (Ko)':>13} | {'CSV (ms)':>9} | {'snapshot (ms)':>13} | accélération")
+    for rows in (None, 1000, 10000):
+        work_dir = Path(tempfile.mkdtemp())
+        try:
+            shutil.copy(source_dir / PRICE_FILE, work_dir / PRICE_FILE)
+            if rows is None:
+                shutil.copy(source_dir / TAXONOMY_FILE, work_dir / TAXONOMY_FILE)
+            else:
+                write_synthetic_taxonomy(work_dir / TAXONOMY_FILE, rows)
+            snapshot_path = str(work_dir / 'ml_data.snapshot')
+            build_snapshot(str(work_dir), snapshot_path)
+
+            def load_csv():
+                return Taxonomizer(str(work_dir)), PriceTimeSuggester(str(work_dir))
+
+            def load_from_snapshot():
+                snapshot = load_snapshot(snapshot_path)
+                return Taxonomizer.from_snapshot(snapshot), PriceTimeSuggester.from_snapshot(snapshot)
+
+            # Les deux chargements doivent classer et chiffrer à l'identique
+            (csv_taxonomizer, csv_pricer), (snap_taxonomizer, snap_pricer) = load_csv(), load_from_snapshot()
+            assert csv_pricer.price_data == snap_pricer.price_data
+            check_pricing(csv_pricer, snap_pricer)
+            sample = ' '.join(csv_taxonomizer.keyword_automaton.keywords[::97][:50])
+            assert csv_taxonomizer.classify(sample) == snap_taxonomizer.classify(sample)
+
+            csv_time = best_of(load_csv)
+            snapshot_time = best_of(load_from_snapshot)
+            label = 'réel' if rows is None else str(rows)
+            print(
+                f"{label:>7} | {os.path.getsize(snapshot_path) / 1024:>13.0f} | {csv_time * 1000:>9.1f} | "
+                f"{snapshot_time * 1000:>13.1f} | x{csv_time / snapshot_time:.1f}"
+            )
+        finally:
+            shutil.rmtree(work_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Budget de latence X-Request-Deadline et abandon des requêtes /improve
+(services/deadline.py), un uvicorn dédié, cache désactivé.
+
+1. Budget dépassé : latence de briefs longs sans budget vs X-Request-Deadline: 0
+   (réécriture, grille what-if et raisons sautées). Vérifie que les champs non
+   dégradés sont identiques à la réponse complète.
+2. Clients partis : C requêtes concurrentes dont le client abandonne au bout de
+   quelques millisecondes (comme le timeout de l'API Node) ; temps jusqu'au
+   retour au repos du service vs le temps de calcul complet des mêmes requêtes,
+   et latence d'une requête envoyée juste après.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_deadline [clients]
+"""
+
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.bench_enhance import _free_port, _wait_ready
+from benchmarks.corpus import make_text
+
+# Champs remplacés par le brief d'origine ou vidés quand le budget est dépassé
+DEGRADED_FIELDS = {'title_std', 'summary_std', 'acceptance_criteria', 'tasks_std', 'deliverables_std',
+                   'rewrite_version', 'reasons', 'degraded', 'loc_uplift_reco'}
+
+def long_brief(index: int) -> dict:
+    return {'title': f"Plateforme métier {index}", 'description': make_text(1500, seed=index),
+            'budget_min': 2000, 'budget_max': 9000}
+
+async def stats(client: httpx.AsyncClient, url: str) -> dict:
+    return (await client.get(f"{url}/stats")).json()
+
+async def wait_idle(client: httpx.AsyncClient, url: str) -> float:
+    """Secondes jusqu'à ce que l'exécuteur n'ait plus de tâche en cours"""
+    start = time.perf_counter()
+    while (await stats(client, url))['executors']['pending'] > 0:
+        await asyncio.sleep(0.005)
+    return time.perf_counter() - start
+
+async def budget(client: httpx.AsyncClient, url: str, count: int):
+    latencies = {'sans budget': [], 'budget dépassé': []}
+    for index in range(count):
+        body = long_brief(index)
+        start = time.perf_counter()
+        full = (await client.post(f"{url}/improve", json=body)).json()
+        latencies['sans budget'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        partial = (await client.post(f"{url}/improve", json=body, headers={'X-Request-Deadline': '0'})).json()
+        latencies['budget dépassé'].append(time.perf_counter() - start)
+
+        assert full['degraded'] == [] and partial['degraded'] == ['rewrite', 'what_if', 'reasons']
+        assert partial['title_std'] == body['title'] and partial['reasons'] == []
+        assert partial['loc_base'] == full['loc_base'] and partial['loc_uplift_reco']['delta_loc'] == 0
+        assert {key for key in full if full[key] != partial[key]} <= DEGRADED_FIELDS
+    print(f"{count} briefs longs (~10 Ko), séquentiels")
+    for label, values in latencies.items():
+        print(f"  {label:<15} p50={statistics.median(values) * 1000:6.1f} ms")
+
+async def abandoned(client: httpx.AsyncClient, url: str, clients: int):
+    bodies = [long_brief(1000 + index) for index in range(clients)]
+
+    # Référence : les mêmes requêtes attendues jusqu'au bout
+    start = time.perf_counter()
+    await asyncio.gather(*(client.post(f"{url}/improve", json=body) for body in bodies))
+    complete = time.perf_counter() - start
+
+    bodies = [long_brief(2000 + index) for index in range(clients)]
+    before = await stats(client, url)
+
+    async def give_up(body):
+        try:
+            await client.post(f"{url}/improve", json=body, timeout=0.02)
+        except httpx.TimeoutException:
+            return True
+        return False
+
+    start = time.perf_counter()
+    gave_up = sum(await asyncio.gather(*(give_up(body) for body in bodies)))
+    idle = await wait_idle(client, url) + (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    (await client.post(f"{url}/improve", json=long_brief(3000))).raise_for_status()
+    next_latency = time.perf_counter() - start
+
+    after = await stats(client, url)
+    queued = after['micro_batches']['improve'].get('abandoned', 0) - before['micro_batches']['improve'].get('abandoned', 0)
+    cancelled = after['deadlines']['cancelled'] - before['deadlines']['cancelled']
+    assert queued + cancelled > 0, "aucun calcul abandonné"
+    print(f"{clients} requêtes concurrentes, {gave_up} clients partis après 20 ms")
+    print(f"  calcul complet des {clients} requêtes : {complete * 1000:7.1f} ms")
+    print(f"  retour au repos après abandon        : {idle * 1000:7.1f} ms "
+          f"({queued} abandonnées en file, {cancelled} arrêtées entre deux étapes)")
+    print(f"  requête suivante                     : {next_latency * 1000:7.1f} ms")
+
+async def measure(url: str, count: int, clients: int):
+    async with httpx.AsyncClient(timeout=120) as client:
+        await _wait_ready(client, url)
+        for index in range(5):
+            await client.post(f"{url}/improve", json=long_brief(index))
+        await budget(client, url, count)
+        await abandoned(client, url, clients)
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--log-level', 'warning'],
+        env={**os.environ, 'ML_CACHE_ENABLED': 'false'},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        asyncio.run(measure(f"http://127.0.0.1:{port}", 50, clients))
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark /enhance vs la séquence /normalize → /generate → /questions de
+enhancementAdapter.ts : latence de bout en bout via HTTP, un uvicorn dédié.
+
+Vérifie aussi, brief par brief, que chaque partie de /enhance est identique à la
+réponse de l'endpoint dédié.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_enhance [nb_briefs]
+"""
+
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+import httpx
+
+from benchmarks.corpus import make_brief, make_text
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+async def _wait_ready(client: httpx.AsyncClient, url: str):
+    for _ in range(600):
+        try:
+            if (await client.get(f"{url}/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.05)
+    raise RuntimeError("uvicorn n'a pas démarré")
+
+async def three_calls(client: httpx.AsyncClient, url: str, brief) -> dict:
+    """Séquence actuelle de l'adaptateur, un aller-retour par service"""
+    normalized = (await client.post(f"{url}/normalize", json=brief)).json()
+    variants = (await client.post(f"{url}/generate", json=brief)).json()
+    questions = (await client.post(f"{url}/questions", json={'brief': brief, 'answers': {}})).json()
+    return {'normalized': normalized, 'variants': variants, 'questions': questions}
+
+async def one_call(client: httpx.AsyncClient, url: str, brief) -> dict:
+    response = await client.post(f"{url}/enhance", json=brief)
+    response.raise_for_status()
+    return response.json()
+
+async def measure(url: str, briefs) -> dict:
+    latencies = {'sequence': [], 'enhance': []}
+    async with httpx.AsyncClient(timeout=60) as client:
+        await _wait_ready(client, url)
+        for brief in briefs[:10]:
+            await three_calls(client, url, brief)
+            await one_call(client, url, brief)
+
+        for brief in briefs:
+            start = time.perf_counter()
+            sequence = await three_calls(client, url, brief)
+            latencies['sequence'].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            combined = await one_call(client, url, brief)
+            latencies['enhance'].append(time.perf_counter() - start)
+
+            assert combined == sequence, brief['title']
+    return latencies
+
+def run(label: str, briefs):
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--log-level', 'warning'],
+        env={**os.environ, 'ML_CACHE_ENABLED': 'false'},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        latencies = asyncio.run(measure(f"http://127.0.0.1:{port}", briefs))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(label)
+    for name, values in (('3 appels', latencies['sequence']), ('/enhance', latencies['enhance'])):
+        print(f"  {name:<9} p50={statistics.median(values) * 1000:6.2f} ms  "
+              f"p99={_percentile(values, 99) * 1000:6.2f} ms")
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    short = [make_brief(index) for index in range(count)]
+    long = [{'title': f"Gros brief {index}", 'description': make_text(1500, seed=index)} for index in range(count // 3)]
+    run(f"{count} briefs courts", short)
+    run(f"{len(long)} briefs longs (~10 Ko)", long)
+    print("Parties de /enhance identiques aux endpoints dédiés sur chaque brief")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark de latence sous charge concurrente : /health et /improve pendant que
+des briefs de 20 Ko sont traités.
+
+Compare l'exécution dans la boucle asyncio (ML_THREAD_WORKERS=0, comportement
+historique) à l'exécuteur par défaut. Chaque configuration démarre un uvicorn dédié.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_event_loop [durée_s] [clients]
+"""
+
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.corpus import make_text
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+async def _wait_ready(client: httpx.AsyncClient, url: str):
+    for _ in range(200):
+        try:
+            if (await client.get(f"{url}/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.05)
+    raise RuntimeError("uvicorn n'a pas démarré")
+
+async def _load(url: str, duration: float, clients: int) -> Dict[str, List[float]]:
+    big_brief = {'title': "Gros brief", 'description': make_text(3000)}  # ~20 Ko
+    latencies: Dict[str, List[float]] = {'health': [], 'improve': []}
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(timeout=60) as client:
+        await _wait_ready(client, url)
+
+        async def improve_worker():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.post(f"{url}/improve", json=big_brief)
+                if response.status_code == 200:
+                    latencies['improve'].append(time.perf_counter() - start)
+
+        async def health_probe():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get(f"{url}/health")
+                latencies['health'].append(time.perf_counter() - start)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(health_probe(), *(improve_worker() for _ in range(clients)))
+
+    return latencies
+
+def run_config(label: str, env_overrides: Dict[str, str], duration: float, clients: int):
+    port = _free_port()
+    env = {**os.environ, **env_overrides}
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--log-level', 'warning'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        latencies = asyncio.run(_load(f"http://127.0.0.1:{port}", duration, clients))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{label}")
+    for endpoint, values in latencies.items():
+        if values:
+            print(
+                f"  {endpoint:<8} n={len(values):<5} "
+                f"p50={statistics.median(values) * 1000:7.1f} ms  "
+                f"p99={_percentile(values, 99) * 1000:7.1f} ms"
+            )
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    print(f"{clients} clients /improve concurrents (briefs ~20 Ko), {duration:.0f} s par configuration")
+    run_config("Boucle asyncio (ML_THREAD_WORKERS=0)", {'ML_THREAD_WORKERS': '0'}, duration, clients)
+    run_config("Exécuteur (ML_THREAD_WORKERS=2)", {'ML_THREAD_WORKERS': '2'}, duration, clients)
+
+if __name__ == "__main__":
+    main()
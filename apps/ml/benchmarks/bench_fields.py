@@ -0,0 +1,90 @@
+"""
+Projection des champs /improve (`fields`) : latence par ensemble de champs
+demandés, pipeline seul et requête /improve complète (application ASGI, cache et
+micro-lots désactivés). Meilleure médiane de 3 passes.
+
+Vérifie que chaque réponse projetée est exactement la restriction de la réponse
+complète aux champs demandés.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_fields [nb_briefs]
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+from benchmarks.corpus import make_brief, make_text
+
+logging.disable(logging.INFO)
+os.environ['ML_CACHE_ENABLED'] = 'false'
+os.environ['ML_MICRO_BATCH_ENABLED'] = 'false'
+
+import main as service  # noqa: E402
+
+ROUNDS = 3
+
+FIELD_SETS = {
+    'complet': None,
+    'catégorie + prix': ['category_std', 'price_suggested_min', 'price_suggested_med', 'price_suggested_max'],
+    'catégorie': ['category_std', 'sub_category_std'],
+    'qualité': ['brief_quality_score', 'missing_info'],
+    'réécriture': ['title_std', 'summary_std', 'acceptance_criteria', 'tasks_std', 'deliverables_std'],
+    'LOC': ['loc_base', 'loc_uplift_reco'],
+}
+
+def request_data(body: dict, fields) -> dict:
+    return service.ProjectImproveRequest(**body, fields=fields).model_dump()
+
+async def run(label: str, bodies):
+    pipeline = service.improve_pipeline
+    fulls = [pipeline.improve(request_data(body, None)) for body in bodies]
+    print(f"{label}")
+    print(f"  {'Champs':<18} {'Étapes':<52} {'pipeline p50':>12} {'/improve p50':>13}")
+    transport = httpx.ASGITransport(app=service.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://ml') as client:
+        for name, fields in FIELD_SETS.items():
+            requests = [request_data(body, fields) for body in bodies]
+            plan = pipeline.plan(requests[0]['fields'])
+            stages = ', '.join(stage_name for stage_name, _ in pipeline.stages if stage_name in plan)
+
+            for request, full in zip(requests, fulls):
+                projected = pipeline.improve(request)
+                expected = full if fields is None else {key: full[key] for key in request['fields']}
+                assert projected == expected, (name, request['title'])
+
+            # Meilleure médiane sur ROUNDS passes (machine bruitée)
+            pipeline_p50 = http_p50 = float('inf')
+            for _ in range(ROUNDS):
+                latencies = []
+                for request in requests:
+                    start = time.perf_counter()
+                    pipeline.improve(request)
+                    latencies.append(time.perf_counter() - start)
+                pipeline_p50 = min(pipeline_p50, statistics.median(latencies))
+
+                latencies = []
+                for body in bodies:
+                    payload = {**body, 'fields': fields} if fields else body
+                    start = time.perf_counter()
+                    (await client.post('/improve', json=payload)).raise_for_status()
+                    latencies.append(time.perf_counter() - start)
+                http_p50 = min(http_p50, statistics.median(latencies))
+
+            print(f"  {name:<18} {stages:<52} {pipeline_p50 * 1000:9.2f} ms {http_p50 * 1000:10.2f} ms")
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    short = [{**make_brief(index), 'budget_min': 600, 'budget_max': 2400} for index in range(count)]
+    long = [{'title': f"Plateforme métier {index}", 'description': make_text(1500, seed=index),
+             'budget_min': 2000, 'budget_max': 9000} for index in range(count // 4)]
+    asyncio.run(run(f"{count} briefs courts", short))
+    asyncio.run(run(f"{len(long)} briefs longs (~10 Ko)", long))
+    print("Réponses projetées identiques à la restriction de la réponse complète")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark /improve vs /improve/batch (projets par seconde)
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_improve_batch [nb_projets]
+"""
+
+import logging
+import os
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+from benchmarks.corpus import make_briefs
+
+logging.disable(logging.INFO)
+
+# Mesure du calcul : les appels unitaires ne doivent pas remplir le cache du lot
+os.environ.setdefault('ML_CACHE_ENABLED', 'false')
+
+from main import app  # noqa: E402
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    briefs = make_briefs(count)
+    client = TestClient(app)
+
+    # Chauffe
+    client.post("/improve", json=briefs[0])
+
+    start = time.perf_counter()
+    for brief in briefs:
+        response = client.post("/improve", json=brief)
+        response.raise_for_status()
+    single_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    response = client.post("/improve/batch", json=briefs)
+    response.raise_for_status()
+    batch_elapsed = time.perf_counter() - start
+    assert response.json()['succeeded'] == count
+
+    print(f"{count} projets")
+    print(f"  {f'/improve (x{count})':<22}: {count / single_elapsed:8.1f} projets/s")
+    print(f"  {'/improve/batch':<22}: {count / batch_elapsed:8.1f} projets/s")
+    print(f"  {'accélération':<22}: x{single_elapsed / batch_elapsed:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+LOCUpliftCalculator : `calculate_loc_with_uplift` projet par projet vs
+`calculate_loc_batch` sur un lot en colonnes (dict de tableaux NumPy ou DataFrame
+pandas), 1 000 000 de projets par défaut.
+
+Vérifie d'abord, sur des projets aléatoires (valeurs manquantes, catégories
+inconnues, mots-clés d'urgence en casse variable, budgets aux bornes des paliers),
+que loc_base et improvement_potential sont exactement ceux du calcul scalaire.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_loc_batch [nb_projets]
+"""
+
+import logging
+import random
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.corpus import make_brief
+from services.loc_uplift import LOCUpliftCalculator
+
+logging.disable(logging.INFO)
+
+CATEGORIES = ['developpement', 'mobile', 'design', 'marketing', 'travaux', 'menage', 'conseil', '', None]
+EXTRA_TEXT = ['', ' URGENT', ' à faire vite', ' Pas pressé', ' quand possible', ' livraison rapide',
+              ' immédiat', ' IMMÉDIAT', ' PRESSÉ', ' flexible', ' ASAP !',
+              ' invite les clients']
+
+def random_columns(count: int, seed: int):
+    rng = random.Random(seed)
+    price_min = [rng.choice([0, rng.randint(200, 3000)]) for _ in range(count)]
+    price_max = [value * rng.uniform(1.2, 3) for value in price_min]
+    price_med = [(low + high) / 2 if low else rng.choice([0, 1500]) for low, high in zip(price_min, price_max)]
+    budget = []
+    for low, med, high in zip(price_min, price_med, price_max):
+        # Budgets aux bornes des paliers de compétitivité et de réalisme
+        budget.append(rng.choice([0.0, float(rng.randint(100, 6000)), med * 1.2, med * 0.8, float(low),
+                                  low * 0.8, high]))
+    return {
+        'category': [rng.choice(CATEGORIES) for _ in range(count)],
+        'description': [
+            make_brief(rng.randrange(10000))['description'] + rng.choice(EXTRA_TEXT) if rng.random() < 0.98 else None
+            for _ in range(count)
+        ],
+        'client_id': [rng.choice([None, '', f"client-{rng.randint(0, 99999)}", f"clé-{rng.randint(0, 999)}"])
+                      for _ in range(count)],
+        'budget': budget,
+        'brief_quality_score': [rng.choice([rng.random(), 0.8]) for _ in range(count)],
+        'price_suggested_min': price_min,
+        'price_suggested_med': price_med,
+        'price_suggested_max': price_max,
+        'heat_score': [rng.random() for _ in range(count)],
+    }
+
+def scalar(calculator: LOCUpliftCalculator, columns, index: int):
+    result = calculator.calculate_loc_with_uplift(
+        {
+            'category': columns['category'][index],
+            'description': columns['description'][index] or '',
+            'budget': columns['budget'][index],
+            'client_id': columns['client_id'][index]
+        },
+        {
+            'brief_quality_score': columns['brief_quality_score'][index],
+            'price_suggested_min': columns['price_suggested_min'][index],
+            'price_suggested_med': columns['price_suggested_med'][index],
+            'price_suggested_max': columns['price_suggested_max'][index]
+        },
+        {'heat_score': columns['heat_score'][index], 'price_suggested_med': columns['price_suggested_med'][index]}
+    )
+    return result.loc_base, result.improvement_potential
+
+def check_equivalence(calculator: LOCUpliftCalculator, count: int, seed: int) -> int:
+    columns = random_columns(count, seed)
+    batch = calculator.calculate_loc_batch(columns)
+    for index in range(count):
+        got = (float(batch.loc_base[index]), float(batch.improvement_potential[index]))
+        wanted = scalar(calculator, columns, index)
+        assert got == wanted, (index, {name: values[index] for name, values in columns.items()}, got, wanted)
+    return count
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    calculator = LOCUpliftCalculator()
+
+    checked = sum(check_equivalence(calculator, 20000, seed) for seed in range(5))
+    print(f"Équivalence vérifiée sur {checked} projets aléatoires")
+
+    columns = random_columns(count, seed=42)
+    start = time.perf_counter()
+    for index in range(count):
+        scalar(calculator, columns, index)
+    scalar_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = calculator.calculate_loc_batch(columns)
+    batch_elapsed = time.perf_counter() - start
+
+    arrays = {name: np.asarray(values, dtype=object if name in ('category', 'description', 'client_id') else None)
+              for name, values in columns.items()}
+    start = time.perf_counter()
+    calculator.calculate_loc_batch(arrays)
+    arrays_elapsed = time.perf_counter() - start
+
+    try:
+        import pandas as pd
+    except ImportError:
+        frame_elapsed = None
+    else:
+        frame = pd.DataFrame(columns)
+        start = time.perf_counter()
+        from_frame = calculator.calculate_loc_batch(frame)
+        frame_elapsed = time.perf_counter() - start
+        assert np.array_equal(from_frame.loc_base, batch.loc_base)
+        assert np.array_equal(from_frame.improvement_potential, batch.improvement_potential)
+
+    ranking = np.argsort(-batch.loc_base, kind='stable')
+    print(f"{count} projets (meilleur LOC : {batch.loc_base[ranking[0]]:.3f})")
+    print(f"  {'calculate_loc_with_uplift':<34}: {scalar_elapsed:7.2f} s")
+    print(f"  {'calculate_loc_batch (listes)':<34}: {batch_elapsed:7.2f} s  (x{scalar_elapsed / batch_elapsed:.0f})")
+    print(f"  {'calculate_loc_batch (tableaux)':<34}: {arrays_elapsed:7.2f} s")
+    if frame_elapsed is not None:
+        print(f"  {'calculate_loc_batch (DataFrame)':<34}: {frame_elapsed:7.2f} s")
+
+if __name__ == "__main__":
+    main()
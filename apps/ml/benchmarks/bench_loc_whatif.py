@@ -0,0 +1,153 @@
+"""
+LOCUpliftCalculator.evaluate_what_if : temps d'évaluation de la grille
+budget × délai × enrichissements du brief (50 × 50 × 8 par défaut) et de sa
+frontière de Pareto, par projet.
+
+Vérifie aussi, sur des projets aléatoires, que la frontière est exactement
+l'ensemble des points non dominés de la grille recalculée point par point avec
+les méthodes scalaires du calculateur (recherche exhaustive, sans élagage).
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_loc_whatif [nb_projets]
+"""
+
+import logging
+import random
+import sys
+import time
+from itertools import product
+
+import numpy as np
+
+from services.loc_uplift import LOCUpliftCalculator
+
+logging.disable(logging.INFO)
+
+CATEGORIES = ['developpement', 'mobile', 'design', 'marketing', 'travaux', 'menage', 'conseil']
+DESCRIPTIONS = [
+    "site vitrine pour un restaurant avec réservation en ligne",
+    "application mobile urgent pour la gestion de stock",
+    "refonte du logo, pas pressé, quand possible",
+    "campagne SEO à lancer vite",
+    "rénovation d'une salle de bain",
+]
+
+def random_project(rng: random.Random):
+    price_min = rng.choice([0, rng.randint(200, 3000)])
+    price_max = price_min * rng.uniform(1.2, 3) if price_min else 0
+    price_med = (price_min + price_max) / 2 if price_min else rng.choice([0, 1500])
+    project_data = {
+        'category': rng.choice(CATEGORIES),
+        'description': rng.choice(DESCRIPTIONS),
+        'budget': rng.choice([0.0, float(rng.randint(100, 6000))]),
+        'client_id': rng.choice([None, f"client-{rng.randint(0, 999)}"])
+    }
+    standardization_data = {
+        'brief_quality_score': rng.random(),
+        'price_suggested_min': price_min,
+        'price_suggested_med': price_med,
+        'price_suggested_max': price_max,
+        'delay_suggested_days': rng.randint(3, 60),
+        'missing_info': rng.choice([[], ['budget']])
+    }
+    market_context = {'heat_score': rng.random()}
+    if rng.random() < 0.9:
+        market_context['price_suggested_med'] = price_med
+    return project_data, standardization_data, market_context
+
+def scalar_grid(calculator: LOCUpliftCalculator, project_data, standardization_data, market_context,
+                budget_steps: int, delay_steps: int):
+    """Grille recalculée point par point : LOC de base au budget du point (méthodes
+    scalaires) + coefficients de délai et de brief"""
+    budget = project_data['budget']
+    delay = standardization_data['delay_suggested_days']
+    budgets = np.linspace(budget, 1.2 * max(budget, standardization_data['price_suggested_max'], 1.0), budget_steps)
+    extensions = np.round(np.linspace(0, delay, delay_steps))
+    urgent = any(word in project_data['description'] for word in ['urgent', 'vite'])
+    brief_open = standardization_data['brief_quality_score'] < 0.8 or standardization_data['missing_info']
+    enhancements = calculator.improvement_coefficients['brief_enhancement']
+    costs = calculator.action_costs
+    cost_scale = standardization_data['price_suggested_med'] or market_context.get('price_suggested_med', 0)
+    cost_scale = cost_scale if cost_scale > 0 else max(budget, 1.0)
+
+    points = []
+    for b, d, k in product(range(budget_steps), range(delay_steps), range(2 ** len(enhancements))):
+        components = calculator.calculate_loc_components(
+            {**project_data, 'budget': float(budgets[b])}, standardization_data, market_context
+        )
+        loc = max(0.15, min(0.95, sum(components.values())))
+        ratio = extensions[d] / delay
+        if not urgent:
+            delay_coefficients = calculator.improvement_coefficients['delay_extension']
+            if ratio >= 0.6:
+                loc += delay_coefficients['high']
+            elif ratio >= 0.3:
+                loc += delay_coefficients['medium']
+            elif ratio >= 0.1:
+                loc += delay_coefficients['low']
+        chosen = [name for bit, name in enumerate(reversed(list(enhancements))) if k >> bit & 1]
+        if brief_open:
+            loc += sum(enhancements[name] for name in chosen)
+        cost = ((budgets[b] - budget) / cost_scale + costs['delay_extension'] * ratio
+                + sum(costs['brief_enhancement'][name] for name in chosen))
+        points.append((cost, min(0.95, loc)))
+    return points
+
+def check_project(calculator: LOCUpliftCalculator, inputs, budget_steps: int, delay_steps: int):
+    result = calculator.evaluate_what_if(*inputs, budget_steps=budget_steps, delay_steps=delay_steps)
+    points = scalar_grid(calculator, *inputs, budget_steps, delay_steps)
+    origin = points[0][1]
+    assert abs(result.loc_base - origin) < 5e-4, (result.loc_base, origin)
+
+    # Frontière exhaustive : points non dominés, un seul par (coût, gain) distinct
+    expected = []
+    for cost, loc in points:
+        dominated = any(
+            (other_cost <= cost + 1e-9 and other_loc > loc + 1e-9)
+            or (other_cost < cost - 1e-9 and other_loc >= loc - 1e-9)
+            for other_cost, other_loc in points
+        )
+        if not dominated:
+            expected.append((cost, loc - origin))
+    expected = sorted({(round(cost, 9), round(gain, 9)) for cost, gain in expected})
+    got = [(point['cost'], point['loc_gain']) for point in result.frontier]
+    assert len(got) == len(expected) and all(
+        abs(cost - wanted_cost) < 1e-4 and abs(gain - wanted_gain) < 1e-3
+        for (cost, gain), (wanted_cost, wanted_gain) in zip(got, expected)
+    ), (inputs, got, expected)
+    costs = [point['cost'] for point in result.frontier]
+    gains = [point['loc_gain'] for point in result.frontier]
+    assert costs == sorted(costs) and gains == sorted(gains)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    calculator = LOCUpliftCalculator()
+    rng = random.Random(42)
+
+    for _ in range(100):
+        check_project(calculator, random_project(rng), budget_steps=10, delay_steps=8)
+    print("Frontière vérifiée sur 100 projets aléatoires (grille 10 × 8 × 8)")
+
+    projects = [random_project(rng) for _ in range(count)]
+    calculator.evaluate_what_if(*projects[0])
+    timings = []
+    sizes = []
+    for inputs in projects:
+        start = time.perf_counter()
+        result = calculator.evaluate_what_if(*inputs)
+        timings.append(time.perf_counter() - start)
+        sizes.append(len(result.frontier))
+    timings.sort()
+
+    start = time.perf_counter()
+    for inputs in projects:
+        calculator.calculate_loc_with_uplift(*inputs)
+    uplift_elapsed = (time.perf_counter() - start) / count
+
+    print(f"{count} projets, grille {result.evaluated} scénarios (50 × 50 × 8)")
+    print(f"  {'evaluate_what_if p50':<30}: {timings[count // 2] * 1000:6.2f} ms")
+    print(f"  {'evaluate_what_if p99':<30}: {timings[int(count * 0.99)] * 1000:6.2f} ms")
+    print(f"  {'points de la frontière (moy.)':<30}: {sum(sizes) / count:6.1f}")
+    print(f"  {'calculate_loc_with_uplift':<30}: {uplift_elapsed * 1000:6.2f} ms (3 actions fixes)")
+
+if __name__ == "__main__":
+    main()
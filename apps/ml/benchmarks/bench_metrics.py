@@ -0,0 +1,141 @@
+"""
+Coût des métriques Prometheus (services/metrics.py) : pipeline /improve avec et
+sans chronométrage des étapes, coût d'une observation, du middleware HTTP par
+requête, et d'une collecte /metrics.
+
+Vérifie aussi que les histogrammes exposés comptent bien une observation par
+étape et par projet.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_metrics [nb_projets]
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+
+from benchmarks.corpus import make_briefs
+from services.improve_pipeline import ImprovePipeline
+from services.metrics import MetricsMiddleware, MetricsRegistry
+
+logging.disable(logging.INFO)
+os.environ.setdefault('ML_CACHE_ENABLED', 'false')
+
+import main as service  # noqa: E402
+
+def make_pipeline(metrics):
+    return ImprovePipeline(
+        text_normalizer=service.text_normalizer,
+        data_registry=service.data_registry,
+        template_rewriter=service.template_rewriter,
+        brief_quality_analyzer=service.brief_quality_analyzer,
+        metrics=metrics
+    )
+
+def run_pipeline(pipeline: ImprovePipeline, requests) -> float:
+    start = time.perf_counter()
+    for request in requests:
+        pipeline.improve(request)
+    return time.perf_counter() - start
+
+def middleware_cost(calls: int) -> float:
+    """Surcoût par requête du middleware autour d'une application ASGI vide"""
+    async def endpoint(scope, receive, send):
+        scope['endpoint'] = endpoint
+        await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        pass
+
+    wrapped = MetricsMiddleware(endpoint, MetricsRegistry())
+
+    async def measure(app) -> float:
+        start = time.perf_counter()
+        for _ in range(calls):
+            scope = {'type': 'http', 'path': '/improve', 'method': 'POST',
+                     'headers': [(b'content-type', b'application/json'), (b'content-length', b'420')]}
+            await app(scope, receive, send)
+        return time.perf_counter() - start
+
+    plain = min(asyncio.run(measure(endpoint)) for _ in range(3))
+    instrumented = min(asyncio.run(measure(wrapped)) for _ in range(3))
+    return (instrumented - plain) / calls
+
+async def improve_over_asgi(requests) -> float:
+    """Temps total de /improve via l'application ASGI (validation, JSON, routage),
+    sans réseau ni cache"""
+    import httpx
+
+    transport = httpx.ASGITransport(app=service.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://ml') as client:
+        (await client.post('/improve', json=requests[0])).raise_for_status()
+        start = time.perf_counter()
+        for request in requests:
+            (await client.post('/improve', json=request)).raise_for_status()
+        return time.perf_counter() - start
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    requests = [
+        {**brief, 'budget_min': 500 + index, 'budget_max': 2000 + index, 'classifier': 'rules', 'pricing': 'rates'}
+        for index, brief in enumerate(make_briefs(count))
+    ]
+
+    registry = MetricsRegistry()
+    instrumented = make_pipeline(registry)
+    plain = make_pipeline(None)
+    run_pipeline(plain, requests[:20])
+
+    # Tours alternés, meilleur temps de chaque variante (bruit de la machine)
+    plain_times, instrumented_times = [], []
+    for _ in range(5):
+        plain_times.append(run_pipeline(plain, requests))
+        instrumented_times.append(run_pipeline(instrumented, requests))
+    plain_elapsed = min(plain_times)
+    instrumented_elapsed = min(instrumented_times)
+
+    stages = [name for name, _ in instrumented.stages]
+    exposition = registry.render()
+    for stage in stages:
+        line = f'ml_stage_duration_seconds_count{{stage="{stage}",mode="single"}} {count * 5}'
+        assert line in exposition, line
+    print(f"Histogrammes vérifiés : {count * 5} observations pour chacune des {len(stages)} étapes")
+
+    observations = 1000000
+    timer = MetricsRegistry().histogram('bench_seconds', "Observation seule").labels()
+    start = time.perf_counter()
+    for _ in range(observations):
+        begin = time.perf_counter()
+        timer.observe(time.perf_counter() - begin)
+    observe_cost = (time.perf_counter() - start) / observations
+
+    request_cost = middleware_cost(100000)
+
+    start = time.perf_counter()
+    for _ in range(100):
+        (service.metrics or registry).render()
+    render_cost = (time.perf_counter() - start) / 100
+
+    http_elapsed = asyncio.run(improve_over_asgi(requests[:200])) / 200
+
+    per_request = plain_elapsed / count
+    # Surcoût par /improve : une observation par étape + le middleware HTTP
+    added = len(stages) * observe_cost + request_cost
+    print(f"{count} projets, {len(stages)} étapes chronométrées")
+    print(f"  {'pipeline sans métriques':<36}: {per_request * 1000:8.3f} ms/projet")
+    print(f"  {'pipeline avec métriques':<36}: {instrumented_elapsed / count * 1000:8.3f} ms/projet "
+          f"({(instrumented_elapsed / plain_elapsed - 1) * 100:+.2f} %, bruit compris)")
+    print(f"  {'chronométrage + observation':<36}: {observe_cost * 1e6:8.2f} µs")
+    print(f"  {'middleware HTTP':<36}: {request_cost * 1e6:8.2f} µs/requête")
+    print(f"  {'/improve (ASGI, sans réseau)':<36}: {http_elapsed * 1000:8.3f} ms/requête")
+    print(f"  {'surcoût estimé par /improve':<36}: {added * 1e6:8.2f} µs ({added / http_elapsed * 100:.2f} % "
+          f"de la requête, {added / per_request * 100:.2f} % du pipeline seul)")
+    print(f"  {'collecte /metrics':<36}: {render_cost * 1000:8.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Micro-lots (services/micro_batcher.py) : requêtes /improve et /normalize unitaires
+concurrentes regroupées ou calculées une par une, via l'application ASGI.
+
+Mesure le débit et la latence avec C clients concurrents, et la latence d'un
+client seul (la fenêtre ne doit rien coûter au repos). Vérifie que chaque réponse
+groupée est identique au calcul unitaire.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_micro_batch [durée_s] [clients]
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from itertools import count
+from typing import List
+
+import httpx
+
+from benchmarks.corpus import make_brief
+
+logging.disable(logging.INFO)
+# Sans cache ni regroupement des requêtes identiques : chaque requête est calculée
+os.environ['ML_CACHE_ENABLED'] = 'false'
+os.environ['ML_SINGLE_FLIGHT_ENABLED'] = 'false'
+# Le micro-lot /normalize est désactivé par défaut : il est mesuré ici
+os.environ['ML_MICRO_BATCH_NORMALIZE_ENABLED'] = 'true'
+
+import main as service  # noqa: E402
+
+def improve_body(index: int) -> dict:
+    classifier = 'linear' if index % 2 else 'rules'
+    return {**make_brief(index), 'budget_min': 500 + index % 700, 'budget_max': 2500, 'classifier': classifier}
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+async def closed_loop(client: httpx.AsyncClient, path: str, make_body, duration: float, clients: int):
+    latencies: List[float] = []
+    numbers = count()
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            body = make_body(next(numbers))
+            start = time.perf_counter()
+            (await client.post(path, json=body)).raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    return len(latencies) / (time.perf_counter() - start), latencies
+
+async def check_equivalence(client: httpx.AsyncClient, requests: int):
+    bodies = [improve_body(10000 + index) for index in range(requests)]
+    batches_before = service.improve_batcher.get_stats()['batches']
+    responses = await asyncio.gather(*(client.post('/improve', json=body) for body in bodies))
+    batches = service.improve_batcher.get_stats()['batches'] - batches_before
+    for body, response in zip(bodies, responses):
+        expected = service.improve_pipeline.improve(service.ProjectImproveRequest(**body).model_dump())
+        assert response.json() == service.ProjectImproveResponse(**expected).model_dump(), body['title']
+
+    bodies = [make_brief(20000 + index) for index in range(requests)]
+    responses = await asyncio.gather(*(client.post('/normalize', json=body) for body in bodies))
+    from enhancements.normalize import normalize_brief
+    for body, response in zip(bodies, responses):
+        assert response.json() == {'success': True, 'data': normalize_brief(**{'category': None, **body})}
+    print(f"{requests} requêtes concurrentes ({batches} micro-lots /improve) identiques au calcul unitaire")
+
+async def run(duration: float, clients: int):
+    batchers = {'improve': service.improve_batcher, 'normalize': service.normalize_batcher}
+    assert all(batchers.values()), "ML_MICRO_BATCH_ENABLED doit valoir true"
+    transport = httpx.ASGITransport(app=service.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://ml', timeout=120) as client:
+        await check_equivalence(client, 200)
+
+        for path, make_body in (('/improve', improve_body), ('/normalize', make_brief)):
+            name = path.strip('/')
+            print(f"{path}, {clients} clients concurrents, {duration:.0f} s par configuration")
+            for label, enabled in (('unitaire', False), ('micro-lots', True)):
+                setattr(service, f"{name}_batcher", batchers[name] if enabled else None)
+                before = batchers[name].get_stats()
+                throughput, latencies = await closed_loop(client, path, make_body, duration, clients)
+                after = batchers[name].get_stats()
+                _, idle = await closed_loop(client, path, make_body, duration / 2, 1)
+                batches = after['batches'] - before['batches']
+                mean_size = (after['items'] - before['items']) / batches if batches else 1.0
+                print(f"  {label:<11} {throughput:7.0f} req/s  p50={statistics.median(latencies) * 1000:6.1f} ms  "
+                      f"p99={_percentile(latencies, 99) * 1000:6.1f} ms  lot moyen={mean_size:5.1f}  "
+                      f"client seul p50={statistics.median(idle) * 1000:5.2f} ms")
+            setattr(service, f"{name}_batcher", batchers[name])
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 6.0
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    asyncio.run(run(duration, clients))
+
+if __name__ == "__main__":
+    main()
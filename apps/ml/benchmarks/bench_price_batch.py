@@ -0,0 +1,109 @@
+"""
+PriceTimeSuggester : boucle de `suggest` vs `suggest_many` (NumPy) sur 100 000
+projets, et vérification par propriété que les deux chemins donnent exactement les
+mêmes prix, délais et confiance sur des entrées aléatoires (catégories inconnues,
+casse variable, facteurs hors table, toutes combinaisons de contraintes).
+
+Usage (depuis apps/ml) : ML_DATA_PATH=../../infra/data python -m benchmarks.bench_price_batch [nb_projets]
+"""
+
+import logging
+import os
+import random
+import sys
+import time
+
+from services.price_time_suggester import PriceTimeSuggester
+
+logging.disable(logging.INFO)
+
+CATEGORIES = ['développement', 'Développement', 'dev', 'web', 'mobile', 'design', 'DESIGN',
+              'marketing', 'conseil', 'rédaction', 'travaux', 'inconnue']
+SUB_CATEGORIES = [None, '', 'web', 'mobile', 'api', 'ui_ux', 'Graphique', 'logo', 'digital',
+                  'contenu', 'strategy', 'stratégie', 'audit', 'seo', 'inexistante']
+COMPLEXITIES = ['simple', 'medium', 'complex', 'very_complex', 'extreme']
+URGENCIES = ['urgent', 'normal', 'flexible', 'asap']
+QUALITY_LEVELS = ['basic', 'professional', 'premium', 'enterprise', 'luxe']
+CONSTRAINTS = ['on_site_required', 'urgent', 'tight_budget', 'certification_required', 'remote_ok']
+
+def random_projects(count: int, seed: int):
+    rng = random.Random(seed)
+    scores = [rng.random() for _ in range(count)]
+    # Valeurs limites du bonus qualité (0.8 / 1.2 atteints exactement)
+    for index in range(0, count, 50):
+        scores[index] = rng.choice([0.0, 0.8 / 1.5, 1.2 / 1.5, 1.0])
+    return {
+        'categories': [rng.choice(CATEGORIES) for _ in range(count)],
+        'sub_categories': [rng.choice(SUB_CATEGORIES) for _ in range(count)],
+        'complexity': [rng.choice(COMPLEXITIES) for _ in range(count)],
+        'urgency': [rng.choice(URGENCIES) for _ in range(count)],
+        'quality_level': [rng.choice(QUALITY_LEVELS) for _ in range(count)],
+        'brief_quality_score': scores,
+        'market_heat': [rng.choice([1.0, rng.uniform(0.5, 1.8)]) for _ in range(count)],
+        'constraints': [rng.sample(CONSTRAINTS, rng.randint(0, 3)) if rng.random() < 0.7 else None
+                        for _ in range(count)],
+    }
+
+def scalar(suggester: PriceTimeSuggester, projects, index: int):
+    return suggester.suggest(
+        category=projects['categories'][index],
+        sub_category=projects['sub_categories'][index],
+        complexity=projects['complexity'][index],
+        urgency=projects['urgency'][index],
+        quality_level=projects['quality_level'][index],
+        brief_quality_score=projects['brief_quality_score'][index],
+        market_heat=projects['market_heat'][index],
+        constraints=projects['constraints'][index]
+    )
+
+def check_equivalence(suggester: PriceTimeSuggester, count: int, seed: int) -> int:
+    projects = random_projects(count, seed)
+    batch = suggester.suggest_many(**projects)
+    for index in range(count):
+        expected = scalar(suggester, projects, index)
+        got = (int(batch.price_suggested_min[index]), int(batch.price_suggested_med[index]),
+               int(batch.price_suggested_max[index]), int(batch.delay_suggested_days[index]),
+               float(batch.confidence[index]))
+        wanted = (expected.price_suggested_min, expected.price_suggested_med, expected.price_suggested_max,
+                  expected.delay_suggested_days, expected.confidence)
+        assert got == wanted, (index, {name: values[index] for name, values in projects.items()}, got, wanted)
+    return count
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    suggester = PriceTimeSuggester(os.getenv('ML_DATA_PATH', '/infra/data'))
+
+    # Propriété : égalité exacte avec le chemin scalaire, grille CSV et grille par défaut
+    default_suggester = PriceTimeSuggester('/nonexistent')
+    checked = sum(check_equivalence(suggester, 20000, seed) for seed in range(5))
+    checked += sum(check_equivalence(default_suggester, 20000, seed) for seed in range(5, 7))
+    print(f"Équivalence vérifiée sur {checked} projets aléatoires")
+
+    projects = random_projects(count, seed=42)
+    start = time.perf_counter()
+    for index in range(count):
+        scalar(suggester, projects, index)
+    scalar_elapsed = time.perf_counter() - start
+
+    suggester.suggest_many(**random_projects(100, seed=0))
+    start = time.perf_counter()
+    suggester.suggest_many(**projects)
+    batch_elapsed = time.perf_counter() - start
+
+    # Cas du pipeline : facteurs communs au lot, seules catégorie et qualité varient
+    start = time.perf_counter()
+    suggester.suggest_many(
+        categories=projects['categories'],
+        sub_categories=projects['sub_categories'],
+        brief_quality_score=projects['brief_quality_score'],
+        constraints=projects['constraints']
+    )
+    common_elapsed = time.perf_counter() - start
+
+    print(f"{count} projets")
+    print(f"  {'suggest (boucle)':<30}: {scalar_elapsed * 1000:8.0f} ms")
+    print(f"  {'suggest_many':<30}: {batch_elapsed * 1000:8.0f} ms  (x{scalar_elapsed / batch_elapsed:.0f})")
+    print(f"  {'suggest_many, facteurs communs':<30}: {common_elapsed * 1000:8.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Sketches de quantiles des missions conclues (services/price_sketches.py) : coût de
+mise à jour, mémoire par cellule selon le volume, erreur de rang des p10/p50/p90
+par rapport aux quantiles exacts, fusion de sketches construits par 4 processus,
+temps de requête, puis tarification 'market' de bout en bout.
+
+Usage (depuis apps/ml) : ML_DATA_PATH=../../infra/data python -m benchmarks.bench_price_sketches
+"""
+
+import bisect
+import json
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from services.price_sketches import QUANTILES, SKETCH_FILE, MissionPriceSketches
+from services.price_time_suggester import PRICE_FILE, PriceTimeSuggester
+
+logging.disable(logging.INFO)
+
+CELLS = [(category, sub_category)
+         for category in ('web-development', 'design', 'marketing', 'conseil', 'travaux')
+         for sub_category in ('a', 'b', 'c', 'd', 'e', 'f')]
+
+def missions(count: int, seed: int):
+    """Montants log-normaux par cellule (médiane propre à chaque cellule)"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        cell = rng.randrange(len(CELLS))
+        category, sub_category = CELLS[cell]
+        yield {
+            'category': category,
+            'sub_category': sub_category,
+            'amount': round(rng.lognormvariate(6.5 + cell * 0.05, 0.7), 2),
+            'timeline_days': rng.randint(2, 60)
+        }
+
+def build_shard(args):
+    count, seed = args
+    sketches = MissionPriceSketches()
+    sketches.update_many(missions(count, seed))
+    return sketches.to_dict()
+
+def rank_errors(sketches: MissionPriceSketches, exact_prices):
+    """Écart maximal entre le rang visé et le rang réel des quantiles de prix"""
+    worst = 0.0
+    for (category, sub_category), values in exact_prices.items():
+        values.sort()
+        quantiles = sketches.quantiles(category, sub_category)
+        for fraction, estimate in zip(QUANTILES, (quantiles.price_p10, quantiles.price_p50, quantiles.price_p90)):
+            rank = bisect.bisect_left(values, estimate) / len(values)
+            worst = max(worst, abs(rank - fraction))
+    return worst
+
+def main():
+    print(f"{'missions':>9} | {'µs/mission':>10} | {'valeurs/cellule':>15} | {'JSON':>7} | {'erreur de rang max':>18}")
+    for count in (10000, 100000, 1000000):
+        sketches = MissionPriceSketches()
+        exact = {}
+        feed = list(missions(count, seed=1))
+        start = time.perf_counter()
+        sketches.update_many(feed)
+        elapsed = time.perf_counter() - start
+        for mission in feed:
+            exact.setdefault((mission['category'], mission['sub_category']), []).append(mission['amount'])
+        stats = sketches.get_stats()
+        size = len(json.dumps(sketches.to_dict()))
+        print(f"{count:>9} | {elapsed / count * 1e6:>10.2f} | {stats['retained_values'] / stats['cells'] / 2:>15.0f} | "
+              f"{size / 1024:>5.0f}Ko | {rank_errors(sketches, exact):>18.4f}")
+
+    # Fusion : 4 processus construisent chacun un sketch sur un quart du flux
+    count = 1000000
+    start = time.perf_counter()
+    with ProcessPoolExecutor(4) as pool:
+        shards = list(pool.map(build_shard, [(count // 4, seed) for seed in range(10, 14)]))
+    merged = MissionPriceSketches.from_dict(shards[0])
+    for shard in shards[1:]:
+        merged.merge(MissionPriceSketches.from_dict(shard))
+    merged.refresh()
+    elapsed = time.perf_counter() - start
+    exact = {}
+    for seed in range(10, 14):
+        for mission in missions(count // 4, seed):
+            exact.setdefault((mission['category'], mission['sub_category']), []).append(mission['amount'])
+    print(f"fusion de 4 sketches ({count} missions) : {elapsed:.1f}s, "
+          f"erreur de rang max {rank_errors(merged, exact):.4f}")
+
+    # Requête : quantiles précalculés, lecture d'un dictionnaire
+    start = time.perf_counter()
+    for _ in range(100000):
+        merged.quantiles('design', 'c')
+    print(f"requête p10/p50/p90 : {(time.perf_counter() - start) / 100000 * 1e6:.2f} µs")
+
+    # Bout en bout : grille CSV + sketches dans le dossier de données, mode 'market'
+    with tempfile.TemporaryDirectory() as data_path:
+        shutil.copy(os.path.join(os.getenv('ML_DATA_PATH', '/infra/data'), PRICE_FILE), data_path)
+        merged.save(os.path.join(data_path, SKETCH_FILE))
+        suggester = PriceTimeSuggester(data_path)
+        quantiles = merged.quantiles('design', 'c')
+        market = suggester.suggest('design', 'c', pricing_mode='market')
+        rates = suggester.suggest('design', 'c')
+        assert market.rationale['base_info']['pricing_source'] == 'market'
+        assert suggester.suggest('design', 'inconnue', pricing_mode='market').rationale['base_info']['market_level'] == 'category'
+        assert suggester.suggest('rédaction', pricing_mode='market').price_suggested_med == \
+            suggester.suggest('rédaction').price_suggested_med
+        print(f"design/c : p10/p50/p90 = {quantiles.price_p10:.0f}/{quantiles.price_p50:.0f}/{quantiles.price_p90:.0f} € "
+              f"-> market {market.price_suggested_min}/{market.price_suggested_med}/{market.price_suggested_max} €, "
+              f"rates {rates.price_suggested_min}/{rates.price_suggested_med}/{rates.price_suggested_max} €")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Regroupement des requêtes identiques concurrentes (services/single_flight.py) :
+N appels /improve ou /normalize identiques envoyés en même temps, avec et sans
+regroupement.
+
+Vérifie que les N appels identiques coûtent un seul calcul (une tâche de
+l'exécuteur, N - 1 appels regroupés) et reçoivent la même réponse, que des
+briefs différents ne sont pas regroupés, et que le regroupement ne survit pas
+au calcul (un appel ultérieur recalcule, le cache étant désactivé).
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_single_flight [nb_appels]
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+
+import httpx
+
+from benchmarks.corpus import make_brief
+
+logging.disable(logging.INFO)
+# Sans cache : seul le regroupement évite les recalculs. Sans micro-lots : une tâche
+# de l'exécuteur par calcul
+os.environ['ML_CACHE_ENABLED'] = 'false'
+os.environ['ML_MICRO_BATCH_ENABLED'] = 'false'
+
+import main as service  # noqa: E402
+
+async def burst(client: httpx.AsyncClient, path: str, bodies) -> list:
+    responses = await asyncio.gather(*(client.post(path, json=body) for body in bodies))
+    for response in responses:
+        response.raise_for_status()
+    return [response.json() for response in responses]
+
+def executor_tasks() -> int:
+    return service.pipeline_executor.get_stats()['submitted']
+
+def flight_counters(endpoint: str):
+    counters = service.single_flight.get_stats()['endpoints'].get(endpoint, {})
+    return counters.get('leaders', 0), counters.get('coalesced', 0)
+
+async def check(client: httpx.AsyncClient, path: str, endpoint: str, body, calls: int) -> float:
+    tasks_before = executor_tasks()
+    leaders_before, coalesced_before = flight_counters(endpoint)
+    start = time.perf_counter()
+    results = await burst(client, path, [body] * calls)
+    elapsed = time.perf_counter() - start
+    leaders, coalesced = flight_counters(endpoint)
+    assert executor_tasks() - tasks_before == 1, (path, executor_tasks() - tasks_before)
+    assert (leaders - leaders_before, coalesced - coalesced_before) == (1, calls - 1)
+    assert all(result == results[0] for result in results), path
+    assert service.single_flight.in_flight == 0
+    return elapsed
+
+async def run(calls: int):
+    transport = httpx.ASGITransport(app=service.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://ml', timeout=120) as client:
+        body = {**make_brief(1), 'budget_min': 800, 'budget_max': 2500}
+        await burst(client, '/improve', [{**make_brief(0), 'budget_min': 800, 'budget_max': 2500}])
+
+        improve_elapsed = await check(client, '/improve', 'improve', body, calls)
+        normalize_elapsed = await check(client, '/normalize', 'normalize', make_brief(2), calls)
+        print(f"{calls} appels identiques concurrents : un seul calcul (/improve et /normalize)")
+
+        # Appel ultérieur : la clé a été libérée, le calcul est relancé
+        tasks_before = executor_tasks()
+        await burst(client, '/improve', [body])
+        assert executor_tasks() - tasks_before == 1
+
+        # Briefs différents : aucun regroupement
+        tasks_before = executor_tasks()
+        leaders_before, coalesced_before = flight_counters('improve')
+        distinct = [{**make_brief(100 + index), 'budget_min': 800, 'budget_max': 2500} for index in range(calls)]
+        await burst(client, '/improve', distinct)
+        assert executor_tasks() - tasks_before == calls
+        assert flight_counters('improve')[1] == coalesced_before
+        print(f"{calls} briefs différents concurrents : {calls} calculs, aucun regroupé")
+
+        # Un project_id ouvre sa propre session : mêmes briefs, projets distincts
+        tasks_before = executor_tasks()
+        await burst(client, '/improve', [{**body, 'project_id': f"p{index}"} for index in range(4)])
+        assert executor_tasks() - tasks_before == 4
+        assert all(service.brief_recomputer.store.get(f"p{index}") is not None for index in range(4))
+
+        # Référence : N appels identiques sans regroupement
+        flight = service.single_flight
+        service.single_flight = None
+        try:
+            tasks_before = executor_tasks()
+            start = time.perf_counter()
+            await burst(client, '/improve', [body] * calls)
+            uncoalesced_elapsed = time.perf_counter() - start
+            assert executor_tasks() - tasks_before == calls
+        finally:
+            service.single_flight = flight
+
+    print(f"  {f'/improve x{calls}, regroupés':<32}: {improve_elapsed * 1000:8.1f} ms (1 calcul)")
+    print(f"  {f'/improve x{calls}, sans regroupement':<32}: {uncoalesced_elapsed * 1000:8.1f} ms ({calls} calculs)")
+    print(f"  {f'/normalize x{calls}, regroupés':<32}: {normalize_elapsed * 1000:8.1f} ms (1 calcul)")
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    assert service.single_flight is not None, "ML_SINGLE_FLIGHT_ENABLED doit valoir true"
+    asyncio.run(run(calls))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Recherche de compétences de NormalizeService sur des bases de 17 (base réelle)
+à 100 000 compétences : recherche exacte (une sous-chaîne par compétence, sans
+tolérance aux fautes, chemin des petites bases), comparaison floue paire à paire
+(difflib, équivalent de fuzzywuzzy.fuzz.ratio, mesurée jusqu'à 100 compétences
+seulement) et index de trigrammes. Sert à fixer ML_SKILL_INDEX_MIN_SKILLS.
+
+Le brief de ~200 mots contient 8 compétences de la base, dont 3 mal orthographiées
+(lettre manquante ou doublée).
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_skill_matcher
+"""
+
+import random
+import time
+import tracemalloc
+from difflib import SequenceMatcher
+
+from benchmarks.corpus import make_text
+from enhancements.skill_matcher import FuzzySkillMatcher, _WORD_PATTERN, trigrams
+
+REAL_SKILLS = [
+    "React", "Vue.js", "Angular", "JavaScript", "TypeScript", "Python",
+    "PHP", "Node.js", "WordPress", "Photoshop", "Illustrator", "Figma",
+    "SEO", "Google Ads", "Facebook Ads", "Instagram", "TikTok"
+]
+# Noms synthétiques : syllabes consonne + voyelle (+ coda), ~1 000 syllabes distinctes
+SYLLABLES = [c + v + coda for c in 'bcdfghjklmnprstvwxz' for v in 'aeiouy' for coda in ('', 'n', 'r', 'x', 'l', 'sh', 'ck', 'tz', 'm')]
+
+def make_skills(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    skills = list(REAL_SKILLS)
+    while len(skills) < count:
+        words = [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(1, 3))]
+        skills.append(' '.join(words).title())
+    return skills[:count]
+
+def make_brief(skills):
+    mentions = [skills[0], skills[7], skills[12], skills[-1], skills[len(skills) // 2],
+                "Wordpres", "Photoshopp", "Javascrip"]
+    words = make_text(200, seed=1).split()
+    for index, mention in enumerate(mentions):
+        words.insert(index * 25, mention)
+    return ' '.join(words)
+
+def legacy_substring(skills, text):
+    text_lower = text.lower()
+    return [skill for skill in skills if skill.lower() in text_lower]
+
+def pairwise_fuzzy(skills, text, threshold=0.8):
+    words = [match.group() for match in _WORD_PATTERN.finditer(text)]
+    windows = [' '.join(words[i:i + n]).lower() for i in range(len(words)) for n in (1, 2, 3)]
+    return [
+        skill for skill in skills
+        if any(SequenceMatcher(None, skill.lower(), window).ratio() >= threshold for window in windows)
+    ]
+
+def exact_dice(matcher, text):
+    """Meilleur score par compétence, toutes fenêtres × toutes compétences (référence)"""
+    best = {}
+    for _, _, window in matcher._windows(text):
+        for skill in matcher.skills:
+            grams = trigrams(skill)
+            score = 2 * len(grams & window) / (len(grams) + len(window))
+            if score >= matcher.threshold:
+                best[skill] = max(best.get(skill, 0), score)
+    return best
+
+def best_of(fn, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    print(f"{'compétences':>11} | {'index (ms)':>10} | {'index (Mo)':>10} | {'sous-chaîne':>11} | "
+          f"{'difflib':>9} | {'trigrammes':>10} | {'pic match (Mo)':>14} | trouvées")
+    for count in (len(REAL_SKILLS), 100, 1000, 10000, 30000, 100000):
+        skills = make_skills(count)
+        brief = make_brief(skills)
+
+        start = time.perf_counter()
+        matcher = FuzzySkillMatcher(skills)
+        build = time.perf_counter() - start
+        exact = FuzzySkillMatcher(skills, index_min_skills=count + 1)
+
+        substring = best_of(lambda: exact.match(brief))
+        pairwise = f"{best_of(lambda: pairwise_fuzzy(skills, brief), 1) * 1000:7.0f}ms" if count <= 100 else '—'
+        trigram = best_of(lambda: matcher.match(brief))
+
+        tracemalloc.start()
+        matches = matcher.match(brief)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        found = {match.skill for match in matches}
+        exact_found = [match.skill for match in exact.match(brief)]
+        # Chemin exact : mêmes compétences que l'ancienne boucle
+        assert sorted(exact_found) == sorted(legacy_substring(skills, brief))
+        if count <= 100:
+            # Le filtrage par taille et par préfixe ne perd aucune correspondance
+            reference = exact_dice(matcher, brief)
+            assert {match.skill: round(match.score, 4) for match in matches} == \
+                {skill: round(score, 4) for skill, score in reference.items()}
+        assert {"WordPress", "Photoshop", "JavaScript"} <= found, found
+        print(
+            f"{count:>11} | {build * 1000:>10.0f} | {matcher.get_stats()['index_bytes'] / 2**20:>10.1f} | "
+            f"{substring * 1000:>9.2f}ms | {pairwise:>9} | {trigram * 1000:>8.1f}ms | "
+            f"{peak / 2**20:>14.1f} | {len(exact_found)} -> {len(matches)}"
+        )
+
+if __name__ == "__main__":
+    main()
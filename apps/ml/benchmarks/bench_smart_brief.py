@@ -0,0 +1,63 @@
+"""
+Débit et mémoire de SmartBriefProcessor.analyze_briefs sur un flux de briefs.
+
+Compare la boucle `analyze_brief` brief par brief au flux `analyze_briefs`
+(nlp.pipe si le modèle français est installé, sinon traitement par regex), puis
+mesure le pic mémoire (tracemalloc) en consommant des flux de tailles croissantes
+produits par un générateur : il doit rester constant.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_smart_brief [nb_briefs] [batch_size] [n_process]
+"""
+
+import logging
+import sys
+import time
+import tracemalloc
+from itertools import islice
+
+from benchmarks.corpus import make_briefs
+from services.smart_brief import SmartBriefProcessor
+
+def brief_stream(count: int):
+    """Textes de briefs générés à la volée (aucune liste en mémoire)"""
+    corpus = [f"{brief['title']}. {brief['description']}" for brief in make_briefs(50)]
+    for index in range(count):
+        yield f"{corpus[index % len(corpus)]} Référence {index}."
+
+def main():
+    logging.disable(logging.INFO)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    n_process = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    processor = SmartBriefProcessor()
+    engine = "spaCy nlp.pipe" if processor.nlp is not None else "regex (modèle spaCy absent)"
+    print(f"Moteur : {engine}, batch_size={batch_size}, n_process={n_process}")
+
+    # Mêmes résultats, dans le même ordre
+    sample = list(islice(brief_stream(count), 200))
+    streamed = list(processor.analyze_briefs(sample, batch_size=batch_size, n_process=n_process))
+    assert streamed == [processor.analyze_brief(text) for text in sample]
+
+    start = time.perf_counter()
+    for text in brief_stream(count):
+        processor.analyze_brief(text)
+    loop_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in processor.analyze_briefs(brief_stream(count), batch_size=batch_size, n_process=n_process):
+        pass
+    stream_elapsed = time.perf_counter() - start
+
+    print(f"  {'analyze_brief (boucle)':<24}: {count / loop_elapsed:8.0f} briefs/s")
+    print(f"  {'analyze_briefs (flux)':<24}: {count / stream_elapsed:8.0f} briefs/s")
+
+    for stream_size in (count // 10, count, count * 5):
+        tracemalloc.start()
+        for _ in processor.analyze_briefs(brief_stream(stream_size), batch_size=batch_size, n_process=n_process):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  pic mémoire pour {stream_size:>7} briefs : {peak / 1024:8.0f} Ko")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Démarrage à froid d'un worker : temps d'import et mémoire résidente (RSS max)
+de chaque module du service, mesurés dans un interpréteur neuf.
+
+« main + warmup » importe l'application puis charge tous les modèles du registre
+(`services/model_registry.py`), comme le fait le démarrage avant que /health
+ne réponde prêt.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_startup [répétitions]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+TARGETS = [
+    ('main', 'import main'),
+    ('main + warmup', 'import main; main.model_registry.warmup()'),
+    ('services.smart_brief', 'import services.smart_brief'),
+    ('services.market_intelligence', 'import services.market_intelligence'),
+    ('enhancements.normalize', 'import enhancements.normalize'),
+]
+
+PROBE = """
+import json, logging, resource, sys, time
+logging.disable(logging.CRITICAL)
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+try:
+    exec(sys.argv[1])
+    error = None
+except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'seconds': elapsed,
+    'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'baseline_kb': baseline,
+    'error': error,
+}))
+"""
+
+def measure(statement: str) -> dict:
+    env = {**os.environ, 'ML_DATA_PATH': os.environ.get('ML_DATA_PATH', '../../infra/data')}
+    output = subprocess.run(
+        [sys.executable, '-W', 'ignore', '-c', PROBE, statement],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(f"{'module':<30} | {'import (ms)':>11} | {'RSS (Mo)':>8} | {'dont import (Mo)':>16}")
+    for label, statement in TARGETS:
+        runs = [measure(statement) for _ in range(repeat)]
+        if runs[0]['error']:
+            print(f"{label:<30} | {'indisponible : ' + runs[0]['error']}")
+            continue
+        seconds = statistics.median(run['seconds'] for run in runs)
+        rss = statistics.median(run['rss_kb'] for run in runs) / 1024
+        added = statistics.median(run['rss_kb'] - run['baseline_kb'] for run in runs) / 1024
+        print(f"{label:<30} | {seconds * 1000:>11.0f} | {rss:>8.0f} | {added:>16.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Micro-benchmark de la recherche directe de Taxonomizer.classify : ancienne boucle
+(un test `keyword in text` par couple compétence/mot-clé) contre l'automate
+Aho-Corasick compilé au chargement.
+
+Taxonomies synthétiques de 80 à 50 000 lignes (la taxonomie par défaut en tête,
+complétée de compétences générées). Vérifie aussi que l'automate retrouve les
+mêmes correspondances qu'une recherche par regex délimitée aux frontières de mots.
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_taxonomy_automaton
+"""
+
+import logging
+import random
+import re
+import time
+import timeit
+from collections import defaultdict
+
+from benchmarks.corpus import make_briefs
+from services.taxonomizer import Taxonomizer
+
+SYLLABLES = ['ka', 'lo', 'mi', 'to', 'zu', 're', 'pa', 'no', 'vi', 'sha', 'dro', 'qui', 'bel', 'tor']
+
+def make_taxonomizer(rows: int, seed: int = 0) -> Taxonomizer:
+    """Taxonomie par défaut complétée jusqu'à `rows` compétences synthétiques"""
+    taxonomizer = Taxonomizer(data_path='/nonexistent')
+    taxonomizer._init_default_taxonomy()
+
+    rng = random.Random(seed)
+    existing = sum(len(skills) for subs in taxonomizer.taxonomy_data.values() for skills in subs.values())
+    for index in range(max(0, rows - existing)):
+        category = f"catégorie_{index % 40}"
+        sub_category = f"sous_catégorie_{index % 7}"
+        keywords = [
+            ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) + str(index)
+            for _ in range(3)
+        ]
+        taxonomizer.taxonomy_data.setdefault(category, {}).setdefault(sub_category, []).append(
+            {'skill': f"Compétence {index}", 'keywords': keywords}
+        )
+
+    start = time.perf_counter()
+    taxonomizer._build_keyword_automaton()
+    taxonomizer.build_seconds = time.perf_counter() - start
+    return taxonomizer
+
+def legacy_direct_search(taxonomy_data, text_lower: str):
+    """Recherche directe avant l'automate (copie de l'implémentation d'origine)"""
+    category_scores = defaultdict(lambda: defaultdict(float))
+    matched_skills = defaultdict(list)
+    matched_tags = []
+    for category, sub_categories in taxonomy_data.items():
+        for sub_category, skills in sub_categories.items():
+            for skill_info in skills:
+                skill_name = skill_info['skill']
+                for keyword in skill_info['keywords']:
+                    if keyword in text_lower:
+                        category_scores[category][sub_category] += 0.8
+                        if skill_name not in matched_skills[(category, sub_category)]:
+                            matched_skills[(category, sub_category)].append(skill_name)
+                        if keyword not in matched_tags:
+                            matched_tags.append(keyword)
+    return matched_skills, matched_tags
+
+def reference_tags(taxonomy_data, text_lower: str):
+    """Tags attendus : mots-clés présents comme mots entiers, dans l'ordre de la taxonomie"""
+    tags = []
+    for sub_categories in taxonomy_data.values():
+        for skills in sub_categories.values():
+            for skill_info in skills:
+                for keyword in skill_info['keywords']:
+                    if keyword not in tags and re.search(rf'(?<!\w){re.escape(keyword)}(?!\w)', text_lower):
+                        tags.append(keyword)
+    return tags
+
+def check_equivalence(taxonomizer: Taxonomizer, texts):
+    for text in texts:
+        text_lower = text.lower()
+        expected = reference_tags(taxonomizer.taxonomy_data, text_lower)
+        # Seule la recherche directe est comparée (classify ajoute aussi les mots-clés exacts)
+        found = [
+            taxonomizer.keyword_automaton.keywords[index]
+            for index in taxonomizer.keyword_automaton.find_keywords(text_lower)
+        ]
+        assert sorted(found) == sorted(expected), (found, expected)
+        taxonomizer.classify(text)
+
+def main():
+    logging.disable(logging.INFO)
+    briefs = make_briefs(20)
+    texts = [f"{brief['title']} {brief['description']}" for brief in briefs]
+
+    print(f"{'lignes':>7} | {'compilation (ms)':>16} | {'ancien (ms)':>11} | {'automate (ms)':>13} | accélération")
+    for rows in (80, 1000, 10000, 50000):
+        taxonomizer = make_taxonomizer(rows)
+        if rows <= 1000:
+            check_equivalence(taxonomizer, texts)
+
+        lowered = [text.lower() for text in texts]
+        number = 1 if rows >= 10000 else 5
+        legacy_time = min(timeit.repeat(
+            lambda: [legacy_direct_search(taxonomizer.taxonomy_data, t) for t in lowered], number=number, repeat=3
+        ))
+        automaton = taxonomizer.keyword_automaton
+        automaton_time = min(timeit.repeat(
+            lambda: [automaton.find_keywords(t) for t in lowered], number=number, repeat=3
+        ))
+
+        per_call = len(texts) * number
+        print(
+            f"{rows:>7} | {taxonomizer.build_seconds * 1000:>16.1f} | "
+            f"{legacy_time / per_call * 1000:>11.3f} | {automaton_time / per_call * 1000:>13.3f} | "
+            f"x{legacy_time / automaton_time:.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Débit de classification taxonomique : mode par règles (un brief à la fois) contre
+le classifieur linéaire TF-IDF scorant tout le lot en un produit matriciel.
+
+Lots de 1, 64 et 4 096 briefs sur la taxonomie réelle (`infra/data`).
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_taxonomy_classifier [dossier_infra_data]
+"""
+
+import logging
+import sys
+import time
+
+from benchmarks.corpus import make_briefs
+from services.taxonomizer import Taxonomizer
+
+def best_of(fn, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    logging.disable(logging.INFO)
+    data_path = sys.argv[1] if len(sys.argv) > 1 else '../../infra/data'
+
+    # Premier entraînement : inclut l'import de scikit-learn
+    for label in ("avec import scikit-learn", "entraînement seul"):
+        taxonomizer = Taxonomizer(data_path)
+        start = time.perf_counter()
+        classifier = taxonomizer.linear_classifier
+        print(f"Entraînement ({label}): {(time.perf_counter() - start) * 1000:.0f} ms, {len(classifier.labels)} labels")
+
+    print(f"{'lot':>6} | {'règles (briefs/s)':>17} | {'linéaire (briefs/s)':>19} | {'linéaire, score seul':>20}")
+    for batch_size in (1, 64, 4096):
+        briefs = make_briefs(batch_size)
+        texts = [f"{brief['title']} {brief['description']}" for brief in briefs]
+
+        rules_time = best_of(lambda: taxonomizer.classify_many(texts, mode='rules'))
+        linear_time = best_of(lambda: taxonomizer.classify_many(texts, mode='linear'))
+        scoring_time = best_of(lambda: classifier.predict_top_k(texts, k=3))
+
+        print(
+            f"{batch_size:>6} | {batch_size / rules_time:>17.0f} | {batch_size / linear_time:>19.0f} | "
+            f"{batch_size / scoring_time:>20.0f}"
+        )
+
+    sample = texts[:3]
+    for text, result in zip(sample, taxonomizer.classify_many(sample, mode='linear')):
+        print(f"  {text[:50]!r} -> {result.alternatives}")
+
+if __name__ == "__main__":
+    main()
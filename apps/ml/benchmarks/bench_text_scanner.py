@@ -0,0 +1,149 @@
+"""
+Micro-benchmark de l'extraction TextNormalizer : ancienne version (une regex par
+motif, non compilées) contre le scanner compilé en une passe.
+
+Mesure nettoyage + quantités + contraintes + indicateurs de prix sur des briefs
+de 200, 2 000 et 20 000 mots. Vérifie d'abord que les indicateurs de prix de
+normalize() et de extract_price_indicators() sont identiques à l'ancien
+extracteur (texte brut), ainsi que les contraintes et les quantités, hors
+changement documenté (un "m" isolé n'est plus une surface).
+
+Usage (depuis apps/ml) : python -m benchmarks.bench_text_scanner
+"""
+
+import re
+import timeit
+from typing import Dict, List
+
+from benchmarks.corpus import make_text
+from services.text_normalizer import TextNormalizer
+
+class LegacyExtraction:
+    """Extraction avant le scanner (copie de l'implémentation d'origine)"""
+
+    def __init__(self):
+        self.surface_patterns = [
+            (r'(\d+(?:[.,]\d+)?)\s*m²?', 'surface_m2'),
+            (r'(\d+(?:[.,]\d+)?)\s*mètres?\s*carrés?', 'surface_m2'),
+            (r'(\d+(?:[.,]\d+)?)\s*hectares?', 'surface_hectare'),
+        ]
+        self.time_patterns = [
+            (r'(\d+(?:[.,]\d+)?)\s*heures?', 'duration_hours'),
+            (r'(\d+(?:[.,]\d+)?)\s*jours?', 'duration_days'),
+            (r'(\d+(?:[.,]\d+)?)\s*semaines?', 'duration_weeks'),
+            (r'(\d+(?:[.,]\d+)?)\s*mois', 'duration_months'),
+        ]
+        self.distance_patterns = [
+            (r'(\d+(?:[.,]\d+)?)\s*km', 'distance_km'),
+            (r'(\d+(?:[.,]\d+)?)\s*kilomètres?', 'distance_km'),
+            (r'(\d+(?:[.,]\d+)?)\s*m(?:\s|$)', 'distance_m'),
+        ]
+
+    def clean(self, text: str) -> str:
+        text = re.sub(r'[^\w\s.,!?;:-]', ' ', text)
+        text = re.sub(r'\s+', ' ', text)
+        return text.lower().strip()
+
+    def quantities(self, text: str) -> Dict[str, float]:
+        quantities = {}
+        for pattern, key in self.surface_patterns + self.time_patterns + self.distance_patterns:
+            for match in re.finditer(pattern, text, re.IGNORECASE):
+                quantities[key] = float(match.group(1).replace(',', '.'))
+        return quantities
+
+    def quantities_without_bare_m(self, text: str) -> Dict[str, float]:
+        """quantities() sans le changement documenté : un "m" isolé ("2 mois") n'est
+        plus une surface, seuls "m²", "m2" et "mètres carrés" comptent"""
+        quantities = self.quantities(text)
+        quantities.pop('surface_m2', None)
+        for pattern, key in self.surface_patterns:
+            if key != 'surface_m2':
+                continue
+            for match in re.finditer(pattern, text, re.IGNORECASE):
+                unit = match.group(0) + text[match.end():match.end() + 2]
+                if re.search(r'm(?:²|2\b)|mètres?\s*carrés?', unit, re.IGNORECASE):
+                    quantities[key] = float(match.group(1).replace(',', '.'))
+        return quantities
+
+    def constraints(self, text: str) -> List[str]:
+        constraint_mapping = {
+            r'(?:sur\s+site|en\s+présentiel|physiquement)': 'on_site_required',
+            r'(?:à\s+distance|en\s+remote|télétravail)': 'remote_ok',
+            r'(?:urgent|rapidement|immédiatement)': 'urgent',
+            r'(?:budget\s+serré|petit\s+budget)': 'tight_budget',
+            r'(?:expérience\s+requise|expérimenté)': 'experience_required',
+            r'(?:certification|certifié|agréé)': 'certification_required',
+        }
+        return [c for p, c in constraint_mapping.items() if re.search(p, text, re.IGNORECASE)]
+
+    def price_indicators(self, text: str) -> List[Dict]:
+        price_patterns = [
+            (r'(\d+(?:[.,]\d+)?)\s*€?\s*(?:/\s*h|par\s+heure|de\s+l[\'’]heure)', 'hourly'),
+            (r'(\d+(?:[.,]\d+)?)\s*€?\s*(?:/\s*jour|par\s+jour)', 'daily'),
+            (r'(\d+(?:[.,]\d+)?)\s*€?\s*(?:forfait|global|total)', 'fixed'),
+            (r'budget\s*:?\s*(\d+(?:[.,]\d+)?)\s*€?', 'budget_max'),
+            (r'à\s+partir\s+de\s+(\d+(?:[.,]\d+)?)\s*€?', 'price_from'),
+        ]
+        indicators = []
+        for pattern, price_type in price_patterns:
+            for match in re.finditer(pattern, text, re.IGNORECASE):
+                indicators.append({'type': price_type, 'value': float(match.group(1).replace(',', '.')),
+                                   'currency': 'EUR'})
+        return indicators
+
+    def run(self, text: str):
+        clean = self.clean(text)
+        # Les prix étaient extraits du texte brut (ponctuation "€", "/h" conservée)
+        return self.quantities(clean), self.constraints(clean), self.price_indicators(text)
+
+    def run_expected(self, text: str):
+        """run() hors changement documenté des surfaces (référence de check())"""
+        clean = self.clean(text)
+        return self.quantities_without_bare_m(clean), self.constraints(clean), self.price_indicators(text)
+
+# Cas limites de ponctuation retirée par le nettoyage
+SAMPLES = [
+    "Tarif 50€/h en semaine, 45 € de l'heure le week-end, 380€/jour sur site.",
+    "Budget : 1 200 €, à partir de 900€ forfait ; 12,5 €/h pour la maintenance.",
+    "Mission urgente de 3 semaines à 20 km, 120 m² à peindre, petit budget.",
+    "Chantier de 2 mois : 85 m2 de parquet puis 40 mètres carrés de carrelage, 15 m de plinthes.",
+]
+
+def check(legacy: LegacyExtraction, normalizer: TextNormalizer):
+    """Mêmes résultats que l'ancienne extraction, par les deux points d'entrée"""
+    texts = SAMPLES + [make_text(word_count, seed=seed) for word_count in (200, 2000) for seed in range(5)]
+    for text in texts:
+        quantities, constraints, prices = legacy.run_expected(text)
+        normalized = normalizer.normalize(text)
+        assert normalized.price_indicators == prices, text
+        assert normalizer.extract_price_indicators(text) == prices, text
+        assert normalized.constraints == constraints, text
+        assert normalized.quantities == quantities, (text, normalized.quantities, quantities)
+    print(f"{len(texts)} textes : prix, contraintes et quantités identiques à l'ancienne extraction")
+
+def main():
+    legacy = LegacyExtraction()
+    normalizer = TextNormalizer()
+
+    check(legacy, normalizer)
+
+    def scanner_run(text: str):
+        # Même travail que l'ancienne version : prix sur le texte brut, comme normalize()
+        return normalizer.scan(normalizer._clean_text(text)), normalizer.extract_price_indicators(text)
+
+    print(f"{'mots':>7} | {'ancien (ms)':>12} | {'scanner (ms)':>12} | accélération")
+    for word_count in (200, 2000, 20000):
+        texts = [make_text(word_count, seed=seed) for seed in range(5)]
+        number = max(1, 2000 // word_count)
+
+        legacy_time = min(timeit.repeat(lambda: [legacy.run(t) for t in texts], number=number, repeat=5))
+        scanner_time = min(timeit.repeat(lambda: [scanner_run(t) for t in texts], number=number, repeat=5))
+
+        per_call = len(texts) * number
+        print(
+            f"{word_count:>7} | {legacy_time / per_call * 1000:>12.3f} | "
+            f"{scanner_time / per_call * 1000:>12.3f} | x{legacy_time / scanner_time:.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
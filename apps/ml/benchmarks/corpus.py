@@ -0,0 +1,79 @@
+"""
+Corpus de briefs français réalistes pour les benchmarks du service ML
+"""
+
+import random
+from typing import Dict, List
+
+BRIEFS = [
+    {
+        'title': "Refonte site e-commerce",
+        'description': (
+            "Nous souhaitons refondre notre boutique en ligne sous React avec un backend Node.js. "
+            "L'objectif est d'augmenter les ventes de 20% avant la fin de l'année. "
+            "Le site doit inclure un paiement sécurisé, une interface d'administration et une API REST. "
+            "Budget : 8000 € forfait, livraison souhaitée sous 6 semaines. Télétravail possible."
+        ),
+        'category': 'développement',
+    },
+    {
+        'title': "Création de logo et charte graphique",
+        'description': (
+            "Jeune entreprise de rénovation, nous cherchons un designer pour créer notre logo "
+            "et une charte graphique complète sous Illustrator et Figma. Livrables : fichiers sources, "
+            "exports PNG et PDF. Délai : 3 semaines. Petit budget, environ 900 €."
+        ),
+        'category': 'design',
+    },
+    {
+        'title': "Campagne SEO et Google Ads",
+        'description': (
+            "Cabinet de conseil parisien, nous voulons améliorer notre référencement naturel et lancer "
+            "une campagne Google Ads. Le périmètre comprend l'audit SEO, la rédaction de 10 articles "
+            "et le suivi mensuel. Prestataire expérimenté requis, à distance."
+        ),
+        'category': 'marketing',
+    },
+    {
+        'title': "Application mobile de réservation",
+        'description': (
+            "Application iOS et Android en Flutter pour la réservation de créneaux dans nos 3 salles "
+            "de sport. Authentification, notifications par email, paiement en ligne. "
+            "Urgent : mise en production avant 2 mois. Budget 15000 € à partir de 12000 €."
+        ),
+        'category': 'mobile',
+    },
+    {
+        'title': "Rénovation appartement",
+        'description': (
+            "Rénovation complète d'un appartement de 65 m² : peinture, électricité et plomberie. "
+            "Travaux sur site uniquement, artisan certifié RGE. Chantier à 12 km de Lyon, "
+            "durée estimée 4 semaines, 45 € par heure maximum."
+        ),
+        'category': 'travaux',
+    },
+]
+
+FILLER = (
+    "Le prestataire devra fournir un planning détaillé, documenter son travail et "
+    "organiser un point hebdomadaire avec notre équipe afin de valider chaque étape. "
+)
+
+def make_brief(index: int) -> Dict[str, str]:
+    """Retourne un brief du corpus (cyclique) pour l'index donné"""
+    brief = dict(BRIEFS[index % len(BRIEFS)])
+    brief['title'] = f"{brief['title']} #{index}"
+    return brief
+
+def make_briefs(count: int) -> List[Dict[str, str]]:
+    """Retourne `count` briefs variés"""
+    return [make_brief(index) for index in range(count)]
+
+def make_text(word_count: int, seed: int = 0) -> str:
+    """Construit un texte de brief d'environ `word_count` mots"""
+    rng = random.Random(seed)
+    words: List[str] = []
+    while len(words) < word_count:
+        source = rng.choice(BRIEFS)['description'] if rng.random() < 0.7 else FILLER
+        words.extend(source.split())
+    return ' '.join(words[:word_count])
@@ -0,0 +1,46 @@
+"""
+Texte d'un brief préparé une seule fois pour les services d'enrichissement
+Nettoyage, minuscules et comptage des mots partagés par la normalisation, la
+génération de variantes et les questions (/enhance), au lieu d'être refaits par
+chaque service et dans chacune de ses règles.
+"""
+
+import re
+from dataclasses import dataclass
+
+_SPECIAL_CHARS = re.compile(r'[^\w\s\-.,!?]')
+_SPACES = re.compile(r'\s+')
+
+def clean_text(text: str) -> str:
+    """Nettoyage basique : caractères spéciaux retirés, espaces normalisés"""
+    if not text:
+        return ""
+    return _SPACES.sub(' ', _SPECIAL_CHARS.sub(' ', text)).strip()
+
+@dataclass(frozen=True)
+class BriefText:
+    """Formes du titre et de la description utilisées par les règles (lecture seule)"""
+    title: str
+    description: str
+    title_clean: str
+    description_clean: str
+    # "titre description" nettoyés, en minuscules
+    text_lower: str
+    description_lower: str
+    description_word_count: int
+
+def prepare_brief_text(title: str, description: str) -> BriefText:
+    """Prépare le texte d'un brief (titre et description bruts)"""
+    title = title or ""
+    description = description or ""
+    title_clean = clean_text(title)
+    description_clean = clean_text(description)
+    return BriefText(
+        title=title,
+        description=description,
+        title_clean=title_clean,
+        description_clean=description_clean,
+        text_lower=f"{title_clean} {description_clean}".lower(),
+        description_lower=description.lower(),
+        description_word_count=len(description.split())
+    )
@@ -8,6 +8,8 @@ from typing import Dict, List, Optional
 from dataclasses import dataclass
 import random
 
+from enhancements.brief_text import BriefText, prepare_brief_text
+
 @dataclass
 class BriefVariant:
     type: str  # 'clair', 'pro', 'premium'
@@ -103,11 +105,15 @@ class GeneratorService:
             }
         }
     
-    def generate_variants(self, title: str, description: str, category: str) -> GeneratedBrief:
-        """Génère 3 variantes optimisées"""
+    def generate_variants(self, title: str, description: str, category: str,
+                          text: Optional[BriefText] = None) -> GeneratedBrief:
+        """Génère 3 variantes optimisées (`text` : texte déjà préparé, partagé avec
+        les autres services de /enhance)"""
         
         # Analyse du brief original
-        context = self._analyze_context(title, description, category)
+        if text is None:
+            text = prepare_brief_text(title, description)
+        context = self._analyze_context(text, category)
         
         # Génération des 3 variantes
         variants = [
@@ -132,17 +138,18 @@ class GeneratorService:
             templates=templates
         )
     
-    def _analyze_context(self, title: str, description: str, category: str) -> Dict:
+    def _analyze_context(self, text: BriefText, category: str) -> Dict:
         """Analyse le contexte pour adaptation"""
+        desc_lower = text.description_lower
         return {
-            "original_title": title,
-            "original_description": description,
+            "original_title": text.title,
+            "original_description": text.description,
             "category": category,
-            "complexity": self._estimate_complexity(description),
-            "urgency": "urgent" in description.lower(),
-            "budget_mentioned": any(word in description.lower() for word in ["€", "budget", "prix"]),
-            "tech_stack": self._extract_tech_stack(description),
-            "tone": self._detect_tone(description)
+            "complexity": self._estimate_complexity(text),
+            "urgency": "urgent" in desc_lower,
+            "budget_mentioned": any(word in desc_lower for word in ["€", "budget", "prix"]),
+            "tech_stack": self._extract_tech_stack(desc_lower),
+            "tone": self._detect_tone(desc_lower)
         }
     
     def _generate_clear_variant(self, context: Dict) -> BriefVariant:
@@ -285,30 +292,29 @@ Présentez votre vision et proposition de valeur unique.
         
         return questions[:5]  # Max 5 questions
     
-    def _estimate_complexity(self, description: str) -> int:
+    def _estimate_complexity(self, text: BriefText) -> int:
         """Estime la complexité (1-10)"""
         complexity = 3
         
         complex_terms = ["api", "intégration", "migration", "sécurité", "performance"]
-        complexity += sum(1 for term in complex_terms if term in description.lower())
+        complexity += sum(1 for term in complex_terms if term in text.description_lower)
         
-        if len(description.split()) > 100:
+        if text.description_word_count > 100:
             complexity += 2
         
         return min(complexity, 10)
     
-    def _extract_tech_stack(self, description: str) -> List[str]:
-        """Extrait les technologies mentionnées"""
+    def _extract_tech_stack(self, desc_lower: str) -> List[str]:
+        """Extrait les technologies mentionnées (description en minuscules)"""
         tech_keywords = ["react", "vue", "angular", "node", "php", "python", "wordpress"]
-        desc_lower = description.lower()
         
         return [tech for tech in tech_keywords if tech in desc_lower]
     
-    def _detect_tone(self, description: str) -> str:
-        """Détecte le ton du brief"""
-        if any(word in description.lower() for word in ["professionnel", "entreprise", "stratégique"]):
+    def _detect_tone(self, desc_lower: str) -> str:
+        """Détecte le ton du brief (description en minuscules)"""
+        if any(word in desc_lower for word in ["professionnel", "entreprise", "stratégique"]):
             return "professionnel"
-        elif any(word in description.lower() for word in ["simple", "basique", "petit"]):
+        elif any(word in desc_lower for word in ["simple", "basique", "petit"]):
             return "décontracté"
         else:
             return "neutre"
@@ -332,9 +338,9 @@ Présentez votre vision et proposition de valeur unique.
 # Service global
 generator_service = GeneratorService()
 
-def generate_brief_variants(title: str, description: str, category: str) -> dict:
+def generate_brief_variants(title: str, description: str, category: str, text: BriefText = None) -> dict:
     """Interface simple pour l'API"""
-    result = generator_service.generate_variants(title, description, category)
+    result = generator_service.generate_variants(title, description, category, text=text)
     
     return {
         "variants": [
@@ -4,12 +4,19 @@ Service de normalisation et structuration des briefs
 Sert à rendre les annonces comparables et exploitables
 """
 
-import re
 import json
+import os
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
-import spacy
-from fuzzywuzzy import fuzz
+from dataclasses import dataclass, asdict
+
+from enhancements.brief_text import BriefText, prepare_brief_text
+from enhancements.skill_matcher import FuzzySkillMatcher, SkillMatch
+
+# Score de similarité minimal (Dice sur trigrammes) pour retenir une compétence
+SKILL_MATCH_THRESHOLD = float(os.getenv("ML_SKILL_MATCH_THRESHOLD", "0.8"))
+# Taille de base à partir de laquelle l'index de trigrammes est plus rapide que
+# la recherche exacte (benchmarks/bench_skill_matcher.py)
+SKILL_INDEX_MIN_SKILLS = int(os.getenv("ML_SKILL_INDEX_MIN_SKILLS", "20000"))
 
 @dataclass
 class NormalizedBrief:
@@ -31,6 +38,9 @@ class NormalizeService:
     def __init__(self):
         self.taxonomies = self._load_taxonomies()
         self.skills_db = self._load_skills()
+        self.skill_matcher = FuzzySkillMatcher(
+            self.skills_db, threshold=SKILL_MATCH_THRESHOLD, index_min_skills=SKILL_INDEX_MIN_SKILLS
+        )
         
     def _load_taxonomies(self) -> Dict:
         """Charge la taxonomie depuis la DB ou fichier"""
@@ -51,38 +61,45 @@ class NormalizeService:
             "SEO", "Google Ads", "Facebook Ads", "Instagram", "TikTok"
         ]
     
-    def normalize(self, title: str, description: str, category: str = None) -> NormalizedBrief:
-        """Normalise un brief complet"""
+    def normalize(self, title: str, description: str, category: str = None,
+                  text: Optional[BriefText] = None) -> NormalizedBrief:
+        """Normalise un brief complet (`text` : texte déjà préparé, partagé avec les
+        autres services de /enhance)"""
         
         # Nettoyage de base
-        title_clean = self._clean_text(title)
-        desc_clean = self._clean_text(description)
+        if text is None:
+            text = prepare_brief_text(title, description)
+        title, description = text.title, text.description
+        title_clean = text.title_clean
+        desc_clean = text.description_clean
         
         # Détection catégorie si pas fournie
         if not category:
-            category = self._detect_category(title_clean + " " + desc_clean)
+            category = self._detect_category(text.text_lower)
         
-        # Extraction skills
-        skills = self._extract_skills(desc_clean)
+        # Extraction skills (positions dans la description d'origine)
+        skill_matches = self._match_skills(description)
+        skills = [match.skill for match in skill_matches]
         
         # Tags automatiques
-        tags = self._generate_tags(title_clean, desc_clean, category)
+        tags = self._generate_tags(text.text_lower, category)
         
         # Score complétude
-        completeness, missing = self._calculate_completeness(title, description)
+        completeness, missing = self._calculate_completeness(title, text)
         
         # Détection ambiguïtés
-        ambiguities = self._detect_ambiguities(description)
+        ambiguities = self._detect_ambiguities(text)
         
         # Structure enrichie
         structured = {
             "original_title": title,
             "original_description": description,
             "detected_skills": skills,
-            "estimated_complexity": self._estimate_complexity(description),
-            "word_count": len(description.split()),
+            "skill_matches": [asdict(match) for match in skill_matches],
+            "estimated_complexity": self._estimate_complexity(text),
+            "word_count": text.description_word_count,
             "has_technical_terms": len(skills) > 0,
-            "urgency_detected": self._detect_urgency(description)
+            "urgency_detected": self._detect_urgency(text.description_lower)
         }
         
         return NormalizedBrief(
@@ -92,28 +109,15 @@ class NormalizeService:
             sub_category_std="general",
             tags_std=tags,
             skills_std=skills,
-            constraints_std=self._extract_constraints(description),
+            constraints_std=self._extract_constraints(description, text.description_lower),
             completeness_score=completeness,
             missing_info=missing,
             ambiguities=ambiguities,
             structured=structured
         )
     
-    def _clean_text(self, text: str) -> str:
-        """Nettoyage basique du texte"""
-        if not text:
-            return ""
-        
-        # Supprime caractères spéciaux
-        text = re.sub(r'[^\w\s\-.,!?]', ' ', text)
-        # Normalise espaces
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
-    
-    def _detect_category(self, text: str) -> str:
-        """Détecte la catégorie principale"""
-        text_lower = text.lower()
-        
+    def _detect_category(self, text_lower: str) -> str:
+        """Détecte la catégorie principale (texte en minuscules)"""
         best_match = "autre"
         best_score = 0
         
@@ -127,33 +131,31 @@ class NormalizeService:
     
     def _extract_skills(self, text: str) -> List[str]:
         """Extrait les compétences mentionnées"""
-        found_skills = []
-        text_lower = text.lower()
-        
-        for skill in self.skills_db:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
-        
-        return found_skills
+        return [match.skill for match in self._match_skills(text)]
+    
+    def _match_skills(self, text: str) -> List[SkillMatch]:
+        """Compétences reconnues, avec score et position (tolérance aux fautes de
+        frappe à partir de SKILL_INDEX_MIN_SKILLS compétences)"""
+        return self.skill_matcher.match(text)
     
-    def _generate_tags(self, title: str, description: str, category: str) -> List[str]:
-        """Génère des tags automatiques"""
+    def _generate_tags(self, text_lower: str, category: str) -> List[str]:
+        """Génère des tags automatiques (titre et description nettoyés, en minuscules)"""
         tags = [category]
         
         # Mots-clés fréquents
         keywords = ["urgent", "pro", "qualité", "rapide", "budget", "délai"]
-        text = (title + " " + description).lower()
         
         for keyword in keywords:
-            if keyword in text:
+            if keyword in text_lower:
                 tags.append(keyword)
         
         return list(set(tags))
     
-    def _calculate_completeness(self, title: str, description: str) -> Tuple[int, List[str]]:
+    def _calculate_completeness(self, title: str, text: BriefText) -> Tuple[int, List[str]]:
         """Calcule le score de complétude"""
         score = 0
         missing = []
+        description_lower = text.description_lower
         
         # Titre présent et descriptif
         if title and len(title) > 10:
@@ -162,35 +164,35 @@ class NormalizeService:
             missing.append("Titre trop court")
         
         # Description détaillée
-        if description and len(description.split()) > 20:
+        if text.description_word_count > 20:
             score += 30
         else:
             missing.append("Description trop courte")
         
         # Informations techniques
-        if any(word in description.lower() for word in ["délai", "budget", "livrable"]):
+        if any(word in description_lower for word in ["délai", "budget", "livrable"]):
             score += 25
         else:
             missing.append("Contraintes (délai, budget, livrables)")
         
         # Contexte
-        if any(word in description.lower() for word in ["pour", "afin", "objectif", "but"]):
+        if any(word in description_lower for word in ["pour", "afin", "objectif", "but"]):
             score += 15
         else:
             missing.append("Contexte et objectifs")
         
         # Critères qualité
-        if any(word in description.lower() for word in ["qualité", "expérience", "référence"]):
+        if any(word in description_lower for word in ["qualité", "expérience", "référence"]):
             score += 10
         else:
             missing.append("Critères de sélection")
         
         return min(score, 100), missing
     
-    def _detect_ambiguities(self, description: str) -> List[str]:
+    def _detect_ambiguities(self, text: BriefText) -> List[str]:
         """Détecte les ambiguïtés potentielles"""
         ambiguities = []
-        desc_lower = description.lower()
+        desc_lower = text.description_lower
         
         if "quelque chose" in desc_lower or "truc" in desc_lower:
             ambiguities.append("Termes vagues utilisés")
@@ -198,21 +200,21 @@ class NormalizeService:
         if "pas cher" in desc_lower and "qualité" in desc_lower:
             ambiguities.append("Contradiction budget/qualité")
         
-        if len(description.split()) < 15:
+        if text.description_word_count < 15:
             ambiguities.append("Description trop courte")
         
         return ambiguities
     
-    def _estimate_complexity(self, description: str) -> int:
+    def _estimate_complexity(self, text: BriefText) -> int:
         """Estime la complexité (1-10)"""
         complexity = 3  # Base
         
         # Facteurs de complexité
         tech_words = ["api", "base de données", "intégration", "migration", "sécurité"]
-        complexity += sum(1 for word in tech_words if word in description.lower())
+        complexity += sum(1 for word in tech_words if word in text.description_lower)
         
         # Longueur
-        word_count = len(description.split())
+        word_count = text.description_word_count
         if word_count > 100:
             complexity += 2
         elif word_count > 50:
@@ -220,10 +222,9 @@ class NormalizeService:
         
         return min(complexity, 10)
     
-    def _extract_constraints(self, description: str) -> List[str]:
-        """Extrait les contraintes mentionnées"""
+    def _extract_constraints(self, description: str, desc_lower: str) -> List[str]:
+        """Extrait les contraintes mentionnées (description brute et en minuscules)"""
         constraints = []
-        desc_lower = description.lower()
         
         if "urgent" in desc_lower:
             constraints.append("Délai urgent")
@@ -236,17 +237,17 @@ class NormalizeService:
         
         return constraints
     
-    def _detect_urgency(self, description: str) -> bool:
-        """Détecte si la mission est urgente"""
+    def _detect_urgency(self, description_lower: str) -> bool:
+        """Détecte si la mission est urgente (description en minuscules)"""
         urgent_words = ["urgent", "rapidement", "vite", "asap", "immédiat"]
-        return any(word in description.lower() for word in urgent_words)
+        return any(word in description_lower for word in urgent_words)
 
 # Service global
 normalize_service = NormalizeService()
 
-def normalize_brief(title: str, description: str, category: str = None) -> dict:
+def normalize_brief(title: str, description: str, category: str = None, text: BriefText = None) -> dict:
     """Interface simple pour l'API"""
-    result = normalize_service.normalize(title, description, category)
+    result = normalize_service.normalize(title, description, category, text=text)
     
     return {
         "title_std": result.title_std,
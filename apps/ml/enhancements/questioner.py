@@ -8,6 +8,8 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import math
 
+from enhancements.brief_text import BriefText
+
 @dataclass
 class Question:
     text: str
@@ -103,12 +105,18 @@ class QuestionerService:
         self, 
         current_brief: Dict, 
         answers_so_far: Dict = None,
-        max_questions: int = 5
+        max_questions: int = 5,
+        text: Optional[BriefText] = None
     ) -> List[Question]:
-        """Sélectionne les meilleures questions selon VoI"""
+        """Sélectionne les meilleures questions selon VoI (`text` : texte déjà
+        préparé par /enhance ; sinon la description du brief est mise en minuscules
+        une fois pour toutes les questions)"""
         
         if answers_so_far is None:
             answers_so_far = {}
+        description_lower = (
+            text.description_lower if text is not None else current_brief.get("description", "").lower()
+        )
         
         # Calcule la VoI pour chaque question
         scored_questions = []
@@ -119,7 +127,7 @@ class QuestionerService:
                 continue
                 
             # Calcule VoI spécifique au contexte
-            voi = self._calculate_contextual_voi(question, current_brief, answers_so_far)
+            voi = self._calculate_contextual_voi(question, current_brief, answers_so_far, description_lower)
             
             scored_questions.append((question, voi))
         
@@ -133,7 +141,8 @@ class QuestionerService:
         self, 
         question: Question, 
         brief: Dict, 
-        answers: Dict
+        answers: Dict,
+        description_lower: str
     ) -> float:
         """Calcule la Value of Information contextuelle"""
         
@@ -144,14 +153,14 @@ class QuestionerService:
         
         # Budget : priorité si pas de mention prix
         if question.category == "budget":
-            if not self._has_budget_info(brief):
+            if not self._has_budget_info(description_lower):
                 adjustments += 0.3
             else:
                 adjustments -= 0.5  # Déjà des infos budget
         
         # Timeline : priorité si urgent mentionné
         elif question.category == "timeline":
-            if "urgent" in brief.get("description", "").lower():
+            if "urgent" in description_lower:
                 adjustments += 0.2
         
         # Tech : priorité si projet complexe
@@ -162,7 +171,7 @@ class QuestionerService:
         
         # Qualité : priorité si projet premium
         elif question.category == "quality":
-            if any(word in brief.get("description", "").lower() for word in ["qualité", "haut de gamme", "premium"]):
+            if any(word in description_lower for word in ["qualité", "haut de gamme", "premium"]):
                 adjustments += 0.2
         
         # Synergie avec réponses existantes
@@ -171,10 +180,9 @@ class QuestionerService:
         final_voi = base_voi + adjustments + synergy
         return max(0.0, min(1.0, final_voi))
     
-    def _has_budget_info(self, brief: Dict) -> bool:
-        """Vérifie si le brief contient des infos budget"""
-        description = brief.get("description", "").lower()
-        return any(word in description for word in ["€", "budget", "prix", "coût", "tarif"])
+    def _has_budget_info(self, description_lower: str) -> bool:
+        """Vérifie si la description (en minuscules) contient des infos budget"""
+        return any(word in description_lower for word in ["€", "budget", "prix", "coût", "tarif"])
     
     def _calculate_synergy(self, question: Question, answers: Dict) -> float:
         """Calcule la synergie avec les réponses existantes"""
@@ -210,9 +218,9 @@ class QuestionerService:
 # Service global
 questioner_service = QuestionerService()
 
-def get_next_questions(brief: Dict, answers: Dict = None, max_questions: int = 5) -> dict:
+def get_next_questions(brief: Dict, answers: Dict = None, max_questions: int = 5, text: BriefText = None) -> dict:
     """Interface simple pour l'API"""
-    questions = questioner_service.select_next_questions(brief, answers, max_questions)
+    questions = questioner_service.select_next_questions(brief, answers, max_questions, text=text)
     completion_gain = questioner_service.estimate_completion_gain(questions)
     
     return {
@@ -0,0 +1,212 @@
+"""
+Recherche floue de compétences par trigrammes de caractères
+La base de compétences est indexée une fois (matrice creuse compétences ×
+trigrammes). Pour un brief, toutes les fenêtres de 1 à N mots sont comparées à
+toutes les compétences par produits de matrices creuses ; le score est le
+coefficient de Dice entre ensembles de trigrammes (1.0 = identique, tolère les
+fautes de frappe et variantes de ponctuation).
+Compétences et fenêtres sont triées par nombre de trigrammes : un lot de fenêtres
+n'est comparé qu'à la tranche de compétences dont la taille permet d'atteindre
+le seuil (Dice >= s impose |B| entre s/(2-s)·|A| et (2-s)/s·|A|), et seules les
+compétences partageant un des trigrammes les plus rares de la fenêtre (filtrage
+par préfixe) sont scorées exactement.
+Sur une petite base, générer et scorer les fenêtres coûte bien plus qu'une
+recherche de sous-chaîne par compétence : en dessous de `index_min_skills`,
+l'index n'est pas construit et la recherche est exacte (sans tolérance aux
+fautes de frappe).
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+
+# Mots d'une compétence ou d'un brief : "node.js", "c++", "c#", "e-commerce"
+_WORD_PATTERN = re.compile(r"\w[\w.+#'-]*[\w+#]|\w")
+
+@dataclass
+class SkillMatch:
+    skill: str
+    score: float
+    # Position de la fenêtre correspondante dans le texte analysé
+    start: int
+    end: int
+
+def _fold(text: str) -> str:
+    """Minuscules sans accents"""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrammes de caractères du texte replié (tirets = espaces), bordé d'un espace"""
+    padded = f" {' '.join(_fold(text).replace('-', ' ').split())} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+class FuzzySkillMatcher:
+    """Index de trigrammes sur une base de compétences.
+
+    - `threshold` : score de Dice minimal d'une correspondance (0 à 1)
+    - `max_window_words` : longueur maximale (en mots) des fenêtres du texte ;
+      par défaut la plus longue compétence, bornée à 4
+    - `chunk_windows` : fenêtres scorées par produit matriciel, ce qui borne la
+      mémoire de travail quelle que soit la longueur du brief
+    - `index_min_skills` : taille de base à partir de laquelle l'index est
+      construit ; en dessous, recherche exacte de sous-chaînes (score 1.0)
+    """
+
+    def __init__(self,
+                 skills: Iterable[str],
+                 threshold: float = 0.8,
+                 max_window_words: int = None,
+                 chunk_windows: int = 256,
+                 index_min_skills: int = 0):
+        skills = list(dict.fromkeys(skills))
+        self.threshold = threshold
+        self.chunk_windows = chunk_windows
+        self.indexed = len(skills) >= index_min_skills
+        if not self.indexed:
+            self.skills: List[str] = skills
+            self._lowered = [skill.lower() for skill in skills]
+            return
+
+        from scipy import sparse
+
+        grams_by_skill = [trigrams(skill) for skill in skills]
+        # Compétences rangées par nombre de trigrammes croissant
+        order = sorted(range(len(skills)), key=lambda index: len(grams_by_skill[index]))
+        self.skills = [skills[index] for index in order]
+        self._vocabulary: Dict[str, int] = {}
+
+        rows, columns = [], []
+        for row, index in enumerate(order):
+            for gram in grams_by_skill[index]:
+                rows.append(row)
+                columns.append(self._vocabulary.setdefault(gram, len(self._vocabulary)))
+
+        # Compétences × trigrammes : une tranche de lignes = une plage de tailles
+        self._index = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, columns)),
+            shape=(len(self.skills), len(self._vocabulary))
+        )
+        self._skill_sizes = np.array([len(grams_by_skill[index]) for index in order], dtype=np.float32)
+        # Nombre de compétences par trigramme (ordre de rareté du filtrage par préfixe)
+        self._frequencies = np.bincount(columns, minlength=len(self._vocabulary))
+        longest = max((len(_WORD_PATTERN.findall(skill)) for skill in self.skills), default=1)
+        self.max_window_words = max_window_words or min(longest, 4)
+
+    def match(self, text: str) -> List[SkillMatch]:
+        """Compétences trouvées dans `text`, meilleure fenêtre par compétence,
+        triées par position"""
+        if not self.indexed:
+            return self._match_exact(text)
+
+        windows = self._windows(text)
+        if not windows or not self.skills:
+            return []
+
+        # Fenêtres rangées par taille pour que chaque lot couvre une plage étroite
+        order = sorted(range(len(windows)), key=lambda index: len(windows[index][2]))
+        best: Dict[int, Tuple[float, int]] = {}
+        for chunk_start in range(0, len(order), self.chunk_windows):
+            chunk = order[chunk_start:chunk_start + self.chunk_windows]
+            for column, score, row in self._score_chunk([windows[index][2] for index in chunk]):
+                window = chunk[row]
+                if column not in best or score > best[column][0]:
+                    best[column] = (score, window)
+
+        matches = [
+            SkillMatch(
+                skill=self.skills[column],
+                score=round(score, 4),
+                start=windows[window][0],
+                end=windows[window][1]
+            )
+            for column, (score, window) in best.items()
+        ]
+        matches.sort(key=lambda match: (match.start, -match.score))
+        return matches
+
+    def _match_exact(self, text: str) -> List[SkillMatch]:
+        """Première occurrence de chaque compétence (sous-chaîne, sans tenir compte de la casse)"""
+        text_lower = text.lower()
+        matches = []
+        for skill, skill_lower in zip(self.skills, self._lowered):
+            start = text_lower.find(skill_lower)
+            if start >= 0:
+                matches.append(SkillMatch(skill=skill, score=1.0, start=start, end=start + len(skill)))
+        matches.sort(key=lambda match: match.start)
+        return matches
+
+    def _windows(self, text: str) -> List[Tuple[int, int, Set[str]]]:
+        """(début, fin, trigrammes) de chaque suite de 1 à `max_window_words` mots"""
+        words = [(match.start(), match.end()) for match in _WORD_PATTERN.finditer(text)]
+        windows = []
+        for first in range(len(words)):
+            for last in range(first, min(first + self.max_window_words, len(words))):
+                start, end = words[first][0], words[last][1]
+                windows.append((start, end, trigrams(text[start:end])))
+        return windows
+
+    def _score_chunk(self, windows: List[Set[str]]):
+        """(compétence, score, fenêtre) au-dessus du seuil pour un lot de fenêtres"""
+        from scipy import sparse
+
+        ratio = self.threshold / (2 - self.threshold)
+        rows, columns, prefix_rows, prefix_columns = [], [], [], []
+        sizes = np.empty(len(windows), dtype=np.float32)
+        for row, grams in enumerate(windows):
+            sizes[row] = len(grams)
+            known = sorted(
+                (self._frequencies[column], column)
+                for column in map(self._vocabulary.get, grams) if column is not None
+            )
+            # Une compétence au-dessus du seuil partage au moins `overlap` trigrammes
+            # avec la fenêtre, donc au moins un de ses len - overlap + 1 plus rares
+            # (les trigrammes absents de la base, de fréquence nulle, comptent parmi eux)
+            overlap = int(np.ceil(ratio * len(grams) - 1e-6))
+            prefix = len(grams) - overlap + 1 - (len(grams) - len(known))
+            for rank, (_, column) in enumerate(known):
+                rows.append(row)
+                columns.append(column)
+                if rank < prefix:
+                    prefix_rows.append(row)
+                    prefix_columns.append(column)
+
+        # Tranche des compétences de taille compatible avec le seuil
+        first = int(np.searchsorted(self._skill_sizes, sizes.min() * ratio, side='left'))
+        last = int(np.searchsorted(self._skill_sizes, sizes.max() / ratio, side='right'))
+        if first >= last or not prefix_rows:
+            return []
+
+        shape = (len(self._vocabulary), len(windows))
+        prefix_matrix = sparse.csr_matrix(
+            (np.ones(len(prefix_rows), dtype=np.float32), (prefix_columns, prefix_rows)), shape=shape
+        )
+        candidates = first + np.unique((self._index[first:last] @ prefix_matrix).tocoo().row)
+        if not len(candidates):
+            return []
+
+        window_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (columns, rows)), shape=shape
+        )
+        shared = (self._index[candidates] @ window_matrix).tocoo()
+
+        # Dice = 2 |A ∩ B| / (|A| + |B|), calculé sur les couples candidats
+        skills = candidates[shared.row]
+        scores = 2 * shared.data / (self._skill_sizes[skills] + sizes[shared.col])
+        keep = scores >= self.threshold
+        return zip(skills[keep].tolist(), scores[keep].tolist(), shared.col[keep].tolist())
+
+    def get_stats(self) -> Dict[str, int]:
+        """Taille de l'index"""
+        if not self.indexed:
+            return {'skills': len(self.skills), 'trigrams': 0, 'index_bytes': 0}
+        return {
+            'skills': len(self.skills),
+            'trigrams': len(self._vocabulary),
+            'index_bytes': int(
+                self._index.data.nbytes + self._index.indices.nbytes + self._index.indptr.nbytes
+            )
+        }
@@ -1,14 +1,28 @@
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from pydantic import BaseModel, ValidationError, field_validator
+from typing import Optional, List, Dict, Any, Literal
 import uvicorn
+import hmac
 import logging
+import os
+import asyncio
 from services.text_normalizer import TextNormalizer
-from services.taxonomizer import Taxonomizer
 from services.template_rewriter import TemplateRewriter
 from services.brief_quality import BriefQualityAnalyzer
-from services.price_time_suggester import PriceTimeSuggester
+from services.improve_pipeline import ImprovePipeline, projection_fields
+from services.executors import ExecutorQueueFull, PipelineExecutor, call_function, call_many
+from services.result_cache import ResultCache, fingerprint, make_cache_key
+from services.data_registry import DataRegistry, watch_interval_from_env
+from services.brief_recompute import BriefRecomputer, BriefSessionStore
+from services.model_registry import model_registry, warmup_models_from_env
+from services.loc_uplift import LOC_MODEL_VERSION, loc_uplift_calculator
+from services.metrics import BATCH_SIZE_BUCKETS, MetricsMiddleware, MetricsRegistry
+from services.micro_batcher import MicroBatcher
+from services.codec import body_schema, decode_body, encode_response
+from services.deadline import Deadline
+from services.single_flight import SingleFlight
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
@@ -16,12 +30,88 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(title="AppelsPro ML Service", version="1.0.0")
 
+# Métriques Prometheus (/metrics) : durées par requête et par étape du pipeline.
+# ML_METRICS_ENABLED=false retire toute mesure (ni middleware, ni chronométrage).
+metrics = MetricsRegistry.from_env()
+if metrics is not None:
+    app.add_middleware(MetricsMiddleware, registry=metrics)
+
+# Données de référence (taxonomie, prix) : snapshot compilé si configuré, sinon CSV.
+# Rechargeables à chaud via /admin/reload ou la surveillance des fichiers (active
+# par défaut avec plusieurs workers).
+data_registry = DataRegistry.from_env()
+DATA_WATCH_SECONDS = watch_interval_from_env()
+ADMIN_TOKEN = os.getenv("ML_ADMIN_TOKEN")
+
+# Modèles lourds (spaCy, scikit-learn) préchargés au démarrage, avant que /health
+# ne réponde prêt ; les autres sont chargés à la première utilisation
+WARMUP_MODELS = warmup_models_from_env()
+
 # Initialisation des services
 text_normalizer = TextNormalizer()
-taxonomizer = Taxonomizer()
 template_rewriter = TemplateRewriter()
 brief_quality_analyzer = BriefQualityAnalyzer()
-price_time_suggester = PriceTimeSuggester()
+# Sessions des projets améliorés avec un project_id, pour /brief/recompute
+brief_recomputer = BriefRecomputer(
+    store=BriefSessionStore.from_env(),
+    brief_quality_analyzer=brief_quality_analyzer,
+    text_normalizer=text_normalizer
+)
+improve_pipeline = ImprovePipeline(
+    text_normalizer=text_normalizer,
+    data_registry=data_registry,
+    template_rewriter=template_rewriter,
+    brief_quality_analyzer=brief_quality_analyzer,
+    brief_recomputer=brief_recomputer,
+    metrics=metrics
+)
+
+# Exécuteur des traitements CPU (hors boucle asyncio)
+pipeline_executor = PipelineExecutor.from_env()
+
+# Cache des résultats /improve, invalidé par les versions du service et des données
+SERVICE_VERSION = f"{app.version}/rewrite-{template_rewriter.version}/loc-{LOC_MODEL_VERSION}"
+result_cache = ResultCache.from_env()
+
+# Requêtes identiques concurrentes (/improve, /normalize) calculées une seule fois
+single_flight = SingleFlight.from_env()
+
+async def dispatch_improve(items: List[Any]) -> List[Any]:
+    """Micro-lot /improve : (requête, lot de données, échéance) par élément, calculés
+    par improve_batch (un appel par version des données présente dans le lot)"""
+    results: List[Any] = [None] * len(items)
+    groups: Dict[int, List[int]] = {}
+    for index, (_, data, _) in enumerate(items):
+        groups.setdefault(id(data), []).append(index)
+    for indexes in groups.values():
+        outcomes = await pipeline_executor.run(
+            improve_pipeline.improve_batch,
+            [items[index][0] for index in indexes],
+            items[indexes[0]][1],
+            [items[index][2] for index in indexes]
+        )
+        for index, outcome in zip(indexes, outcomes):
+            results[index] = outcome['data'] if outcome['success'] else RuntimeError(outcome['error'])
+    return results
+
+async def dispatch_normalize(items: List[Dict[str, Any]]) -> List[Any]:
+    """Micro-lot /normalize : une seule tâche lourde pour tout le lot"""
+    outcomes = await pipeline_executor.run(call_many, "enhancements.normalize:normalize_brief", items, heavy=True)
+    return [value if ok else RuntimeError(value) for ok, value in outcomes]
+
+# Requêtes unitaires concurrentes regroupées en micro-lots (None si désactivé)
+improve_batcher = MicroBatcher.from_env("improve", dispatch_improve, metrics)
+# /normalize n'a pas de chemin vectorisé : son micro-lot n'est activé que sur demande
+NORMALIZE_MICRO_BATCH_ENABLED = os.getenv("ML_MICRO_BATCH_NORMALIZE_ENABLED", "false").lower() == "true"
+normalize_batcher = (
+    MicroBatcher.from_env("normalize", dispatch_normalize, metrics) if NORMALIZE_MICRO_BATCH_ENABLED else None
+)
+
+# Taille maximale d'un lot /improve/batch
+BATCH_MAX_ITEMS = int(os.getenv("ML_BATCH_MAX_ITEMS", "1000"))
+batch_sizes = metrics.histogram(
+    "batch_size", "Projets par appel /improve/batch", BATCH_SIZE_BUCKETS
+) if metrics is not None else None
 
 class ProjectImproveRequest(BaseModel):
     title: str
@@ -30,6 +120,22 @@ class ProjectImproveRequest(BaseModel):
     budget_min: Optional[int] = None
     budget_max: Optional[int] = None
     deadline: Optional[str] = None
+    # Moteur de classification : règles par mots-clés ou TF-IDF linéaire
+    classifier: Literal["rules", "linear"] = "rules"
+    # Tarification : grille horaire ou quantiles des missions conclues
+    pricing: Literal["rates", "market"] = "rates"
+    # Client publiant le projet (historique client du LOC)
+    client_id: Optional[str] = None
+    # Ouvre une session pour /brief/recompute (le résultat n'est alors pas lu en cache)
+    project_id: Optional[str] = None
+    # Champs de la réponse à produire : seules les étapes nécessaires sont exécutées
+    # (réponse complète si absent ; `degraded` toujours inclus)
+    fields: Optional[List[str]] = None
+
+    @field_validator("fields")
+    @classmethod
+    def check_fields(cls, value: Optional[List[str]]) -> Optional[List[str]]:
+        return list(projection_fields(value)) if value else None
 
 class ProjectImproveResponse(BaseModel):
     title_std: str
@@ -39,6 +145,7 @@ class ProjectImproveResponse(BaseModel):
     sub_category_std: str
     skills_std: List[str]
     tags_std: List[str]
+    category_alternatives: List[Dict[str, Any]] = []
     tasks_std: List[Dict[str, Any]]
     deliverables_std: List[Dict[str, Any]]
     constraints_std: List[str]
@@ -53,16 +160,164 @@ class ProjectImproveResponse(BaseModel):
     loc_uplift_reco: Dict[str, Any]
     rewrite_version: str
     reasons: List[str]
+    # Étapes optionnelles sautées, budget X-Request-Deadline dépassé
+    # ("rewrite", "what_if", "reasons")
+    degraded: List[str] = []
+
+class ProjectImproveBatchItem(BaseModel):
+    index: int
+    success: bool
+    data: Optional[ProjectImproveResponse] = None
+    error: Optional[str] = None
+
+class ProjectImproveBatchResponse(BaseModel):
+    results: List[ProjectImproveBatchItem]
+    succeeded: int
+    failed: int
+
+class BriefRequest(BaseModel):
+    """Corps de /normalize (champs absents : mêmes valeurs par défaut qu'avant le typage)"""
+    title: Optional[str] = ""
+    description: Optional[str] = ""
+    category: Optional[str] = None
+
+class BriefGenerateRequest(BriefRequest):
+    category: Optional[str] = "autre"
+
+class BriefQuestionsRequest(BaseModel):
+    brief: Dict[str, Any] = {}
+    answers: Dict[str, Any] = {}
+    max_questions: int = 5
+
+class BriefEnhanceRequest(BaseModel):
+    title: str = ""
+    description: str = ""
+    category: Optional[str] = None
+    # Parties calculées : /normalize, /generate et /questions en un seul appel
+    parts: List[Literal["normalize", "generate", "questions"]] = ["normalize", "generate", "questions"]
+    # Paramètres de la partie questions
+    answers: Dict[str, Any] = {}
+    max_questions: int = 5
 
 class BriefRecomputeRequest(BaseModel):
     project_id: str
     answers: List[Dict[str, str]]
 
+def service_overloaded(error: ExecutorQueueFull) -> HTTPException:
+    """Erreur 503 quand la file de l'exécuteur est pleine"""
+    logger.warning(f"Service ML saturé: {error}")
+    return HTTPException(
+        status_code=503,
+        detail="Service ML saturé, réessayez plus tard",
+        headers={"Retry-After": "1"}
+    )
+
+async def coalesced(endpoint: str, key: str, compute):
+    """Résultat de `compute()`, partagé avec les requêtes identiques en cours"""
+    if single_flight is None:
+        return await compute()
+    return await single_flight.run(key, compute, endpoint=endpoint)
+
+async def _cancel_on_disconnect(http_request: Request, task: "asyncio.Future"):
+    """Annule `task` dès que le client ferme la connexion (corps déjà lu : le
+    prochain message reçu est la déconnexion)"""
+    while True:
+        message = await http_request.receive()
+        if message["type"] == "http.disconnect":
+            task.cancel()
+            return
+
+async def until_disconnect(http_request: Request, awaitable) -> Any:
+    """Résultat de `awaitable`, abandonné si le client se déconnecte avant
+    (asyncio.CancelledError, avec `http_request.state.disconnected` à True)"""
+    task = asyncio.ensure_future(awaitable)
+    watcher = asyncio.ensure_future(_cancel_on_disconnect(http_request, task))
+    try:
+        return await task
+    except asyncio.CancelledError:
+        http_request.state.disconnected = watcher.done() and not watcher.cancelled()
+        raise
+    finally:
+        watcher.cancel()
+
+def collect_service_metrics():
+    """États lus à chaque collecte /metrics : cache, exécuteur, regroupement, historique clients"""
+    executor_stats = pipeline_executor.get_stats()
+    yield ("executor_pending", "gauge", "Tâches acceptées et non terminées par l'exécuteur",
+           [({}, executor_stats["pending"])])
+    yield ("executor_max_pending", "gauge", "Tâches acceptées au maximum",
+           [({}, executor_stats["max_pending"])])
+    yield ("executor_tasks_total", "counter", "Tâches de l'exécuteur par issue",
+           [({"outcome": outcome}, executor_stats[outcome])
+            for outcome in ("submitted", "completed", "failed", "rejected")])
+
+    if result_cache is not None:
+        cache_stats = result_cache.get_stats()
+        yield ("cache_lookups_total", "counter", "Lectures du cache de résultats /improve",
+               [({"result": "hit"}, cache_stats["hits"]), ({"result": "miss"}, cache_stats["misses"])])
+        yield ("cache_hit_ratio", "gauge", "Part des lectures du cache servies",
+               [({}, cache_stats["hit_ratio"])])
+        yield ("cache_evictions_total", "counter", "Entrées évincées du cache",
+               [({}, cache_stats["evictions"])])
+        yield ("cache_bytes", "gauge", "Taille des entrées en mémoire (octets JSON)",
+               [({}, cache_stats["bytes"])])
+
+    if single_flight is not None:
+        flight_stats = single_flight.get_stats()
+        yield ("single_flight_in_flight", "gauge", "Calculs partagés en cours",
+               [({}, flight_stats["in_flight"])])
+        yield ("single_flight_requests_total", "counter",
+               "Requêtes par point d'entrée : calcul lancé (leader) ou résultat partagé (coalesced)",
+               [({"endpoint": endpoint, "role": role}, counters[key])
+                for endpoint, counters in sorted(flight_stats["endpoints"].items())
+                for role, key in (("leader", "leaders"), ("coalesced", "coalesced"))])
+
+    client_features = loc_uplift_calculator.client_features
+    if client_features is not None:
+        feature_stats = client_features.get_stats()
+        yield ("client_features_lookups_total", "counter", "Lectures de l'historique clients",
+               [({"result": "hit"}, feature_stats["hits"]), ({"result": "miss"}, feature_stats["misses"])])
+        yield ("client_features_hit_ratio", "gauge", "Part des lectures servies par le LRU",
+               [({}, feature_stats["hit_ratio"])])
+
+if metrics is not None:
+    metrics.register_collector(collect_service_metrics)
+
+@app.on_event("startup")
+async def start_data_watcher():
+    """Démarre la surveillance des fichiers de données si configurée"""
+    if DATA_WATCH_SECONDS > 0:
+        app.state.data_watcher = asyncio.create_task(data_registry.watch(DATA_WATCH_SECONDS))
+
+@app.on_event("startup")
+async def start_model_warmup():
+    """Précharge les modèles dans un thread : /health répond 503 jusqu'à la fin"""
+    loop = asyncio.get_running_loop()
+    app.state.model_warmup = loop.run_in_executor(None, model_registry.warmup, WARMUP_MODELS)
+
+@app.on_event("shutdown")
+def shutdown_executors():
+    """Arrête les pools de l'exécuteur, la surveillance des données et l'écriture disque du cache"""
+    watcher = getattr(app.state, "data_watcher", None)
+    if watcher:
+        watcher.cancel()
+    pipeline_executor.shutdown()
+    if result_cache is not None:
+        result_cache.close()
+
 @app.get("/health")
 async def health_check():
-    """Point de santé du service ML"""
+    """Point de santé du service ML (503 tant que le préchauffage des modèles n'est pas fini)"""
+    if not model_registry.warmed_up:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "warming_up", "models": model_registry.get_stats()["models"]},
+            headers={"Retry-After": "1"}
+        )
     return {
         "status": "healthy",
+        "data_version": data_registry.current.version,
+        "models": model_registry.get_stats()["models"],
         "services": {
             "text_normalizer": "ready",
             "taxonomizer": "ready", 
@@ -70,172 +325,310 @@ async def health_check():
             "brief_quality_analyzer": "ready",
             "price_time_suggester": "ready",
             "normalize": "ready",
+            "enhance": "ready",
             "generate": "ready", 
             "questions": "ready"
         }
     }
 
-@app.post("/normalize")
-async def normalize_brief(request: dict):
+@app.post("/normalize", openapi_extra=body_schema(BriefRequest))
+async def normalize_brief(http_request: Request):
     """Normalise et structure un brief"""
+    request = await decode_body(http_request, BriefRequest)
     try:
-        # Import dynamique pour éviter les erreurs si module pas installé
-        from enhancements.normalize import normalize_brief
+        # Import dynamique (dans le worker) pour éviter les erreurs si module pas installé
+        title = request.title
+        description = request.description
+        category = request.category
+        async def compute():
+            if normalize_batcher is not None:
+                return await normalize_batcher.submit(
+                    {"title": title, "description": description, "category": category}
+                )
+            return await pipeline_executor.run(
+                call_function,
+                "enhancements.normalize:normalize_brief",
+                title=title,
+                description=description,
+                category=category,
+                heavy=True
+            )
         
-        result = normalize_brief(
-            title=request.get("title", ""),
-            description=request.get("description", ""),
-            category=request.get("category")
-        )
+        result = await coalesced("normalize", fingerprint("normalize", title, description, category), compute)
         
-        return {"success": True, "data": result}
+        return encode_response(http_request, {"success": True, "data": result})
         
+    except ExecutorQueueFull as e:
+        raise service_overloaded(e)
     except Exception as e:
-        return {"success": False, "error": str(e)}
+        return encode_response(http_request, {"success": False, "error": str(e)})
 
-@app.post("/generate") 
-async def generate_variants(request: dict):
+@app.post("/generate", openapi_extra=body_schema(BriefGenerateRequest))
+async def generate_variants(http_request: Request):
     """Génère des variantes d'annonces"""
+    request = await decode_body(http_request, BriefGenerateRequest)
     try:
         from enhancements.generator import generate_brief_variants
         
-        result = generate_brief_variants(
-            title=request.get("title", ""),
-            description=request.get("description", ""),
-            category=request.get("category", "autre")
+        result = await pipeline_executor.run(
+            generate_brief_variants,
+            title=request.title,
+            description=request.description,
+            category=request.category
         )
         
-        return {"success": True, "data": result}
+        return encode_response(http_request, {"success": True, "data": result})
         
+    except ExecutorQueueFull as e:
+        raise service_overloaded(e)
     except Exception as e:
-        return {"success": False, "error": str(e)}
+        return encode_response(http_request, {"success": False, "error": str(e)})
 
-@app.post("/questions")
-async def get_questions(request: dict):
+@app.post("/questions", openapi_extra=body_schema(BriefQuestionsRequest))
+async def get_questions(http_request: Request):
     """Génère des questions adaptatives"""
+    request = await decode_body(http_request, BriefQuestionsRequest)
     try:
         from enhancements.questioner import get_next_questions
         
-        brief = request.get("brief", {})
-        answers = request.get("answers", {})
-        max_questions = request.get("max_questions", 5)
-        
-        result = get_next_questions(brief, answers, max_questions)
+        result = await pipeline_executor.run(
+            get_next_questions, request.brief, request.answers, request.max_questions
+        )
         
-        return {"success": True, "data": result}
+        return encode_response(http_request, {"success": True, "data": result})
         
+    except ExecutorQueueFull as e:
+        raise service_overloaded(e)
     except Exception as e:
-        return {"success": False, "error": str(e)}
-    }
+        return encode_response(http_request, {"success": False, "error": str(e)})
 
-@app.post("/improve", response_model=ProjectImproveResponse)
-async def improve_project(request: ProjectImproveRequest):
-    """Améliore un projet avec l'IA complète"""
-    try:
-        logger.info(f"Amélioration du projet: {request.title}")
-        
-        # 1. Normalisation du texte
-        normalized = text_normalizer.normalize(request.description)
-        logger.info(f"Texte normalisé, {len(normalized.keywords)} mots-clés extraits")
-        
-        # 2. Classification taxonomique
-        taxonomy_result = taxonomizer.classify(
-            text=f"{request.title} {request.description}",
-            keywords=normalized.keywords
-        )
-        logger.info(f"Classification: {taxonomy_result.category_std}/{taxonomy_result.sub_category_std}")
-        
-        # 3. Réécriture avec templates
-        rewritten = template_rewriter.rewrite_project(
-            original_title=request.title,
-            original_description=request.description,
-            category=taxonomy_result.category_std,
-            sub_category=taxonomy_result.sub_category_std,
-            skills=taxonomy_result.skills_std
+@app.post("/enhance", openapi_extra=body_schema(BriefEnhanceRequest))
+async def enhance_brief(http_request: Request):
+    """Normalisation, variantes et questions d'un brief en un seul appel.
+
+    Le texte du brief est préparé une fois et partagé par les trois services,
+    lancés en parallèle sur l'exécuteur. Chaque partie a la forme de la réponse de
+    l'endpoint dédié ({"success": ..., "data"|"error": ...}) et échoue seule ; une
+    partie non demandée vaut None.
+    """
+    from enhancements.brief_text import prepare_brief_text
+    
+    request = await decode_body(http_request, BriefEnhanceRequest)
+    text = prepare_brief_text(request.title, request.description)
+    
+    # Mêmes entrées que les appels /normalize, /generate puis /questions
+    calls = {}
+    if "normalize" in request.parts:
+        calls["normalized"] = pipeline_executor.run(
+            call_function,
+            "enhancements.normalize:normalize_brief",
+            title=request.title,
+            description=request.description,
+            category=request.category,
+            text=text,
+            heavy=True
         )
-        logger.info(f"Projet réécrit avec template {taxonomy_result.category_std}")
-        
-        # 4. Analyse qualité du brief
-        quality_analysis = brief_quality_analyzer.analyze(
+    if "generate" in request.parts:
+        calls["variants"] = pipeline_executor.run(
+            call_function,
+            "enhancements.generator:generate_brief_variants",
             title=request.title,
             description=request.description,
-            category=taxonomy_result.category_std
+            category=request.category or "autre",
+            text=text
         )
-        logger.info(f"Qualité brief: {quality_analysis.brief_quality_score:.2f}")
-        
-        # 5. Suggestions prix et délais
-        price_suggestion = price_time_suggester.suggest(
-            category=taxonomy_result.category_std,
-            sub_category=taxonomy_result.sub_category_std,
-            complexity='medium',  # Déterminé par l'analyse
-            brief_quality_score=quality_analysis.brief_quality_score,
-            constraints=normalized.constraints
+    if "questions" in request.parts:
+        brief = {"title": request.title, "description": request.description}
+        if request.category is not None:
+            brief["category"] = request.category
+        calls["questions"] = pipeline_executor.run(
+            call_function,
+            "enhancements.questioner:get_next_questions",
+            brief,
+            request.answers,
+            request.max_questions,
+            text=text
         )
-        logger.info(f"Prix suggéré: {price_suggestion.price_suggested_med}€")
+    
+    outcomes = await asyncio.gather(*calls.values(), return_exceptions=True)
+    response: Dict[str, Any] = {"normalized": None, "variants": None, "questions": None}
+    for part, outcome in zip(calls, outcomes):
+        if isinstance(outcome, ExecutorQueueFull):
+            raise service_overloaded(outcome)
+        if isinstance(outcome, Exception):
+            response[part] = {"success": False, "error": str(outcome)}
+        else:
+            response[part] = {"success": True, "data": outcome}
+    return encode_response(http_request, response)
+
+@app.post("/improve", response_model=ProjectImproveResponse, openapi_extra=body_schema(ProjectImproveRequest))
+async def improve_project(http_request: Request,
+                          x_request_deadline: Optional[float] = Header(default=None, ge=0)):
+    """Améliore un projet avec l'IA complète.
+
+    X-Request-Deadline : budget de latence de l'appelant, en millisecondes. Une fois
+    dépassé, la réécriture, la grille what-if du LOC et les raisons sont sautées
+    (réponse partielle, champ `degraded`). Un client déconnecté abandonne le calcul
+    (réponse 499). `fields` restreint la réponse, et le calcul, aux champs demandés.
+    """
+    request = await decode_body(http_request, ProjectImproveRequest)
+    deadline = Deadline(x_request_deadline)
+    try:
+        logger.info(f"Amélioration du projet: {request.title}")
         
-        # 6. Compilation des résultats
-        response = ProjectImproveResponse(
-            title_std=rewritten.title_std,
-            summary_std=rewritten.summary_std,
-            acceptance_criteria=rewritten.acceptance_criteria,
-            category_std=taxonomy_result.category_std,
-            sub_category_std=taxonomy_result.sub_category_std,
-            skills_std=taxonomy_result.skills_std,
-            tags_std=taxonomy_result.tags_std,
-            tasks_std=rewritten.tasks_std,
-            deliverables_std=rewritten.deliverables_std,
-            constraints_std=normalized.constraints,
-            brief_quality_score=quality_analysis.brief_quality_score,
-            richness_score=quality_analysis.richness_score,
-            missing_info=[
-                {"id": info["type"], "q": info["questions"][0]}
-                for info in quality_analysis.missing_info[:3]
-            ],
-            price_suggested_min=price_suggestion.price_suggested_min,
-            price_suggested_med=price_suggestion.price_suggested_med,
-            price_suggested_max=price_suggestion.price_suggested_max,
-            delay_suggested_days=price_suggestion.delay_suggested_days,
-            loc_base=0.6,  # Score LOC de base
-            loc_uplift_reco={
-                "new_budget": int(price_suggestion.price_suggested_med * 1.1),
-                "new_delay": price_suggestion.delay_suggested_days + 2,
-                "delta_loc": 0.08
-            },
-            rewrite_version=rewritten.rewrite_version,
-            reasons=generate_improvement_reasons(quality_analysis, price_suggestion, taxonomy_result)
-        )
+        # Lot de données figé pour toute la requête, même si un rechargement intervient
+        data = data_registry.current
+        request_data = request.model_dump()
+        cache_key = make_cache_key(request_data, SERVICE_VERSION, data.version)
+        # Projection : entrée propre aux champs demandés, une réponse complète en cache
+        # la sert aussi
+        result_key = f"{cache_key}:fields={','.join(request.fields)}" if request.fields else cache_key
+        # Un project_id exige l'état analysé du pipeline pour ouvrir la session
+        use_cached = result_cache is not None and not request.project_id
+        result = result_cache.get(cache_key) if use_cached else None
+        if request.fields and use_cached:
+            if result is not None:
+                result = ProjectImproveResponse(**result).model_dump(include=set(request.fields))
+            else:
+                result = result_cache.get(result_key)
+        
+        if result is None:
+            async def compute():
+                try:
+                    if improve_batcher is not None:
+                        computed = await improve_batcher.submit((request_data, data, deadline))
+                    else:
+                        computed = await pipeline_executor.run(improve_pipeline.improve, request_data, data, deadline)
+                except asyncio.CancelledError:
+                    # Plus personne n'attend : le pipeline s'arrête à la prochaine étape
+                    deadline.cancel()
+                    raise
+                # Une réponse partielle n'est pas mise en cache
+                if result_cache and not computed["degraded"]:
+                    result_cache.put(result_key, computed)
+                return computed
+            
+            # Même clé que le cache ; un project_id ouvre sa propre session. Avec un
+            # budget, la réponse peut être partielle : partagée entre appels à budget.
+            flight_key = f"{result_key}:{request.project_id}" if request.project_id else result_key
+            if x_request_deadline is not None:
+                flight_key = f"{flight_key}:deadline"
+            try:
+                result = await until_disconnect(http_request, coalesced("improve", flight_key, compute))
+                if result["degraded"] and not deadline.expired:
+                    # Réponse partielle due au budget plus court d'un autre appel : le
+                    # nôtre n'est pas épuisé, calcul propre dans ce budget
+                    result = await until_disconnect(http_request, compute())
+            except asyncio.CancelledError:
+                if not getattr(http_request.state, "disconnected", False):
+                    raise
+                logger.info(f"Client déconnecté, amélioration abandonnée: {request.title}")
+                return Response(status_code=499)
+        
+        # Projection : seulement les champs demandés (pas de validation complète)
+        response = result if request.fields else ProjectImproveResponse(**result)
         
         logger.info("Amélioration terminée avec succès")
-        return response
+        return encode_response(http_request, response)
         
+    except ExecutorQueueFull as e:
+        raise service_overloaded(e)
     except Exception as e:
         logger.error(f"Erreur lors de l'amélioration: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Erreur lors de l'amélioration: {str(e)}")
 
+@app.post("/improve/batch", response_model=ProjectImproveBatchResponse)
+async def improve_projects_batch(requests: List[Dict[str, Any]]):
+    """Améliore un lot de projets, avec une erreur par projet plutôt qu'un échec global"""
+    if len(requests) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Lot trop volumineux: {len(requests)} projets (max {BATCH_MAX_ITEMS})"
+        )
+    
+    if batch_sizes is not None:
+        batch_sizes.observe(len(requests))
+    
+    try:
+        logger.info(f"Amélioration d'un lot de {len(requests)} projets")
+        
+        data = data_registry.current
+        
+        # Validation projet par projet : un brief invalide n'invalide pas le lot
+        results: List[Optional[ProjectImproveBatchItem]] = [None] * len(requests)
+        pending_indexes = []
+        pending_requests = []
+        pending_keys = []
+        for index, raw_request in enumerate(requests):
+            try:
+                request_data = ProjectImproveRequest.model_validate(raw_request).model_dump()
+            except ValidationError as e:
+                results[index] = ProjectImproveBatchItem(index=index, success=False, error=str(e))
+                continue
+            # Pas de projection par lot : réponses complètes
+            request_data["fields"] = None
+            
+            cache_key = make_cache_key(request_data, SERVICE_VERSION, data.version)
+            fields = result_cache.get(cache_key) if result_cache else None
+            if fields is not None:
+                results[index] = ProjectImproveBatchItem(
+                    index=index, success=True, data=ProjectImproveResponse(**fields)
+                )
+            else:
+                pending_indexes.append(index)
+                pending_requests.append(request_data)
+                pending_keys.append(cache_key)
+        
+        outcomes = await pipeline_executor.run(improve_pipeline.improve_batch, pending_requests, data)
+        for index, cache_key, outcome in zip(pending_indexes, pending_keys, outcomes):
+            if outcome['success']:
+                if result_cache:
+                    result_cache.put(cache_key, outcome['data'])
+                results[index] = ProjectImproveBatchItem(
+                    index=index, success=True, data=ProjectImproveResponse(**outcome['data'])
+                )
+            else:
+                results[index] = ProjectImproveBatchItem(index=index, success=False, error=outcome['error'])
+        
+        succeeded = sum(1 for item in results if item.success)
+        return ProjectImproveBatchResponse(
+            results=results,
+            succeeded=succeeded,
+            failed=len(results) - succeeded
+        )
+        
+    except ExecutorQueueFull as e:
+        raise service_overloaded(e)
+    except Exception as e:
+        logger.error(f"Erreur lors de l'amélioration du lot: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Erreur lors de l'amélioration du lot: {str(e)}")
+
 @app.post("/brief/recompute")
 async def recompute_brief(request: BriefRecomputeRequest):
-    """Recalcule les suggestions après réponses aux questions"""
+    """Recalcule les champs impactés par les réponses aux questions.
+
+    Les réponses ({"id": ..., "answer": ...}) sont appliquées comme des deltas à la
+    session ouverte par /improve avec le même project_id : quelques dizaines de
+    microsecondes de calcul, exécutées directement sur la boucle.
+    """
     try:
         logger.info(f"Recalcul brief pour projet {request.project_id}")
         
-        # TODO: Récupérer le projet depuis la DB
-        # Pour l'instant, on retourne un exemple
+        result = brief_recomputer.recompute(request.project_id, request.answers, data_registry.current)
+        if result is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Aucune session pour ce projet : appeler /improve avec project_id"
+            )
         
-        # Simule une amélioration après réponses
-        improvement_factor = len(request.answers) * 0.05  # 5% par réponse
-        
-        response = {
-            "brief_quality_score": min(0.95, 0.6 + improvement_factor),
-            "richness_score": min(0.90, 0.5 + improvement_factor),
-            "missing_info": [],  # Plus de questions manquantes
-            "price_suggested_med": 8500,  # Prix ajusté
-            "updated_fields": ["brief_quality_score", "richness_score", "price_suggested_med"],
-            "improvement_summary": f"Brief amélioré grâce à {len(request.answers)} réponse(s) supplémentaire(s)"
-        }
-        
-        logger.info("Recalcul terminé")
-        return response
+        result["improvement_summary"] = (
+            f"Brief amélioré grâce à {result['answers_applied']} réponse(s) supplémentaire(s)"
+        )
+        logger.info(f"Recalcul terminé: {', '.join(result['updated_fields']) or 'aucun changement'}")
+        return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Erreur lors du recalcul: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Erreur lors du recalcul: {str(e)}")
@@ -244,13 +637,34 @@ async def recompute_brief(request: BriefRecomputeRequest):
 async def get_ml_stats():
     """Statistiques du service ML"""
     try:
-        taxonomy_stats = taxonomizer.get_category_stats()
+        data = data_registry.current
+        taxonomy_stats = data.taxonomizer.get_category_stats()
         rewriter_stats = template_rewriter.get_rewrite_stats()
         
         return {
             "service_status": "operational",
             "taxonomy": taxonomy_stats,
             "templates": rewriter_stats,
+            "executors": pipeline_executor.get_stats(),
+            "cache": result_cache.get_stats() if result_cache else {"enabled": False},
+            "data_version": data.version,
+            "data": data_registry.get_stats(),
+            "price_sketches": (
+                data.price_time_suggester.mission_sketches.get_stats()
+                if data.price_time_suggester.mission_sketches else None
+            ),
+            "brief_sessions": brief_recomputer.get_stats(),
+            "client_features": (
+                loc_uplift_calculator.client_features.get_stats()
+                if loc_uplift_calculator.client_features else None
+            ),
+            "single_flight": single_flight.get_stats() if single_flight else {"enabled": False},
+            "deadlines": improve_pipeline.get_stats(),
+            "micro_batches": {
+                name: batcher.get_stats() if batcher else {"enabled": False}
+                for name, batcher in (("improve", improve_batcher), ("normalize", normalize_batcher))
+            },
+            "models": model_registry.get_stats(),
             "version": "1.0.0",
             "capabilities": [
                 "text_normalization",
@@ -258,37 +672,59 @@ async def get_ml_stats():
                 "template_rewriting",
                 "quality_analysis",
                 "price_time_suggestion",
-                "loc_estimation"
-            ]
+                "loc_estimation",
+                "batch_improvement",
+                "result_cache",
+                "data_hot_reload",
+                "linear_classification",
+                "incremental_recompute",
+                "market_pricing",
+                "single_flight",
+                "combined_enhancement",
+                "micro_batching",
+                "request_deadlines"
+            ] + (["prometheus_metrics"] if metrics is not None else [])
         }
     except Exception as e:
         logger.error(f"Erreur stats: {str(e)}")
         raise HTTPException(status_code=500, detail="Erreur lors de la récupération des stats")
 
-def generate_improvement_reasons(quality_analysis, price_suggestion, taxonomy_result) -> List[str]:
-    """Génère les raisons des améliorations suggérées"""
-    reasons = []
-    
-    # Raisons liées à la qualité
-    if quality_analysis.brief_quality_score < 0.7:
-        reasons.append("Brief enrichi pour attirer des prestataires plus qualifiés")
-    
-    if quality_analysis.richness_score < 0.6:
-        reasons.append("Contenu structuré pour une meilleure compréhension")
-    
-    # Raisons liées aux prix
-    if price_suggestion.confidence > 0.8:
-        reasons.append(f"Prix basé sur {len(taxonomy_result.skills_std)} compétences identifiées")
-    
-    # Raisons liées à la taxonomie
-    if taxonomy_result.confidence > 0.7:
-        reasons.append(f"Catégorisation précise en {taxonomy_result.category_std}")
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Métriques au format texte Prometheus (404 si ML_METRICS_ENABLED=false)"""
+    if metrics is None:
+        raise HTTPException(status_code=404, detail="Métriques désactivées (ML_METRICS_ENABLED=false)")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.post("/admin/reload")
+async def reload_data(x_admin_token: Optional[str] = Header(default=None)):
+    """Recharge la taxonomie et la grille de prix sans redémarrer le worker.
+
+    Le nouveau lot est construit dans un thread dédié puis publié ; les requêtes
+    en cours terminent sur l'ancienne version.
+    """
+    # Sans jeton configuré, l'endpoint n'existe pas (aucun rechargement anonyme)
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Rechargement désactivé (ML_ADMIN_TOKEN non défini)")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Jeton d'administration invalide")
     
-    # Questions manquantes
-    if len(quality_analysis.missing_info) > 0:
-        reasons.append(f"{len(quality_analysis.missing_info)} questions ajoutées pour compléter le brief")
+    previous_version = data_registry.current.version
+    try:
+        loop = asyncio.get_running_loop()
+        bundle = await loop.run_in_executor(None, data_registry.reload)
+    except Exception as e:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Rechargement refusé, version {previous_version} conservée: {str(e)}"
+        )
     
-    return reasons[:4]  # Limite à 4 raisons
+    return {
+        "previous_version": previous_version,
+        "data_version": bundle.version,
+        "changed": bundle.version != previous_version,
+        "source": bundle.source
+    }
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8001)
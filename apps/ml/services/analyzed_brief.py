@@ -0,0 +1,68 @@
+"""
+Brief analysé : caractéristiques textuelles calculées une fois par requête
+Texte nettoyé, minuscules, tokens, mots-clés techniques, quantités et contraintes
+sont extraits une seule fois puis partagés par la taxonomie, la réécriture et
+l'analyse qualité, au lieu d'être recalculés par chaque service.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import FrozenSet, Optional, Tuple
+
+from services.text_normalizer import NormalizedText, TextNormalizer
+
+# Technologies et compétences reconnues directement dans le texte (une seule regex)
+TECH_KEYWORDS = (
+    'react', 'vue', 'angular', 'node', 'php', 'python', 'java', 'javascript', 'typescript',
+    'html', 'css', 'sass', 'scss', 'bootstrap', 'tailwind',
+    'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch',
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes',
+    'figma', 'sketch', 'photoshop', 'illustrator', 'xd',
+    'seo', 'sem', 'google ads', 'facebook ads', 'instagram',
+)
+_TECH_KEYWORD_PATTERN = re.compile(r'\b(?:' + '|'.join(re.escape(keyword) for keyword in TECH_KEYWORDS) + r')\b')
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+_default_normalizer: Optional[TextNormalizer] = None
+
+def extract_tech_keywords(text_lower: str) -> Tuple[str, ...]:
+    """Technologies citées dans un texte en minuscules, dédupliquées dans l'ordre d'apparition"""
+    return tuple(dict.fromkeys(_TECH_KEYWORD_PATTERN.findall(text_lower)))
+
+@dataclass(frozen=True)
+class AnalyzedBrief:
+    """Caractéristiques d'un brief partagées par tous les services (lecture seule)"""
+    title: str
+    description: str
+    # "titre description" en minuscules, et la description seule en minuscules
+    text_lower: str
+    description_lower: str
+    # Normalisation de la description : texte nettoyé, quantités, contraintes, mots-clés, prix
+    normalized: NormalizedText
+    tokens: Tuple[str, ...]
+    token_set: FrozenSet[str]
+    tech_keywords: Tuple[str, ...]
+    description_word_count: int
+
+def analyze_brief(title: str, description: str, text_normalizer: Optional[TextNormalizer] = None) -> AnalyzedBrief:
+    """Construit le brief analysé d'une requête"""
+    global _default_normalizer
+    if text_normalizer is None:
+        if _default_normalizer is None:
+            _default_normalizer = TextNormalizer()
+        text_normalizer = _default_normalizer
+
+    text_lower = f"{title} {description}".lower()
+    tokens = tuple(_TOKEN_PATTERN.findall(text_lower))
+
+    return AnalyzedBrief(
+        title=title,
+        description=description,
+        text_lower=text_lower,
+        description_lower=description.lower(),
+        normalized=text_normalizer.normalize(description),
+        tokens=tokens,
+        token_set=frozenset(tokens),
+        tech_keywords=extract_tech_keywords(text_lower),
+        description_word_count=len(description.split())
+    )
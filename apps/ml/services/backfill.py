@@ -0,0 +1,298 @@
+"""
+Re-scoring hors ligne de la table des projets (python -m apps.ml backfill)
+Les lignes {title, description, category, budget} sont lues en flux (NDJSON ou CSV),
+scorées par lots dans un pool de processus avec le même pipeline que /improve, puis
+écrites en NDJSON dans l'ordre d'entrée. Le nombre de lots en vol est borné : la
+mémoire reste constante quelle que soit la taille de l'entrée. Un point de reprise
+(nombre de lignes écrites) est enregistré après chaque lot.
+"""
+
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+INPUT_FORMATS = ('ndjson', 'csv')
+
+# Pipeline du processus de travail, construit une fois par processus
+_worker_pipeline = None
+_worker_data = None
+
+def detect_format(path: Optional[str], requested: Optional[str] = None) -> str:
+    """Format d'entrée : explicite, sinon d'après l'extension (NDJSON par défaut)"""
+    if requested:
+        if requested not in INPUT_FORMATS:
+            raise ValueError(f"Format inconnu: {requested} (attendu: {', '.join(INPUT_FORMATS)})")
+        return requested
+    if path and path.lower().endswith('.csv'):
+        return 'csv'
+    return 'ndjson'
+
+def read_rows(stream: TextIO, input_format: str) -> Iterator[Dict[str, Any]]:
+    """Lignes brutes de l'entrée, une par une. Une ligne NDJSON illisible donne
+    {"_error": ...} pour être signalée à sa place dans la sortie."""
+    if input_format == 'csv':
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            row = {'_error': f"JSON invalide: {e}"}
+        yield row if isinstance(row, dict) else {'_error': "ligne JSON non objet"}
+
+def _parse_budget(value: Any) -> Optional[int]:
+    if value is None or value == '':
+        return None
+    return int(float(value))
+
+def row_to_request(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Requête /improve d'une ligne de la table (lève ValueError si elle est invalide)"""
+    if '_error' in row:
+        raise ValueError(row['_error'])
+    title = row.get('title')
+    description = row.get('description')
+    if not isinstance(title, str) or not title.strip():
+        raise ValueError("title manquant")
+    if not isinstance(description, str) or not description.strip():
+        raise ValueError("description manquante")
+    try:
+        budget = _parse_budget(row.get('budget'))
+    except (TypeError, ValueError):
+        raise ValueError(f"budget invalide: {row.get('budget')!r}")
+    return {
+        'title': title,
+        'description': description,
+        'category': row.get('category') or None,
+        'budget_min': budget,
+        'budget_max': budget,
+        'deadline': None,
+        'classifier': row.get('classifier') or 'rules',
+        'pricing': row.get('pricing') or 'rates',
+        'client_id': row.get('client_id') or None,
+        'project_id': None
+    }
+
+def _init_worker():
+    """Construit les services du pipeline /improve dans le processus de travail"""
+    global _worker_pipeline, _worker_data
+    from services.brief_quality import BriefQualityAnalyzer
+    from services.data_registry import DataRegistry
+    from services.improve_pipeline import ImprovePipeline
+    from services.template_rewriter import TemplateRewriter
+    from services.text_normalizer import TextNormalizer
+
+    logging.getLogger().setLevel(logging.WARNING)
+    registry = DataRegistry.from_env()
+    _worker_data = registry.current
+    _worker_pipeline = ImprovePipeline(
+        text_normalizer=TextNormalizer(),
+        data_registry=registry,
+        template_rewriter=TemplateRewriter(),
+        brief_quality_analyzer=BriefQualityAnalyzer()
+    )
+
+def score_chunk(first_index: int, rows: List[Dict[str, Any]]) -> Tuple[str, List[str], List[str]]:
+    """Score un lot de lignes ; retourne (version des données, lignes NDJSON, erreurs)"""
+    if _worker_pipeline is None:
+        _init_worker()
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+    pending_positions = []
+    pending_requests = []
+    for position, row in enumerate(rows):
+        try:
+            pending_requests.append(row_to_request(row))
+            pending_positions.append(position)
+        except ValueError as e:
+            results[position] = {'success': False, 'error': str(e)}
+
+    outcomes = _worker_pipeline.improve_batch(pending_requests, _worker_data) if pending_requests else []
+    for position, outcome in zip(pending_positions, outcomes):
+        results[position] = outcome
+
+    lines = []
+    errors = []
+    for position, (row, result) in enumerate(zip(rows, results)):
+        item = {'index': first_index + position}
+        if row.get('id') not in (None, ''):
+            item['id'] = row['id']
+        item.update(result)
+        lines.append(json.dumps(item, ensure_ascii=False))
+        if not result['success']:
+            errors.append(result['error'])
+    return _worker_data.version, lines, errors
+
+@dataclass
+class Checkpoint:
+    """Point de reprise : lignes d'entrée déjà écrites en sortie.
+    `output_bytes` permet de tronquer la sortie au dernier lot complet avant de reprendre."""
+    offset: int = 0
+    output_bytes: Optional[int] = None
+    data_version: Optional[str] = None
+
+    @classmethod
+    def load(cls, path: Optional[str]) -> 'Checkpoint':
+        if not path or not os.path.exists(path):
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(**json.load(f))
+
+    def save(self, path: Optional[str]):
+        """Écriture atomique (fichier temporaire puis renommage)"""
+        if not path:
+            return
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f)
+        os.replace(tmp_path, path)
+
+@dataclass
+class BackfillReport:
+    """Bilan d'une exécution"""
+    rows: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed_seconds: float = 0.0
+    data_version: Optional[str] = None
+    workers: int = 0
+    errors: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def format(self) -> str:
+        lines = [
+            f"Lignes scorées : {self.rows} ({self.succeeded} ok, {self.failed} en erreur), "
+            f"{self.skipped} déjà écrites avant la reprise",
+            f"Durée : {self.elapsed_seconds:.1f}s, débit : {self.rows_per_second:.0f} lignes/s "
+            f"({self.workers} processus)",
+            f"Version des données : {self.data_version}",
+        ]
+        for error, count in sorted(self.errors.items(), key=lambda item: -item[1])[:5]:
+            lines.append(f"  {count} x {error}")
+        return '\n'.join(lines)
+
+class BackfillRunner:
+    """Score un flux de lignes et écrit les résultats dans l'ordre d'entrée.
+
+    - `workers` : processus de scoring (0 = dans le processus courant)
+    - `chunk_size` : lignes par tâche envoyée à un processus
+    - `max_in_flight` : lots soumis non encore écrits (par défaut 2 par processus),
+      ce qui borne la mémoire
+    - `checkpoint_path` : point de reprise mis à jour après chaque lot écrit
+    - `start_method` : méthode de démarrage des processus (comme ML_PROCESS_START_METHOD)
+    """
+
+    def __init__(self,
+                 workers: int = 1,
+                 chunk_size: int = 256,
+                 max_in_flight: Optional[int] = None,
+                 checkpoint_path: Optional[str] = None,
+                 start_method: str = 'spawn'):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight or max(2, 2 * workers)
+        self.checkpoint_path = checkpoint_path
+        self.start_method = start_method
+
+    def run(self, rows: Iterable[Dict[str, Any]], output: TextIO) -> BackfillReport:
+        """Consomme `rows` et écrit une ligne NDJSON par ligne d'entrée dans `output`.
+
+        Reprend après le point de reprise s'il existe : les lignes déjà écrites
+        sont lues puis ignorées. Lève RuntimeError si les données de référence ont
+        changé depuis le début de l'exécution interrompue.
+        """
+        checkpoint = Checkpoint.load(self.checkpoint_path)
+        report = BackfillReport(skipped=checkpoint.offset, workers=self.workers)
+        rows = iter(rows)
+        if checkpoint.offset:
+            logger.info(f"Reprise après {checkpoint.offset} lignes")
+            for _ in islice(rows, checkpoint.offset):
+                pass
+
+        start = time.perf_counter()
+        executor: Optional[Executor] = (
+            ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker
+            ) if self.workers > 0 else None
+        )
+        in_flight: Deque[Future] = deque()
+        next_index = checkpoint.offset
+        try:
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if chunk:
+                    in_flight.append(self._submit(executor, next_index, chunk))
+                    next_index += len(chunk)
+                # Écrit le lot le plus ancien dès que la fenêtre est pleine (ou en fin d'entrée)
+                while in_flight and (len(in_flight) >= self.max_in_flight or not chunk):
+                    version, lines, errors = in_flight.popleft().result()
+                    self._check_version(checkpoint, version)
+                    self._write(lines, errors, output, report)
+                    checkpoint.offset += len(lines)
+                    checkpoint.output_bytes = self._tell(output)
+                    checkpoint.save(self.checkpoint_path)
+                if not chunk:
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        report.elapsed_seconds = time.perf_counter() - start
+        report.data_version = checkpoint.data_version
+        return report
+
+    @staticmethod
+    def _submit(executor: Optional[Executor], first_index: int, chunk: List[Dict[str, Any]]) -> Future:
+        if executor is not None:
+            return executor.submit(score_chunk, first_index, chunk)
+        future = Future()
+        future.set_result(score_chunk(first_index, chunk))
+        return future
+
+    @staticmethod
+    def _tell(output: TextIO) -> Optional[int]:
+        try:
+            return output.tell()
+        except (OSError, ValueError):
+            # Sortie non positionnable (stdout redirigé vers un pipe)
+            return None
+
+    @staticmethod
+    def _check_version(checkpoint: Checkpoint, version: str):
+        if checkpoint.data_version is None:
+            checkpoint.data_version = version
+        elif version != checkpoint.data_version:
+            raise RuntimeError(
+                f"Données de référence modifiées en cours de backfill "
+                f"({checkpoint.data_version} -> {version}) : relancer sans point de reprise"
+            )
+
+    @staticmethod
+    def _write(lines: List[str], errors: List[str], output: TextIO, report: BackfillReport):
+        for line in lines:
+            output.write(line + '\n')
+        output.flush()
+        report.rows += len(lines)
+        report.failed += len(errors)
+        report.succeeded += len(lines) - len(errors)
+        for error in errors:
+            # Regroupe par étape en échec ("classify: ...") ou par message de validation
+            kind = error.split(':')[0]
+            report.errors[kind] = report.errors.get(kind, 0) + 1
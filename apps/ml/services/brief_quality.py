@@ -1,9 +1,10 @@
 
 import logging
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import re
-from text_normalizer import TextNormalizer
+from services.text_normalizer import TextNormalizer
+from services.analyzed_brief import AnalyzedBrief, analyze_brief
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +16,9 @@ class QualityAnalysis:
     strengths: List[str]
     improvements: List[str]
     completeness_percentage: float
+    # Scores détaillés, conservés pour les recalculs incrémentaux (/brief/recompute)
+    essential_scores: Dict[str, float] = field(default_factory=dict)
+    quality_scores: Dict[str, float] = field(default_factory=dict)
 
 class BriefQualityAnalyzer:
     def __init__(self):
@@ -102,25 +106,42 @@ class BriefQualityAnalyzer:
             }
         }
 
-    def analyze(self, title: str, description: str, category: str = None) -> QualityAnalysis:
-        """Analyse la qualité d'un brief"""
+    def analyze(self,
+                title: str,
+                description: str,
+                category: str = None,
+                brief: Optional[AnalyzedBrief] = None) -> QualityAnalysis:
+        """Analyse la qualité d'un brief (réutilise `brief` s'il est déjà analysé)"""
         
         # Normalisation du texte
-        normalized = self.text_normalizer.normalize(description)
-        full_text = f"{title} {description}".lower()
+        if brief is None:
+            brief = analyze_brief(title, description, self.text_normalizer)
+        normalized = brief.normalized
+        full_text = brief.text_lower
         
         # Analyse des informations essentielles
         essential_scores = self._analyze_essential_info(full_text)
         
         # Analyse des indicateurs de qualité
-        quality_scores = self._analyze_quality_indicators(title, description, normalized)
+        quality_scores = self._analyze_quality_indicators(title, description, normalized, essential_scores, brief)
         
-        # Calcul des scores globaux
-        brief_quality_score = self._calculate_brief_quality_score(essential_scores, quality_scores)
         richness_score = self._calculate_richness_score(normalized, quality_scores)
         
+        return self.rescore(essential_scores, quality_scores, richness_score)
+
+    def rescore(self,
+                essential_scores: Dict[str, float],
+                quality_scores: Dict[str, float],
+                richness_score: float) -> QualityAnalysis:
+        """Scores globaux, manques, forces et améliorations à partir des scores détaillés.
+
+        Ne relit pas le texte : sert aussi à mettre à jour une analyse après réponses.
+        """
+        # Calcul du score global
+        brief_quality_score = self._calculate_brief_quality_score(essential_scores, quality_scores)
+        
         # Identification des informations manquantes
-        missing_info = self._identify_missing_info(essential_scores, full_text)
+        missing_info = self._identify_missing_info(essential_scores)
         
         # Identification des forces et améliorations
         strengths = self._identify_strengths(essential_scores, quality_scores)
@@ -135,43 +156,57 @@ class BriefQualityAnalyzer:
             missing_info=missing_info,
             strengths=strengths,
             improvements=improvements,
-            completeness_percentage=completeness_percentage
+            completeness_percentage=completeness_percentage,
+            essential_scores=essential_scores,
+            quality_scores=quality_scores
         )
 
     def _analyze_essential_info(self, text: str) -> Dict[str, float]:
         """Analyse la présence des informations essentielles"""
-        scores = {}
-        
-        for info_type, criteria in self.quality_criteria['essential_info'].items():
-            score = 0.0
-            keywords = criteria['keywords']
-            
-            # Recherche des mots-clés
-            keyword_matches = sum(1 for keyword in keywords if keyword in text)
-            if keyword_matches > 0:
-                score += min(keyword_matches / len(keywords), 1.0) * 0.6
-            
-            # Bonus pour phrases complètes sur le sujet
-            if info_type == 'objective' and any(word in text for word in ['pour', 'afin', 'objectif']):
-                score += 0.3
-            elif info_type == 'scope' and any(word in text for word in ['inclure', 'périmètre', 'comprend']):
-                score += 0.3
-            elif info_type == 'requirements' and any(word in text for word in ['doit', 'exige', 'nécessaire']):
-                score += 0.3
-            elif info_type == 'deliverables' and any(word in text for word in ['livrer', 'fournir', 'remettre']):
-                score += 0.3
-            elif info_type == 'timeline' and any(word in text for word in ['avant', 'délai', 'échéance']):
-                score += 0.3
-            elif info_type == 'budget' and any(word in text for word in ['€', 'euro', 'budget', 'prix']):
-                score += 0.4
-            
-            scores[info_type] = min(score, 1.0)
-        
-        return scores
+        return {
+            info_type: self.score_essential_info(info_type, text)
+            for info_type in self.quality_criteria['essential_info']
+        }
+
+    def score_essential_info(self, info_type: str, text: str) -> float:
+        """Score de présence d'une information essentielle dans un texte en minuscules"""
+        criteria = self.quality_criteria['essential_info'][info_type]
+        score = 0.0
+        keywords = criteria['keywords']
+        
+        # Recherche des mots-clés
+        keyword_matches = sum(1 for keyword in keywords if keyword in text)
+        if keyword_matches > 0:
+            score += min(keyword_matches / len(keywords), 1.0) * 0.6
+        
+        # Bonus pour phrases complètes sur le sujet
+        if info_type == 'objective' and any(word in text for word in ['pour', 'afin', 'objectif']):
+            score += 0.3
+        elif info_type == 'scope' and any(word in text for word in ['inclure', 'périmètre', 'comprend']):
+            score += 0.3
+        elif info_type == 'requirements' and any(word in text for word in ['doit', 'exige', 'nécessaire']):
+            score += 0.3
+        elif info_type == 'deliverables' and any(word in text for word in ['livrer', 'fournir', 'remettre']):
+            score += 0.3
+        elif info_type == 'timeline' and any(word in text for word in ['avant', 'délai', 'échéance']):
+            score += 0.3
+        elif info_type == 'budget' and any(word in text for word in ['€', 'euro', 'budget', 'prix']):
+            score += 0.4
+        
+        return min(score, 1.0)
 
-    def _analyze_quality_indicators(self, title: str, description: str, normalized) -> Dict[str, float]:
+    def _analyze_quality_indicators(self,
+                                    title: str,
+                                    description: str,
+                                    normalized,
+                                    essential_scores: Optional[Dict[str, float]] = None,
+                                    brief: Optional[AnalyzedBrief] = None) -> Dict[str, float]:
         """Analyse les indicateurs de qualité"""
         scores = {}
+        if brief is None:
+            brief = analyze_brief(title, description, self.text_normalizer)
+        if essential_scores is None:
+            essential_scores = self._analyze_essential_info(brief.text_lower)
         
         # Spécificité
         specific_details = len([word for word in normalized.keywords if len(word) > 5])
@@ -179,7 +214,7 @@ class BriefQualityAnalyzer:
         scores['specificity'] = specificity_score
         
         # Clarté
-        word_count = len(description.split())
+        word_count = brief.description_word_count
         clarity_score = min(word_count / 100, 1.0)  # Normalisation sur 100 mots
         
         # Bonus pour structure (phrases courtes, paragraphes)
@@ -190,18 +225,21 @@ class BriefQualityAnalyzer:
         scores['clarity'] = min(clarity_score, 1.0)
         
         # Complétude
-        sections_covered = sum(1 for score in self._analyze_essential_info(f"{title} {description}".lower()).values() if score > 0.3)
-        completeness_score = sections_covered / len(self.quality_criteria['essential_info'])
-        scores['completeness'] = completeness_score
+        scores['completeness'] = self.score_completeness(essential_scores)
         
         # Profondeur technique
         tech_keywords = self.quality_criteria['quality_indicators']['technical_depth']['tech_keywords']
-        tech_mentions = sum(1 for keyword in tech_keywords if keyword in description.lower())
+        tech_mentions = sum(1 for keyword in tech_keywords if keyword in brief.description_lower)
         tech_score = min(tech_mentions / 3, 1.0)  # Normalisation sur 3 mentions
         scores['technical_depth'] = tech_score
         
         return scores
 
+    def score_completeness(self, essential_scores: Dict[str, float]) -> float:
+        """Indicateur de complétude : part des informations essentielles couvertes"""
+        sections_covered = sum(1 for score in essential_scores.values() if score > 0.3)
+        return sections_covered / len(self.quality_criteria['essential_info'])
+
     def _calculate_brief_quality_score(self, essential_scores: Dict[str, float], quality_scores: Dict[str, float]) -> float:
         """Calcule le score global de qualité du brief"""
         
@@ -237,7 +275,7 @@ class BriefQualityAnalyzer:
         weights = [0.3, 0.3, 0.2, 0.2]
         return sum(score * weight for score, weight in zip(factors.values(), weights))
 
-    def _identify_missing_info(self, essential_scores: Dict[str, float], text: str) -> List[Dict[str, any]]:
+    def _identify_missing_info(self, essential_scores: Dict[str, float]) -> List[Dict[str, any]]:
         """Identifie les informations manquantes importantes"""
         missing = []
         
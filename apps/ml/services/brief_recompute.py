@@ -0,0 +1,331 @@
+"""
+Recalcul incrémental d'un brief après réponses aux questions (/brief/recompute)
+/improve avec un `project_id` ouvre une session qui conserve les scores détaillés
+du brief. Chaque réponse est ensuite appliquée comme un delta : seuls le score de
+l'information essentielle concernée, les ajustements de prix et les facteurs LOC
+qui en dépendent sont recalculés, sans relancer le pipeline.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from services.brief_quality import BriefQualityAnalyzer, QualityAnalysis
+from services.loc_uplift import LOCUpliftCalculator, loc_uplift_calculator
+from services.text_normalizer import TextNormalizer
+
+logger = logging.getLogger(__name__)
+
+# Identifiant de réponse -> information essentielle concernée. Les identifiants sont
+# ceux de `missing_info` (/improve) et les catégories de QuestionerService.
+ANSWER_TOPICS = {
+    'objective': 'objective',
+    'scope': 'scope',
+    'requirements': 'requirements',
+    'deliverables': 'deliverables',
+    'timeline': 'timeline',
+    'budget': 'budget',
+    'tech_constraints': 'requirements',
+    'quality': 'deliverables',
+    'context': 'objective',
+}
+
+# Score minimal d'une information à laquelle le client a répondu explicitement
+ANSWERED_SCORE = 0.8
+
+PRICE_FIELDS = ('price_suggested_min', 'price_suggested_med', 'price_suggested_max', 'delay_suggested_days')
+
+# Nombre d'une réponse budget : milliers groupés par une espace ("15 000") ou
+# chiffres accolés, décimales, suffixe "k", puis le mot qui le suit
+_AMOUNT_PATTERN = re.compile(
+    r'(?<![\d.,])(\d{1,3}(?:[ \u00a0\u202f]\d{3}(?!\d))+|\d+)((?:[.,]\d+)?)'
+    r'\s*(k(?![a-zà-ÿ]))?\s*(€|[a-zà-ÿ%²]+)?'
+)
+_CURRENCY_UNITS = frozenset({'€', 'eur', 'euro', 'euros'})
+# Unités d'un nombre qui n'est pas un montant ("2 ans", "3 mois", "20 %")
+_OTHER_UNITS = frozenset({
+    'an', 'ans', 'année', 'années', 'mois', 'semaine', 'semaines', 'jour', 'jours', 'j',
+    'heure', 'heures', 'h', '%', 'page', 'pages', 'personne', 'personnes', 'm', 'm²', 'm2', 'km'
+})
+# Texte entre deux montants d'une fourchette ("5000-15000", "5 000 à 8 000", "entre 5k et 10k")
+_RANGE_PATTERN = re.compile(r'\s*(?:€\s*)?(?:-|–|à|a|et)\s*')
+
+def parse_budget(text: str) -> Optional[float]:
+    """Montant d'une réponse budget ("8000 €", "5000-15000€", "< 500€", "10k") ;
+    milieu de la fourchette si deux montants sont joints par "-", "à" ou "et".
+
+    Les nombres suivis d'une autre unité ("2 ans") ne sont pas des montants ; si
+    la réponse cite une devise, seuls les montants en devise (et l'autre borne de
+    leur fourchette) comptent.
+    """
+    text = text.lower()
+    numbers = []
+    for match in _AMOUNT_PATTERN.finditer(text):
+        value = float(re.sub(r'\s', '', match.group(1)) + match.group(2).replace(',', '.'))
+        unit = match.group(4)
+        numbers.append({
+            'value': value * 1000 if match.group(3) else value,
+            'thousands': bool(match.group(3)),
+            'currency': unit in _CURRENCY_UNITS,
+            'other': unit in _OTHER_UNITS,
+            # Fin du nombre (suffixe "k" compris), avant l'unité
+            'end': match.end(3) if match.group(3) else match.end(2),
+            'start': match.start(),
+        })
+
+    has_currency = any(number['currency'] for number in numbers)
+    for index, number in enumerate(numbers):
+        if number['other']:
+            continue
+        following = numbers[index + 1] if index + 1 < len(numbers) else None
+        joined = (following is not None and not following['other']
+                  and _RANGE_PATTERN.fullmatch(text, number['end'], following['start']) is not None)
+        if has_currency and not number['currency'] and not (joined and following['currency']):
+            continue
+        if not joined:
+            return number['value']
+        low = number['value']
+        # "5-10k" : le suffixe de la borne haute vaut pour la borne basse
+        if following['thousands'] and not number['thousands']:
+            low *= 1000
+        return (low + following['value']) / 2
+    return None
+
+def format_missing_info(missing_info: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Questions manquantes au format de la réponse /improve"""
+    return [{"id": info["type"], "q": info["questions"][0]} for info in missing_info[:3]]
+
+@dataclass
+class BriefSession:
+    """État analysé d'un projet entre deux recalculs"""
+    project_id: str
+    data_version: str
+    category: str
+    sub_category: str
+    pricing_mode: str
+    client_id: Optional[str]
+    # Description en minuscules, complétée par les réponses (urgence LOC)
+    description_lower: str
+    constraints: List[str]
+    budget: float
+    essential_scores: Dict[str, float]
+    quality_scores: Dict[str, float]
+    richness_score: float
+    fields: Dict[str, Any]
+    loc_components: Dict[str, float]
+    answers: Dict[str, str] = field(default_factory=dict)
+    updated_at: float = field(default_factory=time.time)
+
+class BriefSessionStore:
+    """Sessions par projet, LRU borné en nombre avec expiration (TTL)"""
+
+    def __init__(self, max_sessions: int = 10000, ttl_seconds: float = 86400):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: 'OrderedDict[str, BriefSession]' = OrderedDict()
+        self.lock = threading.Lock()
+        self._counters = {'opened': 0, 'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0}
+
+    @classmethod
+    def from_env(cls) -> 'BriefSessionStore':
+        """Construit le magasin depuis ML_BRIEF_SESSIONS_MAX / ML_BRIEF_SESSION_TTL_SECONDS"""
+        return cls(
+            max_sessions=int(os.getenv('ML_BRIEF_SESSIONS_MAX', '10000')),
+            ttl_seconds=float(os.getenv('ML_BRIEF_SESSION_TTL_SECONDS', '86400'))
+        )
+
+    def get(self, project_id: str) -> Optional[BriefSession]:
+        """Session du projet, ou None (absente ou expirée). Appeler sous `lock`."""
+        session = self._sessions.get(project_id)
+        if session is None:
+            self._counters['misses'] += 1
+            return None
+        if time.time() - session.updated_at > self.ttl_seconds:
+            del self._sessions[project_id]
+            self._counters['expired'] += 1
+            self._counters['misses'] += 1
+            return None
+        self._sessions.move_to_end(project_id)
+        self._counters['hits'] += 1
+        return session
+
+    def put(self, session: BriefSession):
+        """Ouvre ou remplace la session d'un projet"""
+        with self.lock:
+            self._sessions[session.project_id] = session
+            self._sessions.move_to_end(session.project_id)
+            self._counters['opened'] += 1
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                **self._counters,
+                'sessions': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'ttl_seconds': self.ttl_seconds
+            }
+
+class BriefRecomputer:
+    """Ouvre les sessions depuis l'état du pipeline et y applique les réponses"""
+
+    def __init__(self,
+                 store: BriefSessionStore,
+                 brief_quality_analyzer: BriefQualityAnalyzer,
+                 text_normalizer: TextNormalizer,
+                 loc_calculator: LOCUpliftCalculator = loc_uplift_calculator):
+        self.store = store
+        self.brief_quality_analyzer = brief_quality_analyzer
+        self.text_normalizer = text_normalizer
+        self.loc_calculator = loc_calculator
+
+    def open_session(self, project_id: str, state: Dict[str, Any]) -> BriefSession:
+        """Crée la session d'un projet à partir de l'état final du pipeline /improve"""
+        request = state['request']
+        quality: QualityAnalysis = state['quality']
+        price = state['price']
+        budgets = [value for value in (request.get('budget_min'), request.get('budget_max')) if value]
+
+        session = BriefSession(
+            project_id=project_id,
+            data_version=state['data'].version,
+            category=state['taxonomy'].category_std,
+            sub_category=state['taxonomy'].sub_category_std,
+            pricing_mode=request.get('pricing') or 'rates',
+            client_id=request.get('client_id'),
+            description_lower=state['brief'].description_lower,
+            constraints=list(state['normalized'].constraints),
+            budget=float(sum(budgets) / len(budgets)) if budgets else 0.0,
+            essential_scores=dict(quality.essential_scores),
+            quality_scores=dict(quality.quality_scores),
+            richness_score=quality.richness_score,
+            fields={
+                'brief_quality_score': quality.brief_quality_score,
+                'completeness_percentage': quality.completeness_percentage,
+                'missing_info': format_missing_info(quality.missing_info),
+                **{name: getattr(price, name) for name in PRICE_FIELDS}
+            },
+            loc_components={}
+        )
+        session.loc_components = self.loc_calculator.calculate_loc_components(*self._loc_inputs(session))
+        session.fields['loc_base'] = self.loc_calculator.combine_loc_components(session.loc_components)
+
+        self.store.put(session)
+        return session
+
+    def recompute(self, project_id: str, answers: List[Dict[str, str]], data) -> Optional[Dict[str, Any]]:
+        """Applique les réponses à la session du projet (None si aucune session).
+
+        Retourne les champs modifiés, la liste `updated_fields` et les réponses ignorées.
+        """
+        with self.store.lock:
+            session = self.store.get(project_id)
+            if session is None:
+                return None
+            return self._apply_answers(session, answers, data)
+
+    def _apply_answers(self, session: BriefSession, answers: List[Dict[str, str]], data) -> Dict[str, Any]:
+        analyzer = self.brief_quality_analyzer
+        changed_inputs = set()
+        ignored = []
+        essential_scores = dict(session.essential_scores)
+
+        # 1. Deltas : score de l'information concernée, contraintes, budget
+        for answer in answers:
+            answer_id = (answer.get('id') or answer.get('category') or '').strip().lower()
+            text = (answer.get('answer') or '').strip()
+            topic = ANSWER_TOPICS.get(answer_id)
+            if topic is None or not text:
+                ignored.append(answer_id)
+                continue
+
+            text_lower = text.lower()
+            essential_scores[topic] = max(
+                essential_scores[topic], ANSWERED_SCORE, analyzer.score_essential_info(topic, text_lower)
+            )
+            for constraint in self.text_normalizer.scan(text_lower).constraints:
+                if constraint not in session.constraints:
+                    session.constraints.append(constraint)
+                    changed_inputs.add('constraints')
+            if topic == 'budget':
+                budget = parse_budget(text)
+                if budget and budget != session.budget:
+                    session.budget = budget
+                    changed_inputs.add('budget')
+            session.description_lower += ' ' + text_lower
+            changed_inputs.add('description')
+            session.answers[answer_id] = text
+
+        previous = dict(session.fields)
+
+        # 2. Qualité : complétude puis scores globaux, sans relire le texte
+        if essential_scores != session.essential_scores:
+            session.essential_scores = essential_scores
+            session.quality_scores['completeness'] = analyzer.score_completeness(essential_scores)
+            quality = analyzer.rescore(essential_scores, session.quality_scores, session.richness_score)
+            session.fields['brief_quality_score'] = quality.brief_quality_score
+            session.fields['completeness_percentage'] = quality.completeness_percentage
+            session.fields['missing_info'] = format_missing_info(quality.missing_info)
+            if quality.brief_quality_score != previous['brief_quality_score']:
+                changed_inputs.add('brief_quality_score')
+
+        # 3. Prix : seuls les facteurs d'ajustement dépendent des réponses
+        if changed_inputs & {'brief_quality_score', 'constraints'}:
+            price = data.price_time_suggester.reprice(
+                category=session.category,
+                sub_category=session.sub_category,
+                brief_quality_score=session.fields['brief_quality_score'],
+                constraints=session.constraints,
+                pricing_mode=session.pricing_mode
+            )
+            session.fields.update(price)
+            session.data_version = data.version
+            changed_inputs.update(name for name in PRICE_FIELDS if price[name] != previous[name])
+
+        # 4. LOC : uniquement les facteurs dont une entrée a changé
+        factors = self.loc_calculator.factors_affected_by(changed_inputs)
+        if factors:
+            session.loc_components.update(
+                self.loc_calculator.calculate_loc_components(*self._loc_inputs(session), components=factors)
+            )
+            session.fields['loc_base'] = self.loc_calculator.combine_loc_components(session.loc_components)
+
+        session.updated_at = time.time()
+        updated_fields = [name for name, value in session.fields.items() if value != previous[name]]
+        return {
+            'project_id': session.project_id,
+            **{name: session.fields[name] for name in updated_fields},
+            'updated_fields': updated_fields,
+            'answers_applied': len(answers) - len(ignored),
+            'ignored_answers': ignored
+        }
+
+    def _loc_inputs(self, session: BriefSession):
+        """(project_data, standardization_data, market_context) du calcul LOC"""
+        fields = session.fields
+        return (
+            {
+                'category': session.category,
+                'description': session.description_lower,
+                'budget': session.budget,
+                'client_id': session.client_id
+            },
+            {
+                'brief_quality_score': fields['brief_quality_score'],
+                'price_suggested_min': fields['price_suggested_min'],
+                'price_suggested_max': fields['price_suggested_max'],
+                'delay_suggested_days': fields['delay_suggested_days'],
+                'missing_info': fields['missing_info']
+            },
+            {'heat_score': 0.5, 'price_suggested_med': fields['price_suggested_med']}
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self.store.get_stats()
@@ -0,0 +1,281 @@
+"""
+Historique des clients pour le calcul LOC
+Agrégats par client (missions publiées, taux d'aboutissement, justesse du budget)
+dans un fichier SQLite local, alimenté incrémentalement par le flux des événements
+de missions, avec un LRU en mémoire devant : une lecture en cache coûte quelques
+microsecondes, sans aller-retour vers la base de production.
+
+Ingestion (depuis la racine du dépôt) :
+    python -m apps.ml client-features ingest mission_events.ndjson --db client_features.sqlite
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Événements du flux des missions
+EVENT_TYPES = ('posted', 'completed', 'cancelled')
+
+# Justesse du budget supposée tant qu'aucune mission conclue ne la mesure
+DEFAULT_BUDGET_ACCURACY = 0.7
+
+# Identifiants par requête SELECT ... IN (...) (limite des paramètres SQLite)
+PREFETCH_CHUNK = 500
+
+# Entrée négative du LRU : client absent de la base
+_MISSING = object()
+
+@dataclass(frozen=True)
+class ClientFeatures:
+    """Agrégats d'un client"""
+    missions_posted: int
+    missions_completed: int
+    missions_cancelled: int
+    # Moyenne de 1 - |montant final - budget| / budget sur les missions conclues
+    budget_accuracy: Optional[float]
+
+    @property
+    def completion_rate(self) -> Optional[float]:
+        """Part des missions clôturées qui ont abouti (None si aucune clôturée)"""
+        closed = self.missions_completed + self.missions_cancelled
+        return self.missions_completed / closed if closed else None
+
+    def history_score(self) -> float:
+        """Score d'historique (0.4 à 0.9) : taux d'aboutissement lissé (a priori 1/2,
+        poids de 2 missions) pondéré par la justesse du budget"""
+        closed = self.missions_completed + self.missions_cancelled
+        reliability = (self.missions_completed + 1) / (closed + 2)
+        accuracy = self.budget_accuracy if self.budget_accuracy is not None else DEFAULT_BUDGET_ACCURACY
+        return 0.4 + 0.5 * reliability * accuracy
+
+def budget_accuracy(budget: Any, amount: Any) -> Optional[float]:
+    """Justesse du budget d'une mission conclue (None si budget ou montant inconnu)"""
+    try:
+        budget = float(budget or 0)
+        amount = float(amount or 0)
+    except (TypeError, ValueError):
+        return None
+    if budget <= 0 or amount <= 0:
+        return None
+    return 1 - min(1.0, abs(amount - budget) / budget)
+
+class ClientFeatureStore:
+    """Agrégats par client dans SQLite, LRU + TTL en mémoire devant.
+
+    Le TTL borne le retard sur les mises à jour écrites par un autre processus
+    (ingestion) ; celles appliquées par `apply_events` invalident le LRU directement.
+    Les clients absents sont aussi mis en cache.
+    """
+
+    def __init__(self, path: str, cache_size: int = 100000, ttl_seconds: float = 300):
+        self.path = path
+        self.cache_size = cache_size
+        self.ttl_seconds = ttl_seconds
+
+        # client_id -> (ClientFeatures ou _MISSING, date de lecture)
+        self._entries: 'OrderedDict[str, Tuple[Any, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0, 'prefetched': 0, 'db_errors': 0}
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS client_features ('
+            'client_id TEXT PRIMARY KEY, '
+            'missions_posted INTEGER NOT NULL DEFAULT 0, '
+            'missions_completed INTEGER NOT NULL DEFAULT 0, '
+            'missions_cancelled INTEGER NOT NULL DEFAULT 0, '
+            'budget_accuracy_sum REAL NOT NULL DEFAULT 0, '
+            'budget_accuracy_count INTEGER NOT NULL DEFAULT 0, '
+            'updated_at REAL NOT NULL) WITHOUT ROWID'
+        )
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS feed_offsets (feed TEXT PRIMARY KEY, position INTEGER NOT NULL)'
+        )
+
+    @classmethod
+    def from_env(cls) -> Optional['ClientFeatureStore']:
+        """Construit le magasin depuis ML_CLIENT_FEATURES_* (None si aucun fichier
+        configuré : l'historique client reste simulé)"""
+        path = os.getenv('ML_CLIENT_FEATURES_PATH')
+        if not path:
+            return None
+        try:
+            return cls(
+                path,
+                cache_size=int(os.getenv('ML_CLIENT_FEATURES_CACHE_SIZE', '100000')),
+                ttl_seconds=float(os.getenv('ML_CLIENT_FEATURES_TTL_SECONDS', '300'))
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Historique clients indisponible ({path}): {e}")
+            return None
+
+    def get(self, client_id: str) -> Optional[ClientFeatures]:
+        """Agrégats du client, ou None s'il est inconnu"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(client_id)
+            if entry is not None:
+                if now - entry[1] <= self.ttl_seconds:
+                    self._entries.move_to_end(client_id)
+                    self._counters['hits'] += 1
+                    return None if entry[0] is _MISSING else entry[0]
+                del self._entries[client_id]
+                self._counters['expired'] += 1
+
+            self._counters['misses'] += 1
+            fetched = self._fetch([client_id])
+            if fetched is None:
+                return None
+            features = fetched.get(client_id)
+            self._insert(client_id, features, now)
+            return features
+
+    def prefetch(self, client_ids: Iterable[str]) -> Dict[str, Optional[ClientFeatures]]:
+        """Agrégats d'un lot de clients : les absents du LRU sont lus par requêtes
+        groupées puis mis en cache. Retourne client_id -> agrégats (None si inconnu)."""
+        now = time.time()
+        results: Dict[str, Optional[ClientFeatures]] = {}
+        with self._lock:
+            missing = []
+            for client_id in dict.fromkeys(client_ids):
+                entry = self._entries.get(client_id)
+                if entry is not None and now - entry[1] <= self.ttl_seconds:
+                    self._entries.move_to_end(client_id)
+                    self._counters['hits'] += 1
+                    results[client_id] = None if entry[0] is _MISSING else entry[0]
+                else:
+                    missing.append(client_id)
+
+            fetched = self._fetch(missing)
+            for client_id in missing:
+                results[client_id] = fetched.get(client_id) if fetched is not None else None
+                if fetched is not None:
+                    self._insert(client_id, results[client_id], now)
+            self._counters['prefetched'] += len(missing)
+        return results
+
+    def apply_events(self, events: Iterable[Dict[str, Any]],
+                     feed: Optional[str] = None, position: Optional[int] = None) -> Tuple[int, int]:
+        """Applique des événements {event, client_id, budget, amount} du flux des missions.
+
+        Les deltas sont agrégés par client puis écrits en une transaction, avec la
+        position atteinte dans le flux `feed` si elle est fournie (reprise sans
+        double comptage). Retourne (événements appliqués, événements ignorés).
+        """
+        deltas: Dict[str, List[float]] = {}
+        applied = ignored = 0
+        for event in events:
+            client_id = event.get('client_id')
+            kind = event.get('event')
+            if not client_id or kind not in EVENT_TYPES:
+                ignored += 1
+                continue
+            delta = deltas.setdefault(str(client_id), [0, 0, 0, 0.0, 0])
+            delta[EVENT_TYPES.index(kind)] += 1
+            if kind == 'completed':
+                accuracy = budget_accuracy(event.get('budget'), event.get('amount'))
+                if accuracy is not None:
+                    delta[3] += accuracy
+                    delta[4] += 1
+            applied += 1
+
+        now = time.time()
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                self._db.executemany(
+                    'INSERT INTO client_features (client_id, missions_posted, missions_completed, '
+                    'missions_cancelled, budget_accuracy_sum, budget_accuracy_count, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT(client_id) DO UPDATE SET '
+                    'missions_posted = missions_posted + excluded.missions_posted, '
+                    'missions_completed = missions_completed + excluded.missions_completed, '
+                    'missions_cancelled = missions_cancelled + excluded.missions_cancelled, '
+                    'budget_accuracy_sum = budget_accuracy_sum + excluded.budget_accuracy_sum, '
+                    'budget_accuracy_count = budget_accuracy_count + excluded.budget_accuracy_count, '
+                    'updated_at = excluded.updated_at',
+                    [(client_id, *delta, now) for client_id, delta in deltas.items()]
+                )
+                if feed is not None and position is not None:
+                    self._db.execute(
+                        'INSERT OR REPLACE INTO feed_offsets (feed, position) VALUES (?, ?)', (feed, position)
+                    )
+                self._db.execute('COMMIT')
+            except sqlite3.Error:
+                self._db.execute('ROLLBACK')
+                raise
+            for client_id in deltas:
+                self._entries.pop(client_id, None)
+        return applied, ignored
+
+    def feed_position(self, feed: str) -> int:
+        """Événements du flux `feed` déjà appliqués"""
+        with self._lock:
+            row = self._db.execute('SELECT position FROM feed_offsets WHERE feed = ?', (feed,)).fetchone()
+        return row[0] if row else 0
+
+    def clear_cache(self):
+        """Vide le LRU (la base est conservée)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['misses']
+            return {
+                **self._counters,
+                'hit_ratio': round(self._counters['hits'] / lookups, 4) if lookups else 0.0,
+                'cached_clients': len(self._entries),
+                'cache_size': self.cache_size,
+                'ttl_seconds': self.ttl_seconds
+            }
+
+    def count_clients(self) -> int:
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM client_features').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _fetch(self, client_ids: List[str]) -> Optional[Dict[str, ClientFeatures]]:
+        """Lecture groupée en base (None en cas d'erreur, rien n'est alors mis en
+        cache). Appeler sous `_lock`."""
+        features = {}
+        try:
+            for start in range(0, len(client_ids), PREFETCH_CHUNK):
+                chunk = client_ids[start:start + PREFETCH_CHUNK]
+                rows = self._db.execute(
+                    'SELECT client_id, missions_posted, missions_completed, missions_cancelled, '
+                    'budget_accuracy_sum, budget_accuracy_count FROM client_features '
+                    f"WHERE client_id IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+                for client_id, posted, completed, cancelled, accuracy_sum, accuracy_count in rows:
+                    features[client_id] = ClientFeatures(
+                        missions_posted=posted,
+                        missions_completed=completed,
+                        missions_cancelled=cancelled,
+                        budget_accuracy=accuracy_sum / accuracy_count if accuracy_count else None
+                    )
+        except sqlite3.Error as e:
+            self._counters['db_errors'] += 1
+            logger.warning(f"Lecture historique clients impossible: {e}")
+            return None
+        return features
+
+    def _insert(self, client_id: str, features: Optional[ClientFeatures], now: float):
+        """Insère en tête de LRU puis évince au-delà de `cache_size`. Appeler sous `_lock`."""
+        self._entries[client_id] = (_MISSING if features is None else features, now)
+        self._entries.move_to_end(client_id)
+        while len(self._entries) > self.cache_size:
+            self._entries.popitem(last=False)
+            self._counters['evictions'] += 1
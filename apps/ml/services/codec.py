@@ -0,0 +1,105 @@
+"""
+Codec des corps de requête et de réponse des endpoints chauds
+(/improve, /normalize, /generate, /questions, /enhance)
+
+Décodage : le corps brut est validé directement par le modèle pydantic
+(`model_validate_json`, sans passer par un dict Python intermédiaire). Encodage :
+orjson pour les dicts, `model_dump_json` pour les modèles, au lieu de
+jsonable_encoder puis json.dumps. Le JSON produit est identique une fois parsé à
+celui de FastAPI ; les erreurs de validation gardent la forme 422 habituelle.
+
+MessagePack (`application/msgpack`) est négocié par Content-Type et Accept si le
+paquet msgpack est installé ; sinon un corps MessagePack est refusé (415) et la
+réponse reste en JSON.
+"""
+
+import json
+from typing import Any, Dict, Optional, Type, TypeVar
+
+from fastapi import HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from pydantic import BaseModel, ValidationError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MEDIA_TYPE = 'application/json'
+MSGPACK_MEDIA_TYPE = 'application/msgpack'
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, 'application/x-msgpack', 'application/vnd.msgpack')
+
+ModelT = TypeVar('ModelT', bound=BaseModel)
+
+def _default(value: Any) -> Any:
+    """Types non natifs (numpy, dataclasses, dates...) : même conversion que FastAPI"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return jsonable_encoder(value)
+
+def dumps_json(payload: Any) -> bytes:
+    """JSON compact en UTF-8, comme la JSONResponse de FastAPI"""
+    if isinstance(payload, BaseModel):
+        return payload.model_dump_json().encode('utf-8')
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, separators=(',', ':')
+    ).encode('utf-8')
+
+def _media_type(header: Optional[str]) -> str:
+    return (header or '').split(';', 1)[0].strip().lower()
+
+def wants_msgpack(request: Request) -> bool:
+    """Réponse MessagePack si le client l'accepte et que msgpack est installé"""
+    if msgpack is None:
+        return False
+    accept = request.headers.get('accept', '')
+    return any(_media_type(part) in MSGPACK_MEDIA_TYPES for part in accept.split(','))
+
+def body_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """openapi_extra d'un endpoint qui lit son corps lui-même (documentation du modèle)"""
+    content = {JSON_MEDIA_TYPE: {'schema': model.model_json_schema()}}
+    if msgpack is not None:
+        content[MSGPACK_MEDIA_TYPE] = content[JSON_MEDIA_TYPE]
+    return {'requestBody': {'required': True, 'content': content}}
+
+async def decode_body(request: Request, model: Type[ModelT]) -> ModelT:
+    """Valide le corps brut de la requête (JSON ou MessagePack) avec `model`"""
+    raw = await request.body()
+    if not raw:
+        raise RequestValidationError([{'type': 'missing', 'loc': ('body',), 'msg': 'Field required', 'input': None}])
+    try:
+        if _media_type(request.headers.get('content-type')) in MSGPACK_MEDIA_TYPES:
+            if msgpack is None:
+                raise HTTPException(status_code=415, detail="MessagePack non disponible (paquet msgpack absent)")
+            try:
+                payload = msgpack.unpackb(raw)
+            except Exception as e:
+                raise RequestValidationError(
+                    [{'type': 'msgpack_invalid', 'loc': ('body',), 'msg': f"MessagePack invalide: {e}", 'input': None}]
+                )
+            return model.model_validate(payload)
+        return model.model_validate_json(raw)
+    except ValidationError as e:
+        # Même forme que la validation de FastAPI : emplacements préfixés par "body"
+        errors = e.errors(include_url=False)
+        for error in errors:
+            error['loc'] = ('body', *error['loc'])
+        raise RequestValidationError(errors)
+
+def encode_response(request: Request, payload: Any, status_code: int = 200) -> Response:
+    """Réponse JSON (orjson) ou MessagePack selon l'en-tête Accept"""
+    if wants_msgpack(request):
+        if isinstance(payload, BaseModel):
+            payload = payload.model_dump(mode='json')
+        content = msgpack.packb(payload, default=_default)
+        return Response(content=content, status_code=status_code, media_type=MSGPACK_MEDIA_TYPE)
+    return Response(content=dumps_json(payload), status_code=status_code, media_type=JSON_MEDIA_TYPE)
@@ -0,0 +1,190 @@
+"""
+Registre des données de référence rechargeables à chaud
+La taxonomie et la grille de prix forment un lot immuable (DataBundle). Un
+rechargement construit un nouveau lot en arrière-plan puis remplace la référence
+courante : les requêtes en cours terminent sur l'ancien lot, les suivantes voient
+le nouveau, sans verrou sur le chemin des requêtes.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from services.data_snapshot import load_snapshot
+from services.price_sketches import SKETCH_FILE
+from services.price_time_suggester import PRICE_FILE, PriceTimeSuggester
+from services.result_cache import fingerprint
+from services.taxonomizer import TAXONOMY_FILE, Taxonomizer
+
+logger = logging.getLogger(__name__)
+
+# Intervalle de surveillance des sources quand le service tourne en plusieurs workers
+MULTI_WORKER_WATCH_SECONDS = 5.0
+
+def _multiple_workers() -> bool:
+    """Vrai si le service tourne en plusieurs workers : WEB_CONCURRENCY (lu par
+    uvicorn et gunicorn) ou worker lancé par le superviseur de `uvicorn --workers`"""
+    try:
+        if int(os.getenv('WEB_CONCURRENCY') or 1) > 1:
+            return True
+    except ValueError:
+        pass
+    return multiprocessing.parent_process() is not None
+
+def watch_interval_from_env() -> float:
+    """Intervalle de surveillance des sources (0 : inactive).
+
+    ML_DATA_WATCH_SECONDS s'il est défini ; sinon surveillance activée avec
+    plusieurs workers, chacun ne rechargeant que ses propres données : les
+    fichiers sources servent de signal commun à tous les workers.
+    """
+    value = os.getenv('ML_DATA_WATCH_SECONDS')
+    if value:
+        return float(value)
+    return MULTI_WORKER_WATCH_SECONDS if _multiple_workers() else 0.0
+
+@dataclass(frozen=True)
+class DataBundle:
+    """Version cohérente des données : ne jamais modifier après publication"""
+    version: str
+    source: str
+    taxonomizer: Taxonomizer
+    price_time_suggester: PriceTimeSuggester
+    loaded_at: float
+
+class DataRegistry:
+    """Détient le lot de données courant et le remplace atomiquement.
+
+    - `current` est une simple lecture de référence : un handler la lit une fois
+      et utilise ce lot jusqu'à la fin de la requête
+    - `reload()` construit le lot hors verrou de lecture ; les rechargements
+      concurrents sont sérialisés
+    - `watch()` surveille la date de modification des sources et recharge
+    """
+
+    def __init__(self, data_path: str = "/infra/data", snapshot_path: Optional[str] = None):
+        self.data_path = Path(data_path)
+        self.snapshot_path = snapshot_path
+        self._reload_lock = threading.Lock()
+        self._counters = {'reloads': 0, 'reload_errors': 0}
+        self._last_error: Optional[str] = None
+        self._watch_seconds = 0.0
+        self._signature = self._source_signature()
+        self._current = self._load_bundle()
+
+    @classmethod
+    def from_env(cls) -> 'DataRegistry':
+        """Construit le registre depuis ML_DATA_PATH / ML_DATA_SNAPSHOT"""
+        return cls(
+            data_path=os.getenv('ML_DATA_PATH', '/infra/data'),
+            snapshot_path=os.getenv('ML_DATA_SNAPSHOT') or None
+        )
+
+    @property
+    def current(self) -> DataBundle:
+        """Lot de données actif"""
+        return self._current
+
+    def _load_bundle(self) -> DataBundle:
+        """Construit un lot complet depuis le snapshot ou les CSV (lève en cas d'erreur)"""
+        if self.snapshot_path:
+            snapshot = load_snapshot(self.snapshot_path)
+            taxonomizer = Taxonomizer.from_snapshot(snapshot)
+            price_time_suggester = PriceTimeSuggester.from_snapshot(snapshot)
+            version = snapshot.data_version
+            source = self.snapshot_path
+        else:
+            taxonomizer = Taxonomizer(str(self.data_path))
+            price_time_suggester = PriceTimeSuggester(str(self.data_path))
+            version = fingerprint(
+                taxonomizer.taxonomy_data, taxonomizer.sub_category_keywords, price_time_suggester.price_data
+            )
+            source = str(self.data_path)
+
+        # Les quantiles des missions conclues font partie de la version (cache /improve)
+        if price_time_suggester.mission_sketches is not None:
+            version = fingerprint(version, price_time_suggester.mission_sketches.to_dict())
+
+        return DataBundle(
+            version=version,
+            source=source,
+            taxonomizer=taxonomizer,
+            price_time_suggester=price_time_suggester,
+            loaded_at=time.time()
+        )
+
+    def reload(self) -> DataBundle:
+        """Recharge les données et publie le nouveau lot.
+
+        En cas d'erreur (CSV invalide, snapshot incompatible) le lot courant est
+        conservé et l'exception est propagée.
+        """
+        with self._reload_lock:
+            signature = self._source_signature()
+            try:
+                bundle = self._load_bundle()
+            except Exception as e:
+                self._counters['reload_errors'] += 1
+                self._last_error = str(e)
+                logger.error(f"Rechargement des données impossible, version {self._current.version} conservée: {e}")
+                raise
+
+            previous = self._current
+            self._current = bundle
+            self._signature = signature
+            self._counters['reloads'] += 1
+            self._last_error = None
+            logger.info(f"Données rechargées: version {previous.version} -> {bundle.version}")
+            return bundle
+
+    def sources_changed(self) -> bool:
+        """Vrai si un fichier source a changé depuis le dernier chargement"""
+        return self._source_signature() != self._signature
+
+    def _source_signature(self) -> Tuple[Tuple[str, float, int], ...]:
+        """(chemin, date de modification, taille) des fichiers sources"""
+        if self.snapshot_path:
+            paths = [Path(self.snapshot_path), Path(self.snapshot_path).parent / SKETCH_FILE]
+        else:
+            paths = [self.data_path / TAXONOMY_FILE, self.data_path / PRICE_FILE, self.data_path / SKETCH_FILE]
+
+        signature = []
+        for path in paths:
+            try:
+                stat = path.stat()
+                signature.append((str(path), stat.st_mtime, stat.st_size))
+            except OSError:
+                signature.append((str(path), 0.0, -1))
+        return tuple(signature)
+
+    async def watch(self, interval_seconds: float):
+        """Surveille les sources et recharge dans un thread dédié quand elles changent"""
+        logger.info(f"Surveillance des données toutes les {interval_seconds}s")
+        self._watch_seconds = interval_seconds
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                if self.sources_changed():
+                    await loop.run_in_executor(None, self.reload)
+            except Exception:
+                # Erreur déjà journalisée par reload : on réessaiera au prochain changement
+                self._signature = self._source_signature()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Version active et compteurs de rechargement"""
+        bundle = self._current
+        return {
+            'version': bundle.version,
+            'source': bundle.source,
+            'loaded_at': bundle.loaded_at,
+            'last_error': self._last_error,
+            'watch_seconds': self._watch_seconds,
+            **self._counters
+        }
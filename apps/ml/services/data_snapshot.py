@@ -0,0 +1,231 @@
+"""
+Snapshot compilé des données de référence (taxonomie + grille de prix)
+Les CSV de `infra/data` sont compilés une fois en un fichier binaire versionné ;
+les workers le projettent en mémoire en lecture seule au lieu de re-parser les
+CSV au démarrage. La matrice des prix est lue en place (pages du fichier
+partagées entre workers uvicorn) ; la taxonomie et l'automate sont décodés en
+objets Python par chaque worker.
+
+Construction (depuis apps/ml) :
+    python -m services.data_snapshot /infra/data /infra/data/ml_data.snapshot
+
+Format :
+    en-tête fixe  : magic (8 octets), version du format, longueur de l'en-tête JSON
+    en-tête JSON  : version des données, empreintes des sources, table des sections
+    sections      : taxonomie (JSON), automate de mots-clés (marshal),
+                    index des prix (JSON), matrice des prix (float64, alignée sur 8 octets)
+"""
+
+import hashlib
+import json
+import logging
+import marshal
+import mmap
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from services.keyword_automaton import KeywordAutomaton
+from services.price_time_suggester import PRICE_COLUMNS, PRICE_FILE, PriceGrid, read_price_csv
+from services.taxonomizer import TAXONOMY_FILE, build_keyword_automaton, read_taxonomy_csv
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'MLSNAP\x00\x00'
+FORMAT_VERSION = 1
+SNAPSHOT_FILE = "ml_data.snapshot"
+
+# magic, version du format, longueur de l'en-tête JSON
+_PREAMBLE = struct.Struct('<8sII')
+_SECTIONS = ('taxonomy', 'automaton', 'price_index', 'price_matrix')
+
+class SnapshotError(ValueError):
+    """Snapshot illisible ou incompatible avec le code chargé"""
+
+class DataSnapshot:
+    """Données de référence chargées depuis un snapshot projeté en mémoire.
+
+    La matrice des prix (`price_matrix`, tableau NumPy float64 en lecture seule de
+    forme lignes × PRICE_COLUMNS) pointe directement dans le fichier projeté ;
+    `price_data` l'indexe par (catégorie, sous-catégorie) sans la copier.
+    """
+
+    def __init__(self, path: str, header: Dict[str, Any], mapped: mmap.mmap):
+        self.path = path
+        self.header = header
+        self.data_version: str = header['data_version']
+        self._mmap = mapped
+
+        taxonomy = json.loads(bytes(self._section('taxonomy')))
+        self.taxonomy_data: Dict[str, Dict[str, List[Dict]]] = taxonomy['taxonomy_data']
+        self.sub_category_keywords: Dict[str, Dict[str, List[str]]] = taxonomy['sub_category_keywords']
+        self.keyword_automaton = KeywordAutomaton.from_state(marshal.loads(self._section('automaton')))
+
+        import numpy as np
+
+        self.price_index: List[List[str]] = json.loads(bytes(self._section('price_index')))
+        values = np.frombuffer(self._section('price_matrix'), dtype='<f8')
+        if len(values) != len(self.price_index) * len(PRICE_COLUMNS):
+            raise SnapshotError(f"{path}: matrice des prix incohérente avec son index")
+        self.price_matrix = values.reshape(len(self.price_index), len(PRICE_COLUMNS))
+
+        price_rows: Dict[str, Dict[str, int]] = {}
+        for row, (category, sub_category) in enumerate(self.price_index):
+            price_rows.setdefault(category, {})[sub_category] = row
+        self.price_data = PriceGrid(price_rows, self.price_matrix)
+
+    def _section(self, name: str) -> memoryview:
+        offset, length = self.header['sections'][name]
+        return memoryview(self._mmap)[offset:offset + length]
+
+def _source_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+def build_snapshot(data_dir: str, output_path: str) -> Dict[str, Any]:
+    """Compile les CSV de `data_dir` en un snapshot et retourne son en-tête.
+
+    L'écriture passe par un fichier temporaire renommé : un worker qui charge le
+    snapshot pendant la construction lit l'ancienne ou la nouvelle version, jamais
+    un fichier partiel.
+    """
+    data_path = Path(data_dir)
+    taxonomy_file = data_path / TAXONOMY_FILE
+    price_file = data_path / PRICE_FILE
+
+    taxonomy_data, sub_category_keywords = read_taxonomy_csv(taxonomy_file)
+    price_data = read_price_csv(price_file)
+    automaton = build_keyword_automaton(taxonomy_data, sub_category_keywords)
+
+    price_index = [
+        [category, sub_category]
+        for category, sub_categories in price_data.items()
+        for sub_category in sub_categories
+    ]
+    price_values = [
+        float(price_data[category][sub_category][column])
+        for category, sub_category in price_index
+        for column in PRICE_COLUMNS
+    ]
+
+    sections = {
+        'taxonomy': json.dumps(
+            {'taxonomy_data': taxonomy_data, 'sub_category_keywords': sub_category_keywords},
+            ensure_ascii=False
+        ).encode('utf-8'),
+        'automaton': marshal.dumps(automaton.to_state()),
+        'price_index': json.dumps(price_index, ensure_ascii=False).encode('utf-8'),
+        'price_matrix': struct.pack(f'<{len(price_values)}d', *price_values),
+    }
+
+    sources = {
+        TAXONOMY_FILE: _source_digest(taxonomy_file),
+        PRICE_FILE: _source_digest(price_file),
+    }
+    header = {
+        'format_version': FORMAT_VERSION,
+        'data_version': hashlib.sha256(
+            json.dumps([FORMAT_VERSION, sources], sort_keys=True).encode('utf-8')
+        ).hexdigest()[:16],
+        'built_at': time.time(),
+        'python': f"{sys.version_info.major}.{sys.version_info.minor}",
+        'byteorder': 'little',
+        'price_columns': list(PRICE_COLUMNS),
+        'sources': sources,
+        'counts': {
+            'categories': len(taxonomy_data),
+            'keywords': len(automaton),
+            'price_rows': len(price_index),
+        },
+    }
+
+    # Les offsets dépendent de la taille de l'en-tête : on réserve large puis on complète
+    header['sections'] = {name: [0, len(sections[name])] for name in _SECTIONS}
+    header_length = len(json.dumps(header).encode('utf-8')) + 64 * len(_SECTIONS)
+    offset = _align(_PREAMBLE.size + header_length)
+    for name in _SECTIONS:
+        header['sections'][name][0] = offset
+        offset = _align(offset + len(sections[name]))
+
+    header_bytes = json.dumps(header).encode('utf-8').ljust(header_length)
+    tmp_path = f"{output_path}.tmp-{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, header_length))
+        f.write(header_bytes)
+        for name in _SECTIONS:
+            f.seek(header['sections'][name][0])
+            f.write(sections[name])
+    os.replace(tmp_path, output_path)
+
+    logger.info(f"Snapshot de données écrit: {output_path} (version {header['data_version']})")
+    return header
+
+def _align(offset: int, alignment: int = 8) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+def load_snapshot(path: str) -> DataSnapshot:
+    """Projette le snapshot en mémoire (lecture seule) et le valide.
+
+    Lève SnapshotError si le fichier n'est pas un snapshot, si sa version de
+    format ou de Python diffère, ou si son schéma de prix ne correspond pas.
+    """
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"{path}: snapshot illisible ({e})")
+
+    if len(mapped) < _PREAMBLE.size:
+        raise SnapshotError(f"{path}: fichier tronqué")
+    magic, format_version, header_length = _PREAMBLE.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise SnapshotError(f"{path}: ce fichier n'est pas un snapshot de données ML")
+    if format_version != FORMAT_VERSION:
+        raise SnapshotError(
+            f"{path}: format {format_version} incompatible (attendu {FORMAT_VERSION}), reconstruire le snapshot"
+        )
+
+    try:
+        header = json.loads(mapped[_PREAMBLE.size:_PREAMBLE.size + header_length])
+    except ValueError as e:
+        raise SnapshotError(f"{path}: en-tête illisible ({e})")
+
+    # marshal dépend de la version de Python, la matrice de l'ordre des octets
+    python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
+    if header.get('python') != python_version:
+        raise SnapshotError(f"{path}: construit pour Python {header.get('python')}, chargé par {python_version}")
+    if header.get('byteorder') != sys.byteorder:
+        raise SnapshotError(f"{path}: ordre des octets {header.get('byteorder')} non supporté")
+    if tuple(header.get('price_columns', ())) != PRICE_COLUMNS:
+        raise SnapshotError(
+            f"{path}: colonnes de prix {header.get('price_columns')} différentes de {list(PRICE_COLUMNS)}"
+        )
+    for name in _SECTIONS:
+        offset, length = header['sections'].get(name, (0, -1))
+        if length < 0 or offset + length > len(mapped):
+            raise SnapshotError(f"{path}: section {name} absente ou hors du fichier")
+
+    try:
+        snapshot = DataSnapshot(path, header, mapped)
+    except SnapshotError:
+        raise
+    except Exception as e:
+        raise SnapshotError(f"{path}: contenu invalide ({e})")
+
+    logger.info(
+        f"Snapshot de données chargé: {path} (version {snapshot.data_version}, "
+        f"{header['counts']['keywords']} mots-clés, {header['counts']['price_rows']} grilles de prix)"
+    )
+    return snapshot
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python -m services.data_snapshot <dossier_csv> [fichier_snapshot]")
+        sys.exit(2)
+    data_dir = sys.argv[1]
+    output_path = sys.argv[2] if len(sys.argv) == 3 else str(Path(data_dir) / SNAPSHOT_FILE)
+    header = build_snapshot(data_dir, output_path)
+    print(json.dumps({key: header[key] for key in ('data_version', 'sources', 'counts')}, indent=2))
@@ -0,0 +1,53 @@
+"""
+Budget de latence et abandon des requêtes /improve
+L'appelant transmet son budget (en-tête X-Request-Deadline, en millisecondes) :
+le pipeline le vérifie entre les étapes et, une fois dépassé, saute les étapes
+optionnelles (réécriture, grille what-if du LOC, raisons) en le signalant dans
+la réponse. Un client déconnecté annule la requête : le calcul s'arrête à la
+prochaine étape.
+"""
+
+import time
+from typing import Optional
+
+# Étapes sautées une fois le budget dépassé (réponse partielle, marquée `degraded`)
+OPTIONAL_STAGES = ('rewrite', 'what_if', 'reasons')
+
+class RequestCancelled(Exception):
+    """Plus aucun client n'attend le résultat : calcul abandonné"""
+
+    def __init__(self):
+        super().__init__("requête annulée par le client")
+
+class Deadline:
+    """Échéance d'une requête (None : sans budget) et signal d'annulation.
+
+    Partagé entre la boucle asyncio, qui annule, et le thread du pipeline, qui
+    vérifie entre les étapes.
+    """
+
+    def __init__(self, budget_ms: Optional[float] = None):
+        self.expires_at = time.monotonic() + budget_ms / 1000 if budget_ms is not None else None
+        self._cancelled = False
+
+    def remaining(self) -> Optional[float]:
+        """Secondes restantes (négatif une fois dépassé, None sans budget)"""
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def cancel(self):
+        self._cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def check(self):
+        """Lève RequestCancelled si la requête a été annulée"""
+        if self._cancelled:
+            raise RequestCancelled()
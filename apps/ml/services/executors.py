@@ -0,0 +1,153 @@
+"""
+Exécuteurs du service ML
+Sort le travail CPU (regex, scoring) de la boucle asyncio : pool de threads pour
+les étapes courtes, pool de processus pour les traitements lourds (spaCy...).
+"""
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class ExecutorQueueFull(Exception):
+    """Levée quand le nombre de tâches en attente atteint la limite configurée"""
+
+class PipelineExecutor:
+    """Exécute les traitements CPU hors de la boucle d'événements.
+
+    - `thread_workers=0` exécute les tâches directement dans la boucle (mode historique)
+    - `process_workers=0` redirige les tâches lourdes vers le pool de threads
+    - `max_pending` borne le nombre de tâches acceptées (en cours + en file)
+    """
+
+    def __init__(self,
+                 thread_workers: int = 2,
+                 process_workers: int = 0,
+                 max_pending: int = 64,
+                 process_start_method: str = 'spawn'):
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.max_pending = max_pending
+        self.process_start_method = process_start_method
+
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._counters = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0}
+
+    @classmethod
+    def from_env(cls) -> 'PipelineExecutor':
+        """Construit l'exécuteur à partir des variables d'environnement ML_*"""
+        return cls(
+            thread_workers=int(os.getenv('ML_THREAD_WORKERS', '2')),
+            process_workers=int(os.getenv('ML_PROCESS_WORKERS', '0')),
+            max_pending=int(os.getenv('ML_EXECUTOR_MAX_PENDING', '64')),
+            process_start_method=os.getenv('ML_PROCESS_START_METHOD', 'spawn')
+        )
+
+    async def run(self, fn: Callable[..., Any], *args, heavy: bool = False, **kwargs) -> Any:
+        """Exécute `fn(*args, **kwargs)` sans bloquer la boucle d'événements.
+
+        Les tâches `heavy` vont dans le pool de processus : `fn` et ses arguments
+        doivent alors être sérialisables (fonction de module, données simples).
+        """
+        if self._pending >= self.max_pending:
+            self._counters['rejected'] += 1
+            raise ExecutorQueueFull(
+                f"{self._pending} tâches en attente (max {self.max_pending})"
+            )
+
+        self._pending += 1
+        self._counters['submitted'] += 1
+        try:
+            executor = self._select_executor(heavy)
+            if executor is None:
+                result = fn(*args, **kwargs)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(executor, partial(fn, *args, **kwargs))
+            self._counters['completed'] += 1
+            return result
+        except Exception:
+            self._counters['failed'] += 1
+            raise
+        finally:
+            self._pending -= 1
+
+    def _select_executor(self, heavy: bool) -> Optional[Executor]:
+        """Choisit le pool adapté, créé à la première utilisation"""
+        if heavy and self.process_workers > 0:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context(self.process_start_method)
+                )
+                logger.info(f"Pool de processus démarré ({self.process_workers} workers)")
+            return self._process_pool
+
+        if self.thread_workers > 0:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.thread_workers,
+                    thread_name_prefix='ml-worker'
+                )
+                logger.info(f"Pool de threads démarré ({self.thread_workers} workers)")
+            return self._thread_pool
+
+        return None
+
+    @property
+    def pending(self) -> int:
+        """Nombre de tâches acceptées et non terminées"""
+        return self._pending
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retourne l'état des pools et les compteurs de tâches"""
+        return {
+            'thread_workers': self.thread_workers,
+            'process_workers': self.process_workers,
+            'max_pending': self.max_pending,
+            'pending': self._pending,
+            **self._counters
+        }
+
+    def shutdown(self):
+        """Arrête les pools (sans attendre les tâches en file)"""
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool = None
+        self._process_pool = None
+
+def call_function(qualified_name: str, *args, **kwargs) -> Any:
+    """Importe puis appelle `module:fonction`.
+
+    Permet d'envoyer un traitement lourd au pool de processus sans importer
+    son module (spaCy...) dans le processus principal.
+    """
+    module_name, function_name = qualified_name.split(':')
+    function = getattr(importlib.import_module(module_name), function_name)
+    return function(*args, **kwargs)
+
+def call_many(qualified_name: str, calls: List[Dict[str, Any]]) -> List[Tuple[bool, Any]]:
+    """Importe `module:fonction` puis l'appelle pour chaque jeu d'arguments nommés.
+
+    Un lot entier part ainsi en une seule tâche (pool de processus compris). Retourne
+    (True, résultat) ou (False, message d'erreur) par appel, une erreur
+    n'interrompant pas les suivants.
+    """
+    module_name, function_name = qualified_name.split(':')
+    function = getattr(importlib.import_module(module_name), function_name)
+    outcomes: List[Tuple[bool, Any]] = []
+    for kwargs in calls:
+        try:
+            outcomes.append((True, function(**kwargs)))
+        except Exception as e:
+            outcomes.append((False, str(e)))
+    return outcomes
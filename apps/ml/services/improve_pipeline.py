@@ -0,0 +1,566 @@
+"""
+Pipeline d'amélioration de projet (/improve)
+Enchaîne normalisation → taxonomie → réécriture → qualité → prix → LOC,
+pour un projet unique ou pour un lot complet étape par étape.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from services.analyzed_brief import analyze_brief
+from services.deadline import OPTIONAL_STAGES, Deadline, RequestCancelled
+from services.loc_uplift import LOCUpliftCalculator, loc_uplift_calculator
+from services.metrics import MetricsRegistry
+from services.price_time_suggester import PriceTimeSuggestion
+from services.template_rewriter import RewrittenProject
+
+logger = logging.getLogger(__name__)
+
+# Projets en mode 'rates' à partir desquels un lot est tarifé par suggest_many
+# (en deçà, le coût fixe des opérations NumPy dépasse celui de `suggest`)
+PRICE_BATCH_MIN_ITEMS = 16
+
+# Étapes dont chaque étape lit les résultats
+STAGE_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    'normalize': (),
+    'classify': ('normalize',),
+    'rewrite': ('classify',),
+    'quality': ('classify',),
+    'price': ('normalize', 'classify', 'quality'),
+    'loc': ('classify', 'quality', 'price'),
+}
+
+# Champs de la réponse /improve, dans l'ordre, et les étapes qui les produisent
+RESPONSE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'title_std': ('rewrite',),
+    'summary_std': ('rewrite',),
+    'acceptance_criteria': ('rewrite',),
+    'category_std': ('classify',),
+    'sub_category_std': ('classify',),
+    'skills_std': ('classify',),
+    'tags_std': ('classify',),
+    'category_alternatives': ('classify',),
+    'tasks_std': ('rewrite',),
+    'deliverables_std': ('rewrite',),
+    'constraints_std': ('normalize',),
+    'brief_quality_score': ('quality',),
+    'richness_score': ('quality',),
+    'missing_info': ('quality',),
+    'price_suggested_min': ('price',),
+    'price_suggested_med': ('price',),
+    'price_suggested_max': ('price',),
+    'delay_suggested_days': ('price',),
+    'loc_base': ('loc',),
+    'loc_uplift_reco': ('loc',),
+    'rewrite_version': ('rewrite',),
+    'reasons': ('classify', 'quality', 'price'),
+    'degraded': (),
+}
+
+# Étapes dont une session /brief/recompute (project_id) reprend l'état
+SESSION_STAGES = ('normalize', 'classify', 'quality', 'price')
+
+def projection_fields(fields: Sequence[str]) -> Tuple[str, ...]:
+    """Champs demandés dans l'ordre de la réponse, `degraded` toujours inclus
+    (ValueError pour un champ inconnu)"""
+    unknown = [field for field in fields if field not in RESPONSE_FIELDS]
+    if unknown:
+        raise ValueError(f"Champs inconnus: {', '.join(unknown)}")
+    requested = set(fields) | {'degraded'}
+    return tuple(field for field in RESPONSE_FIELDS if field in requested)
+
+class ImprovePipeline:
+    """Orchestre les services ML pour l'amélioration d'un ou plusieurs projets"""
+
+    def __init__(self,
+                 text_normalizer,
+                 data_registry,
+                 template_rewriter,
+                 brief_quality_analyzer,
+                 brief_recomputer=None,
+                 loc_calculator: LOCUpliftCalculator = loc_uplift_calculator,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.text_normalizer = text_normalizer
+        self.data_registry = data_registry
+        self.template_rewriter = template_rewriter
+        self.brief_quality_analyzer = brief_quality_analyzer
+        # Sessions /brief/recompute ouvertes pour les requêtes portant un project_id
+        self.brief_recomputer = brief_recomputer
+        self.loc_calculator = loc_calculator
+
+        # Étapes dans l'ordre d'exécution ; chaque étape enrichit l'état du projet
+        self.stages: List[Tuple[str, Callable[[Dict[str, Any]], None]]] = [
+            ('normalize', self._stage_normalize),
+            ('classify', self._stage_classify),
+            ('rewrite', self._stage_rewrite),
+            ('quality', self._stage_quality),
+            ('price', self._stage_price),
+            ('loc', self._stage_loc),
+        ]
+
+        # Variantes traitant tout un lot d'un coup (improve_batch), par nom d'étape
+        self.batch_stages: Dict[str, Callable[[List[Dict[str, Any]]], List[Optional[str]]]] = {
+            'classify': self._stage_classify_batch,
+            'price': self._stage_price_batch,
+            'loc': self._stage_loc_batch,
+        }
+
+        # Durée de chaque étape (aucune mesure sans registre de métriques) ; en
+        # mode batch, une observation par étape pour tout le lot. Séries résolues
+        # une fois ici pour ne pas chercher les étiquettes à chaque projet.
+        self.stage_durations = None
+        if metrics is not None:
+            histogram = metrics.histogram(
+                'stage_duration_seconds', "Durée des étapes du pipeline /improve", labelnames=('stage', 'mode')
+            )
+            self.stage_durations = {
+                (stage_name, mode): histogram.labels(stage_name, mode)
+                for stage_name, _ in self.stages for mode in ('single', 'batch')
+            }
+
+        # Réponses partielles (budget dépassé) et calculs abandonnés (client parti)
+        self._counters = {'degraded': 0, 'cancelled': 0}
+        # Étapes à exécuter par ensemble de champs demandés (voir `plan`)
+        self._plans: Dict[Tuple[Optional[FrozenSet[str]], bool], FrozenSet[str]] = {}
+
+    def plan(self, fields: Optional[Sequence[str]] = None, session: bool = False) -> FrozenSet[str]:
+        """Étapes nécessaires pour produire `fields` (toutes si None), avec leurs
+        dépendances ; `session` ajoute celles dont une session /brief/recompute a besoin"""
+        key = (frozenset(fields) if fields else None, session)
+        stages = self._plans.get(key)
+        if stages is None:
+            if not fields:
+                stages = frozenset(stage_name for stage_name, _ in self.stages)
+            else:
+                needed = set()
+                pending = [stage_name for field in fields for stage_name in RESPONSE_FIELDS[field]]
+                if session:
+                    pending.extend(SESSION_STAGES)
+                while pending:
+                    stage_name = pending.pop()
+                    if stage_name not in needed:
+                        needed.add(stage_name)
+                        pending.extend(STAGE_DEPENDENCIES[stage_name])
+                stages = frozenset(needed)
+            self._plans[key] = stages
+        return stages
+
+    def _new_state(self, request: Dict[str, Any], data, deadline: Optional[Deadline]) -> Dict[str, Any]:
+        """État initial d'un projet : seules les étapes de `plan` seront exécutées"""
+        return {
+            'request': request,
+            'data': data,
+            'deadline': deadline,
+            'plan': self.plan(request.get('fields'), session=bool(request.get('project_id')))
+        }
+
+    def improve(self, request: Dict[str, Any], data=None, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """Améliore un projet et retourne les champs de la réponse /improve.
+
+        `data` est le lot de données (taxonomie, prix) à utiliser ; par défaut le
+        lot courant du registre, lu une seule fois pour toute la requête.
+        `deadline` est vérifiée entre les étapes : budget dépassé, les étapes
+        optionnelles sont sautées ; requête annulée, RequestCancelled est levée.
+        Avec `request['fields']`, seules les étapes nécessaires à ces champs sont
+        exécutées et la réponse est restreinte à ces champs.
+        """
+        state = self._new_state(request, data or self.data_registry.current, deadline)
+        plan = state['plan']
+
+        for stage_name, stage in self.stages:
+            if stage_name not in plan:
+                continue
+            if deadline is not None and self._skip_stage(state, stage_name):
+                continue
+            if self.stage_durations is None:
+                stage(state)
+            else:
+                start = time.perf_counter()
+                stage(state)
+                self.stage_durations[stage_name, 'single'].observe(time.perf_counter() - start)
+            logger.debug(f"Étape {stage_name} terminée pour: {request.get('title')}")
+
+        response = self._build_response(state)
+        self._open_session(state)
+        return response
+
+    def improve_batch(self, requests: List[Dict[str, Any]], data=None,
+                      deadlines: Optional[List[Optional[Deadline]]] = None) -> List[Dict[str, Any]]:
+        """Améliore un lot de projets, chaque étape étant appliquée à tout le lot.
+
+        Retourne un résultat par projet, dans l'ordre d'entrée :
+        {"success": True, "data": {...}} ou {"success": False, "error": "..."}.
+        Une erreur sur un projet n'interrompt pas le reste du lot. Tout le lot
+        utilise la même version des données. `deadlines` (une par projet, micro-lots
+        /improve) s'appliquent projet par projet comme dans `improve`.
+        """
+        data = data or self.data_registry.current
+        deadlines = deadlines or [None] * len(requests)
+        states = [self._new_state(request, data, deadline) for request, deadline in zip(requests, deadlines)]
+        errors: List[Optional[str]] = [None] * len(states)
+
+        for stage_name, stage in self.stages:
+            if not any(stage_name in state['plan'] for state in states):
+                continue
+            start = time.perf_counter()
+            self._run_batch_stage(stage_name, stage, states, errors)
+            if self.stage_durations is not None:
+                self.stage_durations[stage_name, 'batch'].observe(time.perf_counter() - start)
+
+        results = []
+        for index, state in enumerate(states):
+            if errors[index] is None:
+                try:
+                    response = self._build_response(state)
+                    self._open_session(state)
+                    results.append({'success': True, 'data': response})
+                    continue
+                except Exception as e:
+                    errors[index] = f"response: {e}"
+            results.append({'success': False, 'error': errors[index]})
+
+        failed = sum(1 for error in errors if error is not None)
+        logger.info(f"Lot amélioré: {len(states) - failed}/{len(states)} projets")
+        return results
+
+    def _run_batch_stage(self, stage_name: str, stage: Callable[[Dict[str, Any]], None],
+                         states: List[Dict[str, Any]], errors: List[Optional[str]]):
+        """Applique une étape aux projets du lot encore sans erreur (variante par lot
+        si elle existe, sinon ou si elle échoue projet par projet) et y consigne les
+        erreurs"""
+        skipped = set()
+        for index, state in enumerate(states):
+            if errors[index] is not None:
+                continue
+            # Étape inutile aux champs demandés par ce projet
+            if stage_name not in state['plan']:
+                skipped.add(index)
+            elif state['deadline'] is not None:
+                try:
+                    if self._skip_stage(state, stage_name):
+                        skipped.add(index)
+                except RequestCancelled as e:
+                    errors[index] = f"{stage_name}: {e}"
+
+        batch_stage = self.batch_stages.get(stage_name)
+        if batch_stage is not None:
+            active = [index for index in range(len(states)) if errors[index] is None and index not in skipped]
+            try:
+                stage_errors = batch_stage([states[index] for index in active])
+            except Exception as e:
+                # Échec de la variante par lot : projet par projet, pour n'imputer
+                # l'erreur qu'aux projets réellement en échec
+                logger.warning(f"Étape {stage_name} par lot impossible, projet par projet: {e}")
+            else:
+                for index, error in zip(active, stage_errors):
+                    if error is not None:
+                        errors[index] = f"{stage_name}: {error}"
+                return
+
+        for index, state in enumerate(states):
+            if errors[index] is not None or index in skipped:
+                continue
+            try:
+                stage(state)
+            except Exception as e:
+                errors[index] = f"{stage_name}: {e}"
+
+    def _skip_stage(self, state: Dict[str, Any], stage_name: str) -> bool:
+        """Vérification entre deux étapes : True si l'étape optionnelle est sautée
+        (budget dépassé, consigné dans state['degraded']) ; RequestCancelled si le
+        client est parti"""
+        deadline = state['deadline']
+        if deadline.cancelled:
+            self._counters['cancelled'] += 1
+            deadline.check()
+        if stage_name in OPTIONAL_STAGES and deadline.expired:
+            state.setdefault('degraded', []).append(stage_name)
+            return True
+        return False
+
+    def get_stats(self) -> Dict[str, int]:
+        """Réponses partielles et calculs abandonnés"""
+        return dict(self._counters)
+
+    def _open_session(self, state: Dict[str, Any]):
+        """Conserve l'état analysé du projet pour les recalculs après réponses"""
+        project_id = state['request'].get('project_id')
+        if self.brief_recomputer is not None and project_id:
+            self.brief_recomputer.open_session(project_id, state)
+
+    def _stage_normalize(self, state: Dict[str, Any]):
+        """1. Normalisation du texte : le brief analysé est partagé par les étapes suivantes"""
+        request = state['request']
+        state['brief'] = analyze_brief(request['title'], request['description'], self.text_normalizer)
+        state['normalized'] = state['brief'].normalized
+
+    def _stage_classify(self, state: Dict[str, Any]):
+        """2. Classification taxonomique"""
+        request = state['request']
+        state['taxonomy'] = state['data'].taxonomizer.classify(
+            text=f"{request['title']} {request['description']}",
+            keywords=state['normalized'].keywords,
+            mode=request.get('classifier') or 'rules',
+            brief=state['brief']
+        )
+
+    def _stage_classify_batch(self, states: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """2. Classification taxonomique d'un lot : les projets en mode 'linear' sont
+        scorés ensemble (un seul produit matriciel), les autres un par un"""
+        errors: List[Optional[str]] = [None] * len(states)
+        linear = []
+        for index, state in enumerate(states):
+            if (state['request'].get('classifier') or 'rules') == 'linear':
+                linear.append(index)
+                continue
+            try:
+                self._stage_classify(state)
+            except Exception as e:
+                errors[index] = str(e)
+
+        if linear:
+            taxonomizer = states[linear[0]]['data'].taxonomizer
+            results = taxonomizer.classify_many(
+                texts=[
+                    f"{states[index]['request']['title']} {states[index]['request']['description']}"
+                    for index in linear
+                ],
+                keywords_list=[states[index]['normalized'].keywords for index in linear],
+                mode='linear',
+                briefs=[states[index]['brief'] for index in linear]
+            )
+            for index, result in zip(linear, results):
+                states[index]['taxonomy'] = result
+        return errors
+
+    def _stage_rewrite(self, state: Dict[str, Any]):
+        """3. Réécriture avec templates"""
+        request = state['request']
+        taxonomy = state['taxonomy']
+        state['rewritten'] = self.template_rewriter.rewrite_project(
+            original_title=request['title'],
+            original_description=request['description'],
+            category=taxonomy.category_std,
+            sub_category=taxonomy.sub_category_std,
+            skills=taxonomy.skills_std,
+            brief=state['brief']
+        )
+
+    def _stage_quality(self, state: Dict[str, Any]):
+        """4. Analyse qualité du brief"""
+        request = state['request']
+        state['quality'] = self.brief_quality_analyzer.analyze(
+            title=request['title'],
+            description=request['description'],
+            category=state['taxonomy'].category_std,
+            brief=state['brief']
+        )
+
+    def _stage_price(self, state: Dict[str, Any]):
+        """5. Suggestions prix et délais"""
+        taxonomy = state['taxonomy']
+        state['price'] = state['data'].price_time_suggester.suggest(
+            category=taxonomy.category_std,
+            sub_category=taxonomy.sub_category_std,
+            complexity='medium',  # Déterminé par l'analyse
+            brief_quality_score=state['quality'].brief_quality_score,
+            constraints=state['normalized'].constraints,
+            pricing_mode=state['request'].get('pricing') or 'rates'
+        )
+
+    def _stage_price_batch(self, states: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """5. Prix d'un lot : les projets en mode 'rates' sont tarifés ensemble par
+        suggest_many (mêmes prix, délai et confiance que `suggest`), les autres un par un"""
+        errors: List[Optional[str]] = [None] * len(states)
+        rates = [index for index, state in enumerate(states)
+                 if (state['request'].get('pricing') or 'rates') == 'rates']
+        if len(rates) >= PRICE_BATCH_MIN_ITEMS:
+            try:
+                batch = states[rates[0]]['data'].price_time_suggester.suggest_many(
+                    categories=[states[index]['taxonomy'].category_std for index in rates],
+                    sub_categories=[states[index]['taxonomy'].sub_category_std for index in rates],
+                    brief_quality_score=[states[index]['quality'].brief_quality_score for index in rates],
+                    constraints=[states[index]['normalized'].constraints for index in rates]
+                )
+            except Exception as e:
+                logger.warning(f"Tarification par lot impossible, projet par projet: {e}")
+            else:
+                for position, index in enumerate(rates):
+                    states[index]['price'] = PriceTimeSuggestion(
+                        price_suggested_min=int(batch.price_suggested_min[position]),
+                        price_suggested_med=int(batch.price_suggested_med[position]),
+                        price_suggested_max=int(batch.price_suggested_max[position]),
+                        delay_suggested_days=int(batch.delay_suggested_days[position]),
+                        rationale=None,
+                        confidence=float(batch.confidence[position])
+                    )
+
+        for index, state in enumerate(states):
+            if 'price' in state:
+                continue
+            try:
+                self._stage_price(state)
+            except Exception as e:
+                errors[index] = str(e)
+        return errors
+
+    def _stage_loc(self, state: Dict[str, Any]):
+        """6. LOC de base et grille what-if budget × délai × brief (frontière de Pareto,
+        optionnelle)"""
+        request = state['request']
+        price = state['price']
+        quality = state['quality']
+        budgets = [value for value in (request.get('budget_min'), request.get('budget_max')) if value]
+        # Budget de latence dépassé : LOC de base seul, sans la grille what-if
+        if state['deadline'] is not None and self._skip_stage(state, 'what_if'):
+            evaluate = self.loc_calculator.evaluate_base
+        else:
+            evaluate = self.loc_calculator.evaluate_what_if
+        state['loc'] = evaluate(
+            {
+                'category': state['taxonomy'].category_std,
+                'description': state['brief'].description_lower,
+                'client_id': request.get('client_id'),
+                'budget': float(sum(budgets) / len(budgets)) if budgets else 0.0
+            },
+            {
+                'brief_quality_score': quality.brief_quality_score,
+                'price_suggested_min': price.price_suggested_min,
+                'price_suggested_max': price.price_suggested_max,
+                'delay_suggested_days': price.delay_suggested_days,
+                'missing_info': quality.missing_info
+            },
+            {'heat_score': 0.5, 'price_suggested_med': price.price_suggested_med}
+        )
+
+    def _stage_loc_batch(self, states: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """6. LOC d'un lot : l'historique de tous les clients du lot est lu en une
+        prélecture groupée, puis chaque projet est évalué"""
+        client_features = self.loc_calculator.client_features
+        if client_features is not None:
+            client_features.prefetch(
+                state['request']['client_id'] for state in states if state['request'].get('client_id')
+            )
+        errors: List[Optional[str]] = [None] * len(states)
+        for index, state in enumerate(states):
+            try:
+                self._stage_loc(state)
+            except Exception as e:
+                errors[index] = str(e)
+        return errors
+
+    def _build_response(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """7. Compilation des résultats des étapes exécutées, restreinte aux champs
+        demandés (`request['fields']`), dans l'ordre de RESPONSE_FIELDS"""
+        request = state['request']
+        fields = request.get('fields')
+        plan = state['plan']
+        response: Dict[str, Any] = {}
+
+        if 'rewrite' in plan:
+            # Réécriture sautée (budget dépassé) : le brief d'origine, sans structure
+            rewritten = state.get('rewritten') or RewrittenProject(
+                title_std=request['title'],
+                summary_std=request['description'],
+                acceptance_criteria=[],
+                tasks_std=[],
+                deliverables_std=[],
+                rewrite_version=""
+            )
+            response.update({
+                'title_std': rewritten.title_std,
+                'summary_std': rewritten.summary_std,
+                'acceptance_criteria': rewritten.acceptance_criteria,
+                'tasks_std': rewritten.tasks_std,
+                'deliverables_std': rewritten.deliverables_std,
+                'rewrite_version': rewritten.rewrite_version
+            })
+
+        if 'classify' in plan:
+            taxonomy_result = state['taxonomy']
+            response.update({
+                'category_std': taxonomy_result.category_std,
+                'sub_category_std': taxonomy_result.sub_category_std,
+                'skills_std': taxonomy_result.skills_std,
+                'tags_std': taxonomy_result.tags_std,
+                'category_alternatives': taxonomy_result.alternatives
+            })
+
+        if 'normalize' in plan:
+            response['constraints_std'] = state['normalized'].constraints
+
+        if 'quality' in plan:
+            quality_analysis = state['quality']
+            response.update({
+                'brief_quality_score': quality_analysis.brief_quality_score,
+                'richness_score': quality_analysis.richness_score,
+                'missing_info': [
+                    {"id": info["type"], "q": info["questions"][0]}
+                    for info in quality_analysis.missing_info[:3]
+                ]
+            })
+
+        if 'price' in plan:
+            price_suggestion = state['price']
+            response.update({
+                'price_suggested_min': price_suggestion.price_suggested_min,
+                'price_suggested_med': price_suggestion.price_suggested_med,
+                'price_suggested_max': price_suggestion.price_suggested_max,
+                'delay_suggested_days': price_suggestion.delay_suggested_days
+            })
+
+        if 'loc' in plan:
+            what_if = state['loc']
+            # Sans amélioration possible, la recommandation reprend la situation actuelle
+            recommended = what_if.recommended or what_if.frontier[0]
+            response['loc_base'] = what_if.loc_base  # Score LOC de base
+            response['loc_uplift_reco'] = {
+                "new_budget": recommended['budget'],
+                "new_delay": recommended['delay_days'],
+                "brief_enhancements": recommended['brief_enhancements'],
+                "delta_loc": recommended['loc_gain'],
+                "scenarios_evaluated": what_if.evaluated,
+                "pareto": what_if.frontier
+            }
+
+        if not fields or 'reasons' in fields:
+            if state['deadline'] is not None and self._skip_stage(state, 'reasons'):
+                response['reasons'] = []
+            else:
+                response['reasons'] = generate_improvement_reasons(
+                    state['quality'], state['price'], state['taxonomy']
+                )
+
+        degraded = state.get('degraded', [])
+        if degraded:
+            self._counters['degraded'] += 1
+        response['degraded'] = degraded
+
+        names = projection_fields(fields) if fields else RESPONSE_FIELDS
+        return {name: response[name] for name in names}
+
+def generate_improvement_reasons(quality_analysis, price_suggestion, taxonomy_result) -> List[str]:
+    """Génère les raisons des améliorations suggérées"""
+    reasons = []
+
+    # Raisons liées à la qualité
+    if quality_analysis.brief_quality_score < 0.7:
+        reasons.append("Brief enrichi pour attirer des prestataires plus qualifiés")
+
+    if quality_analysis.richness_score < 0.6:
+        reasons.append("Contenu structuré pour une meilleure compréhension")
+
+    # Raisons liées aux prix
+    if price_suggestion.confidence > 0.8:
+        reasons.append(f"Prix basé sur {len(taxonomy_result.skills_std)} compétences identifiées")
+
+    # Raisons liées à la taxonomie
+    if taxonomy_result.confidence > 0.7:
+        reasons.append(f"Catégorisation précise en {taxonomy_result.category_std}")
+
+    # Questions manquantes
+    if len(quality_analysis.missing_info) > 0:
+        reasons.append(f"{len(quality_analysis.missing_info)} questions ajoutées pour compléter le brief")
+
+    return reasons[:4]  # Limite à 4 raisons
@@ -0,0 +1,137 @@
+"""
+Automate Aho-Corasick de recherche multi-mots-clés
+Trouve toutes les occurrences d'un ensemble de mots-clés en un seul parcours
+du texte, avec respect des frontières de mots ("ai" ne matche pas "maison").
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterator, List, Tuple
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+class KeywordAutomaton:
+    """Automate construit une fois, interrogé à chaque requête.
+
+    Chaque mot-clé ajouté reçoit un index (ordre d'ajout) et porte une liste
+    de charges utiles (payloads) libres.
+    """
+
+    def __init__(self):
+        self.keywords: List[str] = []
+        self.payloads: List[List[Any]] = []
+        self._keyword_index: Dict[str, int] = {}
+
+        # Trie : transitions, lien d'échec et mots-clés reconnus par état
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+        self._alphabet = set()
+        self._built = False
+
+    def add(self, keyword: str, payload: Any = None) -> int:
+        """Ajoute un mot-clé (ou une charge utile à un mot-clé existant)"""
+        if not keyword:
+            raise ValueError("Mot-clé vide")
+
+        keyword_index = self._keyword_index.get(keyword)
+        if keyword_index is None:
+            keyword_index = len(self.keywords)
+            self._keyword_index[keyword] = keyword_index
+            self.keywords.append(keyword)
+            self.payloads.append([])
+            self._insert(keyword, keyword_index)
+            self._built = False
+
+        if payload is not None:
+            self.payloads[keyword_index].append(payload)
+        return keyword_index
+
+    def _insert(self, keyword: str, keyword_index: int):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+            self._alphabet.add(char)
+        self._output[state] = self._output[state] + (keyword_index,)
+
+    def build(self):
+        """Calcule les liens d'échec (parcours en largeur du trie)"""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # Les mots-clés suffixes sont reconnus dans le même état
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Itère sur les occurrences (début, fin, index du mot-clé) délimitées par des frontières de mots"""
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        alphabet = self._alphabet
+        keywords = self.keywords
+        text_length = len(text)
+        state = 0
+
+        for position, char in enumerate(text):
+            if char not in alphabet:
+                state = 0
+                continue
+
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for keyword_index in output[state]:
+                keyword = keywords[keyword_index]
+                start = position - len(keyword) + 1
+                if _is_word_char(keyword[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                end = position + 1
+                if _is_word_char(keyword[-1]) and end < text_length and _is_word_char(text[end]):
+                    continue
+                yield start, end, keyword_index
+
+    def to_state(self) -> Tuple[Any, ...]:
+        """État compilé en conteneurs simples (sérialisable par marshal)"""
+        if not self._built:
+            self.build()
+        return (self.keywords, self.payloads, self._goto, self._fail, self._output, self._alphabet)
+
+    @classmethod
+    def from_state(cls, state: Tuple[Any, ...]) -> 'KeywordAutomaton':
+        """Reconstruit un automate compilé sans recalculer le trie"""
+        automaton = cls()
+        (automaton.keywords, automaton.payloads, automaton._goto,
+         automaton._fail, automaton._output, automaton._alphabet) = state
+        automaton._keyword_index = {keyword: index for index, keyword in enumerate(automaton.keywords)}
+        automaton._built = True
+        return automaton
+
+    def find_keywords(self, text: str) -> List[int]:
+        """Index des mots-clés présents dans le texte, dans l'ordre d'ajout"""
+        return sorted({keyword_index for _, _, keyword_index in self.iter_matches(text)})
+
+    def __len__(self) -> int:
+        return len(self.keywords)
@@ -3,10 +3,46 @@
 LOC Uplift - Calcul probabilité d'aboutissement et recommandations
 """
 
-import numpy as np
-from typing import Dict, List, Optional, Tuple
+import threading
+from itertools import product
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
 from dataclasses import dataclass
 
+from services.client_features import ClientFeatureStore
+
+# Version du modèle LOC / what-if (entre dans la clé du cache /improve)
+LOC_MODEL_VERSION = "whatif-1"
+
+# Taille par défaut de la grille what-if : hausses de budget × extensions de délai
+# (× les 8 combinaisons d'enrichissements du brief)
+WHAT_IF_BUDGET_STEPS = 50
+WHAT_IF_DELAY_STEPS = 50
+
+# Mots-clés d'urgence (recherche de sous-chaîne dans la description en minuscules)
+URGENT_KEYWORDS = ['urgent', 'rapide', 'vite', 'asap', 'immédiat', 'pressé']
+FLEXIBLE_KEYWORDS = ['flexible', 'pas pressé', 'quand possible']
+# Projets dont le délai n'est pas extensible (potentiel d'amélioration)
+FIXED_DELAY_KEYWORDS = ['urgent', 'vite', 'rapide']
+
+CATEGORY_DEMAND_SCORES = {
+    'web_development': 0.8,
+    'mobile_development': 0.7,
+    'design_graphique': 0.6,
+    'marketing_digital': 0.7,
+    'construction': 0.9,
+    'services_personne': 0.8,
+    'default': 0.6
+}
+
+CATEGORY_DEMAND_MAPPING = {
+    'developpement': 'web_development',
+    'mobile': 'mobile_development',
+    'design': 'design_graphique',
+    'marketing': 'marketing_digital',
+    'travaux': 'construction',
+    'menage': 'services_personne'
+}
+
 @dataclass
 class LOCResult:
     loc_base: float
@@ -14,8 +50,86 @@ class LOCResult:
     improvement_potential: float
     recommendations: List[str]
 
+@dataclass
+class WhatIfResult:
+    """Grille what-if évaluée et sa frontière de Pareto (coût, gain LOC)"""
+    loc_base: float
+    evaluated: int
+    # Points non dominés, coût croissant : aucun autre point n'a un gain supérieur
+    # pour un coût inférieur ou égal
+    frontier: List[Dict[str, Any]]
+    # Point recommandé : le moins coûteux atteignant 80% du gain maximal
+    recommended: Optional[Dict[str, Any]]
+
+@dataclass
+class LOCBatch:
+    """LOC d'un lot (calculate_loc_batch), un tableau NumPy par champ"""
+    loc_base: Any
+    improvement_potential: Any
+
+    def __len__(self) -> int:
+        return len(self.loc_base)
+
+def _text_column(values: Sequence[Any]) -> List[str]:
+    """Colonne de texte : valeurs manquantes (None, NaN pandas) remplacées par ''"""
+    return [value if isinstance(value, str) else '' if value is None or value != value else str(value)
+            for value in values]
+
+def _keyword_rows(texts: Sequence[str], keywords: Sequence[str]) -> Dict[str, Any]:
+    """Pour chaque mot-clé (en minuscules), masque des textes qui le contiennent,
+    comme `keyword in text.lower()`.
+
+    Les textes sont concaténés en UTF-8 et mis en minuscules d'un bloc (ASCII, plus
+    les majuscules accentuées des mots-clés) ; chaque mot-clé est cherché par
+    bytes.find sur tout le bloc, les positions trouvées sont ramenées aux lignes.
+    """
+    import numpy as np
+
+    encoded = [text.encode('utf-8', 'surrogatepass') for text in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)) + 1
+    row_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    block = b'\n'.join(encoded).lower()
+    for char in {char for keyword in keywords for char in keyword if not char.isascii()}:
+        upper = char.upper().encode('utf-8')
+        if upper != char.encode('utf-8') and len(upper) == len(char.encode('utf-8')):
+            block = block.replace(upper, char.encode('utf-8'))
+
+    rows = {}
+    for keyword in keywords:
+        needle = keyword.encode('utf-8')
+        positions = []
+        position = block.find(needle)
+        while position != -1:
+            positions.append(position)
+            position = block.find(needle, position + 1)
+        mask = np.zeros(len(encoded), dtype=bool)
+        if positions:
+            mask[np.searchsorted(row_starts, np.array(positions), side='right') - 1] = True
+        rows[keyword] = mask
+    return rows
+
 class LOCUpliftCalculator:
-    def __init__(self):
+    def __init__(self,
+                 client_features: Optional[ClientFeatureStore] = None,
+                 client_features_factory: Optional[Callable[[], Optional[ClientFeatureStore]]] = None):
+        # Historique réel des clients ; sans magasin, l'historique est simulé.
+        # `client_features_factory` ouvre le magasin au premier usage plutôt qu'à
+        # l'import du module (benchmarks, workers, outils en ligne de commande).
+        self._client_features = client_features
+        self._client_features_factory = client_features_factory
+        self._client_features_lock = threading.Lock()
+
+        # Champs d'entrée lus par chaque facteur (recalcul partiel après réponses)
+        self.factor_inputs = {
+            'brief_quality': {'brief_quality_score'},
+            'price_competitiveness': {'budget', 'price_suggested_med'},
+            'category_demand': {'category'},
+            'client_history': {'client_id'},
+            'market_conditions': {'heat_score'},
+            'urgency': {'description'},
+            'budget_realism': {'budget', 'price_suggested_min', 'price_suggested_max'}
+        }
+
         # Facteurs de base pour le calcul LOC
         self.base_factors = {
             'brief_quality': 0.25,      # Impact qualité du brief
@@ -46,6 +160,18 @@ class LOCUpliftCalculator:
             }
         }
 
+        # Coût relatif des actions what-if, en fraction du prix médian suggéré :
+        # +100% de délai « coûte » autant que +25% de budget ; enrichir le brief
+        # demande un effort fixe au client
+        self.action_costs = {
+            'delay_extension': 0.25,
+            'brief_enhancement': {
+                'details': 0.05,
+                'criteria': 0.03,
+                'deliverables': 0.03
+            }
+        }
+
         # Seuils de performance par catégorie
         self.category_benchmarks = {
             'web_development': {'avg_loc': 0.72, 'top_quartile': 0.85},
@@ -56,6 +182,16 @@ class LOCUpliftCalculator:
             'services_personne': {'avg_loc': 0.82, 'top_quartile': 0.92}
         }
 
+    @property
+    def client_features(self) -> Optional[ClientFeatureStore]:
+        """Magasin de l'historique clients, ouvert au premier accès (None : historique simulé)"""
+        if self._client_features_factory is not None:
+            with self._client_features_lock:
+                if self._client_features_factory is not None:
+                    self._client_features = self._client_features_factory()
+                    self._client_features_factory = None
+        return self._client_features
+
     def calculate_loc_with_uplift(self,
                                  project_data: Dict,
                                  standardization_data: Dict,
@@ -87,38 +223,190 @@ class LOCUpliftCalculator:
 
     def _calculate_base_loc(self, project_data: Dict, standardization_data: Dict, market_context: Dict) -> float:
         """Calcule le LOC de base selon multiples facteurs"""
+        loc_components = self.calculate_loc_components(project_data, standardization_data, market_context)
+        return self.combine_loc_components(loc_components)
+
+    def calculate_loc_components(self,
+                                 project_data: Dict,
+                                 standardization_data: Dict,
+                                 market_context: Dict,
+                                 components: Optional[List[str]] = None) -> Dict[str, float]:
+        """Contributions pondérées au LOC, toutes ou seulement `components`"""
+        assessors = {
+            # 1. Qualité du brief (0-1)
+            'brief_quality': lambda: standardization_data.get('brief_quality_score', 0.5),
+            # 2. Compétitivité prix
+            'price_competitiveness': lambda: self._assess_price_competitiveness(project_data, market_context),
+            # 3. Demande de catégorie
+            'category_demand': lambda: self._assess_category_demand(project_data.get('category', '')),
+            # 4. Historique client (simulé)
+            'client_history': lambda: self._assess_client_history(project_data.get('client_id')),
+            # 5. Conditions marché
+            'market_conditions': lambda: market_context.get('heat_score', 0.5),
+            # 6. Urgence
+            'urgency': lambda: self._assess_urgency(project_data.get('description', '')),
+            # 7. Réalisme budget
+            'budget_realism': lambda: self._assess_budget_realism(project_data, standardization_data),
+        }
         
-        loc_components = {}
-        
-        # 1. Qualité du brief (0-1)
+        return {
+            name: assessors[name]() * self.base_factors[name]
+            for name in (components or self.base_factors)
+        }
+
+    def evaluate_what_if(self,
+                         project_data: Dict,
+                         standardization_data: Dict,
+                         market_context: Dict,
+                         budget_steps: int = WHAT_IF_BUDGET_STEPS,
+                         delay_steps: int = WHAT_IF_DELAY_STEPS) -> WhatIfResult:
+        """Évalue toutes les combinaisons hausse de budget × extension de délai ×
+        enrichissements du brief en une passe NumPy.
+
+        Le budget agit sur les facteurs de base qui en dépendent (compétitivité prix,
+        réalisme) ; délai et brief apportent les `improvement_coefficients`. Budget :
+        du budget actuel à 1.2 × max(budget, prix max suggéré) ; délai : de +0 à
+        +100% du délai suggéré.
+        """
+        import numpy as np
+
+        components = self.calculate_loc_components(project_data, standardization_data, market_context)
+        loc_base = self.combine_loc_components(components)
+
+        budget = float(project_data.get('budget', 0) or 0)
+        suggested_min = standardization_data.get('price_suggested_min', 0)
+        suggested_med = standardization_data.get('price_suggested_med', 0) or market_context.get('price_suggested_med', 0)
+        suggested_max = standardization_data.get('price_suggested_max', 0)
+        delay = standardization_data.get('delay_suggested_days', 21) or 21
+        description = project_data.get('description', '').lower()
+
+        # 1. Axe budget : facteurs prix recalculés pour chaque budget (mêmes paliers
+        # que _assess_price_competitiveness et _assess_budget_realism)
+        budgets = np.linspace(budget, 1.2 * max(budget, suggested_max, 1.0), budget_steps)
+        if 'price_suggested_med' not in market_context:
+            # Sans prix de marché, le budget sert de référence (ratio 1)
+            competitiveness = np.full(budget_steps, 0.7)
+        elif market_context['price_suggested_med'] > 0:
+            ratio = budgets / market_context['price_suggested_med']
+            competitiveness = np.select([ratio >= 1.2, ratio >= 1.0, ratio >= 0.8], [0.9, 0.7, 0.5], 0.3)
+        else:
+            competitiveness = np.full(budget_steps, 0.6)
+        competitiveness = np.where(budgets == 0, 0.4, competitiveness)
+        if suggested_min:
+            realism = np.select(
+                [(budgets >= suggested_min) & (budgets <= suggested_max), budgets >= suggested_min * 0.8],
+                [0.9, 0.7], 0.3
+            )
+        else:
+            realism = np.full(budget_steps, 0.4)
+        realism = np.where(budgets == 0, 0.4, realism)
+        other_components = sum(
+            value for name, value in components.items() if name not in ('price_competitiveness', 'budget_realism')
+        )
+        loc_budget = np.clip(
+            other_components
+            + competitiveness * self.base_factors['price_competitiveness']
+            + realism * self.base_factors['budget_realism'],
+            0.15, 0.95
+        )
+
+        # 2. Axe délai : coefficient par palier d'extension, sans effet sur un projet urgent
+        extensions = np.round(np.linspace(0, delay, delay_steps))
+        delay_coefficients = self.improvement_coefficients['delay_extension']
+        delay_ratio = extensions / delay
+        delay_gain = np.select(
+            [delay_ratio >= 0.6, delay_ratio >= 0.3, delay_ratio >= 0.1],
+            [delay_coefficients['high'], delay_coefficients['medium'], delay_coefficients['low']], 0.0
+        )
+        if any(word in description for word in ['urgent', 'vite']):
+            delay_gain = np.zeros(delay_steps)
+
+        # 3. Axe brief : les 8 combinaisons d'enrichissements
+        enhancements = list(self.improvement_coefficients['brief_enhancement'])
+        combinations = list(product((False, True), repeat=len(enhancements)))
+        selected = np.array(combinations, dtype=bool)
+        brief_gain = selected @ np.array([self.improvement_coefficients['brief_enhancement'][name] for name in enhancements])
+        brief_cost = selected @ np.array([self.action_costs['brief_enhancement'][name] for name in enhancements])
         brief_quality = standardization_data.get('brief_quality_score', 0.5)
-        loc_components['brief_quality'] = brief_quality * self.base_factors['brief_quality']
-        
-        # 2. Compétitivité prix
-        price_competitiveness = self._assess_price_competitiveness(project_data, market_context)
-        loc_components['price_competitiveness'] = price_competitiveness * self.base_factors['price_competitiveness']
-        
-        # 3. Demande de catégorie
-        category_demand = self._assess_category_demand(project_data.get('category', ''))
-        loc_components['category_demand'] = category_demand * self.base_factors['category_demand']
-        
-        # 4. Historique client (simulé)
-        client_history = self._assess_client_history(project_data.get('client_id'))
-        loc_components['client_history'] = client_history * self.base_factors['client_history']
-        
-        # 5. Conditions marché
-        market_conditions = market_context.get('heat_score', 0.5)
-        loc_components['market_conditions'] = market_conditions * self.base_factors['market_conditions']
-        
-        # 6. Urgence
-        urgency_score = self._assess_urgency(project_data.get('description', ''))
-        loc_components['urgency'] = urgency_score * self.base_factors['urgency']
-        
-        # 7. Réalisme budget
-        budget_realism = self._assess_budget_realism(project_data, standardization_data)
-        loc_components['budget_realism'] = budget_realism * self.base_factors['budget_realism']
-        
-        # Calcul final avec pondération
+        if brief_quality >= 0.8 and not standardization_data.get('missing_info'):
+            brief_gain = np.zeros(len(combinations))
+
+        # 4. Grille complète (budget × délai × brief) : LOC, gain et coût
+        loc = np.minimum(0.95, loc_budget[:, None, None] + delay_gain[None, :, None] + brief_gain[None, None, :])
+        # Gain mesuré depuis l'origine de la grille (LOC actuel non arrondi)
+        gain = loc - loc[0, 0, 0]
+        cost_scale = suggested_med if suggested_med > 0 else max(budget, 1.0)
+        cost = (
+            ((budgets - budget) / cost_scale)[:, None, None]
+            + (self.action_costs['delay_extension'] * delay_ratio)[None, :, None]
+            + brief_cost[None, None, :]
+        )
+
+        # 5. Frontière de Pareto. À brief et délai fixés, un budget dont le LOC a déjà
+        # été atteint par un budget plus faible est dominé (même gain, coût supérieur) ;
+        # de même pour les extensions de délai : seules les premières occurrences de
+        # chaque valeur restent candidates (quelques dizaines de budgets × délais)
+        _, budget_candidates = np.unique(loc_budget, return_index=True)
+        _, delay_candidates = np.unique(delay_gain, return_index=True)
+        candidates = np.ix_(np.sort(budget_candidates), np.sort(delay_candidates), np.arange(len(combinations)))
+        candidate_indexes = np.ravel_multi_index(
+            np.broadcast_arrays(*candidates), loc.shape
+        ).ravel()
+        # Tri par coût croissant (gain décroissant à coût égal) puis on garde les points
+        # qui améliorent le meilleur gain vu jusque-là. Coûts et gains arrondis : deux
+        # combinaisons de même coût ne diffèrent pas d'un bruit flottant
+        flat_gain = np.round(gain.ravel()[candidate_indexes], 9)
+        flat_cost = np.round(cost.ravel()[candidate_indexes], 9)
+        order = np.lexsort((-flat_gain, flat_cost))
+        sorted_gain = flat_gain[order]
+        best_before = np.concatenate(([-np.inf], np.maximum.accumulate(sorted_gain)[:-1]))
+        frontier_indexes = candidate_indexes[order[sorted_gain > best_before]]
+
+        frontier = []
+        for index in frontier_indexes:
+            b, d, k = np.unravel_index(index, loc.shape)
+            frontier.append({
+                'budget': int(round(budgets[b])),
+                'budget_increase': int(round(budgets[b] - budget)),
+                'delay_days': int(delay + extensions[d]),
+                'delay_extension_days': int(extensions[d]),
+                'brief_enhancements': [name for name, chosen in zip(enhancements, combinations[k]) if chosen],
+                'cost': round(float(cost[b, d, k]), 4),
+                'loc': round(float(loc[b, d, k]), 3),
+                'loc_gain': round(float(gain[b, d, k]), 3)
+            })
+
+        recommended = None
+        if frontier and frontier[-1]['loc_gain'] > 0:
+            target = 0.8 * frontier[-1]['loc_gain']
+            recommended = next(point for point in frontier if point['loc_gain'] >= target)
+
+        return WhatIfResult(loc_base=loc_base, evaluated=int(loc.size), frontier=frontier, recommended=recommended)
+
+    def evaluate_base(self, project_data: Dict, standardization_data: Dict, market_context: Dict) -> WhatIfResult:
+        """LOC de base seul, sans grille what-if (budget de latence dépassé) : la
+        frontière se réduit à la situation actuelle"""
+        components = self.calculate_loc_components(project_data, standardization_data, market_context)
+        loc_base = self.combine_loc_components(components)
+        budget = float(project_data.get('budget', 0) or 0)
+        current = {
+            'budget': int(round(budget)),
+            'budget_increase': 0,
+            'delay_days': int(standardization_data.get('delay_suggested_days', 21) or 21),
+            'delay_extension_days': 0,
+            'brief_enhancements': [],
+            'cost': 0.0,
+            'loc': round(float(loc_base), 3),
+            'loc_gain': 0.0
+        }
+        return WhatIfResult(loc_base=loc_base, evaluated=1, frontier=[current], recommended=None)
+
+    def factors_affected_by(self, changed_fields: set) -> List[str]:
+        """Facteurs LOC à recalculer quand les champs d'entrée `changed_fields` changent"""
+        return [name for name, inputs in self.factor_inputs.items() if inputs & changed_fields]
+
+    def combine_loc_components(self, loc_components: Dict[str, float]) -> float:
+        """LOC de base à partir des contributions pondérées"""
         base_loc = sum(loc_components.values())
         
         # Normalisation et ajustements
@@ -126,6 +414,126 @@ class LOCUpliftCalculator:
         
         return round(base_loc, 3)
 
+    def calculate_loc_batch(self, columns: Mapping[str, Any]) -> LOCBatch:
+        """LOC de base et potentiel d'amélioration d'un lot de projets, identiques à
+        `calculate_loc_with_uplift` projet par projet.
+
+        `columns` est un DataFrame pandas ou un dict de tableaux de même longueur :
+        `budget` (obligatoire), `category`, `description`, `client_id`,
+        `brief_quality_score`, `price_suggested_min`, `price_suggested_med`,
+        `price_suggested_max`, `heat_score`. Une colonne absente ou une valeur
+        manquante prend la valeur par défaut du calcul projet par projet. Chaque
+        facteur `_assess_*` est calculé sur le lot entier.
+        """
+        import numpy as np
+
+        budget = np.nan_to_num(np.asarray(columns['budget'], dtype=np.float64))
+        size = len(budget)
+
+        def numeric(name: str, default: float):
+            if name not in columns:
+                return np.full(size, default)
+            return np.nan_to_num(np.asarray(columns[name], dtype=np.float64), nan=default)
+
+        brief_quality = numeric('brief_quality_score', 0.5)
+        suggested_min = numeric('price_suggested_min', 0.0)
+        suggested_max = numeric('price_suggested_max', 0.0)
+        heat = numeric('heat_score', 0.5)
+
+        # Compétitivité prix : sans prix médian, le budget sert de référence (ratio 1)
+        suggested_med = numeric('price_suggested_med', np.nan)
+        has_med = ~np.isnan(suggested_med)
+        suggested_med = np.where(has_med, suggested_med, 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(has_med, budget / suggested_med, 1.0)
+        competitiveness = np.select([ratio >= 1.2, ratio >= 1.0, ratio >= 0.8], [0.9, 0.7, 0.5], 0.3)
+        competitiveness = np.where(has_med & (suggested_med <= 0), 0.6, competitiveness)
+        competitiveness = np.where(budget == 0, 0.4, competitiveness)
+
+        # Demande de la catégorie : un score par catégorie distincte
+        categories = columns['category'] if 'category' in columns else [''] * size
+        category_codes: Dict[Any, int] = {}
+        codes = np.fromiter(
+            (category_codes.setdefault(category, len(category_codes)) for category in categories),
+            dtype=np.intp, count=size
+        )
+        demand = np.array([self._assess_category_demand(category) for category in category_codes])[codes]
+
+        # Historique client : agrégats du magasin (prélecture groupée) ou simulation
+        client_ids = _text_column(columns['client_id']) if 'client_id' in columns else [''] * size
+        if self.client_features is not None:
+            client_history = self._batch_client_history(client_ids)
+        else:
+            client_history = self._batch_simulated_client_history(client_ids)
+
+        # Urgence : une recherche par mot-clé sur toutes les descriptions concaténées
+        descriptions = _text_column(columns['description']) if 'description' in columns else [''] * size
+        keyword_rows = _keyword_rows(
+            descriptions, list(dict.fromkeys(URGENT_KEYWORDS + FLEXIBLE_KEYWORDS + FIXED_DELAY_KEYWORDS))
+        )
+
+        def containing(keywords: Sequence[str]):
+            return np.logical_or.reduce([keyword_rows[keyword] for keyword in keywords])
+
+        urgency = np.where(containing(URGENT_KEYWORDS), 0.8, np.where(containing(FLEXIBLE_KEYWORDS), 0.6, 0.7))
+
+        # Réalisme du budget
+        realism = np.select(
+            [(budget >= suggested_min) & (budget <= suggested_max), budget >= suggested_min * 0.8], [0.9, 0.7], 0.3
+        )
+        realism = np.where((budget == 0) | (suggested_min == 0), 0.4, realism)
+
+        # Somme pondérée dans l'ordre de `base_factors` (mêmes arrondis flottants que
+        # combine_loc_components)
+        assessed = {
+            'brief_quality': brief_quality,
+            'price_competitiveness': competitiveness,
+            'category_demand': demand,
+            'client_history': client_history,
+            'market_conditions': heat,
+            'urgency': urgency,
+            'budget_realism': realism
+        }
+        total = np.zeros(size)
+        for name, weight in self.base_factors.items():
+            total = total + assessed[name] * weight
+        loc_base = np.round(np.clip(total, 0.15, 0.95), 3)
+
+        # Potentiel d'amélioration : écart au prix médian, extension de délai, brief
+        with np.errstate(divide='ignore', invalid='ignore'):
+            budget_gap = np.where(
+                (suggested_med > 0) & (budget < suggested_med),
+                np.minimum(0.2, (suggested_med - budget) / suggested_med), 0.0
+            )
+        potential = budget_gap + np.where(containing(FIXED_DELAY_KEYWORDS), 0.0, 0.08) \
+            + np.where(brief_quality < 0.8, (0.8 - brief_quality) * 0.5, 0.0)
+        improvement_potential = np.minimum(0.95 - loc_base, potential)
+
+        return LOCBatch(loc_base=loc_base, improvement_potential=improvement_potential)
+
+    def _batch_client_history(self, client_ids: List[str]):
+        """Historique client d'un lot : agrégats lus en une prélecture groupée"""
+        import numpy as np
+
+        features = self.client_features.prefetch(client_id for client_id in client_ids if client_id)
+        scores = {client_id: value.history_score() if value is not None else 0.4
+                  for client_id, value in features.items()}
+        scores[''] = 0.5
+        return np.fromiter((scores[client_id] for client_id in client_ids), dtype=np.float64, count=len(client_ids))
+
+    @staticmethod
+    def _batch_simulated_client_history(client_ids: List[str]):
+        """Historique simulé d'un lot : somme des points de code de l'identifiant
+        (UTF-32) modulo 100"""
+        import numpy as np
+
+        size = len(client_ids)
+        encoded = np.array(client_ids, dtype=str)
+        hash_values = encoded.view(np.uint32).reshape(size, -1).sum(axis=1, dtype=np.int64) % 100 \
+            if size and encoded.itemsize else np.zeros(size, dtype=np.int64)
+        client_history = np.select([hash_values > 80, hash_values > 60, hash_values > 40], [0.9, 0.7, 0.6], 0.4)
+        return np.where(encoded == '', 0.5, client_history)
+
     def _assess_price_competitiveness(self, project_data: Dict, market_context: Dict) -> float:
         """Évalue la compétitivité du prix"""
         budget = float(project_data.get('budget', 0))
@@ -149,36 +557,18 @@ class LOCUpliftCalculator:
 
     def _assess_category_demand(self, category: str) -> float:
         """Évalue la demande pour une catégorie"""
-        demand_scores = {
-            'web_development': 0.8,
-            'mobile_development': 0.7,
-            'design_graphique': 0.6,
-            'marketing_digital': 0.7,
-            'construction': 0.9,
-            'services_personne': 0.8,
-            'default': 0.6
-        }
-        
-        # Mapping des catégories
-        category_mapping = {
-            'developpement': 'web_development',
-            'mobile': 'mobile_development',
-            'design': 'design_graphique',
-            'marketing': 'marketing_digital',
-            'travaux': 'construction',
-            'menage': 'services_personne'
-        }
-        
-        mapped_category = category_mapping.get(category, category)
-        return demand_scores.get(mapped_category, demand_scores['default'])
+        mapped_category = CATEGORY_DEMAND_MAPPING.get(category, category)
+        return CATEGORY_DEMAND_SCORES.get(mapped_category, CATEGORY_DEMAND_SCORES['default'])
 
     def _assess_client_history(self, client_id: str) -> float:
-        """Évalue l'historique du client (simulé)"""
-        # Simulation basée sur l'ID client
+        """Évalue l'historique du client (agrégats du magasin, sinon simulé)"""
         if not client_id:
             return 0.5
-        
-        # Hash simple pour simulation cohérente
+        if self.client_features is not None:
+            features = self.client_features.get(client_id)
+            return features.history_score() if features is not None else 0.4  # Nouveau client
+
+        # Simulation basée sur l'ID client : hash simple pour simulation cohérente
         hash_val = sum(ord(c) for c in client_id) % 100
         
         if hash_val > 80:
@@ -192,14 +582,11 @@ class LOCUpliftCalculator:
 
     def _assess_urgency(self, description: str) -> float:
         """Évalue l'urgence du projet"""
-        urgent_keywords = ['urgent', 'rapide', 'vite', 'asap', 'immédiat', 'pressé']
-        flexible_keywords = ['flexible', 'pas pressé', 'quand possible']
-        
         desc_lower = description.lower()
         
-        if any(keyword in desc_lower for keyword in urgent_keywords):
+        if any(keyword in desc_lower for keyword in URGENT_KEYWORDS):
             return 0.8  # Projet urgent = plus attractif
-        elif any(keyword in desc_lower for keyword in flexible_keywords):
+        elif any(keyword in desc_lower for keyword in FLEXIBLE_KEYWORDS):
             return 0.6  # Projet flexible = moyennement attractif
         else:
             return 0.7  # Neutre
@@ -237,7 +624,7 @@ class LOCUpliftCalculator:
             improvement_factors.append(min(0.2, budget_gap))
         
         # Délais
-        if not any(word in project_data.get('description', '').lower() for word in ['urgent', 'vite', 'rapide']):
+        if not any(word in project_data.get('description', '').lower() for word in FIXED_DELAY_KEYWORDS):
             improvement_factors.append(0.08)  # Potentiel d'extension délai
         
         # Brief quality
@@ -375,5 +762,5 @@ class LOCUpliftCalculator:
         
         return recommendations
 
-# Instance principale
-loc_uplift_calculator = LOCUpliftCalculator()
+# Instance principale (historique clients ouvert au premier calcul)
+loc_uplift_calculator = LOCUpliftCalculator(client_features_factory=ClientFeatureStore.from_env)
@@ -4,8 +4,6 @@ Service d'intelligence de marché pour AppelsPro
 Analyse les tendances, prix et disponibilité par domaine
 """
 
-import pandas as pd
-import numpy as np
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import json
@@ -0,0 +1,194 @@
+"""
+Métriques du service ML au format texte Prometheus (/metrics)
+Histogrammes à seaux fixes en mémoire, sans dépendance externe ; les compteurs
+déjà tenus ailleurs (cache, exécuteur, regroupement, historique clients) sont lus
+au moment de la collecte plutôt que recopiés à chaque requête.
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seaux des durées (secondes) : de 100 µs (étapes) à 10 s (lots)
+DURATION_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Seaux des tailles de corps de requête (octets)
+SIZE_BUCKETS = (256, 512, 1024, 2048, 4096, 8192, 16384, 65536, 262144, 1048576)
+
+# Seaux des tailles de lot /improve/batch (projets)
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# Échantillon collecté : (nom, type, aide, [(étiquettes, valeur)])
+Sample = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    pairs = []
+    for name, value in labels.items():
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{escaped}"')
+    return '{' + ','.join(pairs) + '}'
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class _HistogramChild:
+    """Série d'un histogramme pour une combinaison d'étiquettes"""
+
+    __slots__ = ('_buckets', '_counts', '_sum', '_lock')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._buckets = buckets
+        # Comptes par seau (non cumulés), le dernier pour +Inf
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self._buckets, value)
+        # acquire/release plutôt que `with` : l'observation est sur le chemin de
+        # chaque étape, et rien ne peut lever entre les deux
+        self._lock.acquire()
+        self._counts[index] += 1
+        self._sum += value
+        self._lock.release()
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self._counts), self._sum
+
+class Histogram:
+    """Histogramme Prometheus à seaux fixes, une série par valeur d'étiquettes"""
+
+    def __init__(self, name: str, documentation: str, buckets: Tuple[float, ...],
+                 labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = labelnames
+        self._children: Dict[Tuple[str, ...], _HistogramChild] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> _HistogramChild:
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, _HistogramChild(self.buckets))
+        return child
+
+    def observe(self, value: float, *values: str):
+        self.labels(*values).observe(value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for values, child in sorted(self._children.items()):
+            labels = dict(zip(self.labelnames, values))
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """Métriques du service : histogrammes mis à jour au fil des requêtes, plus
+    des collecteurs appelés à chaque lecture de /metrics"""
+
+    def __init__(self, prefix: str = 'ml'):
+        self.prefix = prefix
+        self._metrics: Dict[str, Any] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    @classmethod
+    def from_env(cls) -> Optional['MetricsRegistry']:
+        """Construit le registre si ML_METRICS_ENABLED vaut true (None sinon : aucune
+        mesure n'est prise et /metrics répond 404)"""
+        if os.getenv('ML_METRICS_ENABLED', 'true').lower() != 'true':
+            return None
+        return cls()
+
+    def histogram(self, name: str, documentation: str, buckets: Tuple[float, ...] = DURATION_BUCKETS,
+                  labelnames: Tuple[str, ...] = ()) -> Histogram:
+        """Histogramme `<prefix>_<name>`, créé au premier appel"""
+        full_name = f"{self.prefix}_{name}"
+        if full_name not in self._metrics:
+            self._metrics[full_name] = Histogram(full_name, documentation, buckets, labelnames)
+        return self._metrics[full_name]
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]):
+        """Ajoute une fonction retournant des échantillons (nom sans préfixe, type,
+        aide, [(étiquettes, valeur)]) lus au moment de la collecte"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Exposition au format texte Prometheus 0.0.4"""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                samples = list(collector())
+            except Exception as e:
+                logger.warning(f"Collecteur de métriques en échec: {e}")
+                continue
+            for name, kind, documentation, values in samples:
+                full_name = f"{self.prefix}_{name}"
+                lines.append(f"# HELP {full_name} {documentation}")
+                lines.append(f"# TYPE {full_name} {kind}")
+                for labels, value in values:
+                    lines.append(f"{full_name}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+class MetricsMiddleware:
+    """Middleware ASGI : durée et taille du corps de chaque requête HTTP, par route.
+
+    Les chemins sans route (404) sont regroupés sous `unmatched` pour borner le
+    nombre de séries.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.durations = registry.histogram(
+            'request_duration_seconds', "Durée des requêtes HTTP", DURATION_BUCKETS, ('path', 'method', 'status')
+        )
+        self.sizes = registry.histogram(
+            'request_size_bytes', "Taille du corps des requêtes HTTP", SIZE_BUCKETS, ('path',)
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message['type'] == 'http.response.start':
+                status[0] = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            # Le routeur renseigne `endpoint` dans le scope quand une route correspond
+            path = scope['path'] if 'endpoint' in scope else 'unmatched'
+            self.durations.labels(path, scope['method'], status[0]).observe(elapsed)
+            for name, value in scope['headers']:
+                if name == b'content-length':
+                    self.sizes.labels(path).observe(int(value))
+                    break
@@ -0,0 +1,158 @@
+"""
+Micro-lots de requêtes unitaires concurrentes (/improve, /normalize)
+Les requêtes qui arrivent pendant qu'un lot est en calcul sont regroupées puis
+traitées ensemble par les étapes vectorisées du pipeline ; chaque handler reçoit
+son propre résultat.
+
+Fenêtre adaptative : au repos (aucun lot en cours) une requête part aussitôt,
+sans attente. Sous charge, les requêtes attendent au plus `window_ms`, ou que
+`max_items` soient réunies, ou qu'un lot en cours se termine. Au plus
+`max_in_flight` lots sont calculés en même temps (un par worker de l'exécuteur) :
+au-delà, la file grossit jusqu'à la fin d'un lot au lieu de partir en petits lots.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from services.metrics import BATCH_SIZE_BUCKETS, DURATION_BUCKETS, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """Regroupe les appels concurrents de `submit` en lots passés à `dispatch`.
+
+    `dispatch(items)` retourne un résultat par élément, dans l'ordre ; une
+    instance d'Exception marque l'échec de cet élément seul. Une exception levée
+    par `dispatch` est transmise à tous les éléments du lot.
+    """
+
+    def __init__(self,
+                 name: str,
+                 dispatch: Callable[[List[Any]], Awaitable[List[Any]]],
+                 max_items: int = 64,
+                 window_ms: float = 2.0,
+                 max_in_flight: int = 2,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.name = name
+        self.dispatch = dispatch
+        self.max_items = max_items
+        self.window_ms = window_ms
+        self.max_in_flight = max_in_flight
+
+        # (élément, future du handler, date d'arrivée)
+        self._queue: List[Tuple[Any, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._in_flight = 0
+        self._counters = {'batches': 0, 'items': 0, 'failed_batches': 0, 'abandoned': 0,
+                          'flush_idle': 0, 'flush_full': 0, 'flush_window': 0, 'flush_drain': 0}
+
+        self._sizes = self._waits = None
+        if metrics is not None:
+            self._sizes = metrics.histogram(
+                'micro_batch_size', "Requêtes par micro-lot", BATCH_SIZE_BUCKETS, ('endpoint',)
+            ).labels(name)
+            self._waits = metrics.histogram(
+                'micro_batch_wait_seconds', "Attente d'une requête avant le départ de son micro-lot",
+                DURATION_BUCKETS, ('endpoint',)
+            ).labels(name)
+
+    @classmethod
+    def from_env(cls, name: str, dispatch: Callable[[List[Any]], Awaitable[List[Any]]],
+                 metrics: Optional[MetricsRegistry] = None) -> Optional['MicroBatcher']:
+        """Construit le micro-lot depuis ML_MICRO_BATCH_* (None si désactivé : chaque
+        requête est calculée seule)"""
+        if os.getenv('ML_MICRO_BATCH_ENABLED', 'true').lower() != 'true':
+            return None
+        return cls(
+            name,
+            dispatch,
+            max_items=int(os.getenv('ML_MICRO_BATCH_MAX_ITEMS', '64')),
+            window_ms=float(os.getenv('ML_MICRO_BATCH_WINDOW_MS', '2')),
+            max_in_flight=int(os.getenv('ML_MICRO_BATCH_MAX_IN_FLIGHT', os.getenv('ML_THREAD_WORKERS', '2'))),
+            metrics=metrics
+        )
+
+    async def submit(self, item: Any) -> Any:
+        """Résultat de `item`, calculé dans le prochain micro-lot"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((item, future, time.perf_counter()))
+
+        if len(self._queue) >= self.max_items:
+            self._flush('full')
+        elif self._in_flight == 0:
+            # Au repos : aucune attente
+            self._flush('idle')
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_ms / 1000, self._on_window)
+        return await future
+
+    def _on_window(self):
+        self._timer = None
+        # Tous les workers occupés : le lot partira à la fin d'un lot en cours
+        if self._in_flight < self.max_in_flight:
+            self._flush('window')
+
+    def _flush(self, reason: str):
+        """Lance les lots de la file (max_items par lot)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # Handlers annulés en attente (client déconnecté) : jamais calculés
+        queued = len(self._queue)
+        self._queue = [entry for entry in self._queue if not entry[1].done()]
+        self._counters['abandoned'] += queued - len(self._queue)
+        while self._queue:
+            batch = self._queue[:self.max_items]
+            del self._queue[:self.max_items]
+            self._in_flight += 1
+            self._counters[f'flush_{reason}'] += 1
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future, float]]):
+        started = time.perf_counter()
+        self._counters['batches'] += 1
+        self._counters['items'] += len(batch)
+        if self._sizes is not None:
+            self._sizes.observe(len(batch))
+            for _, _, enqueued_at in batch:
+                self._waits.observe(started - enqueued_at)
+
+        try:
+            results = await self.dispatch([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"{len(results)} résultats pour un lot de {len(batch)}")
+        except Exception as e:
+            self._counters['failed_batches'] += 1
+            results = [e] * len(batch)
+        finally:
+            self._in_flight -= 1
+
+        for (_, future, _), result in zip(batch, results):
+            # Handler annulé entre-temps (client déconnecté) : résultat ignoré
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+        # Requêtes arrivées pendant le calcul : elles ont déjà attendu
+        if self._queue and self._in_flight < self.max_in_flight:
+            self._flush('drain')
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compteurs des lots : taille moyenne et cause de départ"""
+        batches = self._counters['batches']
+        return {
+            **self._counters,
+            'mean_batch_size': round(self._counters['items'] / batches, 2) if batches else 0.0,
+            'queued': len(self._queue),
+            'in_flight': self._in_flight,
+            'max_items': self.max_items,
+            'window_ms': self.window_ms,
+            'max_in_flight': self.max_in_flight
+        }
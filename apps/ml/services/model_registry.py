@@ -0,0 +1,104 @@
+"""
+Registre des modèles et modules lourds (spaCy, scikit-learn)
+Rien n'est chargé à l'import : chaque entrée est chargée à la première utilisation
+ou pendant la phase de préchauffage du démarrage, une seule fois par processus.
+Un chargement en échec (modèle non installé) est mémorisé et renvoie None : les
+appelants basculent sur leur traitement de repli.
+"""
+
+import importlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Modèle spaCy français ; l'analyse syntaxique et la NER ne sont pas utilisées
+SPACY_MODEL = "fr_core_news_sm"
+SPACY_DISABLED_COMPONENTS = ("parser", "ner")
+
+class ModelRegistry:
+    """Chargeurs nommés, exécutés au plus une fois (thread-safe)"""
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.warmed_up = False
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """Déclare un chargeur, sans l'exécuter"""
+        self._loaders[name] = loader
+
+    def get(self, name: str) -> Optional[Any]:
+        """Modèle chargé (chargé à la demande), ou None si son chargement a échoué"""
+        if name in self._models:
+            return self._models[name]
+        with self._lock:
+            if name not in self._models:
+                self._load(name)
+            return self._models[name]
+
+    def _load(self, name: str):
+        start = time.perf_counter()
+        try:
+            self._models[name] = self._loaders[name]()
+            logger.info(f"Modèle {name} chargé en {time.perf_counter() - start:.2f}s")
+        except Exception as e:
+            self._models[name] = None
+            self._errors[name] = f"{type(e).__name__}: {e}"
+            logger.warning(f"Modèle {name} indisponible, traitement de repli: {e}")
+        self._load_seconds[name] = round(time.perf_counter() - start, 3)
+
+    def warmup(self, names: Optional[Iterable[str]] = None):
+        """Charge les modèles `names` (tous par défaut) avant d'accepter du trafic"""
+        for name in (list(names) if names is not None else list(self._loaders)):
+            if name in self._loaders:
+                self.get(name)
+            else:
+                logger.warning(f"Préchauffage: modèle inconnu {name}")
+        self.warmed_up = True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """État de chaque modèle : loaded / unavailable / lazy"""
+        models = {}
+        for name in self._loaders:
+            if name not in self._models:
+                models[name] = {'status': 'lazy'}
+            elif self._models[name] is None:
+                models[name] = {'status': 'unavailable', 'error': self._errors.get(name)}
+            else:
+                models[name] = {'status': 'loaded', 'load_seconds': self._load_seconds[name]}
+        return {'warmed_up': self.warmed_up, 'models': models}
+
+def warmup_models_from_env() -> Optional[list]:
+    """Modèles à précharger selon ML_WARMUP_MODELS : 'all' (défaut), 'none' ou une liste"""
+    value = os.getenv('ML_WARMUP_MODELS', 'all').strip().lower()
+    if value == 'all':
+        return None
+    if value in ('', 'none'):
+        return []
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+def _load_spacy_fr():
+    spacy = importlib.import_module('spacy')
+    nlp = spacy.load(SPACY_MODEL, disable=list(SPACY_DISABLED_COMPONENTS))
+    # Sans parser, le découpage en phrases est assuré par le composant `senter`
+    if 'senter' in nlp.disabled:
+        nlp.enable_pipe('senter')
+    return nlp
+
+def _load_sklearn_text():
+    # Modules utilisés par le classifieur linéaire (import ~1.5 s à froid)
+    importlib.import_module('scipy.sparse')
+    importlib.import_module('sklearn.preprocessing')
+    return importlib.import_module('sklearn.feature_extraction.text')
+
+# Registre du processus
+model_registry = ModelRegistry()
+model_registry.register('spacy_fr', _load_spacy_fr)
+model_registry.register('sklearn_text', _load_sklearn_text)
@@ -0,0 +1,301 @@
+"""
+Quantiles empiriques des prix et délais des missions conclues
+Un sketch KLL (compacteurs de capacité décroissante) par (catégorie, sous-catégorie)
+résume les montants acceptés et délais des missions terminées : mémoire bornée par
+cellule quel que soit le volume, mise à jour incrémentale, fusion de sketches
+calculés par des processus différents, sérialisation JSON.
+
+Construction et fusion (depuis la racine du dépôt) :
+    python -m apps.ml sketches build missions.ndjson -o infra/data/price_sketches.json
+    python -m apps.ml sketches merge shard1.json shard2.json -o infra/data/price_sketches.json
+"""
+
+import json
+import logging
+import math
+import os
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SKETCH_FILE = "price_sketches.json"
+SKETCH_FORMAT_VERSION = 1
+
+# Quantiles exposés par cellule
+QUANTILES = (0.1, 0.5, 0.9)
+
+# Sous-catégorie des sketches agrégés au niveau de la catégorie
+CATEGORY_LEVEL = ''
+
+class KLLSketch:
+    """Sketch de quantiles KLL.
+
+    `k` fixe la précision (erreur de rang ~1.7/k) et la mémoire : au plus ~3k
+    valeurs conservées, quel que soit le nombre de valeurs vues. Les valeurs du
+    compacteur de niveau h pèsent 2^h.
+    """
+
+    _CAPACITY_DECAY = 2 / 3
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = k
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._levels: List[List[float]] = [[]]
+        self._retained = 0
+        self._max_retained = self._total_capacity()
+        self._rng = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, int(math.ceil(self.k * self._CAPACITY_DECAY ** depth)))
+
+    def _total_capacity(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self._levels)))
+
+    def _add_level(self):
+        self._levels.append([])
+        self._max_retained = self._total_capacity()
+
+    def update(self, value: float):
+        """Ajoute une valeur"""
+        value = float(value)
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self._levels[0].append(value)
+        self._retained += 1
+        if self._retained >= self._max_retained:
+            self._compress()
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """Ajoute les valeurs résumées par `other` (même `k` recommandé)"""
+        if other.count == 0:
+            return self
+        while len(self._levels) < len(other._levels):
+            self._add_level()
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+        self._retained = sum(len(items) for items in self._levels)
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        while self._retained >= self._max_retained:
+            self._compress()
+        return self
+
+    def _compress(self):
+        """Compacte le premier niveau plein : une valeur sur deux (décalage aléatoire)
+        monte d'un niveau avec un poids double"""
+        for level, items in enumerate(self._levels):
+            if len(items) < self._capacity(level):
+                continue
+            if level + 1 == len(self._levels):
+                self._add_level()
+            items.sort()
+            # Un nombre impair de valeurs laisse la plus grande au niveau courant
+            kept = [items.pop()] if len(items) % 2 else []
+            promoted = items[self._rng.randint(0, 1)::2]
+            self._levels[level + 1].extend(promoted)
+            self._levels[level] = kept
+            self._retained -= len(items) - len(promoted)
+            return
+
+    def quantiles(self, fractions: Iterable[float]) -> List[Optional[float]]:
+        """Valeurs aux rangs `fractions` (0 à 1) ; None si le sketch est vide"""
+        fractions = list(fractions)
+        if self.count == 0:
+            return [None] * len(fractions)
+        weighted = sorted(
+            (value, 1 << level) for level, items in enumerate(self._levels) for value in items
+        )
+        total = sum(weight for _, weight in weighted)
+        results = []
+        for fraction in fractions:
+            if fraction <= 0:
+                results.append(self.min)
+                continue
+            if fraction >= 1:
+                results.append(self.max)
+                continue
+            target = fraction * total
+            cumulative = 0
+            for value, weight in weighted:
+                cumulative += weight
+                if cumulative >= target:
+                    results.append(value)
+                    break
+        return results
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        return self.quantiles([fraction])[0]
+
+    @property
+    def retained(self) -> int:
+        """Valeurs conservées (mémoire)"""
+        return self._retained
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'k': self.k, 'count': self.count, 'min': self.min, 'max': self.max, 'levels': self._levels}
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> 'KLLSketch':
+        sketch = cls(k=payload['k'])
+        sketch.count = payload['count']
+        sketch.min = payload['min']
+        sketch.max = payload['max']
+        sketch._levels = [list(items) for items in payload['levels']] or [[]]
+        sketch._retained = sum(len(items) for items in sketch._levels)
+        sketch._max_retained = sketch._total_capacity()
+        return sketch
+
+@dataclass(frozen=True)
+class CellQuantiles:
+    """Quantiles d'une cellule, calculés à la mise à jour et lus en O(1)"""
+    count: int
+    price_p10: float
+    price_p50: float
+    price_p90: float
+    delay_p10: float
+    delay_p50: float
+    delay_p90: float
+
+class MissionPriceSketches:
+    """Sketches prix / délai par (catégorie, sous-catégorie) et par catégorie.
+
+    Chaque mission met à jour sa cellule et la cellule agrégée de sa catégorie
+    (sous-catégorie `CATEGORY_LEVEL`), utilisée quand la sous-catégorie a trop peu
+    de missions.
+    """
+
+    def __init__(self, k: int = 200):
+        self.k = k
+        self._cells: Dict[Tuple[str, str], Dict[str, KLLSketch]] = {}
+        self._quantiles: Dict[Tuple[str, str], CellQuantiles] = {}
+        self._dirty: set = set()
+        self.skipped = 0
+
+    @staticmethod
+    def cell_key(category: str, sub_category: Optional[str] = None) -> Tuple[str, str]:
+        return (category or '').strip().lower(), (sub_category or CATEGORY_LEVEL).strip().lower()
+
+    def _cell(self, key: Tuple[str, str]) -> Dict[str, KLLSketch]:
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = {'price': KLLSketch(self.k), 'delay': KLLSketch(self.k)}
+        return cell
+
+    def update(self, category: str, sub_category: Optional[str], price: float, delay_days: float):
+        """Ajoute une mission conclue (montant accepté, délai en jours)"""
+        key = self.cell_key(category, sub_category)
+        keys = [key] if key[1] == CATEGORY_LEVEL else [key, (key[0], CATEGORY_LEVEL)]
+        for cell_key in keys:
+            cell = self._cell(cell_key)
+            cell['price'].update(price)
+            cell['delay'].update(delay_days)
+            self._dirty.add(cell_key)
+
+    def update_many(self, missions: Iterable[Dict[str, Any]]) -> int:
+        """Ajoute un flux de missions {category, sub_category, amount, timeline_days}.
+
+        Les missions sans catégorie ou sans montant/délai positifs sont ignorées
+        (compteur `skipped`). Retourne le nombre de missions prises en compte.
+        """
+        added = 0
+        for mission in missions:
+            try:
+                price = float(mission.get('amount') or 0)
+                delay = float(mission.get('timeline_days') or 0)
+            except (TypeError, ValueError):
+                price = delay = 0
+            if not mission.get('category') or price <= 0 or delay <= 0:
+                self.skipped += 1
+                continue
+            self.update(mission['category'], mission.get('sub_category'), price, delay)
+            added += 1
+        return added
+
+    def merge(self, other: 'MissionPriceSketches') -> 'MissionPriceSketches':
+        """Fusionne les sketches d'un autre processus ou d'une autre période"""
+        for key, cell in other._cells.items():
+            target = self._cell(key)
+            target['price'].merge(cell['price'])
+            target['delay'].merge(cell['delay'])
+            self._dirty.add(key)
+        self.skipped += other.skipped
+        return self
+
+    def quantiles(self, category: str, sub_category: Optional[str] = None) -> Optional[CellQuantiles]:
+        """p10/p50/p90 des prix et délais d'une cellule (None si aucune mission)"""
+        key = self.cell_key(category, sub_category)
+        if key in self._dirty:
+            self._refresh(key)
+        return self._quantiles.get(key)
+
+    def _refresh(self, key: Tuple[str, str]):
+        cell = self._cells[key]
+        prices = cell['price'].quantiles(QUANTILES)
+        delays = cell['delay'].quantiles(QUANTILES)
+        self._quantiles[key] = CellQuantiles(cell['price'].count, *prices, *delays)
+        self._dirty.discard(key)
+
+    def refresh(self):
+        """Recalcule les quantiles de toutes les cellules modifiées"""
+        for key in list(self._dirty):
+            self._refresh(key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'format_version': SKETCH_FORMAT_VERSION,
+            'k': self.k,
+            'skipped': self.skipped,
+            'cells': [
+                {'category': key[0], 'sub_category': key[1],
+                 'price': cell['price'].to_dict(), 'delay': cell['delay'].to_dict()}
+                for key, cell in sorted(self._cells.items())
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> 'MissionPriceSketches':
+        if payload.get('format_version') != SKETCH_FORMAT_VERSION:
+            raise ValueError(f"Format de sketches non supporté: {payload.get('format_version')}")
+        sketches = cls(k=payload['k'])
+        sketches.skipped = payload.get('skipped', 0)
+        for cell in payload['cells']:
+            key = (cell['category'], cell['sub_category'])
+            sketches._cells[key] = {
+                'price': KLLSketch.from_dict(cell['price']),
+                'delay': KLLSketch.from_dict(cell['delay'])
+            }
+            sketches._dirty.add(key)
+        sketches.refresh()
+        return sketches
+
+    def save(self, path: str):
+        """Écriture atomique du fichier JSON"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> 'MissionPriceSketches':
+        """Lit un fichier de sketches (lève ValueError s'il est invalide)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls.from_dict(json.load(f))
+        except (KeyError, TypeError, json.JSONDecodeError) as e:
+            raise ValueError(f"{path}: sketches illisibles ({e})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'cells': len(self._cells),
+            'missions': sum(cell['price'].count for key, cell in self._cells.items() if key[1] == CATEGORY_LEVEL),
+            'retained_values': sum(cell['price'].retained + cell['delay'].retained for cell in self._cells.values()),
+            'skipped': self.skipped
+        }
@@ -1,11 +1,15 @@
 
 import csv
 import logging
-from typing import Dict, List, Optional, Tuple
+import os
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from pathlib import Path
 from dataclasses import dataclass
 import statistics
 
+from services.price_sketches import SKETCH_FILE, CellQuantiles, MissionPriceSketches
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -14,9 +18,140 @@ class PriceTimeSuggestion:
     price_suggested_med: int
     price_suggested_max: int
     delay_suggested_days: int
-    rationale: Dict[str, any]
+    # None pour les prix calculés par lot (suggest_many, sans justification)
+    rationale: Optional[Dict[str, any]]
     confidence: float
 
+# Schéma attendu de price_terms_fr.csv
+PRICE_FILE = "price_terms_fr.csv"
+PRICE_COLUMNS = (
+    'hourly_min', 'hourly_med', 'hourly_max',
+    'daily_min', 'daily_med', 'daily_max',
+    'complexity_factor', 'avg_days'
+)
+
+# Catégorie de la requête -> catégorie de la grille de prix (développement par défaut)
+CATEGORY_MAPPING = {
+    'développement': 'développement',
+    'dev': 'développement',
+    'web': 'développement',
+    'mobile': 'développement',
+    'design': 'design',
+    'marketing': 'marketing',
+    'conseil': 'conseil'
+}
+
+# Tarifs utilisés quand la catégorie n'existe pas dans la grille
+DEFAULT_PRICING = {
+    'hourly_min': 25, 'hourly_med': 45, 'hourly_max': 75,
+    'daily_min': 200, 'daily_med': 360, 'daily_max': 600,
+    'complexity_factor': 1.0, 'avg_days': 15
+}
+
+# Heures de base par (catégorie, sous-catégorie), 30 h par défaut
+BASE_HOURS = {
+    'développement': {'web': 40, 'mobile': 60, 'api': 30},
+    'design': {'ui_ux': 25, 'graphique': 15, 'logo': 8},
+    'marketing': {'digital': 20, 'contenu': 15, 'strategy': 30},
+    'conseil': {'stratégie': 35, 'audit': 20}
+}
+DEFAULT_HOURS = 30
+
+# Multiplicateur des heures estimées selon la complexité
+HOURS_COMPLEXITY_MULTIPLIERS = {
+    'simple': 0.6,
+    'medium': 1.0,
+    'complex': 1.8,
+    'very_complex': 2.5
+}
+
+HOURS_PER_DAY = 6
+MAX_DELAY_DAYS = 90
+
+# Modes de tarification sélectionnables par requête : grille horaire ou quantiles
+# p10/p50/p90 des missions conclues (services/price_sketches.py)
+PRICING_MODES = ('rates', 'market')
+
+# Missions minimales d'une cellule pour utiliser ses quantiles
+MARKET_MIN_MISSIONS = int(os.getenv('ML_MARKET_MIN_MISSIONS', '30'))
+
+@dataclass
+class PriceTimeBatch:
+    """Prix et délais d'un lot (suggest_many), un tableau NumPy par champ"""
+    price_suggested_min: Any
+    price_suggested_med: Any
+    price_suggested_max: Any
+    delay_suggested_days: Any
+    confidence: Any
+
+    def __len__(self) -> int:
+        return len(self.confidence)
+
+def read_price_csv(path: Path) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Lit la grille de prix CSV.
+
+    Lève ValueError si une colonne manque ou si une valeur n'est pas numérique.
+    """
+    price_data: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+    with open(path, 'r', encoding='utf-8') as f:
+        # Les lignes vides (en tête de fichier notamment) sont ignorées
+        reader = csv.DictReader(line for line in f if line.strip())
+        expected = ('category', 'sub_category') + PRICE_COLUMNS
+        missing = [column for column in expected if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"{path}: colonnes manquantes {missing} (colonnes lues: {reader.fieldnames})")
+
+        for line_number, row in enumerate(reader, start=2):
+            try:
+                pricing = {column: float(row[column]) for column in PRICE_COLUMNS}
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{path}:{line_number}: valeur non numérique ({e})")
+            pricing['avg_days'] = int(pricing['avg_days'])
+            price_data.setdefault(row['category'], {})[row['sub_category']] = pricing
+
+    return price_data
+
+class PriceGrid(Mapping):
+    """Grille de prix {catégorie: {sous-catégorie: tarifs}} lue en place dans une
+    matrice lignes × PRICE_COLUMNS (celle du snapshot projeté en mémoire).
+
+    Seul l'index (catégorie, sous-catégorie) -> ligne est un objet Python ; les
+    tarifs d'une cellule sont lus dans la matrice à chaque accès.
+    """
+
+    def __init__(self, rows: Dict[str, Dict[str, int]], matrix):
+        self.rows = rows
+        self.matrix = matrix
+        self._categories = {category: _PriceGridCategory(matrix, sub_rows) for category, sub_rows in rows.items()}
+
+    def __getitem__(self, category: str) -> Mapping:
+        return self._categories[category]
+
+    def __iter__(self):
+        return iter(self._categories)
+
+    def __len__(self) -> int:
+        return len(self._categories)
+
+class _PriceGridCategory(Mapping):
+    """Sous-catégories d'une catégorie de PriceGrid"""
+
+    def __init__(self, matrix, rows: Dict[str, int]):
+        self._matrix = matrix
+        self._rows = rows
+
+    def __getitem__(self, sub_category: str) -> Dict[str, float]:
+        pricing = dict(zip(PRICE_COLUMNS, self._matrix[self._rows[sub_category]].tolist()))
+        pricing['avg_days'] = int(pricing['avg_days'])
+        return pricing
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
 class PriceTimeSuggester:
     def __init__(self, data_path: str = "/infra/data"):
         self.data_path = Path(data_path)
@@ -24,38 +159,43 @@ class PriceTimeSuggester:
         self.time_factors = {}
         self._load_pricing_data()
 
+    @classmethod
+    def from_snapshot(cls, snapshot) -> 'PriceTimeSuggester':
+        """Construit le suggesteur depuis un snapshot de données compilé (sans lire les
+        CSV) ; la grille est lue en place dans la matrice projetée"""
+        suggester = cls.__new__(cls)
+        suggester.data_path = Path(snapshot.path).parent
+        suggester.price_data = snapshot.price_data
+        suggester._init_time_factors()
+        suggester.mission_sketches = suggester._load_mission_sketches()
+        return suggester
+
     def _load_pricing_data(self):
-        """Charge les données de prix depuis les fichiers CSV"""
-        try:
-            price_file = self.data_path / "price_terms_fr.csv"
-            if price_file.exists():
-                with open(price_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        category = row['category']
-                        sub_category = row['sub_category']
-                        
-                        if category not in self.price_data:
-                            self.price_data[category] = {}
-                        
-                        self.price_data[category][sub_category] = {
-                            'hourly_min': float(row.get('hourly_min', 25)),
-                            'hourly_med': float(row.get('hourly_med', 45)),
-                            'hourly_max': float(row.get('hourly_max', 80)),
-                            'daily_min': float(row.get('daily_min', 200)),
-                            'daily_med': float(row.get('daily_med', 350)),
-                            'daily_max': float(row.get('daily_max', 600)),
-                            'complexity_factor': float(row.get('complexity_factor', 1.0)),
-                            'avg_days': int(row.get('avg_days', 15))
-                        }
-            
-            self._init_time_factors()
+        """Charge les données de prix depuis le fichier CSV.
+
+        Un fichier absent donne la grille par défaut ; un fichier dont le schéma
+        ne correspond pas lève une erreur au lieu d'être ignoré.
+        """
+        price_file = self.data_path / PRICE_FILE
+        if price_file.exists():
+            self.price_data = read_price_csv(price_file)
             logger.info(f"Données de prix chargées pour {len(self.price_data)} catégories")
-            
-        except Exception as e:
-            logger.error(f"Erreur lors du chargement des prix: {e}")
+        else:
+            logger.warning(f"Grille de prix introuvable ({price_file}), grille par défaut utilisée")
             self._init_default_pricing()
 
+        self._init_time_factors()
+        self.mission_sketches = self._load_mission_sketches()
+
+    def _load_mission_sketches(self) -> Optional[MissionPriceSketches]:
+        """Quantiles des missions conclues, s'ils ont été construits (mode 'market')"""
+        sketch_file = self.data_path / SKETCH_FILE
+        if not sketch_file.exists():
+            return None
+        sketches = MissionPriceSketches.load(sketch_file)
+        logger.info(f"Sketches de prix chargés: {sketches.get_stats()['cells']} cellules")
+        return sketches
+
     def _init_default_pricing(self):
         """Initialise une grille de prix par défaut"""
         self.price_data = {
@@ -140,8 +280,21 @@ class PriceTimeSuggester:
                 quality_level: str = 'professional',
                 brief_quality_score: float = 0.5,
                 market_heat: float = 1.0,
-                constraints: List[str] = None) -> PriceTimeSuggestion:
-        """Suggère des prix et délais optimaux"""
+                constraints: List[str] = None,
+                pricing_mode: str = 'rates') -> PriceTimeSuggestion:
+        """Suggère des prix et délais optimaux.
+
+        En mode 'market', prix et délai sont les quantiles des missions conclues de
+        la cellule (repli sur la grille horaire si elle a trop peu de missions).
+        """
+        market = self._market_quantiles(category, sub_category) if pricing_mode == 'market' else None
+        if market is not None:
+            quantiles, level = market
+            return PriceTimeSuggestion(
+                **self._market_prices(quantiles),
+                rationale=self._market_rationale(quantiles, level, category, sub_category),
+                confidence=self._calculate_confidence(brief_quality_score, category, sub_category)
+            )
         
         # Récupération des données de base
         base_pricing = self._get_base_pricing(category, sub_category)
@@ -180,69 +333,242 @@ class PriceTimeSuggester:
             confidence=confidence
         )
 
-    def _get_base_pricing(self, category: str, sub_category: str = None) -> Dict[str, any]:
-        """Récupère les données de prix de base"""
-        category_lower = category.lower()
+    def reprice(self,
+                category: str,
+                sub_category: str = None,
+                complexity: str = 'medium',
+                brief_quality_score: float = 0.5,
+                constraints: List[str] = None,
+                pricing_mode: str = 'rates') -> Dict[str, int]:
+        """Prix et délai de `suggest` sans justification ni confiance.
+
+        Sert aux recalculs après réponses : seuls les facteurs d'ajustement
+        (qualité du brief, contraintes) changent entre deux appels.
+        """
+        market = self._market_quantiles(category, sub_category) if pricing_mode == 'market' else None
+        if market is not None:
+            return self._market_prices(market[0])
+        base_pricing = self._get_base_pricing(category, sub_category)
+        estimated_hours = self._estimate_hours(category, sub_category, complexity)
+        adjustments = self._calculate_adjustments(
+            complexity, 'normal', 'professional', brief_quality_score, 1.0, constraints
+        )
+        prices = self._calculate_prices(base_pricing, estimated_hours, adjustments)
         
-        # Mapping des catégories
-        category_mapping = {
-            'développement': 'développement',
-            'dev': 'développement',
-            'web': 'développement',
-            'mobile': 'développement',
-            'design': 'design',
-            'marketing': 'marketing',
-            'conseil': 'conseil'
+        return {
+            'price_suggested_min': int(prices['min']),
+            'price_suggested_med': int(prices['med']),
+            'price_suggested_max': int(prices['max']),
+            'delay_suggested_days': self._calculate_delay(base_pricing, estimated_hours, adjustments)
         }
-        
-        mapped_category = category_mapping.get(category_lower, 'développement')
-        
-        if mapped_category in self.price_data:
-            # Sélection de la sous-catégorie
-            if sub_category and sub_category.lower() in self.price_data[mapped_category]:
-                return self.price_data[mapped_category][sub_category.lower()]
-            else:
-                # Prendre la première sous-catégorie disponible
-                first_sub = next(iter(self.price_data[mapped_category].values()))
-                return first_sub
-        
-        # Valeurs par défaut
+
+    def _market_quantiles(self, category: str, sub_category: str = None) -> Optional[Tuple[CellQuantiles, str]]:
+        """Quantiles de la sous-catégorie, sinon de la catégorie, s'ils reposent sur
+        assez de missions ; (quantiles, niveau) ou None"""
+        if self.mission_sketches is None:
+            return None
+        for level, sub in (('sub_category', sub_category), ('category', None)):
+            if level == 'sub_category' and not sub:
+                continue
+            quantiles = self.mission_sketches.quantiles(category, sub)
+            if quantiles is not None and quantiles.count >= MARKET_MIN_MISSIONS:
+                return quantiles, level
+        return None
+
+    def _market_prices(self, quantiles: CellQuantiles) -> Dict[str, int]:
+        """Prix p10/p50/p90 des montants acceptés et délai médian, arrondis comme la grille"""
         return {
-            'hourly_min': 25, 'hourly_med': 45, 'hourly_max': 75,
-            'daily_min': 200, 'daily_med': 360, 'daily_max': 600,
-            'complexity_factor': 1.0, 'avg_days': 15
+            'price_suggested_min': int(self._round_price(quantiles.price_p10)),
+            'price_suggested_med': int(self._round_price(quantiles.price_p50)),
+            'price_suggested_max': int(self._round_price(quantiles.price_p90)),
+            'delay_suggested_days': max(1, min(int(round(quantiles.delay_p50)), MAX_DELAY_DAYS))
         }
 
+    @staticmethod
+    def _market_rationale(quantiles: CellQuantiles, level: str, category: str, sub_category: str) -> Dict[str, any]:
+        return {
+            'base_info': {
+                'category': category,
+                'sub_category': sub_category,
+                'pricing_source': 'market',
+                'market_level': level,
+                'market_missions': quantiles.count,
+                'delay_range_days': f"{int(quantiles.delay_p10)}-{int(quantiles.delay_p90)}"
+            },
+            'adjustments_applied': [],
+            'market_factors': [f"Prix p10/p50/p90 de {quantiles.count} missions conclues"],
+            'recommendations': []
+        }
+
+    def suggest_many(self,
+                     categories: Sequence[str],
+                     sub_categories: Optional[Sequence[Optional[str]]] = None,
+                     complexity: Union[str, Sequence[str]] = 'medium',
+                     urgency: Union[str, Sequence[str]] = 'normal',
+                     quality_level: Union[str, Sequence[str]] = 'professional',
+                     brief_quality_score: Union[float, Sequence[float]] = 0.5,
+                     market_heat: Union[float, Sequence[float]] = 1.0,
+                     constraints: Optional[Sequence[Optional[List[str]]]] = None) -> PriceTimeBatch:
+        """Prix, délais et confiance d'un lot de projets, identiques à `suggest` projet
+        par projet (sans justification).
+
+        Chaque paramètre est soit une valeur commune au lot, soit une séquence de même
+        longueur que `categories`. Tarification par la grille horaire (mode 'rates'). La grille est encodée en matrice dense
+        (catégorie, sous-catégorie) et les facteurs sont appliqués au lot entier.
+        """
+        import numpy as np
+
+        size = len(categories)
+        sub_categories = sub_categories if sub_categories is not None else [None] * size
+
+        # Couples (catégorie, sous-catégorie) distincts : résolus une seule fois
+        pair_codes: Dict[Tuple[str, Optional[str]], int] = {}
+        codes = np.fromiter(
+            (pair_codes.setdefault(pair, len(pair_codes)) for pair in zip(categories, sub_categories)),
+            dtype=np.intp, count=size
+        )
+        matrix, row_of = self._price_matrix()
+        pair_rows = np.array([row_of(*pair) for pair in pair_codes], dtype=np.intp)
+        pair_hours = np.array([self._estimate_hours(*pair, 'medium') for pair in pair_codes], dtype=np.float64)
+        pair_category_bonus = np.array([
+            0.1 if category.lower() in ['développement', 'design', 'marketing'] else 0.0
+            for category, _ in pair_codes
+        ], dtype=np.float64)
+        pair_sub_category_bonus = np.array(
+            [0.1 if sub_category else 0.0 for _, sub_category in pair_codes], dtype=np.float64
+        )
+        # Tarifs horaires min/med/max : trois premières colonnes de PRICE_COLUMNS
+        known = pair_rows >= 0
+        pair_rates = np.empty((len(pair_rows), 3))
+        pair_rates[known] = matrix[pair_rows[known], :3]
+        pair_rates[~known] = (DEFAULT_PRICING['hourly_min'], DEFAULT_PRICING['hourly_med'], DEFAULT_PRICING['hourly_max'])
+        hourly_rates = pair_rates[codes]
+
+        # Facteurs d'ajustement (mêmes tables et même ordre d'opérations que `suggest`)
+        complexity_factor = self._factor_array(complexity, self.time_factors['complexity'], size)
+        urgency_factor = self._factor_array(urgency, self.time_factors['urgency'], size)
+        quality_factor = self._factor_array(quality_level, self.time_factors['quality_level'], size)
+        scores = np.broadcast_to(np.asarray(brief_quality_score, dtype=np.float64), (size,))
+        brief_quality_bonus = np.maximum(0.8, np.minimum(1.2, scores * 1.5))
+        market_heat_factor = np.broadcast_to(np.asarray(market_heat, dtype=np.float64), (size,))
+        constraint_penalty = np.ones(size)
+
+        if constraints is not None:
+            flags = np.array([
+                [name in (item or ()) for name in
+                 ('on_site_required', 'urgent', 'tight_budget', 'certification_required')]
+                for item in constraints
+            ], dtype=bool).reshape(size, 4)
+            constraint_penalty = np.where(flags[:, 0], constraint_penalty * 1.15, constraint_penalty)
+            urgency_factor = np.where(flags[:, 1], urgency_factor * 0.8, urgency_factor)
+            brief_quality_bonus = np.where(flags[:, 2], brief_quality_bonus * 0.9, brief_quality_bonus)
+            quality_factor = np.where(flags[:, 3], quality_factor * 1.2, quality_factor)
+
+        estimated_hours = np.trunc(
+            pair_hours[codes] * self._factor_array(complexity, HOURS_COMPLEXITY_MULTIPLIERS, size)
+        )
+
+        # Prix : tarif horaire × ajustement total × heures, puis arrondi par palier
+        total_adjustment = (
+            complexity_factor * quality_factor * brief_quality_bonus * market_heat_factor * constraint_penalty
+        )
+        total_adjustment = total_adjustment * np.where(urgency_factor < 1.0, 1.3, urgency_factor)
+        prices = hourly_rates * total_adjustment[:, None] * estimated_hours[:, None]
+        steps = np.where(prices < 500, 50, np.where(prices < 2000, 100, 250))
+        prices = (np.round(prices / steps) * steps).astype(np.int64)
+
+        # Délai : heures / 6 × facteurs temporels × bonus brief, borné à [1, 90]
+        adjusted_days = (
+            estimated_hours / HOURS_PER_DAY
+            * (complexity_factor * urgency_factor * quality_factor)
+            * (2 - brief_quality_bonus)
+        )
+        delays = np.clip(np.trunc(adjusted_days), 1, MAX_DELAY_DAYS).astype(np.int64)
+
+        confidence = scores + pair_category_bonus[codes] + pair_sub_category_bonus[codes]
+        confidence = np.maximum(np.minimum(confidence, 0.95), 0.3)
+
+        return PriceTimeBatch(
+            price_suggested_min=prices[:, 0],
+            price_suggested_med=prices[:, 1],
+            price_suggested_max=prices[:, 2],
+            delay_suggested_days=delays,
+            confidence=confidence
+        )
+
+    def _price_matrix(self):
+        """Grille en matrice lignes × PRICE_COLUMNS et résolution d'un couple de la
+        requête en ligne (-1 : tarifs par défaut), construites une fois. Une grille
+        de snapshot (PriceGrid) est utilisée en place, sans copie."""
+        cached = getattr(self, '_price_matrix_cache', None)
+        if cached is not None and cached[0] is self.price_data:
+            return cached[1], cached[2]
+
+        import numpy as np
+
+        if isinstance(self.price_data, PriceGrid):
+            rows, matrix = self.price_data.rows, self.price_data.matrix
+        else:
+            rows: Dict[str, Dict[str, int]] = {}
+            values = []
+            for category, sub_categories in self.price_data.items():
+                for sub_category, pricing in sub_categories.items():
+                    rows.setdefault(category, {})[sub_category] = len(values)
+                    values.append([pricing[column] for column in PRICE_COLUMNS])
+            matrix = np.array(values, dtype=np.float64).reshape(len(values), len(PRICE_COLUMNS))
+
+        def row_of(category: str, sub_category: Optional[str]) -> int:
+            key = self._resolve_pricing_key(category, sub_category)
+            if key is None:
+                return -1
+            return rows[key[0]][key[1]]
+
+        self._price_matrix_cache = (self.price_data, matrix, row_of)
+        return matrix, row_of
+
+    @staticmethod
+    def _factor_array(values: Union[str, Sequence[str]], factors: Dict[str, float], size: int):
+        """Facteur de chaque projet d'après sa valeur (1.0 si inconnue)"""
+        import numpy as np
+
+        if isinstance(values, str):
+            return np.full(size, factors.get(values, 1.0))
+        return np.array([factors.get(value, 1.0) for value in values], dtype=np.float64)
+
+    def _get_base_pricing(self, category: str, sub_category: str = None) -> Dict[str, any]:
+        """Récupère les données de prix de base"""
+        key = self._resolve_pricing_key(category, sub_category)
+        if key is None:
+            return DEFAULT_PRICING
+        return self.price_data[key[0]][key[1]]
+
+    def _resolve_pricing_key(self, category: str, sub_category: str = None) -> Optional[Tuple[str, str]]:
+        """(catégorie, sous-catégorie) de la grille à appliquer, None pour les tarifs par défaut"""
+        mapped_category = CATEGORY_MAPPING.get(category.lower(), 'développement')
+        if mapped_category not in self.price_data:
+            return None
+        sub_categories = self.price_data[mapped_category]
+        # Sous-catégorie demandée, sinon la première disponible
+        if sub_category and sub_category.lower() in sub_categories:
+            return mapped_category, sub_category.lower()
+        return mapped_category, next(iter(sub_categories))
+
     def _estimate_hours(self, category: str, sub_category: str = None, complexity: str = 'medium') -> int:
         """Estime le nombre d'heures nécessaires"""
-        base_hours = {
-            'développement': {'web': 40, 'mobile': 60, 'api': 30},
-            'design': {'ui_ux': 25, 'graphique': 15, 'logo': 8},
-            'marketing': {'digital': 20, 'contenu': 15, 'strategy': 30},
-            'conseil': {'stratégie': 35, 'audit': 20}
-        }
-        
         category_lower = category.lower()
         sub_category_lower = sub_category.lower() if sub_category else None
         
         # Récupération des heures de base
-        hours = 30  # Défaut
-        if category_lower in base_hours:
-            category_hours = base_hours[category_lower]
+        hours = DEFAULT_HOURS
+        if category_lower in BASE_HOURS:
+            category_hours = BASE_HOURS[category_lower]
             if sub_category_lower and sub_category_lower in category_hours:
                 hours = category_hours[sub_category_lower]
             else:
                 hours = list(category_hours.values())[0]
         
         # Ajustement par complexité
-        complexity_multipliers = {
-            'simple': 0.6,
-            'medium': 1.0,
-            'complex': 1.8,
-            'very_complex': 2.5
-        }
-        
-        multiplier = complexity_multipliers.get(complexity, 1.0)
+        multiplier = HOURS_COMPLEXITY_MULTIPLIERS.get(complexity, 1.0)
         return int(hours * multiplier)
 
     def _calculate_adjustments(self, 
@@ -310,24 +636,24 @@ class PriceTimeSuggester:
         
         # Arrondissement intelligent
         for level in prices:
-            price = prices[level]
-            if price < 500:
-                prices[level] = round(price / 50) * 50  # Arrondi à 50€
-            elif price < 2000:
-                prices[level] = round(price / 100) * 100  # Arrondi à 100€
-            else:
-                prices[level] = round(price / 250) * 250  # Arrondi à 250€
+            prices[level] = self._round_price(prices[level])
         
         return prices
 
+    @staticmethod
+    def _round_price(price: float) -> int:
+        """Arrondi à 50€ sous 500€, à 100€ sous 2000€, à 250€ au-delà"""
+        if price < 500:
+            return round(price / 50) * 50
+        elif price < 2000:
+            return round(price / 100) * 100
+        return round(price / 250) * 250
+
     def _calculate_delay(self, base_pricing: Dict, estimated_hours: int, adjustments: Dict) -> int:
         """Calcule le délai en jours"""
         
-        # Heures de travail par jour (moyenne 6h productives)
-        hours_per_day = 6
-        
-        # Calcul de base
-        base_days = estimated_hours / hours_per_day
+        # Calcul de base (moyenne 6h productives par jour)
+        base_days = estimated_hours / HOURS_PER_DAY
         
         # Application des ajustements temporels
         time_adjustment = (
@@ -342,7 +668,7 @@ class PriceTimeSuggester:
         adjusted_days = base_days * time_adjustment * brief_bonus
         
         # Minimum 1 jour, maximum raisonnable
-        return max(1, min(int(adjusted_days), 90))
+        return max(1, min(int(adjusted_days), MAX_DELAY_DAYS))
 
     def _generate_rationale(self, 
                           base_pricing: Dict,
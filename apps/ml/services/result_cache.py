@@ -0,0 +1,259 @@
+"""
+Cache de résultats du pipeline /improve
+LRU + TTL en mémoire, borné en octets, adressé par le contenu de la requête,
+avec un niveau disque SQLite optionnel pour redémarrer un worker à chaud.
+Les écritures disque passent par un thread dédié : put() ne bloque pas la
+boucle d'événements sur SQLite.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Champs de la requête qui influencent le résultat
+KEY_FIELDS = ('title', 'description', 'category', 'budget_min', 'budget_max', 'deadline', 'classifier', 'pricing',
+              'client_id')
+
+# Purge des entrées disque expirées toutes les N écritures
+DISK_PURGE_EVERY = 1000
+
+# Écritures disque en attente au-delà desquelles une nouvelle écriture est abandonnée
+DISK_QUEUE_MAX = 10000
+
+def fingerprint(*parts: Any) -> str:
+    """Empreinte courte et stable d'objets JSON-sérialisables"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+def make_cache_key(request: Dict[str, Any], service_version: str, data_version: str) -> str:
+    """Clé de cache : hash de la requête normalisée et des versions service/données"""
+    normalized = {}
+    for field in KEY_FIELDS:
+        value = request.get(field)
+        if isinstance(value, str):
+            value = ' '.join(value.split())
+        normalized[field] = value
+
+    payload = json.dumps(
+        [normalized, service_version, data_version],
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ResultCache:
+    """Cache LRU + TTL borné en octets (taille JSON des valeurs).
+
+    Les valeurs retournées sont partagées entre appels et doivent être traitées
+    en lecture seule.
+    """
+
+    def __init__(self,
+                 max_bytes: int = 64 * 1024 * 1024,
+                 ttl_seconds: float = 3600,
+                 disk_path: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = disk_path
+
+        # clé -> (valeur, taille en octets, date de création)
+        self._entries: 'OrderedDict[str, Tuple[Any, int, float]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0,
+            'disk_hits': 0, 'disk_errors': 0, 'disk_dropped': 0
+        }
+
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_lock = threading.Lock()
+        self._disk_writes = 0
+        self._disk_queue: 'queue.Queue[Optional[Tuple[str, bytes, float]]]' = queue.Queue(maxsize=DISK_QUEUE_MAX)
+        self._disk_writer: Optional[threading.Thread] = None
+        if disk_path:
+            self._open_disk(disk_path)
+        if self._disk is not None:
+            self._disk_writer = threading.Thread(target=self._write_disk, name='result-cache-disk', daemon=True)
+            self._disk_writer.start()
+
+    @classmethod
+    def from_env(cls) -> Optional['ResultCache']:
+        """Construit le cache depuis les variables ML_CACHE_* (None si désactivé)"""
+        if os.getenv('ML_CACHE_ENABLED', 'true').lower() != 'true':
+            return None
+        return cls(
+            max_bytes=int(os.getenv('ML_CACHE_MAX_BYTES', str(64 * 1024 * 1024))),
+            ttl_seconds=float(os.getenv('ML_CACHE_TTL_SECONDS', '3600')),
+            disk_path=os.getenv('ML_CACHE_DISK_PATH') or None
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retourne la valeur en cache, ou None (absente ou expirée)"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, size, created_at = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                    return value
+                self._remove(key)
+                self._counters['expired'] += 1
+
+            disk_entry = self._disk_get(key, now)
+            if disk_entry is not None:
+                value, size, created_at = disk_entry
+                self._insert(key, value, size, created_at)
+                self._counters['hits'] += 1
+                self._counters['disk_hits'] += 1
+                return value
+
+            self._counters['misses'] += 1
+            return None
+
+    def put(self, key: str, value: Any):
+        """Ajoute une valeur (JSON-sérialisable) au cache"""
+        encoded = json.dumps(value, ensure_ascii=False).encode('utf-8')
+        size = len(encoded)
+        if size > self.max_bytes:
+            return
+
+        created_at = time.time()
+        with self._lock:
+            self._insert(key, value, size, created_at)
+            if self._disk_writer is None:
+                return
+            # Écriture SQLite déléguée au thread disque ; file pleine : entrée gardée en mémoire seulement
+            try:
+                self._disk_queue.put_nowait((key, encoded, created_at))
+            except queue.Full:
+                self._counters['disk_dropped'] += 1
+
+    def flush(self):
+        """Attend que les écritures disque en attente soient faites"""
+        if self._disk_writer is not None:
+            self._disk_queue.join()
+
+    def close(self):
+        """Termine les écritures disque en attente et arrête le thread disque"""
+        if self._disk_writer is not None:
+            self._disk_queue.put(None)
+            self._disk_writer.join()
+            self._disk_writer = None
+
+    def clear(self):
+        """Vide le cache mémoire (le niveau disque est conservé)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compteurs et occupation du cache"""
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['misses']
+            return {
+                **self._counters,
+                'hit_ratio': round(self._counters['hits'] / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'disk_tier': self._disk is not None,
+                'disk_pending': self._disk_queue.qsize()
+            }
+
+    def _insert(self, key: str, value: Any, size: int, created_at: float):
+        """Insère en tête de LRU puis évince jusqu'à respecter la borne en octets"""
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, size, created_at)
+        self._bytes += size
+
+        while self._bytes > self.max_bytes and self._entries:
+            evicted_key = next(iter(self._entries))
+            self._remove(evicted_key)
+            self._counters['evictions'] += 1
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _open_disk(self, path: str):
+        """Ouvre (ou crée) le niveau disque et purge les entrées expirées"""
+        try:
+            self._disk = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._disk.execute('PRAGMA journal_mode=WAL')
+            self._disk.execute(
+                'CREATE TABLE IF NOT EXISTS results '
+                '(key TEXT PRIMARY KEY, value BLOB NOT NULL, created_at REAL NOT NULL)'
+            )
+            self._disk.execute(
+                'DELETE FROM results WHERE created_at < ?', (time.time() - self.ttl_seconds,)
+            )
+            logger.info(f"Cache disque ouvert: {path}")
+        except sqlite3.Error as e:
+            logger.error(f"Cache disque indisponible ({path}): {e}")
+            self._disk = None
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[Any, int, float]]:
+        if self._disk is None:
+            return None
+        try:
+            with self._disk_lock:
+                row = self._disk.execute(
+                    'SELECT value, created_at FROM results WHERE key = ?', (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            self._counters['disk_errors'] += 1
+            logger.warning(f"Lecture cache disque impossible: {e}")
+            return None
+
+        if row is None:
+            return None
+        encoded, created_at = row
+        if now - created_at > self.ttl_seconds:
+            return None
+        return json.loads(encoded), len(encoded), created_at
+
+    def _write_disk(self):
+        """Thread disque : écrit les entrées mises en file par put(), dans l'ordre"""
+        while True:
+            entry = self._disk_queue.get()
+            try:
+                if entry is None:
+                    return
+                if not self._disk_put(*entry):
+                    with self._lock:
+                        self._counters['disk_errors'] += 1
+            finally:
+                self._disk_queue.task_done()
+
+    def _disk_put(self, key: str, encoded: bytes, created_at: float) -> bool:
+        """Écrit une entrée (et purge périodiquement) ; False en cas d'erreur SQLite.
+
+        Appelé sans self._lock, que get() prend avant self._disk_lock.
+        """
+        try:
+            with self._disk_lock:
+                self._disk.execute(
+                    'INSERT OR REPLACE INTO results (key, value, created_at) VALUES (?, ?, ?)',
+                    (key, encoded, created_at)
+                )
+                self._disk_writes += 1
+                if self._disk_writes % DISK_PURGE_EVERY == 0:
+                    self._disk.execute(
+                        'DELETE FROM results WHERE created_at < ?', (created_at - self.ttl_seconds,)
+                    )
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"Écriture cache disque impossible: {e}")
+            return False
@@ -0,0 +1,86 @@
+"""
+Regroupement des requêtes identiques concurrentes (single-flight)
+Pendant une rafale (reprises, double soumission), un même brief arrive plusieurs
+fois en quelques millisecondes : le premier appel calcule, les suivants attendent
+le même résultat au lieu de relancer le pipeline.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """Un calcul en cours au plus par clé, partagé par tous les appels concurrents.
+
+    Le calcul tourne dans une tâche indépendante : l'annulation de l'appel qui l'a
+    lancé (client déconnecté) n'interrompt pas les autres ; il n'est abandonné que
+    lorsque tous les appels qui l'attendent ont été annulés. Une erreur est
+    transmise à tous les appels regroupés ; rien n'est mémorisé une fois la tâche
+    terminée (c'est le rôle du cache de résultats). Le résultat est partagé et doit
+    être traité en lecture seule.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, 'asyncio.Task'] = {}
+        # Appels qui attendent encore chaque calcul en cours
+        self._waiters: Dict['asyncio.Task', int] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_env(cls) -> Optional['SingleFlight']:
+        """Construit le regroupement si ML_SINGLE_FLIGHT_ENABLED vaut true (None sinon)"""
+        if os.getenv('ML_SINGLE_FLIGHT_ENABLED', 'true').lower() != 'true':
+            return None
+        return cls()
+
+    async def run(self, key: str, compute: Callable[[], Awaitable[Any]], endpoint: str = 'default') -> Any:
+        """Résultat de `compute()` pour `key`, calculé une seule fois pour tous les
+        appels arrivés pendant le calcul"""
+        counters = self._counters.get(endpoint)
+        if counters is None:
+            counters = self._counters[endpoint] = {'leaders': 0, 'coalesced': 0, 'failed': 0, 'abandoned': 0}
+
+        task = self._in_flight.get(key)
+        if task is None:
+            counters['leaders'] += 1
+            task = asyncio.ensure_future(compute())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done, counters))
+        else:
+            counters['coalesced'] += 1
+        
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            remaining = self._waiters.get(task, 0) - 1
+            if task in self._waiters:
+                self._waiters[task] = remaining
+            # Plus personne n'attend ce calcul : abandonné
+            if remaining <= 0 and not task.done():
+                counters['abandoned'] += 1
+                task.cancel()
+            raise
+
+    def _finish(self, key: str, task: 'asyncio.Task', counters: Dict[str, int]):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        self._waiters.pop(task, None)
+        if task.cancelled() or task.exception() is not None:
+            counters['failed'] += 1
+
+    @property
+    def in_flight(self) -> int:
+        """Calculs en cours"""
+        return len(self._in_flight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compteurs par point d'entrée : calculs lancés, appels regroupés, échecs,
+        calculs abandonnés"""
+        return {
+            'in_flight': len(self._in_flight),
+            'endpoints': {endpoint: dict(counters) for endpoint, counters in self._counters.items()}
+        }
@@ -3,11 +3,10 @@ Smart Brief - Structuration IA automatique des besoins clients
 """
 
 import re
-import spacy
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
-from sklearn.feature_extraction.text import TfidfVectorizer
-import numpy as np
+
+from services.model_registry import model_registry
 
 @dataclass
 class BriefAnalysis:
@@ -20,15 +19,12 @@ class BriefAnalysis:
     structured_brief: Dict[str, any]
     complexity_level: str
 
+# Traitement par lots spaCy (analyze_briefs)
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_N_PROCESS = 1
+
 class SmartBriefProcessor:
     def __init__(self):
-        # Chargement du modèle français (fallback simple si spacy indisponible)
-        self.nlp = None
-        try:
-            self.nlp = spacy.load("fr_core_news_sm")
-        except:
-            print("SpaCy FR model not available, using basic processing")
-
         # Mots-clés techniques par domaine
         self.tech_keywords = {
             'web_dev': ['react', 'vue', 'angular', 'node', 'php', 'laravel', 'symfony', 'api', 'rest', 'graphql'],
@@ -44,11 +40,43 @@ class SmartBriefProcessor:
             'délai', 'budget', 'livrables', 'critères'
         ]
 
-    def analyze_brief(self, brief_text: str) -> BriefAnalysis:
-        """Analyse complète d'un brief client"""
+    @property
+    def nlp(self):
+        """Modèle spaCy français, chargé à la première utilisation (None si non installé)"""
+        return model_registry.get('spacy_fr')
 
-        # Nettoyage du texte
-        cleaned_text = self._clean_text(brief_text)
+    def analyze_brief(self, brief_text: str) -> BriefAnalysis:
+        """Analyse complète d'un brief client.
+
+        Même chemin qu'`analyze_briefs` (lot d'un seul texte) : avec le modèle
+        français, le découpage en phrases est celui de spaCy dans les deux cas.
+        """
+        return next(self.analyze_briefs([brief_text], batch_size=1, n_process=1))
+
+    def analyze_briefs(self,
+                       brief_texts: Iterable[str],
+                       batch_size: int = DEFAULT_BATCH_SIZE,
+                       n_process: int = DEFAULT_N_PROCESS) -> Iterator[BriefAnalysis]:
+        """Analyse un flux de briefs et produit les résultats dans l'ordre d'entrée.
+
+        Les textes sont consommés au fil de l'eau (générateur accepté) : la mémoire
+        reste bornée par `batch_size`, quelle que soit la taille du flux. Avec le
+        modèle français, les textes passent par `nlp.pipe` (`n_process` processus) ;
+        sans modèle, chaque brief suit le traitement par regex.
+        """
+        cleaned_texts = (self._clean_text(text) for text in brief_texts)
+
+        nlp = self.nlp
+        if nlp is None:
+            for cleaned_text in cleaned_texts:
+                yield self._analyze_cleaned(cleaned_text)
+            return
+
+        for doc in nlp.pipe(cleaned_texts, batch_size=batch_size, n_process=n_process):
+            yield self._analyze_cleaned(doc.text, doc)
+
+    def _analyze_cleaned(self, cleaned_text: str, doc=None) -> BriefAnalysis:
+        """Analyse d'un texte nettoyé ; `doc` est son analyse spaCy si disponible"""
 
         # Analyse de structure
         structure_score = self._analyze_structure(cleaned_text)
@@ -57,7 +85,7 @@ class SmartBriefProcessor:
         completeness_score, missing_elements = self._analyze_completeness(cleaned_text)
 
         # Analyse de clarté
-        clarity_score = self._analyze_clarity(cleaned_text)
+        clarity_score = self._analyze_clarity(cleaned_text, doc)
 
         # Extraction mots-clés techniques
         technical_keywords = self._extract_technical_keywords(cleaned_text)
@@ -140,13 +168,19 @@ class SmartBriefProcessor:
 
         return int(completeness_score), missing_elements
 
-    def _analyze_clarity(self, text: str) -> int:
+    def _analyze_clarity(self, text: str, doc=None) -> int:
         """Analyse la clarté du brief"""
         score = 50
 
-        # Longueur des phrases
-        sentences = text.split('.')
-        avg_sentence_length = np.mean([len(s.split()) for s in sentences if s.strip()])
+        # Longueur des phrases : découpage spaCy si disponible, sinon sur les points
+        if doc is not None and doc.has_annotation("SENT_START"):
+            sentence_lengths = [
+                sum(1 for token in sentence if not (token.is_punct or token.is_space))
+                for sentence in doc.sents
+            ]
+        else:
+            sentence_lengths = [len(s.split()) for s in text.split('.') if s.strip()]
+        avg_sentence_length = sum(sentence_lengths) / len(sentence_lengths) if sentence_lengths else 0.0
 
         if 10 <= avg_sentence_length <= 20:
             score += 20
@@ -1,11 +1,17 @@
 
 import csv
 import logging
-from typing import Dict, List, Optional, Tuple
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
-from dataclasses import dataclass
-import re
+from dataclasses import dataclass, field
 from collections import defaultdict
+from services.keyword_automaton import KeywordAutomaton
+from services.analyzed_brief import AnalyzedBrief, extract_tech_keywords
+from services.taxonomy_classifier import (
+    CLASSIFIER_MODES, LABELED_BRIEFS_FILE, LinearTaxonomyClassifier,
+    read_labeled_briefs, taxonomy_training_set
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,53 +22,155 @@ class TaxonomyResult:
     skills_std: List[str]
     tags_std: List[str]
     confidence: float
+    # Top-k du classifieur linéaire : [{"category", "sub_category", "confidence"}]
+    alternatives: List[Dict[str, Any]] = field(default_factory=list)
+
+# Schéma attendu de taxonomy_skills_fr.csv (listes séparées par des virgules)
+TAXONOMY_FILE = "taxonomy_skills_fr.csv"
+TAXONOMY_COLUMNS = ('category', 'sub_category', 'skills', 'keywords')
+
+def _split_list(value: str) -> List[str]:
+    return [item.strip() for item in (value or '').split(',') if item.strip()]
+
+def read_taxonomy_csv(path: Path) -> Tuple[Dict[str, Dict[str, List[Dict]]], Dict[str, Dict[str, List[str]]]]:
+    """Lit le CSV de taxonomie.
+
+    Retourne (taxonomy_data, sub_category_keywords) : chaque compétence a son nom
+    pour mot-clé, les mots-clés de la ligne sont rattachés à la sous-catégorie.
+    Lève ValueError si les colonnes ne correspondent pas au schéma attendu.
+    """
+    taxonomy_data: Dict[str, Dict[str, List[Dict]]] = {}
+    sub_category_keywords: Dict[str, Dict[str, List[str]]] = {}
+
+    with open(path, 'r', encoding='utf-8') as f:
+        # Les lignes vides (en tête de fichier notamment) sont ignorées
+        reader = csv.DictReader(line for line in f if line.strip())
+        missing = [column for column in TAXONOMY_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"{path}: colonnes manquantes {missing} (colonnes lues: {reader.fieldnames})")
+
+        for line_number, row in enumerate(reader, start=2):
+            category = (row['category'] or '').strip()
+            sub_category = (row['sub_category'] or '').strip()
+            if not category or not sub_category:
+                raise ValueError(f"{path}:{line_number}: catégorie ou sous-catégorie vide")
+
+            skills = taxonomy_data.setdefault(category, {}).setdefault(sub_category, [])
+            known_skills = {skill_info['skill'] for skill_info in skills}
+            for skill in _split_list(row['skills']):
+                if skill not in known_skills:
+                    known_skills.add(skill)
+                    skills.append({'skill': skill, 'keywords': [skill.lower()]})
+
+            keywords = sub_category_keywords.setdefault(category, {}).setdefault(sub_category, [])
+            for keyword in _split_list(row['keywords']):
+                if keyword.lower() not in keywords:
+                    keywords.append(keyword.lower())
+
+    return taxonomy_data, sub_category_keywords
+
+def index_category_keywords(sub_category_keywords: Dict[str, Dict[str, List[str]]]) -> Dict[str, List[Dict]]:
+    """Index des mots-clés exacts vers (catégorie, sous-catégorie).
+
+    Seuls les mots-clés des lignes du CSV sont indexés, comme avant le snapshot :
+    les noms de compétences ne sont cherchés que dans le texte (automate).
+    """
+    category_keywords: Dict[str, List[Dict]] = {}
+    for category, sub_categories in sub_category_keywords.items():
+        for sub_category, keywords in sub_categories.items():
+            for keyword in keywords:
+                category_keywords.setdefault(keyword, []).append({
+                    'category': category,
+                    'sub_category': sub_category,
+                    'skill': None
+                })
+    return category_keywords
+
+def build_keyword_automaton(taxonomy_data: Dict[str, Dict[str, List[Dict]]],
+                            sub_category_keywords: Dict[str, Dict[str, List[str]]]) -> KeywordAutomaton:
+    """Compile les mots-clés de la taxonomie en un automate multi-motifs.
+
+    Chaque occurrence (compétence, mot-clé) reçoit un numéro d'ordre afin que
+    la recherche directe restitue les correspondances dans l'ordre de la taxonomie.
+    Les mots-clés de sous-catégorie portent une compétence None.
+    """
+    automaton = KeywordAutomaton()
+    entry_order = 0
+    for category, sub_categories in taxonomy_data.items():
+        for sub_category, skills in sub_categories.items():
+            for skill_info in skills:
+                for keyword in skill_info['keywords']:
+                    automaton.add(keyword, (entry_order, category, sub_category, skill_info['skill']))
+                    entry_order += 1
+            for keyword in sub_category_keywords.get(category, {}).get(sub_category, []):
+                automaton.add(keyword, (entry_order, category, sub_category, None))
+                entry_order += 1
+    automaton.build()
+    return automaton
 
 class Taxonomizer:
     def __init__(self, data_path: str = "/infra/data"):
         self.data_path = Path(data_path)
         self.taxonomy_data = {}
+        self.sub_category_keywords = {}
         self.skills_mapping = {}
         self.category_keywords = defaultdict(list)
+        self.keyword_automaton = KeywordAutomaton()
         self._load_taxonomy_data()
+        self._index_category_keywords()
+        self._build_keyword_automaton()
+        self._init_linear_classifier()
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> 'Taxonomizer':
+        """Construit le taxonomiseur depuis un snapshot de données compilé (sans lire les CSV)"""
+        taxonomizer = cls.__new__(cls)
+        taxonomizer.data_path = Path(snapshot.path).parent
+        taxonomizer.taxonomy_data = snapshot.taxonomy_data
+        taxonomizer.sub_category_keywords = snapshot.sub_category_keywords
+        taxonomizer.skills_mapping = {}
+        taxonomizer._index_category_keywords()
+        taxonomizer.keyword_automaton = snapshot.keyword_automaton
+        taxonomizer._init_linear_classifier()
+        return taxonomizer
+
+    def _init_linear_classifier(self):
+        """Prépare le mode linéaire : briefs étiquetés lus maintenant, entraînement au premier usage"""
+        labeled_file = self.data_path / LABELED_BRIEFS_FILE
+        self.labeled_briefs = read_labeled_briefs(labeled_file) if labeled_file.exists() else []
+        self._linear_classifier: Optional[LinearTaxonomyClassifier] = None
+        self._linear_lock = threading.Lock()
+
+    @property
+    def linear_classifier(self) -> LinearTaxonomyClassifier:
+        """Classifieur TF-IDF entraîné sur la taxonomie et les briefs étiquetés (paresseux)"""
+        if self._linear_classifier is None:
+            with self._linear_lock:
+                if self._linear_classifier is None:
+                    documents, labels = taxonomy_training_set(
+                        self.taxonomy_data, self.sub_category_keywords, self.labeled_briefs
+                    )
+                    self._linear_classifier = LinearTaxonomyClassifier().fit(documents, labels)
+        return self._linear_classifier
 
     def _load_taxonomy_data(self):
-        """Charge les données de taxonomie depuis les fichiers CSV"""
-        try:
-            # Chargement de la taxonomie des compétences
-            taxonomy_file = self.data_path / "taxonomy_skills_fr.csv"
-            if taxonomy_file.exists():
-                with open(taxonomy_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        category = row['category']
-                        sub_category = row['sub_category']
-                        skill = row['skill']
-                        keywords = row.get('keywords', '').split(',')
-                        
-                        if category not in self.taxonomy_data:
-                            self.taxonomy_data[category] = {}
-                        if sub_category not in self.taxonomy_data[category]:
-                            self.taxonomy_data[category][sub_category] = []
-                        
-                        self.taxonomy_data[category][sub_category].append({
-                            'skill': skill,
-                            'keywords': [k.strip().lower() for k in keywords if k.strip()]
-                        })
-                        
-                        # Index pour la recherche par mots-clés
-                        for keyword in keywords:
-                            if keyword.strip():
-                                self.category_keywords[keyword.strip().lower()].append({
-                                    'category': category,
-                                    'sub_category': sub_category,
-                                    'skill': skill
-                                })
-            
-            logger.info(f"Taxonomie chargée: {len(self.taxonomy_data)} catégories")
-            
-        except Exception as e:
-            logger.error(f"Erreur lors du chargement de la taxonomie: {e}")
-            self._init_default_taxonomy()
+        """Charge les données de taxonomie depuis le fichier CSV.
+
+        Un fichier absent laisse la taxonomie vide (tout brief est classé
+        services/généraliste) ; un fichier dont le schéma ne correspond pas lève
+        une erreur au lieu d'être ignoré.
+        """
+        taxonomy_file = self.data_path / TAXONOMY_FILE
+        if not taxonomy_file.exists():
+            logger.warning(f"Taxonomie introuvable ({taxonomy_file}), aucune catégorie chargée")
+            return
+
+        self.taxonomy_data, self.sub_category_keywords = read_taxonomy_csv(taxonomy_file)
+        logger.info(f"Taxonomie chargée: {len(self.taxonomy_data)} catégories")
+
+    def _index_category_keywords(self):
+        """Index des mots-clés exacts vers (catégorie, sous-catégorie, compétence)"""
+        self.category_keywords = defaultdict(list, index_category_keywords(self.sub_category_keywords))
 
     def _init_default_taxonomy(self):
         """Initialise une taxonomie par défaut"""
@@ -106,50 +214,25 @@ class Taxonomizer:
             }
         }
 
-    def classify(self, text: str, keywords: List[str] = None) -> TaxonomyResult:
-        """Classifie un texte selon la taxonomie"""
-        text_lower = text.lower()
-        all_keywords = keywords or []
-        
-        # Extraction des mots-clés du texte
-        text_keywords = self._extract_keywords_from_text(text_lower)
-        all_keywords.extend(text_keywords)
-        
-        # Scoring par catégorie/sous-catégorie
-        category_scores = defaultdict(lambda: defaultdict(float))
-        matched_skills = defaultdict(list)
-        matched_tags = []
-        
-        for keyword in all_keywords:
-            keyword_lower = keyword.lower()
-            if keyword_lower in self.category_keywords:
-                for match in self.category_keywords[keyword_lower]:
-                    category = match['category']
-                    sub_category = match['sub_category']
-                    skill = match['skill']
-                    
-                    category_scores[category][sub_category] += 1.0
-                    if skill not in matched_skills[(category, sub_category)]:
-                        matched_skills[(category, sub_category)].append(skill)
-                    
-                    if keyword not in matched_tags:
-                        matched_tags.append(keyword)
-        
-        # Recherche directe dans le texte
-        for category, sub_categories in self.taxonomy_data.items():
-            for sub_category, skills in sub_categories.items():
-                for skill_info in skills:
-                    skill_name = skill_info['skill']
-                    skill_keywords = skill_info['keywords']
-                    
-                    # Vérification de la présence des mots-clés dans le texte
-                    for keyword in skill_keywords:
-                        if keyword in text_lower:
-                            category_scores[category][sub_category] += 0.8
-                            if skill_name not in matched_skills[(category, sub_category)]:
-                                matched_skills[(category, sub_category)].append(skill_name)
-                            if keyword not in matched_tags:
-                                matched_tags.append(keyword)
+    def _build_keyword_automaton(self):
+        """Compile l'automate de recherche directe à partir de la taxonomie chargée"""
+        self.keyword_automaton = build_keyword_automaton(self.taxonomy_data, self.sub_category_keywords)
+        logger.info(f"Automate de mots-clés compilé: {len(self.keyword_automaton)} mots-clés")
+
+    def classify(self,
+                 text: str,
+                 keywords: List[str] = None,
+                 mode: str = 'rules',
+                 brief: Optional[AnalyzedBrief] = None) -> TaxonomyResult:
+        """Classifie un texte selon la taxonomie.
+
+        `mode` : 'rules' (scoring par mots-clés) ou 'linear' (TF-IDF + centroïdes).
+        `brief` : brief déjà analysé dont `text` est le titre + la description.
+        """
+        if mode != 'rules':
+            return self.classify_many([text], [keywords], mode=mode, briefs=[brief])[0]
+
+        category_scores, matched_skills, matched_tags = self._match_keywords(text, keywords, brief)
         
         # Sélection de la meilleure catégorie/sous-catégorie
         best_category = None
@@ -182,24 +265,106 @@ class Taxonomizer:
             confidence=confidence
         )
 
+    def classify_many(self,
+                      texts: List[str],
+                      keywords_list: List[Optional[List[str]]] = None,
+                      mode: str = 'linear',
+                      top_k: int = 3,
+                      briefs: List[Optional[AnalyzedBrief]] = None) -> List[TaxonomyResult]:
+        """Classifie un lot de textes.
+
+        En mode 'linear', tout le lot est scoré par un seul produit matriciel ; les
+        compétences et tags restent issus des mots-clés, pour la sous-catégorie prédite.
+        """
+        if mode not in CLASSIFIER_MODES:
+            raise ValueError(f"Mode de classification inconnu: {mode} (attendu: {', '.join(CLASSIFIER_MODES)})")
+        keywords_list = keywords_list or [None] * len(texts)
+        briefs = briefs or [None] * len(texts)
+        if mode == 'rules':
+            return [
+                self.classify(text, keywords, brief=brief)
+                for text, keywords, brief in zip(texts, keywords_list, briefs)
+            ]
+
+        if self.taxonomy_data or self.labeled_briefs:
+            predictions = self.linear_classifier.predict_top_k(texts, k=top_k)
+        else:
+            # Taxonomie absente : rien à apprendre, classement généraliste
+            predictions = [[] for _ in texts]
+        results = []
+        for text, keywords, brief, top in zip(texts, keywords_list, briefs, predictions):
+            _, matched_skills, matched_tags = self._match_keywords(text, keywords, brief)
+            if top:
+                best_category, best_sub_category, confidence = top[0]
+            else:
+                best_category, best_sub_category, confidence = "services", "généraliste", 0.1
+            
+            results.append(TaxonomyResult(
+                category_std=best_category,
+                sub_category_std=best_sub_category,
+                skills_std=matched_skills.get((best_category, best_sub_category), [])[:10],
+                tags_std=matched_tags[:15],
+                confidence=confidence,
+                alternatives=[
+                    {"category": category, "sub_category": sub_category, "confidence": score}
+                    for category, sub_category, score in top
+                ]
+            ))
+        return results
+
+    def _match_keywords(self, text: str, keywords: Optional[List[str]], brief: Optional[AnalyzedBrief] = None):
+        """Scores par (catégorie, sous-catégorie), compétences et tags trouvés dans le texte"""
+        all_keywords = list(keywords or [])
+        
+        # Extraction des mots-clés du texte (déjà faite si le brief est analysé)
+        if brief is not None:
+            text_lower = brief.text_lower
+            text_keywords = brief.tech_keywords
+        else:
+            text_lower = text.lower()
+            text_keywords = self._extract_keywords_from_text(text_lower)
+        all_keywords.extend(text_keywords)
+        
+        # Scoring par catégorie/sous-catégorie
+        category_scores = defaultdict(lambda: defaultdict(float))
+        matched_skills = defaultdict(list)
+        matched_tags = []
+        
+        for keyword in all_keywords:
+            keyword_lower = keyword.lower()
+            if keyword_lower in self.category_keywords:
+                for match in self.category_keywords[keyword_lower]:
+                    category = match['category']
+                    sub_category = match['sub_category']
+                    skill = match['skill']
+                    
+                    category_scores[category][sub_category] += 1.0
+                    if skill is not None and skill not in matched_skills[(category, sub_category)]:
+                        matched_skills[(category, sub_category)].append(skill)
+                    
+                    if keyword not in matched_tags:
+                        matched_tags.append(keyword)
+        
+        # Recherche directe dans le texte : un seul parcours de l'automate
+        automaton = self.keyword_automaton
+        direct_matches = sorted(
+            (entry_order, category, sub_category, skill_name, automaton.keywords[keyword_index])
+            for keyword_index in automaton.find_keywords(text_lower)
+            for entry_order, category, sub_category, skill_name in automaton.payloads[keyword_index]
+        )
+        
+        for _, category, sub_category, skill_name, keyword in direct_matches:
+            category_scores[category][sub_category] += 0.8
+            if skill_name is not None and skill_name not in matched_skills[(category, sub_category)]:
+                matched_skills[(category, sub_category)].append(skill_name)
+            if keyword not in matched_tags:
+                matched_tags.append(keyword)
+        
+        return category_scores, matched_skills, matched_tags
+
     def _extract_keywords_from_text(self, text: str) -> List[str]:
         """Extrait les mots-clés techniques du texte"""
-        # Patterns pour identifier les technologies/compétences
-        tech_patterns = [
-            r'\b(?:react|vue|angular|node|php|python|java|javascript|typescript)\b',
-            r'\b(?:html|css|sass|scss|bootstrap|tailwind)\b',
-            r'\b(?:mysql|postgresql|mongodb|redis|elasticsearch)\b',
-            r'\b(?:aws|azure|gcp|docker|kubernetes)\b',
-            r'\b(?:figma|sketch|photoshop|illustrator|xd)\b',
-            r'\b(?:seo|sem|google ads|facebook ads|instagram)\b',
-        ]
-        
-        keywords = []
-        for pattern in tech_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            keywords.extend(matches)
-        
-        return list(set(keywords))  # Déduplication
+        return list(extract_tech_keywords(text.lower()))
 
     def suggest_improvements(self, current_category: str, current_skills: List[str]) -> Dict[str, any]:
         """Suggère des améliorations pour la classification"""
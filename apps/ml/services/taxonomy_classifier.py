@@ -0,0 +1,142 @@
+"""
+Classifieur taxonomique linéaire (TF-IDF haché + centroïdes)
+Alternative au scoring par règles de Taxonomizer : chaque sous-catégorie est
+représentée par le centroïde TF-IDF de ses documents d'entraînement (compétences,
+mots-clés, briefs historiques étiquetés). Un lot de briefs est scoré par un seul
+produit de matrices creuses.
+"""
+
+import csv
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Modes de classification sélectionnables par requête
+CLASSIFIER_MODES = ('rules', 'linear')
+
+# Briefs historiques étiquetés (optionnels) utilisés pour l'entraînement
+LABELED_BRIEFS_FILE = "labeled_briefs_fr.csv"
+LABELED_BRIEFS_COLUMNS = ('title', 'description', 'category', 'sub_category')
+
+def read_labeled_briefs(path: Path) -> List[Tuple[str, str, str]]:
+    """Lit les briefs étiquetés : [(texte, catégorie, sous-catégorie)].
+
+    Lève ValueError si les colonnes ne correspondent pas au schéma attendu.
+    """
+    briefs = []
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(line for line in f if line.strip())
+        missing = [column for column in LABELED_BRIEFS_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"{path}: colonnes manquantes {missing} (colonnes lues: {reader.fieldnames})")
+        for row in reader:
+            briefs.append((f"{row['title']} {row['description']}", row['category'], row['sub_category']))
+    return briefs
+
+class LinearTaxonomyClassifier:
+    """TF-IDF sur n-grammes de mots hachés, score = cosinus au centroïde de chaque label.
+
+    scikit-learn et numpy ne sont importés qu'à l'entraînement : le mode par règles
+    n'en dépend pas.
+    """
+
+    def __init__(self, n_features: int = 2 ** 18, ngram_range: Tuple[int, int] = (1, 2)):
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.labels: List[Tuple[str, str]] = []
+        self._vectorizer = None
+        self._tfidf = None
+        self._centroids = None
+
+    def fit(self, documents: Sequence[str], labels: Sequence[Tuple[str, str]]) -> 'LinearTaxonomyClassifier':
+        """Entraîne le modèle sur des documents étiquetés (catégorie, sous-catégorie)"""
+        import numpy as np
+        from scipy import sparse
+        from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+        from sklearn.preprocessing import normalize
+
+        if not documents:
+            raise ValueError("Aucun document d'entraînement")
+
+        self._vectorizer = HashingVectorizer(
+            n_features=self.n_features,
+            ngram_range=self.ngram_range,
+            alternate_sign=False,
+            norm=None,
+            lowercase=True
+        )
+        counts = self._vectorizer.transform(documents)
+        self._tfidf = TfidfTransformer(sublinear_tf=True).fit(counts)
+        features = normalize(self._tfidf.transform(counts))
+
+        # Centroïde normalisé par label : matrice (labels × features) creuse
+        self.labels = list(dict.fromkeys(labels))
+        label_index = {label: index for index, label in enumerate(self.labels)}
+        rows = np.array([label_index[label] for label in labels])
+        membership = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, np.arange(len(rows)))),
+            shape=(len(self.labels), len(rows))
+        )
+        self._centroids = normalize(membership @ features).T.tocsc()
+
+        logger.info(f"Classifieur linéaire entraîné: {len(documents)} documents, {len(self.labels)} labels")
+        return self
+
+    @property
+    def fitted(self) -> bool:
+        return self._centroids is not None
+
+    def predict_top_k(self, texts: Sequence[str], k: int = 3) -> List[List[Tuple[str, str, float]]]:
+        """Top-k (catégorie, sous-catégorie, confiance) par texte, en un produit matriciel.
+
+        La confiance est la similarité cosinus au centroïde (0 à 1) ; les labels de
+        score nul sont omis.
+        """
+        import numpy as np
+        from sklearn.preprocessing import normalize
+
+        if not self.fitted:
+            raise RuntimeError("Classifieur non entraîné")
+        if not texts:
+            return []
+
+        features = normalize(self._tfidf.transform(self._vectorizer.transform(texts)))
+        scores = (features @ self._centroids).toarray()
+
+        k = min(k, len(self.labels))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in enumerate(top):
+            ranked = sorted(candidates, key=lambda column: -scores[row, column])
+            results.append([
+                (*self.labels[column], round(float(scores[row, column]), 4))
+                for column in ranked
+                if scores[row, column] > 0
+            ])
+        return results
+
+def taxonomy_training_set(taxonomy_data: Dict[str, Dict[str, List[Dict]]],
+                          sub_category_keywords: Dict[str, Dict[str, List[str]]],
+                          labeled_briefs: Optional[List[Tuple[str, str, str]]] = None
+                          ) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Documents d'entraînement : un document par sous-catégorie (noms, compétences,
+    mots-clés) et un par brief étiqueté"""
+    documents = []
+    labels = []
+    for category, sub_categories in taxonomy_data.items():
+        for sub_category, skills in sub_categories.items():
+            terms = [category.replace('-', ' '), sub_category.replace('-', ' ')]
+            for skill_info in skills:
+                terms.append(skill_info['skill'])
+                terms.extend(skill_info['keywords'])
+            terms.extend(sub_category_keywords.get(category, {}).get(sub_category, []))
+            documents.append(' '.join(terms))
+            labels.append((category, sub_category))
+
+    for text, category, sub_category in labeled_briefs or []:
+        documents.append(text)
+        labels.append((category, sub_category))
+
+    return documents, labels
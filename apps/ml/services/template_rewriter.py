@@ -3,6 +3,7 @@ import logging
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 import re
+from services.analyzed_brief import AnalyzedBrief
 
 logger = logging.getLogger(__name__)
 
@@ -184,21 +185,26 @@ class TemplateRewriter:
                        original_description: str,
                        category: str,
                        sub_category: str = None,
-                       skills: List[str] = None) -> RewrittenProject:
-        """Réécrit un projet selon les templates de qualité"""
+                       skills: List[str] = None,
+                       brief: Optional[AnalyzedBrief] = None) -> RewrittenProject:
+        """Réécrit un projet selon les templates de qualité (réutilise `brief` s'il est déjà analysé)"""
         
         # Sélection du template approprié
         template_key = self._select_template(category, sub_category)
         template = self.templates.get(template_key, self.templates['default'])
         
         # Extraction des informations du projet original
-        project_info = self._extract_project_info(original_title, original_description)
+        project_info = self._extract_project_info(
+            original_title, original_description, brief.text_lower if brief else None
+        )
         
         # Génération du titre standardisé
         title_std = self._generate_title(template, project_info, category)
         
         # Génération du résumé structuré
-        summary_std = self._generate_summary(template, project_info, original_description)
+        summary_std = self._generate_summary(
+            template, project_info, original_description, brief.description_lower if brief else None
+        )
         
         # Génération des critères d'acceptation
         acceptance_criteria = self._generate_acceptance_criteria(template, project_info, skills)
@@ -240,7 +246,7 @@ class TemplateRewriter:
         
         return template_mapping.get(category_lower, 'default')
 
-    def _extract_project_info(self, title: str, description: str) -> Dict[str, any]:
+    def _extract_project_info(self, title: str, description: str, text_lower: Optional[str] = None) -> Dict[str, any]:
         """Extrait les informations clés du projet"""
         info = {
             'purpose': 'améliorer la productivité',
@@ -252,7 +258,7 @@ class TemplateRewriter:
         }
         
         # Analyse du titre et de la description
-        text = (title + ' ' + description).lower()
+        text = text_lower if text_lower is not None else (title + ' ' + description).lower()
         
         # Détection du type de projet
         if any(word in text for word in ['ecommerce', 'boutique', 'vente', 'shop']):
@@ -300,12 +306,17 @@ class TemplateRewriter:
         
         return title
 
-    def _generate_summary(self, template: Dict, project_info: Dict, original_description: str) -> str:
+    def _generate_summary(self,
+                          template: Dict,
+                          project_info: Dict,
+                          original_description: str,
+                          description_lower: Optional[str] = None) -> str:
         """Génère un résumé structuré"""
         structure = template.get('summary_structure', [])
         
         # Extraction d'informations de la description originale
-        description_lower = original_description.lower()
+        if description_lower is None:
+            description_lower = original_description.lower()
         
         summary_parts = []
         
@@ -1,8 +1,7 @@
-
 import re
 import logging
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
@@ -12,162 +11,183 @@ class NormalizedText:
     quantities: Dict[str, float]
     constraints: List[str]
     keywords: List[str]
+    price_indicators: List[Dict[str, Any]] = field(default_factory=list)
 
-class TextNormalizer:
-    def __init__(self):
-        self.surface_patterns = [
-            (r'(\d+(?:[.,]\d+)?)\s*m²?', 'surface_m2'),
-            (r'(\d+(?:[.,]\d+)?)\s*mètres?\s*carrés?', 'surface_m2'),
-            (r'(\d+(?:[.,]\d+)?)\s*hectares?', 'surface_hectare'),
-        ]
-        
-        self.time_patterns = [
-            (r'(\d+(?:[.,]\d+)?)\s*heures?', 'duration_hours'),
-            (r'(\d+(?:[.,]\d+)?)\s*jours?', 'duration_days'),
-            (r'(\d+(?:[.,]\d+)?)\s*semaines?', 'duration_weeks'),
-            (r'(\d+(?:[.,]\d+)?)\s*mois', 'duration_months'),
-        ]
-        
-        self.distance_patterns = [
-            (r'(\d+(?:[.,]\d+)?)\s*km', 'distance_km'),
-            (r'(\d+(?:[.,]\d+)?)\s*kilomètres?', 'distance_km'),
-            (r'(\d+(?:[.,]\d+)?)\s*m(?:\s|$)', 'distance_m'),
-        ]
-        
-        self.constraint_patterns = [
-            r'(?:sur\s+site|en\s+présentiel|physiquement)',
-            r'(?:à\s+distance|en\s+remote|télétravail)',
-            r'(?:urgent|rapidement|immédiatement)',
-            r'(?:budget\s+serré|petit\s+budget)',
-        ]
+@dataclass
+class ScanResult:
+    quantities: Dict[str, float]
+    constraints: List[str]
+    price_indicators: List[Dict[str, Any]]
+
+# Nombre décimal français (virgule ou point)
+_NUMBER = r'\d+(?:[.,]\d+)?'
+
+# Unités pouvant suivre un nombre : prix d'abord (le "€" est optionnel), puis
+# les quantités. L'ordre des alternatives départage les préfixes communs.
+_UNIT_PATTERNS = [
+    ('hourly', r'€?\s*(?:/\s*h|par\s+heure|de\s+l[\'’]heure)'),
+    ('daily', r'€?\s*(?:/\s*jour|par\s+jour)'),
+    ('fixed', r'€?\s*(?:forfait|global|total)'),
+    ('surface_m2', r'm²|m2\b|mètres?\s*carrés?'),
+    ('surface_hectare', r'hectares?'),
+    ('duration_hours', r'heures?'),
+    ('duration_days', r'jours?'),
+    ('duration_weeks', r'semaines?'),
+    ('duration_months', r'mois'),
+    ('distance_km', r'km|kilomètres?'),
+    ('distance_m', r'mètres?|m(?=\s|$)'),
+]
+
+# Préfixes annonçant un montant : le nombre suivant est capturé par la branche nombre
+_PREFIX_PATTERNS = [
+    ('budget_max', r'budget\s*:?\s*(?=\d)'),
+    ('price_from', r'à\s+partir\s+de\s+(?=\d)'),
+]
+
+_CONSTRAINT_PATTERNS = [
+    ('on_site_required', r'sur\s+site|en\s+présentiel|physiquement'),
+    ('remote_ok', r'à\s+distance|en\s+remote|télétravail'),
+    ('urgent', r'urgent|rapidement|immédiatement'),
+    # "petit" seul : "budget" reste disponible pour le préfixe "budget 500"
+    ('tight_budget', r'budget\s+serré|petit(?=\s+budget)'),
+    ('experience_required', r'expérience\s+requise|expérimenté'),
+    ('certification_required', r'certification|certifié|agréé'),
+]
 
+PRICE_UNIT_TYPES = ('hourly', 'daily', 'fixed')
+PRICE_TYPES = ('hourly', 'daily', 'fixed', 'budget_max', 'price_from')
+CONSTRAINT_TYPES = tuple(name for name, _ in _CONSTRAINT_PATTERNS)
+
+def _build_scanner(unit_patterns, constraint_patterns) -> 're.Pattern':
+    """Compile l'automate unique : préfixes de prix | nombre + unité | contraintes.
+
+    Le texte est parcouru en minuscules (sans re.IGNORECASE). Une garde de tête
+    n'essaie les alternatives qu'avant un chiffre ou en début d'un mot dont la
+    première lettre peut ouvrir un préfixe ou une contrainte.
+    """
+    keyword_patterns = _PREFIX_PATTERNS + constraint_patterns
+    first_letters = ''.join(sorted({
+        alternative[0] for _, pattern in keyword_patterns for alternative in pattern.split('|')
+    }))
+    alternatives = [f'(?P<{name}>{pattern})' for name, pattern in _PREFIX_PATTERNS]
+    units = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in unit_patterns)
+    alternatives.append(f'(?P<number>{_NUMBER})(?:\\s*(?:{units}))?')
+    alternatives.extend(f'(?P<{name}>{pattern})' for name, pattern in constraint_patterns)
+    return re.compile(f'(?=\\d|\\b[{first_letters}])(?:{"|".join(alternatives)})')
+
+_SCANNER = _build_scanner(_UNIT_PATTERNS, _CONSTRAINT_PATTERNS)
+# Prix seuls, pour le texte brut (voir TextNormalizer.extract_price_indicators)
+_PRICE_SCANNER = _build_scanner([unit for unit in _UNIT_PATTERNS if unit[0] in PRICE_UNIT_TYPES], [])
+_PREFIX_NAMES = tuple(name for name, _ in _PREFIX_PATTERNS)
+
+# Tout ce qui n'est ni un mot ni une ponctuation conservée (espaces compris)
+_CLEAN_PATTERN = re.compile(r'[^\w.,!?;:-]+')
+_WORD_PATTERN = re.compile(r'\b\w{3,}\b')
+
+# Mots vides français
+STOP_WORDS = frozenset({
+    'le', 'la', 'les', 'un', 'une', 'des', 'du', 'de', 'et', 'ou', 'mais',
+    'car', 'si', 'ce', 'se', 'que', 'qui', 'quoi', 'dont', 'où', 'quand',
+    'comment', 'pourquoi', 'je', 'tu', 'il', 'elle', 'nous', 'vous', 'ils',
+    'elles', 'mon', 'ma', 'mes', 'ton', 'ta', 'tes', 'son', 'sa', 'ses',
+    'notre', 'nos', 'votre', 'vos', 'leur', 'leurs', 'dans', 'sur', 'avec',
+    'par', 'pour', 'sans', 'sous', 'vers', 'chez', 'contre', 'entre',
+    'pendant', 'avant', 'après', 'depuis', 'jusqu', 'avoir', 'être',
+    'faire', 'aller', 'venir', 'voir', 'savoir', 'pouvoir', 'vouloir',
+    'devoir', 'falloir', 'très', 'plus', 'moins', 'bien', 'mal', 'beaucoup'
+})
+
+class TextNormalizer:
     def normalize(self, text: str) -> NormalizedText:
         """Normalise le texte français et extrait les informations structurées"""
-        
+
         # Nettoyage du texte
         clean_text = self._clean_text(text)
-        
-        # Extraction des quantités
-        quantities = self._extract_quantities(clean_text)
-        
-        # Extraction des contraintes
-        constraints = self._extract_constraints(clean_text)
-        
+
+        # Quantités et contraintes en une seule passe sur le texte nettoyé
+        scan = self.scan(clean_text)
+
+        # Les motifs de prix ont besoin de la ponctuation d'origine ("€", "/h",
+        # "de l'heure") que le nettoyage retire : parcours du texte brut
+        price_indicators = self.extract_price_indicators(text)
+
         # Extraction des mots-clés
         keywords = self._extract_keywords(clean_text)
-        
+
         return NormalizedText(
             clean_text=clean_text,
-            quantities=quantities,
-            constraints=constraints,
-            keywords=keywords
+            quantities=scan.quantities,
+            constraints=scan.constraints,
+            keywords=keywords,
+            price_indicators=price_indicators
         )
 
     def _clean_text(self, text: str) -> str:
         """Nettoie et normalise le texte"""
-        # Suppression des caractères spéciaux
-        text = re.sub(r'[^\w\s.,!?;:-]', ' ', text)
-        
-        # Normalisation des espaces
-        text = re.sub(r'\s+', ' ', text)
-        
+        # Caractères spéciaux et espaces consécutifs remplacés par un seul espace
+        text = _CLEAN_PATTERN.sub(' ', text)
+
         # Conversion en minuscules
-        text = text.lower().strip()
-        
-        return text
-
-    def _extract_quantities(self, text: str) -> Dict[str, float]:
-        """Extrait les quantités du texte"""
-        quantities = {}
-        
-        all_patterns = self.surface_patterns + self.time_patterns + self.distance_patterns
-        
-        for pattern, key in all_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                value_str = match.group(1).replace(',', '.')
-                try:
-                    value = float(value_str)
-                    quantities[key] = value
-                except ValueError:
-                    continue
-        
-        return quantities
-
-    def _extract_constraints(self, text: str) -> List[str]:
-        """Extrait les contraintes du texte"""
-        constraints = []
-        
-        constraint_mapping = {
-            r'(?:sur\s+site|en\s+présentiel|physiquement)': 'on_site_required',
-            r'(?:à\s+distance|en\s+remote|télétravail)': 'remote_ok',
-            r'(?:urgent|rapidement|immédiatement)': 'urgent',
-            r'(?:budget\s+serré|petit\s+budget)': 'tight_budget',
-            r'(?:expérience\s+requise|expérimenté)': 'experience_required',
-            r'(?:certification|certifié|agréé)': 'certification_required',
-        }
-        
-        for pattern, constraint in constraint_mapping.items():
-            if re.search(pattern, text, re.IGNORECASE):
-                constraints.append(constraint)
-        
-        return constraints
+        return text.lower().strip()
+
+    def scan(self, text: str) -> ScanResult:
+        """Extrait quantités, contraintes et indicateurs de prix en un seul parcours du texte"""
+        return self._scan(text, _SCANNER)
+
+    def _scan(self, text: str, scanner: 're.Pattern') -> ScanResult:
+        quantities: Dict[str, float] = {}
+        found_constraints = set()
+        prices: Dict[str, List[float]] = {price_type: [] for price_type in PRICE_TYPES}
+
+        # Préfixe ("budget :", "à partir de") en attente du nombre qui le suit
+        pending_prefix: Optional[Tuple[str, int]] = None
+
+        for match in scanner.finditer(text.lower()):
+            kind = match.lastgroup
+
+            if kind in _PREFIX_NAMES:
+                pending_prefix = (kind, match.end())
+                continue
+
+            if kind in CONSTRAINT_TYPES:
+                found_constraints.add(kind)
+                continue
+
+            # Nombre, éventuellement suivi d'une unité
+            value = float(match.group('number').replace(',', '.'))
+            if pending_prefix is not None and pending_prefix[1] == match.start():
+                prices[pending_prefix[0]].append(value)
+            pending_prefix = None
+
+            if kind in PRICE_UNIT_TYPES:
+                prices[kind].append(value)
+            elif kind != 'number':
+                quantities[kind] = value
+
+        return ScanResult(
+            quantities=quantities,
+            constraints=[constraint for constraint in CONSTRAINT_TYPES if constraint in found_constraints],
+            price_indicators=[
+                {'type': price_type, 'value': value, 'currency': 'EUR'}
+                for price_type in PRICE_TYPES
+                for value in prices[price_type]
+            ]
+        )
 
     def _extract_keywords(self, text: str) -> List[str]:
         """Extrait les mots-clés pertinents"""
-        # Mots vides français
-        stop_words = {
-            'le', 'la', 'les', 'un', 'une', 'des', 'du', 'de', 'et', 'ou', 'mais',
-            'car', 'si', 'ce', 'se', 'que', 'qui', 'quoi', 'dont', 'où', 'quand',
-            'comment', 'pourquoi', 'je', 'tu', 'il', 'elle', 'nous', 'vous', 'ils',
-            'elles', 'mon', 'ma', 'mes', 'ton', 'ta', 'tes', 'son', 'sa', 'ses',
-            'notre', 'nos', 'votre', 'vos', 'leur', 'leurs', 'dans', 'sur', 'avec',
-            'par', 'pour', 'sans', 'sous', 'vers', 'chez', 'contre', 'entre',
-            'pendant', 'avant', 'après', 'depuis', 'jusqu', 'avoir', 'être',
-            'faire', 'aller', 'venir', 'voir', 'savoir', 'pouvoir', 'vouloir',
-            'devoir', 'falloir', 'très', 'plus', 'moins', 'bien', 'mal', 'beaucoup'
-        }
-        
-        # Tokenisation simple
-        words = re.findall(r'\b\w{3,}\b', text.lower())
-        
-        # Filtrage des mots vides et extraction des mots-clés
-        keywords = [word for word in words if word not in stop_words]
-        
-        # Déduplication en gardant l'ordre
+        # Tokenisation simple, filtrage des mots vides et déduplication en gardant l'ordre
         seen = set()
         unique_keywords = []
-        for keyword in keywords:
-            if keyword not in seen:
-                seen.add(keyword)
-                unique_keywords.append(keyword)
-        
-        return unique_keywords[:20]  # Limite à 20 mots-clés
-
-    def extract_price_indicators(self, text: str) -> List[Dict[str, any]]:
+        for word in _WORD_PATTERN.findall(text.lower()):
+            if word not in STOP_WORDS and word not in seen:
+                seen.add(word)
+                unique_keywords.append(word)
+                if len(unique_keywords) == 20:  # Limite à 20 mots-clés
+                    break
+
+        return unique_keywords
+
+    def extract_price_indicators(self, text: str) -> List[Dict[str, Any]]:
         """Extrait les indicateurs de prix du texte"""
-        price_patterns = [
-            (r'(\d+(?:[.,]\d+)?)\s*€?\s*(?:/\s*h|par\s+heure|de\s+l[\'']heure)', 'hourly'),
-            (r'(\d+(?:[.,]\d+)?)\s*€?\s*(?:/\s*jour|par\s+jour)', 'daily'),
-            (r'(\d+(?:[.,]\d+)?)\s*€?\s*(?:forfait|global|total)', 'fixed'),
-            (r'budget\s*:?\s*(\d+(?:[.,]\d+)?)\s*€?', 'budget_max'),
-            (r'à\s+partir\s+de\s+(\d+(?:[.,]\d+)?)\s*€?', 'price_from'),
-        ]
-        
-        price_indicators = []
-        
-        for pattern, price_type in price_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                value_str = match.group(1).replace(',', '.')
-                try:
-                    value = float(value_str)
-                    price_indicators.append({
-                        'type': price_type,
-                        'value': value,
-                        'currency': 'EUR'
-                    })
-                except ValueError:
-                    continue
-        
-        return price_indicators
+        return self._scan(text, _PRICE_SCANNER).price_indicators
@@ -195,9 +195,14 @@ export async function routes(fastify: FastifyInstance) {
       // Appel au service ML avec fallback intelligent
       let mlResult = null;
       try {
+        const mlTimeoutMs = 5000;
         const mlResponse = await fetch('http://localhost:8001/improve', {
           method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
+          headers: {
+            'Content-Type': 'application/json',
+            // Budget laissé au service ML (marge pour le retour) : au-delà, réponse partielle
+            'X-Request-Deadline': String(mlTimeoutMs - 500)
+          },
           body: JSON.stringify({
             title: data.title,
             description: data.description,
@@ -205,7 +210,7 @@ export async function routes(fastify: FastifyInstance) {
             budget_min: data.budget_min,
             budget_max: data.budget_max
           }),
-          signal: AbortSignal.timeout(5000) // 5 sec timeout
+          signal: AbortSignal.timeout(mlTimeoutMs) // 5 sec timeout
         });
 
         if (mlResponse.ok) {